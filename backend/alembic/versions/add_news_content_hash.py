@@ -0,0 +1,43 @@
+"""add content_hash to news
+
+Revision ID: add_news_content_hash
+Revises: c4c0466047c6
+Create Date: 2025-04-02 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_news_content_hash'
+down_revision = 'c4c0466047c6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Check if content_hash column already exists
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    
+    columns = [c['name'] for c in inspector.get_columns('news')]
+    if 'content_hash' not in columns:
+        print("Adding content_hash column to news table...")
+        op.add_column('news', sa.Column('content_hash', sa.String(length=40), nullable=True))
+        print("content_hash column added successfully")
+    else:
+        print("content_hash column already exists in news table, skipping")
+
+
+def downgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    
+    columns = [c['name'] for c in inspector.get_columns('news')]
+    if 'content_hash' in columns:
+        print("Removing content_hash column from news table...")
+        op.drop_column('news', 'content_hash')
+        print("content_hash column removed successfully")
+    else:
+        print("content_hash column does not exist in news table, skipping")
@@ -0,0 +1,56 @@
+"""add composite indexes for news listing queries
+
+Revision ID: add_news_listing_indexes
+Revises: add_news_content_hash
+Create Date: 2025-04-03 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_news_listing_indexes'
+down_revision = 'add_news_content_hash'
+branch_labels = None
+depends_on = None
+
+
+NEWS_INDEXES = {
+    'ix_news_source_published': ['source_id', 'published_at'],
+    'ix_news_category_published': ['category_id', 'published_at'],
+    'ix_news_published_view_count': ['published_at', 'view_count'],
+    'ix_news_cluster_id': ['cluster_id'],
+}
+
+
+def upgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    existing = {index['name'] for index in inspector.get_indexes('news')}
+    is_postgresql = conn.dialect.name == 'postgresql'
+
+    for name, columns in NEWS_INDEXES.items():
+        if name in existing:
+            print(f"Index {name} already exists on news table, skipping")
+            continue
+        print(f"Creating index {name} on news({', '.join(columns)})...")
+        if is_postgresql:
+            # Build without locking writes on a large table; CONCURRENTLY cannot run inside a transaction
+            with op.get_context().autocommit_block():
+                op.create_index(name, 'news', columns, unique=False, postgresql_concurrently=True)
+        else:
+            op.create_index(name, 'news', columns, unique=False)
+
+
+def downgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    existing = {index['name'] for index in inspector.get_indexes('news')}
+
+    for name in NEWS_INDEXES:
+        if name in existing:
+            print(f"Dropping index {name} from news table...")
+            op.drop_index(name, table_name='news')
+        else:
+            print(f"Index {name} does not exist on news table, skipping")
@@ -0,0 +1,65 @@
+"""add full-text search column and GIN index to news
+
+Revision ID: add_news_search_index
+Revises: add_news_listing_indexes
+Create Date: 2025-04-04 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_news_search_index'
+down_revision = 'add_news_listing_indexes'
+branch_labels = None
+depends_on = None
+
+
+# Title tokens (first line of search_tokens) weigh more than summary tokens (second line)
+SEARCH_VECTOR_SQL = """
+ALTER TABLE news ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('simple', split_part(coalesce(search_tokens, ''), E'\\n', 1)), 'A') ||
+    setweight(to_tsvector('simple', split_part(coalesce(search_tokens, ''), E'\\n', 2)), 'B')
+) STORED
+"""
+
+
+def upgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    columns = [c['name'] for c in inspector.get_columns('news')]
+    if 'search_tokens' not in columns:
+        print("Adding search_tokens column to news table...")
+        op.add_column('news', sa.Column('search_tokens', sa.Text(), nullable=True))
+    else:
+        print("search_tokens column already exists in news table, skipping")
+
+    # The tsvector column and GIN index are PostgreSQL only (generated columns need 12+)
+    if conn.dialect.name != 'postgresql':
+        print("Not PostgreSQL, search falls back to substring matching on search_tokens")
+        return
+
+    if 'search_vector' not in columns:
+        print("Adding generated search_vector column to news table...")
+        op.execute(SEARCH_VECTOR_SQL)
+
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_news_search_vector ON news USING gin (search_vector)")
+    print("Run 'news reindex-search' to segment existing news for search")
+
+
+def downgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    columns = [c['name'] for c in inspector.get_columns('news')]
+
+    if conn.dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_news_search_vector")
+        if 'search_vector' in columns:
+            op.drop_column('news', 'search_vector')
+
+    if 'search_tokens' in columns:
+        print("Removing search_tokens column from news table...")
+        op.drop_column('news', 'search_tokens')
@@ -0,0 +1,75 @@
+"""add hourly/daily source stats rollups and a source_stats lookup index
+
+Revision ID: add_source_stats_rollups
+Revises: add_news_search_index
+Create Date: 2025-04-05 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_source_stats_rollups'
+down_revision = 'add_news_search_index'
+branch_labels = None
+depends_on = None
+
+
+STATS_INDEX = 'ix_source_stats_source_type_created'
+
+
+def upgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if 'source_stats_rollups' not in inspector.get_table_names():
+        print("Creating source_stats_rollups table...")
+        op.create_table(
+            'source_stats_rollups',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('source_id', sa.String(), sa.ForeignKey('sources.id'), nullable=False),
+            sa.Column('api_type', sa.String(16), nullable=False),
+            sa.Column('granularity', sa.String(8), nullable=False),
+            sa.Column('bucket', sa.DateTime(), nullable=False),
+            sa.Column('samples', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('total_requests', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('error_count', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('news_count', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('response_time_sum', sa.Float(), nullable=False, server_default='0'),
+            sa.Column('weighted_response_time_sum', sa.Float(), nullable=False, server_default='0'),
+            sa.Column('weighted_success_sum', sa.Float(), nullable=False, server_default='0'),
+            sa.UniqueConstraint('source_id', 'api_type', 'granularity', 'bucket', name='uix_source_stats_rollup'),
+        )
+        op.create_index('ix_source_stats_rollups_granularity_bucket', 'source_stats_rollups', ['granularity', 'bucket'])
+    else:
+        print("source_stats_rollups table already exists, skipping")
+
+    existing = {index['name'] for index in inspector.get_indexes('source_stats')}
+    if STATS_INDEX in existing:
+        print(f"Index {STATS_INDEX} already exists on source_stats table, skipping")
+    else:
+        print(f"Creating index {STATS_INDEX} on source_stats(source_id, api_type, created_at)...")
+        columns = ['source_id', 'api_type', 'created_at']
+        if conn.dialect.name == 'postgresql':
+            # Build without locking writes; CONCURRENTLY cannot run inside a transaction
+            with op.get_context().autocommit_block():
+                op.create_index(STATS_INDEX, 'source_stats', columns, unique=False, postgresql_concurrently=True)
+        else:
+            op.create_index(STATS_INDEX, 'source_stats', columns, unique=False)
+
+    print("Run 'news rebuild-stats-rollups' to aggregate existing source_stats rows")
+
+
+def downgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if STATS_INDEX in {index['name'] for index in inspector.get_indexes('source_stats')}:
+        print(f"Dropping index {STATS_INDEX} from source_stats table...")
+        op.drop_index(STATS_INDEX, table_name='source_stats')
+
+    if 'source_stats_rollups' in inspector.get_table_names():
+        print("Dropping source_stats_rollups table...")
+        op.drop_index('ix_source_stats_rollups_granularity_bucket', table_name='source_stats_rollups')
+        op.drop_table('source_stats_rollups')
@@ -34,6 +34,18 @@ async def get_cache_manager():
     return cache_manager
 
 
+async def _find_keys(cm: CacheManager, pattern: str) -> List[str]:
+    """
+    查找匹配的缓存键
+    
+    模式只是前缀加*时直接读取缓存键索引，其他模式使用SCAN分批遍历
+    """
+    prefix = pattern[:-1]
+    if pattern.endswith("*") and not any(ch in prefix for ch in "*?[\\"):
+        return await cm.indexed_keys(prefix)
+    return await cm.scan_keys(pattern)
+
+
 @router.get("/stats", response_model=Dict[str, Any])
 async def get_cache_stats(
     pattern: str = Query(f"{SOURCE_CACHE_PREFIX}*", description="缓存键匹配模式")
@@ -45,9 +57,7 @@ async def get_cache_stats(
         cm = await get_cache_manager()
         
         # 获取匹配的缓存键
-        keys = []
-        if cm.redis:
-            keys = await cm.redis.keys(pattern)
+        keys = set(await _find_keys(cm, pattern))
         
         total_items = 0
         ttl_values = []
@@ -60,49 +70,40 @@ async def get_cache_stats(
         all_sources = provider.get_all_sources()
         all_source_ids = [source.source_id for source in all_sources]
         
+        # 一次MGET读取所有源的缓存元数据，不读取和反序列化缓存数据
+        source_names = {source.source_id: source.name for source in all_sources}
+        cache_keys = {source_id: f"{SOURCE_CACHE_PREFIX}{source_id}" for source_id in all_source_ids}
+        metadata = await cm.get_metadata(list(cache_keys.values()))
+        
         # 检查每个源的缓存状态
         for source_id in all_source_ids:
-            cache_key = f"{SOURCE_CACHE_PREFIX}{source_id}"
-            if cache_key.encode() in keys or cache_key in keys:  # 兼容字节和字符串键
-                # 获取该源的缓存数据
-                cached_data = await cm.get(cache_key)
-                items_count = len(cached_data) if isinstance(cached_data, list) else 0
+            cache_key = cache_keys[source_id]
+            meta = metadata.get(cache_key)
+            if meta is not None or cache_key in keys:
+                # 升级前写入的缓存没有元数据，下次写入后补齐
+                items_count = (meta or {}).get("count") or 0
                 total_items += items_count
                 
-                # 获取TTL
-                ttl = -1
-                if cm.redis:
-                    ttl = await cm.redis.ttl(cache_key)
-                    if ttl > 0:
-                        ttl_values.append(ttl)
-                
-                # 获取内存使用情况
-                memory_usage = "未知"
-                if cm.redis:
-                    try:
-                        memory_info = await cm.redis.memory_usage(cache_key)
-                        if memory_info:
-                            memory_usage = _format_size(memory_info)
-                    except:
-                        pass
+                ttl = meta["ttl"] if meta else -1
+                if ttl > 0:
+                    ttl_values.append(ttl)
                 
                 # 添加源缓存统计
                 source_stats.append({
                     "id": source_id,
-                    "name": next((s.name for s in all_sources if s.source_id == source_id), source_id),
+                    "name": source_names.get(source_id, source_id),
                     "has_cache": True,
                     "items_count": items_count,
                     "ttl": ttl,
-                    "memory": memory_usage,
+                    "memory": _format_size(meta["size"]) if meta else "未知",
                     "cache_key": cache_key
                 })
             else:
                 # 添加到无缓存源列表
-                source_name = next((s.name for s in all_sources if s.source_id == source_id), source_id)
                 no_cache_sources.append(source_id)
                 source_stats.append({
                     "id": source_id,
-                    "name": source_name,
+                    "name": source_names.get(source_id, source_id),
                     "has_cache": False,
                     "items_count": 0,
                     "ttl": -1,
@@ -253,21 +254,16 @@ async def clear_cache(
         # 获取缓存管理器
         cm = await get_cache_manager()
         
-        # 获取匹配的键
-        keys = []
-        if cm.redis:
-            keys = await cm.redis.keys(pattern)
+        # 按SCAN批次删除匹配的键
+        deleted_count = await cm.clear(pattern)
         
-        if not keys:
+        if not deleted_count:
             return {"success": True, "message": "未找到匹配的缓存键", "deleted_count": 0}
         
-        # 删除键
-        await cm.clear(pattern)
-        
         return {
             "success": True,
-            "message": f"已清除 {len(keys)} 个缓存键",
-            "deleted_count": len(keys),
+            "message": f"已清除 {deleted_count} 个缓存键",
+            "deleted_count": deleted_count,
             "pattern": pattern
         }
     except Exception as e:
@@ -285,15 +281,13 @@ async def list_cache_keys(
         # 获取缓存管理器
         cm = await get_cache_manager()
         
-        # 获取匹配的键
-        keys = []
-        if cm.redis:
-            keys = await cm.redis.keys(pattern)
+        # 使用SCAN获取匹配的键
+        keys = await cm.scan_keys(pattern)
         
         return {
             "count": len(keys),
             "pattern": pattern,
-            "keys": sorted(keys)
+            "keys": keys
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"列出缓存键失败: {str(e)}")
@@ -1,18 +1,21 @@
 from typing import Any, List, Dict, Optional
 import asyncio
 import logging
-from datetime import datetime, timezone
 import time
 import traceback
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, Path, Depends
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, Path, Depends, Response
 from pydantic import BaseModel
 
 from worker.sources.factory import NewsSourceFactory
-from worker.sources.base import NewsSource, NewsItemModel
+from worker.sources.base import (
+    NewsSource, NewsItemModel, normalize_published_at, UNIFIED_FIELDS, EXTERNAL_FIELDS
+)
 from worker.sources.aggregator import aggregator_manager
 from worker.sources.manager import source_manager
 from worker.stats_wrapper import stats_updater  # 导入统计更新器
+from worker.utils import fast_json
+from app.db.session import run_db
 
 # Configure logging
 logging.basicConfig(
@@ -137,6 +140,39 @@ class SearchResponse(BaseModel):
 
 
 # 实用函数
+def json_response(content: bytes) -> Response:
+    """
+    直接返回序列化好的JSON字节，跳过FastAPI按response_model的校验和再次序列化
+
+    路由上的response_model仍用于生成接口文档
+    """
+    return Response(content=content, media_type="application/json")
+
+
+def unified_item_dict(item: Dict[str, Any], category: Optional[str] = None) -> Dict[str, Any]:
+    """
+    把聚合器返回的新闻字典转换为统一格式
+    """
+    published_at = normalize_published_at(item.get("published_at"))
+    if published_at is None and item.get("published_at"):
+        logger.warning(f"处理发布时间出错, 源: {item.get('source_id')}, 值: {item.get('published_at')}")
+    return {
+        "id": item.get("id"),
+        "title": item.get("title"),
+        "url": item.get("url"),
+        "source_id": item.get("source_id"),
+        "source_name": item.get("source_name"),
+        "category": category or item.get("category", "unknown"),
+        "published_at": published_at.isoformat() if published_at else None,
+        "summary": item.get("summary"),
+        "content": item.get("content"),
+        "image_url": item.get("image_url"),
+        "country": item.get("country"),
+        "language": item.get("language"),
+        "extra": item.get("extra", {})
+    }
+
+
 async def close_source(source):
     """Close the data source and release resources"""
     if source is None:
@@ -184,8 +220,146 @@ async def close_source(source):
         logger.warning(f"Error closing source: {str(e)}")
 
 
-async def fetch_source_news(source_type: str, timeout: int = 60) -> Dict[str, Any]:
-    """获取指定新闻源的新闻"""
+def _query_custom_source_data(db, source_type: str) -> Dict[str, Any]:
+    """查询自定义源的URL和其他配置，在数据库线程池中执行"""
+    from app.models.source import Source
+    from app.models.category import Category
+
+    source_data = {}
+    # 查询数据库获取源信息
+    db_source = db.query(Source).filter(Source.id == source_type).first()
+    if db_source:
+        # 获取分类信息
+        category = "general"
+        if db_source.category_id:
+            cat = db.query(Category).filter(Category.id == db_source.category_id).first()
+            if cat:
+                category = cat.slug
+
+        source_data = {
+            "id": db_source.id,
+            "name": db_source.name,
+            "url": db_source.url,
+            "type": db_source.type,
+            "country": db_source.country,
+            "language": db_source.language,
+            "config": db_source.config,
+            "description": db_source.description,
+            "category": category  # 使用分类slug而不是ID
+        }
+    return source_data
+
+
+async def load_custom_source_data(source_type: str) -> Dict[str, Any]:
+    """从数据库获取自定义源的URL和其他配置，不阻塞事件循环"""
+    try:
+        source_data = await run_db(_query_custom_source_data, source_type)
+        if source_data:
+            logger.info(f"从数据库获取自定义源 {source_type} 的信息: 名称={source_data.get('name')}, 分类={source_data.get('category')}, URL={source_data.get('url', 'None')}")
+        return source_data
+    except Exception as e:
+        logger.error(f"从数据库获取自定义源信息失败: {str(e)}")
+        return {}
+
+
+def _query_custom_sources_metadata(db) -> Dict[str, Dict[str, Any]]:
+    """查询所有自定义源的元数据，在数据库线程池中执行"""
+    from app.models.source import Source
+    from app.models.category import Category
+
+    custom_sources_data = {}
+    category_map = {}
+
+    # 查询数据库中的所有自定义源
+    custom_sources = db.query(Source).filter(Source.id.like('custom-%')).all()
+
+    # 获取分类信息
+    category_ids = [s.category_id for s in custom_sources if s.category_id is not None]
+    if category_ids:
+        for cat in db.query(Category).filter(Category.id.in_(category_ids)).all():
+            category_map[cat.id] = cat.slug
+
+    # 保存自定义源数据
+    for source in custom_sources:
+        category = "general"
+        if source.category_id and source.category_id in category_map:
+            category = category_map[source.category_id]
+
+        # 转换timedelta为秒
+        update_interval = source.update_interval.total_seconds() if hasattr(source.update_interval, 'total_seconds') else 1800
+        cache_ttl = source.cache_ttl.total_seconds() if hasattr(source.cache_ttl, 'total_seconds') else 900
+
+        custom_sources_data[source.id] = {
+            "name": source.name,
+            "category": category,
+            "country": source.country or "unknown",
+            "language": source.language or "unknown",
+            "update_interval": int(update_interval),
+            "cache_ttl": int(cache_ttl),
+            "description": source.description
+        }
+    return custom_sources_data
+
+
+async def get_pooled_source(source_type: str) -> Optional[NewsSource]:
+    """
+    从进程级常驻源池获取新闻源实例
+
+    源池由source_manager维护，实例在请求之间复用，不能在请求结束时关闭，
+    否则会清空其内存缓存。池中不存在时才创建并注册。
+    """
+    source = source_manager.get_source(source_type)
+    if source is not None:
+        return source
+
+    if source_type.startswith('custom-'):
+        # 自定义源需要从数据库获取URL和其他配置
+        source_data = await load_custom_source_data(source_type)
+        return source_manager.get_or_create_source(
+            source_type,
+            url=source_data.get("url", ""),
+            name=source_data.get("name", source_type),
+            country=source_data.get("country", "global"),
+            language=source_data.get("language", "en"),
+            config=source_data.get("config", {}),
+            source_data=source_data
+        )
+
+    return source_manager.get_or_create_source(source_type)
+
+
+# 每个常驻源的刷新锁，同一个源同时只有一个请求真正抓取上游
+_source_refresh_locks: Dict[str, asyncio.Lock] = {}
+
+
+async def get_pooled_source_news(source: NewsSource, force_update: bool = False) -> List[NewsItemModel]:
+    """
+    从常驻源实例获取新闻，默认优先使用缓存
+
+    只有缓存失效或显式要求刷新时才抓取上游，并统计为external类型的调用
+    """
+    if not force_update and source.is_cache_valid():
+        return await source.get_news()
+
+    lock = _source_refresh_locks.setdefault(source.source_id, asyncio.Lock())
+    async with lock:
+        # 等待锁期间其他请求可能已经刷新了缓存
+        if not force_update and source.is_cache_valid():
+            return await source.get_news()
+
+        # 通过参数传入external类型的统计包装，不修改常驻源实例上的fetch
+        return await source.get_news(
+            force_update=force_update,
+            fetch=lambda: stats_updater.wrap_fetch(source.source_id, source.fetch, api_type="external")
+        )
+
+
+async def fetch_source_news(source_type: str, timeout: int = 60, force_update: bool = False) -> Dict[str, Any]:
+    """
+    获取指定新闻源的新闻
+
+    使用常驻源池中的实例，force_update为False时优先返回缓存
+    """
     result = {
         "source_id": source_type,
         "success": False,
@@ -195,87 +369,27 @@ async def fetch_source_news(source_type: str, timeout: int = 60) -> Dict[str, An
         "elapsed_time": 0,
         "source_info": {}  # 添加源信息，用于传递给API响应
     }
-    
+
     logger.info(f"Fetching news from source: {source_type}")
-    
-    # 创建数据源
-    source = None
+
     try:
-        # 如果是自定义源，需要从数据库获取URL和其他配置
-        source_data = {}
-        if source_type.startswith('custom-'):
-            try:
-                from app.db.session import SessionLocal
-                from app.models.source import Source
-                from app.models.category import Category
-                
-                # 创建数据库会话
-                db = SessionLocal()
-                try:
-                    # 查询数据库获取源信息
-                    db_source = db.query(Source).filter(Source.id == source_type).first()
-                    if db_source:
-                        # 获取分类信息
-                        category = "general"
-                        if db_source.category_id:
-                            cat = db.query(Category).filter(Category.id == db_source.category_id).first()
-                            if cat:
-                                category = cat.slug
-                        
-                        source_data = {
-                            "id": db_source.id,
-                            "name": db_source.name,
-                            "url": db_source.url,
-                            "type": db_source.type,
-                            "country": db_source.country,
-                            "language": db_source.language,
-                            "config": db_source.config,
-                            "description": db_source.description,
-                            "category": category  # 使用分类slug而不是ID
-                        }
-                        logger.info(f"从数据库获取自定义源 {source_type} 的信息: 名称={source_data.get('name')}, 分类={source_data.get('category')}, URL={source_data.get('url', 'None')}")
-                        
-                        # 保存源信息用于响应
-                        result["source_info"] = source_data
-                finally:
-                    db.close()
-            except Exception as e:
-                logger.error(f"从数据库获取自定义源信息失败: {str(e)}")
-                
-            # 创建自定义源，传递从数据库获取的信息
-            source = NewsSourceFactory.create_source(
-                source_type=source_type,
-                url=source_data.get("url", ""),
-                name=source_data.get("name", source_type),
-                country=source_data.get("country", "global"),
-                language=source_data.get("language", "en"),
-                config=source_data.get("config", {}),
-                source_data=source_data
-            )
-        else:
-            # 非自定义源使用正常方式创建
-            source = NewsSourceFactory.create_source(source_type)
-        
+        source = await get_pooled_source(source_type)
+
         if source is None:
             error_msg = f"无法创建新闻源: {source_type}"
             result["error"] = error_msg
             logger.error(error_msg)
             return result
-        
+
         # 获取数据
         start_time = time.time()
         try:
-            # 包装源的fetch方法为external类型
-            original_fetch = source.fetch
-            source.fetch = lambda *args, **kwargs: stats_updater.wrap_fetch(source_type, original_fetch, api_type="external", *args, **kwargs)
-            
             # 设置超时
-            fetch_task = asyncio.create_task(source.get_news(force_update=True))
-            news_items = await asyncio.wait_for(fetch_task, timeout=timeout)
-            
-            # 恢复原始fetch方法
-            source.fetch = original_fetch
-            
+            news_items = await asyncio.wait_for(
+                get_pooled_source_news(source, force_update=force_update),
+                timeout=timeout
+            )
+
             elapsed_time = time.time() - start_time
             
             # 记录结果
@@ -301,11 +415,7 @@ async def fetch_source_news(source_type: str, timeout: int = 60) -> Dict[str, An
         error_msg = f"创建新闻源出错: {str(e)}"
         result["error"] = error_msg
         logger.error(error_msg)
-    finally:
-        # 关闭数据源
-        if source:
-            await close_source(source)
-    
+
     return result
 
 
@@ -315,61 +425,11 @@ async def get_sources():
     获取所有可用的新闻源信息
     """
     try:
-        # 获取所有可用的源类型
-        source_types = NewsSourceFactory.get_available_sources()
-        
-        # 创建数据库会话，用于获取自定义源的元数据
-        from app.db.session import SessionLocal
-        from app.models.source import Source
-        from app.models.category import Category
-        
-        db = SessionLocal()
-        
-        # 获取所有自定义源的信息
-        custom_sources_data = {}
-        category_map = {}
-        
-        try:
-            # 查询数据库中的所有自定义源
-            custom_sources = db.query(Source).filter(Source.id.like('custom-%')).all()
-            
-            # 获取分类信息
-            category_ids = [s.category_id for s in custom_sources if s.category_id is not None]
-            if category_ids:
-                for cat in db.query(Category).filter(Category.id.in_(category_ids)).all():
-                    category_map[cat.id] = cat.slug
-            
-            # 保存自定义源数据
-            for source in custom_sources:
-                category = "general"
-                if source.category_id and source.category_id in category_map:
-                    category = category_map[source.category_id]
-                
-                # 转换timedelta为秒
-                update_interval = source.update_interval.total_seconds() if hasattr(source.update_interval, 'total_seconds') else 1800
-                cache_ttl = source.cache_ttl.total_seconds() if hasattr(source.cache_ttl, 'total_seconds') else 900
-                
-                custom_sources_data[source.id] = {
-                    "name": source.name,
-                    "category": category,
-                    "country": source.country or "unknown",
-                    "language": source.language or "unknown",
-                    "update_interval": int(update_interval),
-                    "cache_ttl": int(cache_ttl),
-                    "description": source.description
-                }
-        finally:
-            db.close()
+        # 从常驻源池读取源实例，实例在请求之间复用
+        sources = source_manager.ensure_sources()
         
-        # 创建并获取源实例
-        sources = []
-        for source_type in source_types:
-            try:
-                source = NewsSourceFactory.create_source(source_type)
-                if source:
-                    sources.append(source)
-            except Exception as e:
-                logger.error(f"创建源 {source_type} 时出错: {str(e)}")
+        # 在数据库线程池中获取自定义源的元数据
+        custom_sources_data = await run_db(_query_custom_sources_metadata)
         
         # 构建响应
         source_info_list = []
@@ -404,10 +464,6 @@ async def get_sources():
             except Exception as e:
                 logger.error(f"处理源 {source.source_id} 时出错: {str(e)}")
         
-        # 关闭所有数据源
-        for source in sources:
-            await close_source(source)
-        
         return SourcesResponse(
             total_sources=len(source_info_list),
             sources=source_info_list
@@ -421,62 +477,21 @@ async def get_sources():
 async def get_source(
     source_id: str = Path(..., description="新闻源ID"),
     timeout: int = Query(60, description="获取超时时间（秒）"),
+    refresh: bool = Query(False, description="是否强制实时刷新，默认优先使用常驻源的缓存")
 ):
     """
     获取指定新闻源的信息和最新新闻
+
+    缓存有效时直接读取常驻源的缓存，只有缓存失效或refresh=true时才抓取上游
     """
     try:
-        # 如果是自定义源，需要从数据库获取URL和其他配置
+        # 如果是自定义源，需要从数据库获取名称、分类等元数据
         source_data = {}
         if source_id.startswith('custom-'):
-            try:
-                from app.db.session import SessionLocal
-                from app.models.source import Source
-                from app.models.category import Category
-                
-                # 创建数据库会话
-                db = SessionLocal()
-                try:
-                    # 查询数据库获取源信息
-                    db_source = db.query(Source).filter(Source.id == source_id).first()
-                    if db_source:
-                        # 获取分类信息
-                        category = "general"
-                        if db_source.category_id:
-                            cat = db.query(Category).filter(Category.id == db_source.category_id).first()
-                            if cat:
-                                category = cat.slug
-                        
-                        source_data = {
-                            "id": db_source.id,
-                            "name": db_source.name,
-                            "url": db_source.url,
-                            "type": db_source.type,
-                            "country": db_source.country,
-                            "language": db_source.language,
-                            "config": db_source.config,
-                            "description": db_source.description,
-                            "category": category  # 使用字符串类型的分类slug，而不是ID
-                        }
-                        logger.info(f"从数据库获取自定义源 {source_id} 的信息: 名称={source_data.get('name')}, 分类={source_data.get('category')}, URL={source_data.get('url', 'None')}")
-                finally:
-                    db.close()
-            except Exception as e:
-                logger.error(f"从数据库获取自定义源信息失败: {str(e)}")
-                
-            # 创建自定义源，传递从数据库获取的信息
-            source = NewsSourceFactory.create_source(
-                source_type=source_id,
-                url=source_data.get("url", ""),
-                name=source_data.get("name", source_id),
-                country=source_data.get("country", "global"),
-                language=source_data.get("language", "en"),
-                config=source_data.get("config", {}),
-                source_data=source_data
-            )
-        else:
-            # 非自定义源使用正常方式创建
-            source = NewsSourceFactory.create_source(source_id)
+            source_data = await load_custom_source_data(source_id)
+
+        # 使用常驻源池中的实例
+        source = await get_pooled_source(source_id)
         
         if source is None:
             raise HTTPException(status_code=404, detail=f"找不到新闻源: {source_id}")
@@ -506,57 +521,32 @@ async def get_source(
             )
         
         # 获取新闻 - 使用已经创建好的source_info信息，避免重复查询数据库
-        result = await fetch_source_news(source_id, timeout)
+        result = await fetch_source_news(source_id, timeout, force_update=refresh)
         
+        # 条目的发布时间已在创建时规范化，直接输出缓存的JSON字节
         news_items = []
         if result["success"] and result["news"]:
             for item in result["news"]:
                 try:
-                    # 处理发布时间，确保格式一致
-                    published_at_str = None
-                    if item.published_at:
-                        try:
-                            # 如果是字符串，尝试解析
-                            if isinstance(item.published_at, str):
-                                dt = datetime.fromisoformat(item.published_at)
-                            else:
-                                dt = item.published_at
-                            
-                            # 统一转换为无时区的ISO格式字符串
-                            if dt.tzinfo is not None:
-                                dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
-                            published_at_str = dt.isoformat()
-                        except Exception as e:
-                            logger.warning(f"处理发布时间出错: {e}, 源: {source_info.source_id}, 值: {item.published_at}")
-                    
-                    news_item = NewsItem(
-                        id=item.id,
-                        title=item.title,
-                        url=item.url,
-                        source_id=item.source_id,
+                    news_items.append(item.to_json(
+                        EXTERNAL_FIELDS,
                         source_name=source_info.name,
-                        published_at=published_at_str,
-                        updated_at=item.updated_at.isoformat() if hasattr(item, 'updated_at') and item.updated_at else None,
-                        summary=item.summary,
-                        content=item.content,
-                        author=getattr(item, 'author', None),
                         category=source_info.category,
-                        tags=getattr(item, 'tags', []),
-                        image_url=item.image_url,
                         language=source_info.language,
-                        country=source_info.country,
-                        extra=item.extra
-                    )
-                    news_items.append(news_item)
+                        country=source_info.country
+                    ))
                 except Exception as e:
                     logger.error(f"处理新闻项时出错: {str(e)}")
         
-        return SourceResponse(
-            source=source_info,
-            news_count=len(news_items),
-            news=news_items,
-            fetch_time=result["elapsed_time"]
-        )
+        return json_response(fast_json.dumps_with_array(
+            {
+                "source": source_info.model_dump(),
+                "news_count": len(news_items),
+                "fetch_time": result["elapsed_time"]
+            },
+            "news",
+            news_items
+        ))
     except HTTPException:
         raise
     except Exception as e:
@@ -570,60 +560,11 @@ async def get_sources_stats():
     获取所有新闻源的统计信息
     """
     try:
-        # 获取所有可用的源类型
-        source_types = NewsSourceFactory.get_available_sources()
-        
-        # 创建数据库会话，用于获取自定义源的元数据
-        from app.db.session import SessionLocal
-        from app.models.source import Source
-        from app.models.category import Category
-        
-        db = SessionLocal()
-        
-        # 获取所有自定义源的信息
-        custom_sources_data = {}
-        category_map = {}
+        # 从常驻源池读取源实例，实例在请求之间复用
+        sources = source_manager.ensure_sources()
         
-        try:
-            # 查询数据库中的所有自定义源
-            custom_sources = db.query(Source).filter(Source.id.like('custom-%')).all()
-            
-            # 获取分类信息
-            category_ids = [s.category_id for s in custom_sources if s.category_id is not None]
-            if category_ids:
-                for cat in db.query(Category).filter(Category.id.in_(category_ids)).all():
-                    category_map[cat.id] = cat.slug
-            
-            # 保存自定义源数据
-            for source in custom_sources:
-                category = "general"
-                if source.category_id and source.category_id in category_map:
-                    category = category_map[source.category_id]
-                
-                # 转换timedelta为秒
-                update_interval = source.update_interval.total_seconds() if hasattr(source.update_interval, 'total_seconds') else 1800
-                cache_ttl = source.cache_ttl.total_seconds() if hasattr(source.cache_ttl, 'total_seconds') else 900
-                
-                custom_sources_data[source.id] = {
-                    "name": source.name,
-                    "category": category,
-                    "country": source.country or "unknown",
-                    "language": source.language or "unknown",
-                    "update_interval": int(update_interval),
-                    "cache_ttl": int(cache_ttl)
-                }
-        finally:
-            db.close()
-        
-        # 创建并获取源实例
-        sources = []
-        for source_type in source_types:
-            try:
-                source = NewsSourceFactory.create_source(source_type)
-                if source:
-                    sources.append(source)
-            except Exception as e:
-                logger.error(f"创建源 {source_type} 时出错: {str(e)}")
+        # 在数据库线程池中获取自定义源的元数据
+        custom_sources_data = await run_db(_query_custom_sources_metadata)
         
         # 统计信息
         categories = {}
@@ -682,10 +623,6 @@ async def get_sources_stats():
             except Exception as e:
                 logger.error(f"处理源 {source.source_id} 统计信息时出错: {str(e)}")
         
-        # 关闭所有数据源
-        for source in sources:
-            await close_source(source)
-        
         return SourcesStatsResponse(
             total_sources=len(sources),
             categories=categories,
@@ -700,7 +637,6 @@ async def get_sources_stats():
 
 @router.get("/unified", response_model=UnifiedNewsResponse)
 async def get_unified_news(
-    background_tasks: BackgroundTasks,
     page: int = Query(1, description="页码，从1开始"),
     page_size: int = Query(20, description="每页数量"),
     category: Optional[str] = Query(None, description="按分类筛选"),
@@ -711,72 +647,79 @@ async def get_unified_news(
     sort_by: str = Query("published_at", description="排序字段，支持published_at、title"),
     sort_order: str = Query("desc", description="排序方向，支持asc、desc"),
     timeout: int = Query(60, description="获取超时时间（秒）"),
-    max_concurrent: int = Query(5, description="最大并发数")
+    max_concurrent: int = Query(5, description="最大并发数"),
+    refresh: bool = Query(False, description="是否强制实时刷新，默认优先使用常驻源的缓存")
 ):
     """
     获取统一格式的新闻列表，支持分页和筛选
+
+    新闻来自进程级常驻源池，缓存有效时直接读取，只有缓存失效或refresh=true时才抓取上游
     """
     # 创建记录器并设置名称
     logger = logging.getLogger("external_api")
     
+    filters = {
+        "category": category,
+        "country": country,
+        "language": language,
+        "source_id": source_id,
+        "keyword": keyword,
+        "sort_by": sort_by,
+        "sort_order": sort_order
+    }
+
     try:
-        # 获取所有可用的源类型
-        source_types = NewsSourceFactory.get_available_sources()
-        
-        # 创建并获取源实例
-        all_sources = []
-        for source_type in source_types:
-            try:
-                source = NewsSourceFactory.create_source(source_type)
-                if source:
-                    all_sources.append(source)
-            except Exception as e:
-                logger.error(f"创建源 {source_type} 时出错: {str(e)}")
+        # 从常驻源池获取所有源实例
+        all_sources = source_manager.ensure_sources()
         
         # 筛选符合条件的源
-        filtered_sources = []
-        for source in all_sources:
-            # 关闭不需要的源
-            if (category and source.category != category) or \
-               (country and source.country != country) or \
-               (language and source.language != language) or \
-               (source_id and source.source_id != source_id):
-                await close_source(source)
-                continue
-            
-            filtered_sources.append(source)
+        filtered_sources = [
+            source for source in all_sources
+            if not ((category and source.category != category) or
+                    (country and source.country != country) or
+                    (language and source.language != language) or
+                    (source_id and source.source_id != source_id))
+        ]
         
         # 如果没有符合条件的源，直接返回空结果
         if not filtered_sources:
             logger.warning(f"没有符合条件的新闻源，筛选条件：category={category}, country={country}, language={language}, source_id={source_id}")
-            return UnifiedNewsResponse(
-                total=0,
-                page=page,
-                page_size=page_size,
-                total_pages=0,
-                news=[],
-                filters={
-                    "category": category,
-                    "country": country,
-                    "language": language,
-                    "source_id": source_id,
-                    "keyword": keyword,
-                    "sort_by": sort_by,
-                    "sort_order": sort_order
-                }
-            )
+            return json_response(fast_json.dumps_with_array(
+                {
+                    "total": 0,
+                    "page": page,
+                    "page_size": page_size,
+                    "total_pages": 0,
+                    "filters": filters
+                },
+                "news",
+                []
+            ))
         
         # 限制并发的信号量
         semaphore = asyncio.Semaphore(max_concurrent)
         
-        # 并发获取每个源的新闻
+        # 并发获取每个源的新闻，缓存有效的源不会占用信号量
         async def fetch_with_semaphore(source_id: str) -> Dict[str, Any]:
             async with semaphore:
-                return await fetch_source_news(source_id, timeout)
+                return await fetch_source_news(source_id, timeout, force_update=refresh)
+        
+        async def fetch_pooled(source: NewsSource) -> Dict[str, Any]:
+            if not refresh and source.is_cache_valid():
+                news_items = await source.get_news()
+                return {
+                    "source_id": source.source_id,
+                    "success": True,
+                    "news": news_items,
+                    "count": len(news_items),
+                    "error": None,
+                    "elapsed_time": 0
+                }
+            return await fetch_with_semaphore(source.source_id)
                 
         # 创建获取任务
         source_ids = [source.source_id for source in filtered_sources]
-        tasks = [fetch_with_semaphore(source_id) for source_id in source_ids]
+        tasks = [fetch_pooled(source) for source in filtered_sources]
         
         # 执行所有任务
         results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -797,70 +740,20 @@ async def get_unified_news(
             if not source:
                 continue
             
-            # 处理新闻项
+            # 筛选新闻项，序列化推迟到分页之后，只处理当前页的条目
             for item in result["news"]:
-                try:
-                    # 如果有关键词筛选，检查标题是否包含关键词
-                    if keyword and keyword.lower() not in item.title.lower():
-                        continue
-                    
-                    # 处理发布时间，确保格式一致
-                    published_at_str = None
-                    if item.published_at:
-                        try:
-                            # 如果是字符串，尝试解析
-                            if isinstance(item.published_at, str):
-                                dt = datetime.fromisoformat(item.published_at)
-                            else:
-                                dt = item.published_at
-                            
-                            # 统一转换为无时区的ISO格式字符串
-                            if dt.tzinfo is not None:
-                                dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
-                            published_at_str = dt.isoformat()
-                        except Exception as e:
-                            logger.warning(f"处理发布时间出错: {e}, 源: {source.source_id}, 值: {item.published_at}")
-                    
-                    news_item = UnifiedNewsItem(
-                        id=item.id,
-                        title=item.title,
-                        url=item.url,
-                        source_id=item.source_id,
-                        source_name=source.name,
-                        category=source.category or "unknown",
-                        published_at=published_at_str,
-                        summary=item.summary,
-                        content=item.content,
-                        image_url=item.image_url,
-                        country=source.country or "unknown",
-                        language=source.language or "unknown",
-                        extra=item.extra
-                    )
-                    all_news.append(news_item)
-                except Exception as e:
-                    logger.error(f"处理新闻项时出错: {str(e)}", exc_info=True)
-        
-        # 排序
-        def get_published_at(item):
-            if not item.published_at:
-                return datetime.min
-            try:
-                # 解析 ISO 格式的日期时间字符串
-                dt = datetime.fromisoformat(item.published_at)
-                # 如果有时区信息，转换为 UTC 无时区
-                if dt.tzinfo is not None:
-                    dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
-                return dt
-            except Exception as e:
-                logger.warning(f"解析日期时间出错: {e}, 值: {item.published_at}")
-                return datetime.min
+                # 如果有关键词筛选，检查标题是否包含关键词
+                if keyword and keyword.lower() not in (item.title or "").lower():
+                    continue
+                all_news.append((item, source))
         
+        # 排序，发布时间在条目创建时已规范化，不再重复解析
         if sort_by == "published_at":
             reverse = (sort_order.lower() == "desc")
-            all_news.sort(key=get_published_at, reverse=reverse)
+            all_news.sort(key=lambda entry: entry[0].sort_key, reverse=reverse)
         elif sort_by == "title":
             reverse = (sort_order.lower() == "desc")
-            all_news.sort(key=lambda x: x.title, reverse=reverse)
+            all_news.sort(key=lambda entry: entry[0].title or "", reverse=reverse)
         
         # 分页
         total = len(all_news)
@@ -869,30 +762,31 @@ async def get_unified_news(
         end = start + page_size
         paginated_news = all_news[start:end] if start < total else []
         
-        # 后台任务：关闭所有源
-        async def cleanup():
-            for source in filtered_sources:
-                await close_source(source)
-        
-        background_tasks.add_task(cleanup)
-        
-        # 返回响应
-        return UnifiedNewsResponse(
-            total=total,
-            page=page,
-            page_size=page_size,
-            total_pages=total_pages,
-            news=paginated_news,
-            filters={
-                "category": category,
-                "country": country,
-                "language": language,
-                "source_id": source_id,
-                "keyword": keyword,
-                "sort_by": sort_by,
-                "sort_order": sort_order
-            }
-        )
+        # 输出当前页，源级字段覆盖条目自身的值
+        news_items = []
+        for item, source in paginated_news:
+            try:
+                news_items.append(item.to_json(
+                    UNIFIED_FIELDS,
+                    source_name=source.name,
+                    category=source.category or "unknown",
+                    country=source.country or "unknown",
+                    language=source.language or "unknown"
+                ))
+            except Exception as e:
+                logger.error(f"处理新闻项时出错: {str(e)}", exc_info=True)
+        
+        return json_response(fast_json.dumps_with_array(
+            {
+                "total": total,
+                "page": page,
+                "page_size": page_size,
+                "total_pages": total_pages,
+                "filters": filters
+            },
+            "news",
+            news_items
+        ))
     except Exception as e:
         # 记录详细错误信息并包含堆栈跟踪
         logger.error(f"获取统一格式新闻出错: {str(e)}", exc_info=True)
@@ -905,7 +799,6 @@ async def get_unified_news(
 
 @router.get("/hot", response_model=HotNewsResponse)
 async def get_hot_news(
-    background_tasks: BackgroundTasks,
     hot_limit: int = Query(10, description="热门新闻数量"),
     recommended_limit: int = Query(10, description="推荐新闻数量"),
     category_limit: int = Query(5, description="每个分类的新闻数量"),
@@ -925,39 +818,7 @@ async def get_hot_news(
         hot_news = []
         for item in news_data.get("hot_news", [])[:hot_limit]:
             try:
-                # 处理发布时间，确保格式一致
-                published_at_str = None
-                if item.get("published_at"):
-                    try:
-                        # 如果是字符串，尝试解析
-                        if isinstance(item.get("published_at"), str):
-                            dt = datetime.fromisoformat(item.get("published_at"))
-                        else:
-                            dt = item.get("published_at")
-                        
-                        # 统一转换为无时区的ISO格式字符串
-                        if dt.tzinfo is not None:
-                            dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
-                        published_at_str = dt.isoformat()
-                    except Exception as e:
-                        logger.warning(f"处理发布时间出错: {e}, 源: {item.get('source_id')}, 值: {item.get('published_at')}")
-                
-                news_item = UnifiedNewsItem(
-                    id=item.get("id"),
-                    title=item.get("title"),
-                    url=item.get("url"),
-                    source_id=item.get("source_id"),
-                    source_name=item.get("source_name"),
-                    category=item.get("category", "unknown"),
-                    published_at=published_at_str,
-                    summary=item.get("summary"),
-                    content=item.get("content"),
-                    image_url=item.get("image_url"),
-                    country=item.get("country"),
-                    language=item.get("language"),
-                    extra=item.get("extra", {})
-                )
-                hot_news.append(news_item)
+                hot_news.append(unified_item_dict(item))
             except Exception as e:
                 logger.error(f"处理热门新闻项时出错: {str(e)}")
         
@@ -965,39 +826,7 @@ async def get_hot_news(
         recommended_news = []
         for item in news_data.get("recommended_news", [])[:recommended_limit]:
             try:
-                # 处理发布时间，确保格式一致
-                published_at_str = None
-                if item.get("published_at"):
-                    try:
-                        # 如果是字符串，尝试解析
-                        if isinstance(item.get("published_at"), str):
-                            dt = datetime.fromisoformat(item.get("published_at"))
-                        else:
-                            dt = item.get("published_at")
-                        
-                        # 统一转换为无时区的ISO格式字符串
-                        if dt.tzinfo is not None:
-                            dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
-                        published_at_str = dt.isoformat()
-                    except Exception as e:
-                        logger.warning(f"处理发布时间出错: {e}, 源: {item.get('source_id')}, 值: {item.get('published_at')}")
-                
-                news_item = UnifiedNewsItem(
-                    id=item.get("id"),
-                    title=item.get("title"),
-                    url=item.get("url"),
-                    source_id=item.get("source_id"),
-                    source_name=item.get("source_name"),
-                    category=item.get("category", "unknown"),
-                    published_at=published_at_str,
-                    summary=item.get("summary"),
-                    content=item.get("content"),
-                    image_url=item.get("image_url"),
-                    country=item.get("country"),
-                    language=item.get("language"),
-                    extra=item.get("extra", {})
-                )
-                recommended_news.append(news_item)
+                recommended_news.append(unified_item_dict(item))
             except Exception as e:
                 logger.error(f"处理推荐新闻项时出错: {str(e)}")
         
@@ -1007,57 +836,19 @@ async def get_hot_news(
             category_news = []
             for item in items[:category_limit]:
                 try:
-                    # 处理发布时间，确保格式一致
-                    published_at_str = None
-                    if item.get("published_at"):
-                        try:
-                            # 如果是字符串，尝试解析
-                            if isinstance(item.get("published_at"), str):
-                                dt = datetime.fromisoformat(item.get("published_at"))
-                            else:
-                                dt = item.get("published_at")
-                            
-                            # 统一转换为无时区的ISO格式字符串
-                            if dt.tzinfo is not None:
-                                dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
-                            published_at_str = dt.isoformat()
-                        except Exception as e:
-                            logger.warning(f"处理发布时间出错: {e}, 源: {item.get('source_id')}, 值: {item.get('published_at')}")
-                    
-                    news_item = UnifiedNewsItem(
-                        id=item.get("id"),
-                        title=item.get("title"),
-                        url=item.get("url"),
-                        source_id=item.get("source_id"),
-                        source_name=item.get("source_name"),
-                        category=category,
-                        published_at=published_at_str,
-                        summary=item.get("summary"),
-                        content=item.get("content"),
-                        image_url=item.get("image_url"),
-                        country=item.get("country"),
-                        language=item.get("language"),
-                        extra=item.get("extra", {})
-                    )
-                    category_news.append(news_item)
+                    category_news.append(unified_item_dict(item, category=category))
                 except Exception as e:
                     logger.error(f"处理分类 {category} 新闻项时出错: {str(e)}")
             
             if category_news:
                 categories[category] = category_news
         
-        # 关闭所有源（在后台进行）
-        async def cleanup():
-            for source in source_manager.get_all_sources():
-                await close_source(source)
-        
-        background_tasks.add_task(cleanup)
-        
-        return HotNewsResponse(
-            hot_news=hot_news,
-            recommended_news=recommended_news,
-            categories=categories
-        )
+        # 注意: source_manager中的源是常驻实例，不能在此关闭，否则会清空其缓存
+        return json_response(fast_json.dumps({
+            "hot_news": hot_news,
+            "recommended_news": recommended_news,
+            "categories": categories
+        }))
     except HTTPException:
         raise
     except Exception as e:
@@ -1093,39 +884,7 @@ async def search_news(
         results = []
         for item in search_results:
             try:
-                # 处理发布时间，确保格式一致
-                published_at_str = None
-                if item.get("published_at"):
-                    try:
-                        # 如果是字符串，尝试解析
-                        if isinstance(item.get("published_at"), str):
-                            dt = datetime.fromisoformat(item.get("published_at"))
-                        else:
-                            dt = item.get("published_at")
-                        
-                        # 统一转换为无时区的ISO格式字符串
-                        if dt.tzinfo is not None:
-                            dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
-                        published_at_str = dt.isoformat()
-                    except Exception as e:
-                        logger.warning(f"处理发布时间出错: {e}, 源: {item.get('source_id')}, 值: {item.get('published_at')}")
-                
-                news_item = UnifiedNewsItem(
-                    id=item.get("id"),
-                    title=item.get("title"),
-                    url=item.get("url"),
-                    source_id=item.get("source_id"),
-                    source_name=item.get("source_name"),
-                    category=item.get("category", "unknown"),
-                    published_at=published_at_str,
-                    summary=item.get("summary"),
-                    content=item.get("content"),
-                    image_url=item.get("image_url"),
-                    country=item.get("country"),
-                    language=item.get("language"),
-                    extra=item.get("extra", {})
-                )
-                results.append(news_item)
+                results.append(unified_item_dict(item))
             except Exception as e:
                 logger.error(f"处理搜索结果项时出错: {str(e)}")
         
@@ -1136,14 +895,14 @@ async def search_news(
         end = start + page_size
         paginated_results = results[start:end] if start < total else []
         
-        return SearchResponse(
-            total=total,
-            page=page,
-            page_size=page_size,
-            total_pages=total_pages,
-            query=query,
-            results=paginated_results
-        )
+        return json_response(fast_json.dumps({
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "total_pages": total_pages,
+            "query": query,
+            "results": paginated_results
+        }))
     except Exception as e:
         logger.error(f"搜索新闻出错: {str(e)}")
         raise HTTPException(status_code=500, detail=f"搜索新闻出错: {str(e)}")
@@ -1186,40 +945,7 @@ async def test_source(
         # 如果是自定义源，从数据库获取详细信息
         source_data = {}
         if source_id.startswith('custom-'):
-            try:
-                from app.db.session import SessionLocal
-                from app.models.source import Source
-                from app.models.category import Category
-                
-                # 创建数据库会话
-                db = SessionLocal()
-                try:
-                    # 查询数据库获取源信息
-                    db_source = db.query(Source).filter(Source.id == source_id).first()
-                    if db_source:
-                        # 获取分类信息
-                        category = "general"
-                        if db_source.category_id:
-                            cat = db.query(Category).filter(Category.id == db_source.category_id).first()
-                            if cat:
-                                category = cat.slug
-                        
-                        source_data = {
-                            "id": db_source.id,
-                            "name": db_source.name,
-                            "url": db_source.url,
-                            "type": db_source.type,
-                            "country": db_source.country,
-                            "language": db_source.language,
-                            "config": db_source.config,
-                            "description": db_source.description,
-                            "category": category  # 使用分类slug而不是ID
-                        }
-                        logger.info(f"从数据库获取自定义源 {source_id} 的信息: 名称={source_data.get('name')}, 分类={source_data.get('category')}, URL={source_data.get('url', 'None')}")
-                finally:
-                    db.close()
-            except Exception as e:
-                logger.error(f"从数据库获取自定义源信息失败: {str(e)}")
+            source_data = await load_custom_source_data(source_id)
             
             # 创建自定义源，传递从数据库获取的信息
             source = NewsSourceFactory.create_source(
@@ -1243,17 +969,13 @@ async def test_source(
             )
         
         try:
-            # 包装源的fetch方法为external类型
-            original_fetch = source.fetch
-            source.fetch = lambda *args, **kwargs: stats_updater.wrap_fetch(source_id, original_fetch, api_type="external", *args, **kwargs)
-            
-            # 获取数据
-            fetch_task = asyncio.create_task(source.get_news(force_update=True))
+            # 获取数据，通过参数传入external类型的统计包装
+            fetch_task = asyncio.create_task(source.get_news(
+                force_update=True,
+                fetch=lambda: stats_updater.wrap_fetch(source_id, source.fetch, api_type="external")
+            ))
             news_items = await asyncio.wait_for(fetch_task, timeout=timeout)
             
-            # 恢复原始fetch方法
-            source.fetch = original_fetch
-            
             end_time = time.time()
             elapsed_time = end_time - start_time
             
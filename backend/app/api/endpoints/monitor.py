@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 
@@ -17,6 +17,21 @@ from app.models.category import Category
 
 router = APIRouter()
 
+
+def _empty_totals() -> Dict[str, float]:
+    return dict.fromkeys(stats_crud.ROLLUP_COLUMNS, 0)
+
+
+def _add_rollup(totals: Dict[str, float], rollup) -> None:
+    for column in stats_crud.ROLLUP_COLUMNS:
+        totals[column] += getattr(rollup, column)
+
+
+def _merge_totals(totals: Dict[str, float], other: Dict[str, float]) -> None:
+    for column in stats_crud.ROLLUP_COLUMNS:
+        totals[column] += other[column]
+
+
 @router.get("/sources", response_model=MonitorResponse)
 def get_source_monitor_data(
     status: Optional[SourceStatus] = None,
@@ -28,8 +43,8 @@ def get_source_monitor_data(
     获取新闻源监控数据
     """
     try:
-        # 构建查询
-        query = db.query(Source)
+        # 构建查询，分类随源一起加载
+        query = db.query(Source).options(joinedload(Source.category))
         
         # 应用过滤条件
         if status:
@@ -53,25 +68,29 @@ def get_source_monitor_data(
         warning_sources = sum(1 for s in sources if s.status == SourceStatus.WARNING)
         inactive_sources = sum(1 for s in sources if s.status == SourceStatus.INACTIVE)
         
+        # 两次查询获取所有源的数据：24小时内的小时聚合，以及每种调用类型的最新统计记录
+        source_ids = [source.id for source in sources]
+        rollups = stats_crud.get_stats_rollups(
+            db, "hour", since=datetime.utcnow() - timedelta(hours=24), source_ids=source_ids
+        )
+        latest_by_source = stats_crud.get_latest_stats_by_source(db, source_ids)
+        
+        # 按源和调用类型汇总聚合桶，同时按源和小时汇总响应时间
+        type_totals: Dict[tuple, Dict[str, float]] = {}
+        hourly_totals: Dict[str, Dict[datetime, Dict[str, float]]] = {}
+        for rollup in rollups:
+            _add_rollup(type_totals.setdefault((rollup.source_id, rollup.api_type), _empty_totals()), rollup)
+            source_hours = hourly_totals.setdefault(rollup.source_id, {})
+            _add_rollup(source_hours.setdefault(rollup.bucket, _empty_totals()), rollup)
+        
         # 获取历史响应时间数据
         historical_data = []
         for source in sources:
-            stats_history = stats_crud.get_stats_history(db, source.id)
-            if stats_history:
-                # 按小时聚合数据
-                hourly_data = {}
-                for stat in stats_history:
-                    hour = stat.created_at.replace(minute=0, second=0, microsecond=0)
-                    if hour not in hourly_data:
-                        hourly_data[hour] = []
-                    hourly_data[hour].append(stat.avg_response_time)
-                
-                # 计算每小时的平均值
-                for hour, times in hourly_data.items():
-                    historical_data.append(TimeSeriesData(
-                        timestamp=hour,
-                        value=sum(times) / len(times)
-                    ))
+            for hour, totals in sorted(hourly_totals.get(source.id, {}).items()):
+                historical_data.append(TimeSeriesData(
+                    timestamp=hour,
+                    value=totals["response_time_sum"] / totals["samples"]
+                ))
         
         # 计算内部/外部API调用的统计信息
         api_type_metrics = {
@@ -83,74 +102,44 @@ def get_source_monitor_data(
             "external_success_rate": 0.0
         }
         
-        internal_stats = []
-        external_stats = []
+        latest_by_type = {"internal": [], "external": []}
+        history_by_type = {"internal": _empty_totals(), "external": _empty_totals()}
         
         # 创建API类型对比数据
         api_type_comparison = []
         
         # 构建源详细信息
         source_infos = []
+        all_latest = []
         for source in sources:
-            # 获取内部和外部最新统计数据
-            internal_latest = stats_crud.get_latest_stats(db, source.id, api_type="internal")
-            external_latest = stats_crud.get_latest_stats(db, source.id, api_type="external")
-            
-            # 准备存储内部/外部指标
             source_api_type_metrics = {}
+            source_history = _empty_totals()
             
-            # 获取历史聚合数据（24小时内）
-            internal_history = stats_crud.get_stats_history(db, source.id, hours=24, api_type="internal")
-            external_history = stats_crud.get_stats_history(db, source.id, hours=24, api_type="external")
-            
-            # 计算内部API的聚合指标
-            if internal_latest:
-                internal_stats.append(internal_latest)
-                
-                # 计算总请求数
-                total_internal_requests = sum(stat.total_requests for stat in internal_history) if internal_history else internal_latest.total_requests
+            for api_type in ("internal", "external"):
+                type_latest = latest_by_source.get((source.id, api_type))
+                history = type_totals.get((source.id, api_type))
+                if history:
+                    _merge_totals(source_history, history)
+                    _merge_totals(history_by_type[api_type], history)
+                if not type_latest:
+                    continue
+                latest_by_type[api_type].append(type_latest)
                 
-                # 计算加权平均响应时间
-                if internal_history and len(internal_history) > 1:
-                    weighted_response_time = sum(stat.avg_response_time * stat.total_requests for stat in internal_history) / max(1, sum(stat.total_requests for stat in internal_history))
+                # 24小时内有多条记录时使用按请求数加权的平均响应时间
+                if history and history["samples"] > 1:
+                    weighted_response_time = history["weighted_response_time_sum"] / max(1, history["total_requests"])
                 else:
-                    weighted_response_time = internal_latest.avg_response_time
+                    weighted_response_time = type_latest.avg_response_time
                 
-                # 计算总错误数
-                total_error_count = sum(stat.error_count for stat in internal_history) if internal_history else internal_latest.error_count
-                
-                source_api_type_metrics["internal"] = {
-                    "success_rate": internal_latest.success_rate,
+                source_api_type_metrics[api_type] = {
+                    "success_rate": type_latest.success_rate,
                     "avg_response_time": weighted_response_time,
-                    "total_requests": total_internal_requests,
-                    "error_count": total_error_count
-                }
-            
-            # 计算外部API的聚合指标
-            if external_latest:
-                external_stats.append(external_latest)
-                
-                # 计算总请求数
-                total_external_requests = sum(stat.total_requests for stat in external_history) if external_history else external_latest.total_requests
-                
-                # 计算加权平均响应时间
-                if external_history and len(external_history) > 1:
-                    weighted_response_time = sum(stat.avg_response_time * stat.total_requests for stat in external_history) / max(1, sum(stat.total_requests for stat in external_history))
-                else:
-                    weighted_response_time = external_latest.avg_response_time
-                
-                # 计算总错误数
-                total_error_count = sum(stat.error_count for stat in external_history) if external_history else external_latest.error_count
-                
-                source_api_type_metrics["external"] = {
-                    "success_rate": external_latest.success_rate,
-                    "avg_response_time": weighted_response_time,
-                    "total_requests": total_external_requests,
-                    "error_count": total_error_count
+                    "total_requests": history["total_requests"] if history else type_latest.total_requests,
+                    "error_count": history["error_count"] if history else type_latest.error_count
                 }
             
             # 如果有内部或外部统计数据，添加到对比列表
-            if internal_latest or external_latest:
+            if source_api_type_metrics:
                 api_type_comparison.append({
                     "source_id": source.id,
                     "source_name": source.name,
@@ -158,34 +147,29 @@ def get_source_monitor_data(
                     "external": source_api_type_metrics.get("external")
                 })
             
-            # 使用合并的统计信息或内部统计信息
-            latest_stats = internal_latest or stats_crud.get_latest_stats(db, source.id)
-            
-            # 获取历史统计数据以计算聚合指标
-            all_stats_history = stats_crud.get_stats_history(db, source.id, hours=24)
+            # 使用内部统计信息，没有时使用任意类型的最新统计信息
+            candidates = [
+                stats for stats in (
+                    latest_by_source.get((source.id, "internal")),
+                    latest_by_source.get((source.id, "external"))
+                ) if stats is not None
+            ]
+            newest_stats = max(candidates, key=lambda stats: stats.created_at) if candidates else None
+            if newest_stats:
+                all_latest.append(newest_stats)
+            latest_stats = latest_by_source.get((source.id, "internal")) or newest_stats
             
             # 计算聚合指标
-            if all_stats_history:
-                # 计算总请求数
-                total_requests = sum(stat.total_requests for stat in all_stats_history)
-                
-                # 计算加权平均响应时间
+            if source_history["samples"]:
+                total_requests = source_history["total_requests"]
                 if total_requests > 0:
-                    weighted_avg_response_time = sum(stat.avg_response_time * stat.total_requests for stat in all_stats_history) / total_requests
+                    weighted_avg_response_time = source_history["weighted_response_time_sum"] / total_requests
+                    weighted_success_rate = source_history["weighted_success_sum"] / total_requests
                 else:
                     weighted_avg_response_time = latest_stats.avg_response_time if latest_stats else 0.0
-                
-                # 计算总错误数
-                total_error_count = sum(stat.error_count for stat in all_stats_history)
-                
-                # 计算加权成功率
-                if total_requests > 0:
-                    weighted_success_rate = sum(stat.success_rate * stat.total_requests for stat in all_stats_history) / total_requests
-                else:
                     weighted_success_rate = latest_stats.success_rate if latest_stats else 0.0
-                    
-                # 计算总新闻数
-                total_news_count = sum(stat.news_count for stat in all_stats_history)
+                total_error_count = source_history["error_count"]
+                total_news_count = source_history["news_count"]
             else:
                 # 如果没有历史数据，使用最新的统计信息
                 total_requests = latest_stats.total_requests if latest_stats else 0
@@ -220,69 +204,31 @@ def get_source_monitor_data(
                 api_type_metrics=source_api_type_metrics
             ))
         
-        # 计算内部/外部API调用的平均响应时间和请求总数
-        if internal_stats:
-            # 获取所有数据源的24小时内内部API调用历史
-            all_internal_history = []
-            for source in sources:
-                source_history = stats_crud.get_stats_history(db, source.id, hours=24, api_type="internal")
-                if source_history:
-                    all_internal_history.extend(source_history)
-            
-            # 计算总请求数
-            api_type_metrics["internal_requests"] = sum(stat.total_requests for stat in all_internal_history) if all_internal_history else sum(s.total_requests for s in internal_stats)
-            
-            # 计算加权平均响应时间
-            if all_internal_history:
-                total_requests = sum(stat.total_requests for stat in all_internal_history)
-                if total_requests > 0:
-                    api_type_metrics["internal_avg_response_time"] = sum(stat.avg_response_time * stat.total_requests for stat in all_internal_history) / total_requests
-                else:
-                    api_type_metrics["internal_avg_response_time"] = sum(s.avg_response_time for s in internal_stats) / len(internal_stats)
-            else:
-                api_type_metrics["internal_avg_response_time"] = sum(s.avg_response_time for s in internal_stats) / len(internal_stats)
-            
-            # 计算加权成功率
-            if api_type_metrics["internal_requests"] > 0:
-                total_success = sum((stat.success_rate * stat.total_requests) for stat in all_internal_history) if all_internal_history else sum(s.success_rate * s.total_requests for s in internal_stats)
-                api_type_metrics["internal_success_rate"] = total_success / api_type_metrics["internal_requests"]
-            else:
-                api_type_metrics["internal_success_rate"] = 0
-        
-        if external_stats:
-            # 获取所有数据源的24小时内外部API调用历史
-            all_external_history = []
-            for source in sources:
-                source_history = stats_crud.get_stats_history(db, source.id, hours=24, api_type="external")
-                if source_history:
-                    all_external_history.extend(source_history)
-            
-            # 计算总请求数
-            api_type_metrics["external_requests"] = sum(stat.total_requests for stat in all_external_history) if all_external_history else sum(s.total_requests for s in external_stats)
+        # 计算内部/外部API调用的平均响应时间、请求总数和成功率
+        for api_type in ("internal", "external"):
+            type_latest = latest_by_type[api_type]
+            if not type_latest:
+                continue
+            history = history_by_type[api_type]
+            latest_avg_response_time = sum(s.avg_response_time for s in type_latest) / len(type_latest)
             
-            # 计算加权平均响应时间
-            if all_external_history:
-                total_requests = sum(stat.total_requests for stat in all_external_history)
-                if total_requests > 0:
-                    api_type_metrics["external_avg_response_time"] = sum(stat.avg_response_time * stat.total_requests for stat in all_external_history) / total_requests
-                else:
-                    api_type_metrics["external_avg_response_time"] = sum(s.avg_response_time for s in external_stats) / len(external_stats)
+            if history["samples"]:
+                requests = history["total_requests"]
+                total_success = history["weighted_success_sum"]
+                avg_response_time = history["weighted_response_time_sum"] / requests if requests > 0 else latest_avg_response_time
             else:
-                api_type_metrics["external_avg_response_time"] = sum(s.avg_response_time for s in external_stats) / len(external_stats)
+                requests = sum(s.total_requests for s in type_latest)
+                total_success = sum(s.success_rate * s.total_requests for s in type_latest)
+                avg_response_time = latest_avg_response_time
             
-            # 计算加权成功率
-            if api_type_metrics["external_requests"] > 0:
-                total_success = sum((stat.success_rate * stat.total_requests) for stat in all_external_history) if all_external_history else sum(s.success_rate * s.total_requests for s in external_stats)
-                api_type_metrics["external_success_rate"] = total_success / api_type_metrics["external_requests"]
-            else:
-                api_type_metrics["external_success_rate"] = 0
+            api_type_metrics[f"{api_type}_requests"] = requests
+            api_type_metrics[f"{api_type}_avg_response_time"] = avg_response_time
+            api_type_metrics[f"{api_type}_success_rate"] = total_success / requests if requests > 0 else 0
             
         # 计算总体平均响应时间
-        all_stats = [stats_crud.get_latest_stats(db, s.id) for s in sources]
-        valid_stats = [s for s in all_stats if s is not None]
         avg_response_time = (
-            sum(s.avg_response_time for s in valid_stats) / len(valid_stats)
-            if valid_stats else 0.0
+            sum(s.avg_response_time for s in all_latest) / len(all_latest)
+            if all_latest else 0.0
         )
         
         return MonitorResponse(
@@ -1,31 +1,58 @@
 from typing import Any, List, Optional
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db, get_current_superuser, get_current_active_user
 from app.crud.news import (
     get_news_by_id, get_news, get_news_with_relations,
     get_news_list_items, create_news, update_news, delete_news,
-    increment_view_count, get_trending_news,
+    encode_news_cursor,
+    increment_view_count, get_trending_news, search_news,
     add_tag_to_news, remove_tag_from_news,
     update_news_cluster, get_news_by_cluster
 )
 from app.crud.user import add_read_history
+from app.core.view_buffer import view_buffer
+from app.core.response_cache import response_cache, ALL_SCOPE, source_scope, category_scope
 from app.models.user import User
 from app.schemas.news import (
-    News, NewsCreate, NewsUpdate, NewsWithRelations, NewsListItem
+    News, NewsCreate, NewsUpdate, NewsWithRelations, NewsListItem, NewsSearchResult
 )
 
 router = APIRouter()
 
+# Trending ranks on live view counts, so it is cached for a shorter time than plain lists
+TRENDING_CACHE_TTL = 30
+
+_news_list_adapter = TypeAdapter(List[NewsListItem])
+
+
+def _serialize_list(items: Any) -> bytes:
+    return _news_list_adapter.dump_json(_news_list_adapter.validate_python(items, from_attributes=True))
+
+
+def _invalidate(*news_items: Any) -> None:
+    """Bump the response cache versions of the sources and categories of the given news."""
+    response_cache.bump(
+        source_ids=[news.source_id for news in news_items if news is not None],
+        category_ids=[news.category_id for news in news_items if news is not None]
+    )
+
 
 @router.get("/", response_model=List[NewsListItem])
 def read_news(
+    request: Request,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 20,
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset pagination cursor. Pass an empty value for the first page, "
+                    "then the X-Next-Cursor header of the previous response. Ignores skip."
+    ),
     source_id: Optional[str] = None,
     category_id: Optional[int] = None,
     tag_id: Optional[int] = None,
@@ -36,20 +63,49 @@ def read_news(
 ) -> Any:
     """
     Retrieve news.
+    
+    Responses are cached per query and invalidated when news of the filtered
+    source or category (or any news, for unfiltered lists) is written.
     """
-    news = get_news_list_items(
-        db,
-        skip=skip,
-        limit=limit,
-        source_id=source_id,
-        category_id=category_id,
-        tag_id=tag_id,
-        search_query=search,
-        start_date=start_date,
-        end_date=end_date,
-        is_top=is_top
-    )
-    return news
+    params = {
+        "skip": skip, "limit": limit, "cursor": cursor, "source_id": source_id,
+        "category_id": category_id, "tag_id": tag_id, "search": search,
+        "start_date": start_date, "end_date": end_date, "is_top": is_top,
+    }
+    scopes = []
+    if source_id:
+        scopes.append(source_scope(source_id))
+    if category_id is not None:
+        scopes.append(category_scope(category_id))
+    if not scopes or tag_id is not None or search:
+        scopes.append(ALL_SCOPE)
+    
+    def build():
+        try:
+            news = get_news_list_items(
+                db,
+                skip=skip,
+                limit=limit,
+                source_id=source_id,
+                category_id=category_id,
+                tag_id=tag_id,
+                search_query=search,
+                start_date=start_date,
+                end_date=end_date,
+                is_top=is_top,
+                cursor=cursor
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        # A full page in keyset mode may have a next page
+        headers = {}
+        if cursor is not None and news and len(news) == limit:
+            last = news[-1]
+            headers["X-Next-Cursor"] = encode_news_cursor(last.published_at, last.id)
+        return _serialize_list(news), headers
+    
+    return response_cache.respond(request, "list", params, scopes, build)
 
 
 @router.post("/", response_model=News)
@@ -63,11 +119,13 @@ def create_news_item(
     Create new news item.
     """
     news = create_news(db, news_in)
+    _invalidate(news)
     return news
 
 
 @router.get("/trending", response_model=List[NewsListItem])
 def read_trending_news(
+    request: Request,
     db: Session = Depends(get_db),
     limit: int = 10,
     hours: int = 24,
@@ -76,18 +134,48 @@ def read_trending_news(
     """
     Retrieve trending news.
     """
-    news = get_trending_news(
+    params = {"limit": limit, "hours": hours, "category_id": category_id}
+    scopes = [category_scope(category_id) if category_id is not None else ALL_SCOPE]
+    
+    def build():
+        news = get_trending_news(
+            db,
+            limit=limit,
+            hours=hours,
+            category_id=category_id,
+            pending_views=view_buffer.pending_counts()
+        )
+        return _serialize_list(news), {}
+    
+    return response_cache.respond(request, "trending", params, scopes, build, ttl=TRENDING_CACHE_TTL)
+
+
+@router.get("/search", response_model=List[NewsSearchResult])
+def search_news_items(
+    db: Session = Depends(get_db),
+    q: str = Query(..., min_length=1, max_length=200, description="Search query"),
+    skip: int = 0,
+    limit: int = Query(20, ge=1, le=100),
+    source_id: Optional[str] = None,
+    category_id: Optional[int] = None,
+) -> Any:
+    """
+    Full-text search news by title and summary, ranked by relevance.
+    """
+    return search_news(
         db,
+        query=q,
+        skip=skip,
         limit=limit,
-        hours=hours,
+        source_id=source_id,
         category_id=category_id
     )
-    return news
 
 
 @router.get("/cluster/{cluster_id}", response_model=List[NewsListItem])
 def read_news_by_cluster(
     *,
+    request: Request,
     db: Session = Depends(get_db),
     cluster_id: str = Path(..., description="The cluster ID"),
     limit: int = 20,
@@ -95,8 +183,12 @@ def read_news_by_cluster(
     """
     Retrieve news by cluster.
     """
-    news = get_news_by_cluster(db, cluster_id=cluster_id, limit=limit)
-    return news
+    params = {"cluster_id": cluster_id, "limit": limit}
+    
+    def build():
+        return _serialize_list(get_news_by_cluster(db, cluster_id=cluster_id, limit=limit)), {}
+    
+    return response_cache.respond(request, "cluster", params, [ALL_SCOPE], build)
 
 
 @router.get("/{news_id}", response_model=NewsWithRelations)
@@ -116,21 +208,23 @@ def read_news_item(
             detail="News not found",
         )
     
-    # Increment view count
-    increment_view_count(db, news_id=news_id)
-    
-    # Add to read history if user is logged in
-    if current_user:
-        add_read_history(db, user_id=current_user.id, news_id=news_id)
+    # Buffer the view and read-history event; write directly only if Redis is unavailable
+    news = result["news"]
+    pending_views = view_buffer.record_view(news_id, user_id=current_user.id if current_user else None)
+    if pending_views is None:
+        increment_view_count(db, news_id=news_id)
+        if current_user:
+            add_read_history(db, user_id=current_user.id, news_id=news_id)
+        pending_views = 0
     
     # Prepare response
-    news = result["news"]
     source = result["source"]
     category = result["category"]
     tags = result["tags"]
     
     response = {
         **news.__dict__,
+        "view_count": (news.view_count or 0) + pending_views,
         "source_name": source.name if source else "",
         "category_name": category.name if category else None,
         "tags": [tag.name for tag in tags]
@@ -160,7 +254,10 @@ def update_news_item(
             status_code=404,
             detail="News not found",
         )
+    # The source or category may change, so both the old and new ones are invalidated
+    previous = (news.source_id, news.category_id)
     news = update_news(db, news_id=news_id, news=news_in)
+    response_cache.bump(source_ids=[previous[0], news.source_id], category_ids=[previous[1], news.category_id])
     return news
 
 
@@ -180,6 +277,7 @@ def delete_news_item(
             status_code=404,
             detail="News not found",
         )
+    _invalidate(news)
     result = delete_news(db, news_id=news_id)
     return result
 
@@ -201,6 +299,7 @@ def add_tag(
             status_code=404,
             detail="News or tag not found",
         )
+    response_cache.bump()
     return result
 
 
@@ -221,6 +320,7 @@ def remove_tag(
             status_code=404,
             detail="News or tag not found",
         )
+    response_cache.bump()
     return result
 
 
@@ -241,4 +341,5 @@ def set_news_cluster(
             status_code=404,
             detail="News not found",
         )
+    _invalidate(news)
     return news 
\ No newline at end of file
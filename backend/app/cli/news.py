@@ -141,6 +141,37 @@ def analyze(days: int, is_async: bool):
         click.echo(json.dumps(result, indent=2, ensure_ascii=False))
 
 
+@news.command("reindex-search")
+@click.option("--batch-size", type=int, default=1000, help="每批处理的新闻数量")
+@click.option("--all", "rebuild_all", is_flag=True, help="重建全部新闻的分词，而不只是缺失的")
+def reindex_search(batch_size: int, rebuild_all: bool):
+    """为新闻生成全文搜索分词"""
+    from app.crud.news import backfill_search_tokens
+    
+    db = SessionLocal()
+    try:
+        updated = backfill_search_tokens(db, batch_size=batch_size, only_missing=not rebuild_all)
+        click.echo(f"已更新 {updated} 条新闻的搜索分词")
+    finally:
+        db.close()
+
+
+@news.command("rebuild-stats-rollups")
+@click.option("--days", type=int, default=None, help="只重建最近多少天的聚合，不提供则全部重建")
+def rebuild_stats_rollups(days: Optional[int]):
+    """根据源统计记录重建按小时/按天的聚合"""
+    from datetime import datetime, timedelta
+    from app.crud.source_stats import rebuild_stats_rollups as rebuild
+    
+    since = datetime.utcnow() - timedelta(days=days) if days else None
+    db = SessionLocal()
+    try:
+        rows = rebuild(db, since=since)
+        click.echo(f"已写入 {rows} 条统计聚合")
+    finally:
+        db.close()
+
+
 @news.command("add-source")
 @click.option("--id", "source_id", required=True, help="新闻源ID")
 @click.option("--name", required=True, help="新闻源名称")
@@ -0,0 +1,195 @@
+"""
+Versioned response cache for the news list endpoints.
+
+Responses are stored in Redis as pre-serialized JSON under a key built from
+the endpoint, its normalized query parameters and the current values of the
+version counters the response depends on (news:version:all,
+news:version:source:<id>, news:version:category:<id>). Ingestion and news
+writes bump the counters of the sources and categories they touched, so the
+next request builds a new key and stale entries simply expire.
+
+The ETag is a hash of the serialized body and is stored next to it, so it
+lives exactly as long as the cached entry: a matching If-None-Match is
+answered with 304 after reading the version counters and the stored ETag
+only, without loading the body or touching the database. Once the entry is
+invalidated or its TTL runs out, the response is rebuilt and the client only
+gets 304 again if the new body is identical.
+"""
+
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import redis
+from fastapi import Request, Response
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ALL_SCOPE = "all"
+
+
+def source_scope(source_id: str) -> str:
+    return f"source:{source_id}"
+
+
+def category_scope(category_id: int) -> str:
+    return f"category:{category_id}"
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        prefix: str = "news:resp",
+        version_prefix: str = "news:version",
+        default_ttl: int = 300,
+        socket_timeout: float = 1.0
+    ):
+        self.redis_url = redis_url
+        self.prefix = prefix
+        self.version_prefix = version_prefix
+        self.default_ttl = default_ttl
+        self.socket_timeout = socket_timeout
+        self._client: Optional[redis.Redis] = None
+        self.stats = {"hits": 0, "misses": 0, "not_modified": 0, "errors": 0}
+
+    @property
+    def client(self) -> redis.Redis:
+        if self._client is None:
+            self._client = redis.Redis.from_url(
+                self.redis_url or settings.REDIS_URL,
+                socket_timeout=self.socket_timeout,
+                socket_connect_timeout=self.socket_timeout
+            )
+        return self._client
+
+    def _version_key(self, scope: str) -> str:
+        return f"{self.version_prefix}:{scope}"
+
+    def cache_key(self, namespace: str, params: Mapping[str, Any], scopes: Iterable[str]) -> str:
+        """
+        Build the cache key for a response from the current version counters.
+        Raises redis.RedisError when Redis is unavailable.
+        """
+        scopes = sorted(set(scopes))
+        versions = self.client.mget([self._version_key(scope) for scope in scopes])
+        material = json.dumps({
+            "params": {name: _normalize(value) for name, value in params.items() if value is not None},
+            "versions": {scope: int(version or 0) for scope, version in zip(scopes, versions)},
+        }, sort_keys=True)
+        return f"{self.prefix}:{namespace}:{hashlib.sha1(material.encode('utf-8')).hexdigest()}"
+
+    def bump(self, source_ids: Iterable[str] = (), category_ids: Iterable[int] = ()) -> None:
+        """
+        Invalidate cached responses that depend on the given sources or
+        categories, and every unfiltered list.
+        """
+        scopes = [ALL_SCOPE]
+        scopes.extend(source_scope(source_id) for source_id in set(source_ids) if source_id)
+        scopes.extend(category_scope(category_id) for category_id in set(category_ids) if category_id is not None)
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for scope in scopes:
+                pipe.incr(self._version_key(scope))
+            pipe.execute()
+        except redis.RedisError as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Failed to bump response cache versions: {e}")
+
+    def respond(
+        self,
+        request: Request,
+        namespace: str,
+        params: Mapping[str, Any],
+        scopes: Iterable[str],
+        build: Callable[[], Tuple[bytes, Dict[str, str]]],
+        ttl: Optional[int] = None
+    ) -> Response:
+        """
+        Serve a JSON response from the cache, building and storing it on a miss.
+
+        build returns the serialized body and any extra response headers.
+        When Redis is unavailable the response is built on every request.
+        """
+        try:
+            key = self.cache_key(namespace, params, scopes)
+        except redis.RedisError as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Response cache unavailable: {e}")
+            body, headers = build()
+            return self._response(body, headers, _body_etag(body), "BYPASS")
+
+        if_none_match = _parse_if_none_match(request.headers.get("if-none-match"))
+        if if_none_match:
+            try:
+                stored_etag = self.client.hget(key, "etag")
+            except redis.RedisError as e:
+                self.stats["errors"] += 1
+                logger.warning(f"Failed to read cached ETag {key}: {e}")
+                stored_etag = None
+            if stored_etag and stored_etag.decode() in if_none_match:
+                return self._not_modified(stored_etag.decode())
+
+        try:
+            cached = self.client.hgetall(key)
+        except redis.RedisError as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Failed to read cached response {key}: {e}")
+            cached = None
+
+        if cached:
+            self.stats["hits"] += 1
+            return self._response(cached[b"body"], json.loads(cached[b"headers"]), cached[b"etag"].decode(), "HIT")
+
+        self.stats["misses"] += 1
+        body, headers = build()
+        etag = _body_etag(body)
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.hset(key, mapping={"body": body, "headers": json.dumps(headers), "etag": etag})
+            pipe.expire(key, ttl or self.default_ttl)
+            pipe.execute()
+        except redis.RedisError as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Failed to store cached response {key}: {e}")
+        if etag in if_none_match:
+            return self._not_modified(etag)
+        return self._response(body, headers, etag, "MISS")
+
+    def _not_modified(self, etag: str) -> Response:
+        self.stats["not_modified"] += 1
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+    @staticmethod
+    def _response(body: bytes, headers: Dict[str, str], etag: str, status: str) -> Response:
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers={**headers, "ETag": etag, "Cache-Control": "no-cache", "X-Cache": status}
+        )
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self.stats)
+
+
+def _body_etag(body: bytes) -> str:
+    return f'W/"{hashlib.sha1(body).hexdigest()}"'
+
+
+def _parse_if_none_match(value: Optional[str]) -> List[str]:
+    if not value:
+        return []
+    return [tag.strip() for tag in value.split(",") if tag.strip()]
+
+
+response_cache = ResponseCache()
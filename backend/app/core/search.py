@@ -0,0 +1,73 @@
+"""
+News full-text search helpers.
+
+PostgreSQL's built-in parsers cannot segment Chinese, so text is segmented
+with jieba in Python and stored as space-separated tokens in
+news.search_tokens. The first line holds title tokens and the second line
+summary tokens. A generated tsvector column built from them with the
+'simple' configuration (title weighted A, summary B) backs a GIN index.
+"""
+
+import re
+import html
+from typing import Iterable, List, Optional
+
+# Characters that would be taken as tsquery syntax or line separators
+_UNSAFE_CHARS = re.compile(r"[\s&|!():*<>'\\]+")
+
+# Upper bound on search terms taken from a single query
+MAX_QUERY_TERMS = 16
+
+
+def _tokens(text: Optional[str], for_search: bool = False) -> List[str]:
+    if not text:
+        return []
+    # Imported on first use so loading the models does not pull in jieba
+    import jieba
+    words = jieba.lcut_for_search(text) if for_search else jieba.lcut(text)
+    tokens = []
+    for word in words:
+        word = _UNSAFE_CHARS.sub("", word.lower())
+        if word and any(ch.isalnum() for ch in word):
+            tokens.append(word)
+    return tokens
+
+
+def build_search_tokens(title: Optional[str], summary: Optional[str]) -> str:
+    """
+    Segment title and summary into the stored search_tokens value.
+
+    Search-mode segmentation also emits the shorter words inside long
+    compounds, so a query for "银行" matches "商业银行".
+    """
+    title_tokens = " ".join(_tokens(title, for_search=True))
+    summary_tokens = " ".join(_tokens(summary, for_search=True))
+    return f"{title_tokens}\n{summary_tokens}"
+
+
+def query_terms(query: str) -> List[str]:
+    """
+    Segment a user query into distinct search terms, keeping their order.
+    """
+    terms = []
+    for token in _tokens(query):
+        if token not in terms:
+            terms.append(token)
+    return terms[:MAX_QUERY_TERMS]
+
+
+def highlight(text: Optional[str], terms: Iterable[str], start: str = "<mark>", stop: str = "</mark>") -> Optional[str]:
+    """
+    Wrap occurrences of the search terms in text with highlight markers.
+
+    The text is HTML-escaped first, so the markers are the only markup in
+    the result. Longer terms are matched first so overlapping terms do not nest.
+    """
+    if not text:
+        return text
+    text = html.escape(text)
+    terms = sorted({html.escape(term) for term in terms if term}, key=len, reverse=True)
+    if not terms:
+        return text
+    pattern = re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE)
+    return pattern.sub(lambda match: f"{start}{match.group(0)}{stop}", text)
@@ -0,0 +1,210 @@
+"""
+Write-behind buffer for news view counts and read history.
+
+Reading an article records the view with HINCRBY on a Redis hash and, for
+logged-in users, appends a read event to a Redis stream. The periodic
+news.flush_view_buffer task moves both into the database in batches, so a
+read request no longer runs write transactions or takes the row lock on a
+popular article.
+
+Only one flush runs at a time: flush() takes a Redis lock (SET NX EX) and
+returns without doing anything when another flush holds it. Flushing is
+at-least-once: the pending hash is renamed before it is applied and each
+batch's fields are removed from it right after the batch is committed, and
+stream entries are only removed after their batch is committed. A crash
+between a commit and the cleanup that follows it may count that one batch
+twice.
+"""
+
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import redis
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ViewBuffer:
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        views_key: str = "news:views:pending",
+        history_stream: str = "news:read_history",
+        history_maxlen: int = 100000,
+        socket_timeout: float = 1.0,
+        lock_timeout: int = 600
+    ):
+        self.redis_url = redis_url
+        self.views_key = views_key
+        self.flushing_key = f"{views_key}:flushing"
+        self.lock_key = f"{views_key}:lock"
+        self.history_stream = history_stream
+        self.history_maxlen = history_maxlen
+        self.socket_timeout = socket_timeout
+        self.lock_timeout = lock_timeout
+        self._client: Optional[redis.Redis] = None
+
+    @property
+    def client(self) -> redis.Redis:
+        if self._client is None:
+            self._client = redis.Redis.from_url(
+                self.redis_url or settings.REDIS_URL,
+                socket_timeout=self.socket_timeout,
+                socket_connect_timeout=self.socket_timeout
+            )
+        return self._client
+
+    def record_view(self, news_id: int, user_id: Optional[int] = None) -> Optional[int]:
+        """
+        Buffer one view, and a read-history event when user_id is given.
+
+        Returns the number of views buffered for the article since the last
+        flush, or None when Redis is unavailable and the caller should write
+        to the database directly.
+        """
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.hincrby(self.views_key, str(news_id), 1)
+            pipe.hget(self.flushing_key, str(news_id))
+            if user_id is not None:
+                pipe.xadd(
+                    self.history_stream,
+                    {"user_id": user_id, "news_id": news_id},
+                    maxlen=self.history_maxlen,
+                    approximate=True
+                )
+            pending, flushing = pipe.execute()[:2]
+            return int(pending) + int(flushing or 0)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to buffer view of news {news_id}: {e}")
+            return None
+
+    def pending_counts(self, news_ids: Optional[Iterable[int]] = None) -> Dict[int, int]:
+        """
+        Views buffered but not yet written to news.view_count, by news id.
+
+        Includes a flush in progress. Returns an empty dict when Redis is unavailable.
+        """
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            if news_ids is None:
+                pipe.hgetall(self.views_key)
+                pipe.hgetall(self.flushing_key)
+                pending, flushing = pipe.execute()
+            else:
+                fields = [str(news_id) for news_id in news_ids]
+                if not fields:
+                    return {}
+                pipe.hmget(self.views_key, fields)
+                pipe.hmget(self.flushing_key, fields)
+                pending, flushing = (dict(zip(fields, values)) for values in pipe.execute())
+        except redis.RedisError as e:
+            logger.warning(f"Failed to read buffered view counts: {e}")
+            return {}
+
+        counts: Dict[int, int] = {}
+        for values in (pending, flushing):
+            for news_id, views in values.items():
+                if views:
+                    key = int(news_id)
+                    counts[key] = counts.get(key, 0) + int(views)
+        return counts
+
+    def flush(self, db: Session, batch_size: int = 1000) -> Dict[str, int]:
+        """
+        Apply buffered views and read-history events to the database.
+
+        Returns the number of articles whose view count changed and the
+        number of read events processed. Both are 0 when another flush is
+        still running.
+        """
+        # The lock expires on its own if the flushing worker dies
+        token = uuid.uuid4().hex
+        if not self.client.set(self.lock_key, token, nx=True, ex=self.lock_timeout):
+            logger.info("Another view buffer flush is running, skipping")
+            return {"views": 0, "read_history": 0}
+        try:
+            return {
+                "views": self._flush_views(db, batch_size),
+                "read_history": self._flush_read_history(db, batch_size),
+            }
+        finally:
+            # Only release our own lock, not one taken after ours expired
+            if self.client.get(self.lock_key) == token.encode():
+                self.client.delete(self.lock_key)
+
+    def _flush_views(self, db: Session, batch_size: int) -> int:
+        from app.crud.news import apply_view_counts
+
+        # A leftover flushing hash means the previous flush did not finish; apply it first
+        if not self.client.exists(self.flushing_key):
+            try:
+                self.client.rename(self.views_key, self.flushing_key)
+            except redis.ResponseError:
+                # Nothing buffered since the last flush
+                return 0
+
+        counts = {
+            int(news_id): int(views)
+            for news_id, views in self.client.hgetall(self.flushing_key).items()
+        }
+        items = list(counts.items())
+        for start in range(0, len(items), batch_size):
+            batch = items[start:start + batch_size]
+            apply_view_counts(db, dict(batch))
+            # Drop the committed batch so a retry after a failure does not apply it again
+            self.client.hdel(self.flushing_key, *[str(news_id) for news_id, _ in batch])
+        self.client.delete(self.flushing_key)
+        return len(counts)
+
+    def _flush_read_history(self, db: Session, batch_size: int) -> int:
+        from app.crud.user import bulk_add_read_history
+
+        processed = 0
+        while True:
+            entries = self.client.xrange(self.history_stream, count=batch_size)
+            if not entries:
+                return processed
+
+            events: List[Tuple[int, int, datetime]] = []
+            for entry_id, fields in entries:
+                try:
+                    events.append((
+                        int(fields[b"user_id"]),
+                        int(fields[b"news_id"]),
+                        _entry_time(entry_id)
+                    ))
+                except (KeyError, ValueError):
+                    logger.warning(f"Skipping malformed read-history entry {entry_id!r}")
+
+            bulk_add_read_history(db, events)
+            self.client.xdel(self.history_stream, *[entry_id for entry_id, _ in entries])
+            processed += len(entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.hlen(self.views_key)
+            pipe.xlen(self.history_stream)
+            pending_articles, pending_events = pipe.execute()
+        except redis.RedisError as e:
+            return {"available": False, "error": str(e)}
+        return {
+            "available": True,
+            "pending_articles": pending_articles,
+            "pending_read_events": pending_events,
+        }
+
+
+def _entry_time(entry_id: bytes) -> datetime:
+    # Stream ids start with the millisecond timestamp the entry was added at
+    milliseconds = int(entry_id.split(b"-")[0])
+    return datetime.utcfromtimestamp(milliseconds / 1000)
+
+
+view_buffer = ViewBuffer()
@@ -1,13 +1,22 @@
-from typing import List, Optional, Dict, Any
+import json
+import base64
+import hashlib
+import logging
+from typing import List, Optional, Dict, Any, Iterable, Set, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc, func, and_, or_
+from sqlalchemy import desc, func, and_, or_, tuple_, literal, literal_column, bindparam
+from sqlalchemy.exc import SQLAlchemyError
 
+from app.db.upsert import dialect_insert
 from app.models.news import News
 from app.models.source import Source
 from app.models.category import Category
 from app.models.tag import Tag
 from app.schemas.news import NewsCreate, NewsUpdate
+from app.core.search import build_search_tokens, query_terms, highlight
+
+logger = logging.getLogger(__name__)
 
 
 def get_news_by_id(db: Session, news_id: int) -> Optional[News]:
@@ -21,6 +30,49 @@ def get_news_by_original_id(db: Session, source_id: str, original_id: str) -> Op
     ).first()
 
 
+def encode_news_cursor(published_at: Optional[datetime], news_id: int) -> str:
+    """Encode the sort key of the last row of a page as an opaque keyset cursor"""
+    payload = json.dumps(
+        {"p": published_at.isoformat() if published_at else None, "i": news_id},
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_news_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """Decode a keyset cursor, raising ValueError if it is malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        published_at = datetime.fromisoformat(payload["p"]) if payload["p"] else None
+        return published_at, int(payload["i"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def _apply_keyset(query, cursor: str):
+    """
+    Order by (published_at DESC, id DESC) and seek past the cursor.
+
+    NULL published_at rows come first, which is how PostgreSQL walks a
+    plain ascending btree index backwards, so the listing indexes are used.
+    An empty cursor means the first page.
+    """
+    if cursor:
+        published_at, news_id = decode_news_cursor(cursor)
+        if published_at is None:
+            query = query.filter(or_(
+                and_(News.published_at.is_(None), News.id < news_id),
+                News.published_at.isnot(None)
+            ))
+        else:
+            query = query.filter(or_(
+                News.published_at < published_at,
+                and_(News.published_at == published_at, News.id < news_id)
+            ))
+    return query.order_by(desc(News.published_at).nulls_first(), desc(News.id))
+
+
 def get_news(
     db: Session,
     skip: int = 0,
@@ -33,7 +85,8 @@ def get_news(
     end_date: Optional[datetime] = None,
     is_top: Optional[bool] = None,
     cluster_id: Optional[str] = None,
-    include_content: bool = False
+    include_content: bool = False,
+    cursor: Optional[str] = None
 ) -> List[News]:
     query = db.query(News)
     
@@ -68,6 +121,10 @@ def get_news(
     if cluster_id:
         query = query.filter(News.cluster_id == cluster_id)
     
+    # Keyset pagination when a cursor is given, otherwise offset pagination
+    if cursor is not None:
+        return _apply_keyset(query, cursor).limit(limit).all()
+    
     # Always order by published_at desc, then created_at desc
     query = query.order_by(desc(News.published_at), desc(News.created_at))
     
@@ -105,7 +162,8 @@ def get_news_list_items(
     search_query: Optional[str] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    is_top: Optional[bool] = None
+    is_top: Optional[bool] = None,
+    cursor: Optional[str] = None
 ) -> List[Dict[str, Any]]:
     query = db.query(
         News.id,
@@ -153,6 +211,10 @@ def get_news_list_items(
     if is_top is not None:
         query = query.filter(News.is_top == is_top)
     
+    # Keyset pagination when a cursor is given, otherwise offset pagination
+    if cursor is not None:
+        return _apply_keyset(query, cursor).limit(limit).all()
+    
     # Always order by published_at desc, then created_at desc
     query = query.order_by(desc(News.published_at), desc(News.created_at))
     
@@ -182,6 +244,253 @@ def update_news(db: Session, news_id: int, news: NewsUpdate) -> Optional[News]:
     return db_news
 
 
+# Columns written by the ingestion upsert; also the input of the content hash
+UPSERT_COLUMNS = (
+    "title", "url", "content", "summary", "image_url", "published_at", "category_id"
+)
+
+
+def compute_news_hash(row: Dict[str, Any]) -> str:
+    parts = []
+    for column in UPSERT_COLUMNS:
+        value = row.get(column)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        parts.append("" if value is None else str(value))
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def _write_news_rows(
+    db: Session,
+    insert,
+    rows: List[Dict[str, Any]],
+    existing: Dict[tuple, str],
+    now: datetime
+) -> Set[tuple]:
+    """
+    Write rows and return the (source_id, original_id) keys the database
+    actually inserted or updated. Rows whose stored content hash already
+    matches, e.g. because a concurrent writer stored them meanwhile, are left out.
+    """
+    if insert is None:
+        # No ON CONFLICT support: insert new rows and update known ones one by one
+        written = set()
+        for row in rows:
+            key = (row["source_id"], row["original_id"])
+            if key in existing:
+                updated = db.query(News).filter(
+                    News.source_id == row["source_id"],
+                    News.original_id == row["original_id"],
+                    News.content_hash.is_distinct_from(row["content_hash"])
+                ).update({
+                    **{column: row[column] for column in UPSERT_COLUMNS},
+                    "content_hash": row["content_hash"],
+                    "search_tokens": row["search_tokens"],
+                    "updated_at": now,
+                }, synchronize_session=False)
+                if not updated:
+                    continue
+            else:
+                db.execute(News.__table__.insert().values(**row))
+            written.add(key)
+        return written
+
+    stmt = insert(News).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[News.source_id, News.original_id],
+        set_={
+            **{column: stmt.excluded[column] for column in UPSERT_COLUMNS},
+            "content_hash": stmt.excluded.content_hash,
+            "search_tokens": stmt.excluded.search_tokens,
+            "updated_at": now,
+        },
+        # Guards against a concurrent writer having stored the same content meanwhile
+        where=News.content_hash.is_distinct_from(stmt.excluded.content_hash)
+    ).returning(News.source_id, News.original_id)
+    return {(source_id, original_id) for source_id, original_id in db.execute(stmt)}
+
+
+def bulk_upsert_news(
+    db: Session,
+    rows: Iterable[Dict[str, Any]],
+    chunk_size: int = 500
+) -> Dict[str, Any]:
+    """
+    Insert or update news rows in chunks with INSERT ... ON CONFLICT against
+    uix_source_original. Rows whose content hash matches the stored one are skipped.
+    Databases without ON CONFLICT support get a plain INSERT or UPDATE per row.
+
+    Each chunk is written in a savepoint; when it fails, its rows are retried
+    one by one and only the rows the database rejects are dropped.
+
+    Each row needs source_id, original_id and the UPSERT_COLUMNS.
+    Returns the number of inserted, updated and unchanged rows, and the
+    (source_id, original_id) keys of the rows that failed under "failed".
+    Only rows the statement actually wrote count as inserted or updated.
+    """
+    # Later duplicates win; a single ON CONFLICT statement cannot touch a row twice
+    unique_rows: Dict[tuple, Dict[str, Any]] = {}
+    for row in rows:
+        row = dict(row)
+        row["content_hash"] = compute_news_hash(row)
+        row["search_tokens"] = build_search_tokens(row.get("title"), row.get("summary"))
+        unique_rows[(row["source_id"], row["original_id"])] = row
+
+    result: Dict[str, Any] = {"inserted": 0, "updated": 0, "unchanged": 0, "failed": []}
+    if not unique_rows:
+        return result
+
+    insert = dialect_insert(db)
+    items = list(unique_rows.items())
+
+    for start in range(0, len(items), chunk_size):
+        chunk = items[start:start + chunk_size]
+
+        existing = dict(
+            ((source_id, original_id), content_hash)
+            for source_id, original_id, content_hash in db.query(
+                News.source_id, News.original_id, News.content_hash
+            ).filter(tuple_(News.source_id, News.original_id).in_([key for key, _ in chunk]))
+        )
+
+        pending = []
+        for key, row in chunk:
+            if key not in existing:
+                kind = "inserted"
+            elif existing[key] == row["content_hash"]:
+                result["unchanged"] += 1
+                continue
+            else:
+                kind = "updated"
+            pending.append((key, kind, row))
+
+        if not pending:
+            continue
+
+        now = datetime.utcnow()
+        for _, _, row in pending:
+            row.setdefault("created_at", now)
+            row.setdefault("updated_at", now)
+
+        try:
+            with db.begin_nested():
+                written = _write_news_rows(db, insert, [row for _, _, row in pending], existing, now)
+        except SQLAlchemyError as e:
+            # Retry the chunk row by row so one bad row does not discard the rest
+            logger.warning(f"Bulk upsert of {len(pending)} news rows failed, retrying row by row: {e}")
+            written = set()
+            for key, kind, row in pending:
+                try:
+                    with db.begin_nested():
+                        written |= _write_news_rows(db, insert, [row], existing, now)
+                except SQLAlchemyError as row_error:
+                    logger.error(f"Skipping news row {key[0]}/{key[1]}: {row_error}")
+                    result["failed"].append(key)
+
+        failed = set(result["failed"])
+        for key, kind, _ in pending:
+            if key in written:
+                result[kind] += 1
+            elif key not in failed:
+                result["unchanged"] += 1
+
+    db.commit()
+    return result
+
+
+def search_news(
+    db: Session,
+    query: str,
+    skip: int = 0,
+    limit: int = 20,
+    source_id: Optional[str] = None,
+    category_id: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Full-text search over title and summary.
+
+    On PostgreSQL matches go through the GIN-indexed search_vector column and
+    are ordered by ts_rank_cd; other databases fall back to substring matching
+    on search_tokens ordered by recency. Each result carries HTML-escaped
+    title_highlight/summary_highlight with the matched terms in <mark> tags.
+    """
+    terms = query_terms(query)
+    if not terms:
+        return []
+
+    query_obj = db.query(
+        News.id,
+        News.title,
+        News.url,
+        News.source_id,
+        Source.name.label("source_name"),
+        News.published_at,
+        News.image_url,
+        News.summary,
+        News.category_id,
+        Category.name.label("category_name"),
+        News.is_top,
+        News.view_count,
+        News.sentiment_score,
+        News.extra,
+        News.created_at
+    ).join(Source, News.source_id == Source.id
+    ).outerjoin(Category, News.category_id == Category.id)
+
+    if source_id:
+        query_obj = query_obj.filter(News.source_id == source_id)
+
+    if category_id:
+        query_obj = query_obj.filter(News.category_id == category_id)
+
+    if db.get_bind().dialect.name == "postgresql":
+        # search_vector is a generated column that only exists on PostgreSQL
+        search_vector = literal_column("news.search_vector")
+        ts_query = func.plainto_tsquery("simple", " ".join(terms))
+        rank = func.ts_rank_cd(search_vector, ts_query).label("rank")
+        query_obj = query_obj.add_columns(rank).filter(
+            search_vector.op("@@")(ts_query)
+        ).order_by(desc(rank), desc(News.published_at))
+    else:
+        for term in terms:
+            query_obj = query_obj.filter(News.search_tokens.contains(term, autoescape=True))
+        query_obj = query_obj.add_columns(literal(None).label("rank")).order_by(
+            desc(News.published_at), desc(News.id)
+        )
+
+    results = []
+    for row in query_obj.offset(skip).limit(limit).all():
+        item = row._asdict()
+        item["title_highlight"] = highlight(row.title, terms)
+        item["summary_highlight"] = highlight(row.summary, terms)
+        results.append(item)
+    return results
+
+
+def backfill_search_tokens(db: Session, batch_size: int = 1000, only_missing: bool = True) -> int:
+    """
+    Recompute search_tokens for existing rows in id order, committing per batch.
+    Returns the number of rows updated.
+    """
+    updated = 0
+    last_id = 0
+    while True:
+        query = db.query(News.id, News.title, News.summary).filter(News.id > last_id)
+        if only_missing:
+            query = query.filter(News.search_tokens.is_(None))
+        batch = query.order_by(News.id).limit(batch_size).all()
+        if not batch:
+            return updated
+
+        db.bulk_update_mappings(News, [
+            {"id": news_id, "search_tokens": build_search_tokens(title, summary)}
+            for news_id, title, summary in batch
+        ])
+        db.commit()
+        updated += len(batch)
+        last_id = batch[-1].id
+
+
 def delete_news(db: Session, news_id: int) -> bool:
     db_news = get_news_by_id(db, news_id)
     if not db_news:
@@ -203,12 +512,34 @@ def increment_view_count(db: Session, news_id: int) -> Optional[News]:
     return db_news
 
 
+def apply_view_counts(db: Session, counts: Dict[int, int]) -> None:
+    """
+    Add buffered view counts to news.view_count in one executemany UPDATE.
+    Ids of deleted news are ignored.
+    """
+    if not counts:
+        return
+    table = News.__table__
+    stmt = table.update().where(table.c.id == bindparam("news_id")).values(
+        view_count=func.coalesce(table.c.view_count, 0) + bindparam("views")
+    )
+    db.execute(stmt, [{"news_id": news_id, "views": views} for news_id, views in counts.items()])
+    db.commit()
+
+
 def get_trending_news(
     db: Session,
     limit: int = 10,
     hours: int = 24,
-    category_id: Optional[int] = None
+    category_id: Optional[int] = None,
+    pending_views: Optional[Dict[int, int]] = None
 ) -> List[Dict[str, Any]]:
+    """
+    Most viewed news published in the last `hours`.
+
+    pending_views holds view counts not yet flushed to the database (see
+    app.core.view_buffer); they are added to view_count before ranking.
+    """
     cutoff_time = datetime.utcnow() - timedelta(hours=hours)
     
     query = db.query(
@@ -235,9 +566,21 @@ def get_trending_news(
         query = query.filter(News.category_id == category_id)
     
     # Order by view_count and then published_at
-    query = query.order_by(desc(News.view_count), desc(News.published_at))
-    
-    return query.limit(limit).all()
+    ranked = query.order_by(desc(News.view_count), desc(News.published_at))
+    rows = [dict(row._mapping) for row in ranked.limit(limit).all()]
+    if not pending_views:
+        return rows
+    
+    # Only news with pending views can overtake the database top list
+    seen = {row["id"] for row in rows}
+    missing = [news_id for news_id in pending_views if news_id not in seen]
+    if missing:
+        rows.extend(dict(row._mapping) for row in query.filter(News.id.in_(missing)).all())
+    for row in rows:
+        row["view_count"] = (row["view_count"] or 0) + pending_views.get(row["id"], 0)
+    
+    rows.sort(key=lambda row: (row["view_count"], row["published_at"]), reverse=True)
+    return rows[:limit]
 
 
 def add_tag_to_news(db: Session, news_id: int, tag_id: int) -> bool:
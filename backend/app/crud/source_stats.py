@@ -1,10 +1,18 @@
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import and_, func
 from sqlalchemy.orm import Session
-from app.models.source_stats import SourceStats, ApiCallType
+from app.db.upsert import dialect_insert
+from app.models.source_stats import SourceStats, SourceStatsRollup, ApiCallType, RollupGranularity
 from app.models.source import Source, SourceStatus
 from datetime import datetime, timedelta
 from sqlalchemy.types import String
 
+# 累加到聚合桶中的指标列
+ROLLUP_COLUMNS = (
+    "samples", "total_requests", "error_count", "news_count",
+    "response_time_sum", "weighted_response_time_sum", "weighted_success_sum"
+)
+
 def create_source_stats(
     db: Session,
     source_id: str,
@@ -31,6 +39,7 @@ def create_source_stats(
     
     db_stats = SourceStats(
         source_id=source_id,
+        created_at=datetime.utcnow(),
         success_rate=success_rate,
         avg_response_time=avg_response_time,
         total_requests=total_requests,
@@ -40,10 +49,162 @@ def create_source_stats(
         api_type=enum_api_type
     )
     db.add(db_stats)
+    # 与统计记录在同一个事务中累加到小时和天的聚合桶
+    record_stats_rollup(db, db_stats)
     db.commit()
     db.refresh(db_stats)
     return db_stats
 
+
+def bucket_start(timestamp: datetime, granularity: str) -> datetime:
+    """返回时间所在聚合桶的起始时间"""
+    if granularity == RollupGranularity.day.value:
+        return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+
+def _api_type_value(api_type) -> str:
+    return api_type.value if isinstance(api_type, ApiCallType) else str(api_type)
+
+
+def _rollup_values(stats: SourceStats) -> Dict[str, float]:
+    total_requests = stats.total_requests or 0
+    avg_response_time = stats.avg_response_time or 0.0
+    return {
+        "samples": 1,
+        "total_requests": total_requests,
+        "error_count": stats.error_count or 0,
+        "news_count": stats.news_count or 0,
+        "response_time_sum": avg_response_time,
+        "weighted_response_time_sum": avg_response_time * total_requests,
+        "weighted_success_sum": (stats.success_rate or 0.0) * total_requests,
+    }
+
+
+def record_stats_rollup(db: Session, stats: SourceStats) -> None:
+    """
+    把一条统计记录累加到对应的小时和天聚合桶，不提交事务
+
+    使用 INSERT ... ON CONFLICT DO UPDATE 在数据库中累加，多个进程同时写入同一个桶时不会丢失更新；
+    其他数据库退回到加锁读取后更新
+    """
+    values = _rollup_values(stats)
+    created_at = stats.created_at or datetime.utcnow()
+    insert = dialect_insert(db)
+    for granularity in RollupGranularity:
+        keys = {
+            "source_id": stats.source_id,
+            "api_type": _api_type_value(stats.api_type),
+            "granularity": granularity.value,
+            "bucket": bucket_start(created_at, granularity.value),
+        }
+        if insert is None:
+            # 不支持 ON CONFLICT 的数据库：锁定已有的桶后在Python中累加
+            rollup = db.query(SourceStatsRollup).filter_by(**keys).with_for_update().first()
+            if rollup is None:
+                db.add(SourceStatsRollup(**keys, **values))
+            else:
+                for column in ROLLUP_COLUMNS:
+                    setattr(rollup, column, getattr(rollup, column) + values[column])
+            continue
+
+        stmt = insert(SourceStatsRollup).values(**keys, **values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                SourceStatsRollup.source_id, SourceStatsRollup.api_type,
+                SourceStatsRollup.granularity, SourceStatsRollup.bucket
+            ],
+            set_={
+                column: getattr(SourceStatsRollup, column) + stmt.excluded[column]
+                for column in ROLLUP_COLUMNS
+            }
+        )
+        db.execute(stmt)
+
+
+def rebuild_stats_rollups(db: Session, since: Optional[datetime] = None, batch_size: int = 5000) -> int:
+    """
+    根据source_stats重新计算聚合，用于升级后回填历史数据
+
+    Args:
+        since: 只重建该时间所在的天及之后的聚合，默认全部重建
+        batch_size: 每批读取的统计记录数
+
+    Returns:
+        写入的聚合行数
+    """
+    start = bucket_start(since, RollupGranularity.day.value) if since else None
+    delete_query = db.query(SourceStatsRollup)
+    if start:
+        delete_query = delete_query.filter(SourceStatsRollup.bucket >= start)
+    delete_query.delete(synchronize_session=False)
+
+    buckets: Dict[Tuple[str, str, str, datetime], Dict[str, float]] = {}
+    last_id = 0
+    while True:
+        query = db.query(SourceStats).filter(SourceStats.id > last_id)
+        if start:
+            query = query.filter(SourceStats.created_at >= start)
+        batch = query.order_by(SourceStats.id).limit(batch_size).all()
+        if not batch:
+            break
+        for stats in batch:
+            values = _rollup_values(stats)
+            for granularity in RollupGranularity:
+                key = (
+                    stats.source_id, _api_type_value(stats.api_type), granularity.value,
+                    bucket_start(stats.created_at, granularity.value)
+                )
+                totals = buckets.setdefault(key, dict.fromkeys(ROLLUP_COLUMNS, 0))
+                for column in ROLLUP_COLUMNS:
+                    totals[column] += values[column]
+        last_id = batch[-1].id
+        db.expunge_all()
+
+    db.bulk_insert_mappings(SourceStatsRollup, [
+        {"source_id": source_id, "api_type": api_type, "granularity": granularity, "bucket": bucket, **totals}
+        for (source_id, api_type, granularity, bucket), totals in buckets.items()
+    ])
+    db.commit()
+    return len(buckets)
+
+
+def get_stats_rollups(
+    db: Session,
+    granularity: str = RollupGranularity.hour.value,
+    since: Optional[datetime] = None,
+    source_ids: Optional[Iterable[str]] = None
+) -> List[SourceStatsRollup]:
+    """一次查询获取所有源在时间范围内的聚合桶，按桶时间排序"""
+    query = db.query(SourceStatsRollup).filter(SourceStatsRollup.granularity == granularity)
+    if since:
+        query = query.filter(SourceStatsRollup.bucket >= bucket_start(since, granularity))
+    if source_ids is not None:
+        query = query.filter(SourceStatsRollup.source_id.in_(list(source_ids)))
+    return query.order_by(SourceStatsRollup.bucket.asc()).all()
+
+
+def get_latest_stats_by_source(
+    db: Session,
+    source_ids: Optional[Iterable[str]] = None
+) -> Dict[Tuple[str, str], SourceStats]:
+    """一次查询获取每个源每种调用类型的最新统计记录，键为(source_id, api_type)"""
+    latest = db.query(
+        SourceStats.source_id,
+        SourceStats.api_type,
+        func.max(SourceStats.created_at).label("created_at")
+    )
+    if source_ids is not None:
+        latest = latest.filter(SourceStats.source_id.in_(list(source_ids)))
+    latest = latest.group_by(SourceStats.source_id, SourceStats.api_type).subquery()
+
+    rows = db.query(SourceStats).join(latest, and_(
+        SourceStats.source_id == latest.c.source_id,
+        SourceStats.api_type == latest.c.api_type,
+        SourceStats.created_at == latest.c.created_at
+    )).all()
+    return {(stats.source_id, _api_type_value(stats.api_type)): stats for stats in rows}
+
 def get_latest_stats(db: Session, source_id: str, api_type: Optional[str] = None) -> Optional[SourceStats]:
     """获取最新的源统计数据，可以按api_type过滤"""
     query = db.query(SourceStats).filter(SourceStats.source_id == source_id)
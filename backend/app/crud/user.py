@@ -1,7 +1,9 @@
-from typing import List, Optional, Dict, Any
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Iterable, Tuple
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session, joinedload
 
-from app.models.user import User, Subscription
+from app.models.user import User, Subscription, user_read_history
 from app.models.news import News
 from app.schemas.user import UserCreate, UserUpdate, SubscriptionCreate
 
@@ -140,6 +142,41 @@ def add_read_history(db: Session, user_id: int, news_id: int) -> bool:
     return True
 
 
+def bulk_add_read_history(db: Session, events: Iterable[Tuple[int, int, datetime]]) -> int:
+    """
+    Insert (user_id, news_id, read_at) events into the read history in one
+    statement, skipping pairs already recorded and unknown users or news.
+    Returns the number of rows inserted.
+    """
+    first_reads: Dict[Tuple[int, int], datetime] = {}
+    for user_id, news_id, read_at in events:
+        key = (user_id, news_id)
+        if key not in first_reads or read_at < first_reads[key]:
+            first_reads[key] = read_at
+    if not first_reads:
+        return 0
+
+    user_ids = {user_id for user_id, _ in first_reads}
+    news_ids = {news_id for _, news_id in first_reads}
+    known_users = {row.id for row in db.query(User.id).filter(User.id.in_(user_ids))}
+    known_news = {row.id for row in db.query(News.id).filter(News.id.in_(news_ids))}
+    existing = {
+        tuple(row) for row in db.query(user_read_history.c.user_id, user_read_history.c.news_id).filter(
+            tuple_(user_read_history.c.user_id, user_read_history.c.news_id).in_(list(first_reads))
+        )
+    }
+
+    rows = [
+        {"user_id": user_id, "news_id": news_id, "created_at": read_at}
+        for (user_id, news_id), read_at in first_reads.items()
+        if user_id in known_users and news_id in known_news and (user_id, news_id) not in existing
+    ]
+    if rows:
+        db.execute(user_read_history.insert(), rows)
+    db.commit()
+    return len(rows)
+
+
 def get_read_history(db: Session, user_id: int, skip: int = 0, limit: int = 20) -> List[News]:
     db_user = get_user(db, user_id)
     if not db_user:
@@ -1,7 +1,11 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import QueuePool
-import logging
 
 from app.core.config import settings
 from app.db.base_class import Base
@@ -31,6 +35,34 @@ engine = create_engine(
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 异步代码中的数据库操作在专用线程池中执行，避免阻塞事件循环
+# 线程数与连接池大小一致，避免线程空等连接
+_db_executor = ThreadPoolExecutor(max_workers=5, thread_name_prefix="db")
+
+T = TypeVar("T")
+
+
+async def run_db(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    在数据库线程池中执行同步数据库操作
+
+    func的第一个参数为新建的会话，调用结束后会话自动关闭。
+    返回的ORM对象已脱离会话，需要在func内加载好要用的属性。
+
+    用法:
+        proxies = await run_db(lambda db: db.query(ProxyConfig).all())
+    """
+    def _call() -> T:
+        db = SessionLocal()
+        try:
+            return func(db, *args, **kwargs)
+        finally:
+            db.close()
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_db_executor, _call)
+
+
 # Dependency
 def get_db():
     db = SessionLocal()
@@ -0,0 +1,18 @@
+from typing import Callable, Optional
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+
+def dialect_insert(db: Session) -> Optional[Callable]:
+    """
+    返回会话所用数据库方言的insert()，支持 INSERT ... ON CONFLICT
+
+    目前只有PostgreSQL和SQLite支持，其他数据库返回None，调用方退回逐行插入或更新
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert
+    if dialect == "sqlite":
+        return sqlite.insert
+    return None
@@ -3,7 +3,7 @@ from app.models.news import News, news_tag
 from app.models.category import Category
 from app.models.tag import Tag
 from app.models.user import User, Subscription, user_favorite, user_read_history
-from app.models.source_stats import SourceStats, ApiCallType
+from app.models.source_stats import SourceStats, SourceStatsRollup, ApiCallType, RollupGranularity
 from app.models.proxy import ProxyConfig, ProxyProtocol, ProxyStatus
 
 # For Alembic to detect all models
@@ -13,6 +13,6 @@ __all__ = [
     "Category",
     "Tag",
     "User", "Subscription", "user_favorite", "user_read_history",
-    "SourceStats", "ApiCallType",
+    "SourceStats", "SourceStatsRollup", "ApiCallType", "RollupGranularity",
     "ProxyConfig", "ProxyProtocol", "ProxyStatus"
 ] 
\ No newline at end of file
@@ -1,7 +1,9 @@
 import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey, JSON, Table, UniqueConstraint
+from sqlalchemy import event, inspect
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey, JSON, Table, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 
+from app.core.search import build_search_tokens
 from app.db.session import Base
 
 
@@ -35,6 +37,9 @@ class News(Base):
     sentiment_score = Column(Float, nullable=True)
     cluster_id = Column(String(50), nullable=True)  # Cluster ID
     extra = Column(JSON, nullable=True)  # Extra information, such as icons, heat, etc.
+    content_hash = Column(String(40), nullable=True)  # Hash of the stored fields, used to skip unchanged upserts
+    # jieba-segmented title/summary; PostgreSQL derives the indexed search_vector column from it
+    search_tokens = Column(Text, nullable=True)
     
     # Relationships
     source = relationship("Source", back_populates="news")
@@ -44,4 +49,22 @@ class News(Base):
     __table_args__ = (
         # Only one record with the same original ID from the same source
         UniqueConstraint('source_id', 'original_id', name='uix_source_original'),
-    ) 
\ No newline at end of file
+        # Listing queries filter by source/category and order by published_at
+        Index('ix_news_source_published', 'source_id', 'published_at'),
+        Index('ix_news_category_published', 'category_id', 'published_at'),
+        # Trending queries filter on published_at and sort by view_count
+        Index('ix_news_published_view_count', 'published_at', 'view_count'),
+        Index('ix_news_cluster_id', 'cluster_id'),
+    )
+
+
+@event.listens_for(News, "before_insert")
+def _set_search_tokens_on_insert(mapper, connection, target):
+    target.search_tokens = build_search_tokens(target.title, target.summary)
+
+
+@event.listens_for(News, "before_update")
+def _set_search_tokens_on_update(mapper, connection, target):
+    state = inspect(target)
+    if state.attrs.title.history.has_changes() or state.attrs.summary.history.has_changes():
+        target.search_tokens = build_search_tokens(target.title, target.summary)
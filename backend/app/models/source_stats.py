@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, String, Enum as SQLEnum
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, String, Enum as SQLEnum, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from app.db.session import Base
 from datetime import datetime
@@ -8,6 +8,10 @@ class ApiCallType(str, Enum):
     internal = "internal"  # 内部调度任务访问
     external = "external"  # 外部API访问
 
+class RollupGranularity(str, Enum):
+    hour = "hour"
+    day = "day"
+
 class SourceStats(Base):
     """
     新闻源统计数据模型
@@ -30,4 +34,38 @@ class SourceStats(Base):
     api_type = Column(SQLEnum(ApiCallType), default=ApiCallType.internal, nullable=False)  # API调用类型
     
     # 关联关系
-    source = relationship("Source", back_populates="stats") 
\ No newline at end of file
+    source = relationship("Source", back_populates="stats")
+    
+    __table_args__ = (
+        # 按源和调用类型查询最新记录和时间范围
+        Index('ix_source_stats_source_type_created', 'source_id', 'api_type', 'created_at'),
+    )
+
+
+class SourceStatsRollup(Base):
+    """
+    新闻源统计数据的按小时/按天聚合
+    每写入一条source_stats记录时累加到对应的小时和天桶中，监控接口直接读取聚合结果
+    """
+    __tablename__ = "source_stats_rollups"
+
+    id = Column(Integer, primary_key=True)
+    source_id = Column(String, ForeignKey("sources.id"), nullable=False)
+    api_type = Column(String(16), nullable=False)  # API调用类型，取值同ApiCallType
+    granularity = Column(String(8), nullable=False)  # 聚合粒度，取值同RollupGranularity
+    bucket = Column(DateTime, nullable=False)  # 桶的起始时间（UTC）
+    
+    # 桶内各项指标的累加值
+    samples = Column(Integer, default=0, nullable=False)  # 统计记录数
+    total_requests = Column(Integer, default=0, nullable=False)  # 请求数之和
+    error_count = Column(Integer, default=0, nullable=False)  # 错误数之和
+    news_count = Column(Integer, default=0, nullable=False)  # 新闻数之和
+    response_time_sum = Column(Float, default=0.0, nullable=False)  # 平均响应时间之和
+    weighted_response_time_sum = Column(Float, default=0.0, nullable=False)  # 平均响应时间×请求数之和
+    weighted_success_sum = Column(Float, default=0.0, nullable=False)  # 成功率×请求数之和
+    
+    __table_args__ = (
+        UniqueConstraint('source_id', 'api_type', 'granularity', 'bucket', name='uix_source_stats_rollup'),
+        # 监控接口按粒度和时间范围读取所有源的聚合
+        Index('ix_source_stats_rollups_granularity_bucket', 'granularity', 'bucket'),
+    )
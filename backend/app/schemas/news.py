@@ -75,4 +75,10 @@ class NewsListItem(BaseModel):
     created_at: datetime
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+
+class NewsSearchResult(NewsListItem):
+    rank: Optional[float] = None
+    title_highlight: str
+    summary_highlight: Optional[str] = None 
\ No newline at end of file
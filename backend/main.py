@@ -137,6 +137,20 @@ def find_and_kill_chrome_processes():
         logger.error(f"查找和杀死Chrome进程时出错: {str(e)}")
         return 0
 
+def cleanup_chrome_processes(shutdown: bool = False) -> int:
+    """
+    清理Chrome进程
+
+    浏览器池启用时不按进程名清理整台机器的Chrome进程，以免杀掉本进程和工作进程中
+    正在租用或保持预热的浏览器；退出时只关闭本进程浏览器池中的浏览器
+    """
+    from worker.utils.browser_pool import browser_pool, browser_pool_enabled
+    if browser_pool_enabled():
+        if shutdown:
+            browser_pool.close_all()
+        return 0
+    return find_and_kill_chrome_processes()
+
 # 添加定期清理Chrome进程的函数
 async def schedule_chrome_process_cleanup():
     """定期清理Chrome进程"""
@@ -153,7 +167,7 @@ async def schedule_chrome_process_cleanup():
             logger.info(f"开始定期清理Chrome进程 [{now.strftime('%Y-%m-%d %H:%M:%S')}]")
             
             # 执行清理
-            chrome_count = find_and_kill_chrome_processes()
+            chrome_count = cleanup_chrome_processes()
             if chrome_count > 0:
                 logger.info(f"定期任务清理了 {chrome_count} 个Chrome相关进程")
             else:
@@ -360,7 +374,7 @@ async def startup_event():
     
     try:
         # 清理遗留的Chrome进程
-        chrome_count = find_and_kill_chrome_processes()
+        chrome_count = cleanup_chrome_processes()
         if chrome_count > 0:
             logger.info(f"已清理 {chrome_count} 个遗留的Chrome进程")
         
@@ -377,33 +391,24 @@ async def startup_event():
         stats_updater.update_interval = 300  # 设置为5分钟
         logger.info("已初始化源统计信息自动更新器 (更新间隔: 5分钟)")
         
-        # 获取所有可用的数据源
-        sources = source_provider.get_all_sources()
-        
-        # 收集所有源类型ID并排序
-        source_ids = sorted([source.source_id for source in sources])
-        
-        # 输出数据源类型列表
-        logger.info(f"加载了 {len(source_ids)} 个数据源:")
-        
-        # 按字母顺序排序并分组输出，每行10个
-        for i in range(0, len(source_ids), 10):
-            chunk = source_ids[i:i+10]
-            logger.info(", ".join(chunk))
-        
-        logger.info(f"已注册 {len(sources)} 个新闻源")
+        # 只有SOURCE_WARM_UP中的数据源在启动时创建，其余数据源在首次使用时创建
+        warm_ids = sorted(source_provider.sources.keys())
+        if warm_ids:
+            logger.info(f"预加载了 {len(warm_ids)} 个数据源: {', '.join(warm_ids)}")
+        else:
+            logger.info("未配置预加载数据源，所有数据源将在首次使用时创建")
         
         # 设置全局访问点
         # 注意: 这里使用app.state存储提供者，以便其他模块可以访问
         app.state.source_provider = source_provider
         
-        # 将source_provider中的所有源注册到source_manager中，确保API路由可以访问
+        # source_manager通过source_provider按需创建源，确保API路由可以访问
         from worker.sources.manager import source_manager
-        # 清空source_manager以避免重复
-        source_manager.sources.clear()
-        for source in sources:
-            source_manager.register_source(source)
-        logger.info(f"已将 {len(sources)} 个源从source_provider同步到source_manager")
+        source_manager.attach_provider(source_provider)
+        
+        # 输出适配器模块的导入耗时，便于分析启动耗时
+        from worker.sources.adapter_registry import adapter_registry
+        adapter_registry.log_import_report()
         
         # 启动定期清理Chrome进程的任务
         import asyncio
@@ -427,7 +432,16 @@ async def shutdown_event():
         # 禁用统计信息更新器，防止新的更新
         stats_updater.enabled = False
         logger.info("已禁用源统计信息自动更新器")
-        
+
+        # 写入尚未落库的代理使用统计
+        try:
+            from worker.utils.proxy_manager import proxy_manager
+            flushed = await proxy_manager.flush_proxy_stats()
+            if flushed:
+                logger.info(f"已写入 {flushed} 个代理的使用统计")
+        except Exception as e:
+            logger.error(f"写入代理使用统计时出错: {str(e)}")
+
         # 关闭可能的Redis连接
         try:
             from worker.cache import cache_manager
@@ -438,7 +452,7 @@ async def shutdown_event():
             logger.error(f"关闭缓存连接时出错: {str(e)}")
         
         # 清理所有Chrome进程
-        chrome_count = find_and_kill_chrome_processes()
+        chrome_count = cleanup_chrome_processes(shutdown=True)
         if chrome_count > 0:
             logger.info(f"已清理 {chrome_count} 个Chrome进程")
         
@@ -449,7 +463,7 @@ async def shutdown_event():
         logger.error(traceback.format_exc())
 
 # 注册退出处理函数
-atexit.register(lambda: find_and_kill_chrome_processes())
+atexit.register(lambda: cleanup_chrome_processes(shutdown=True))
 
 # 设置信号处理器
 def signal_handler(signum, frame):
@@ -458,7 +472,7 @@ def signal_handler(signum, frame):
     
     # 清理Chrome进程
     try:
-        find_and_kill_chrome_processes()
+        cleanup_chrome_processes(shutdown=True)
         logger.info("已清理Chrome进程")
     except Exception as e:
         logger.error(f"清理Chrome进程时出错: {str(e)}")
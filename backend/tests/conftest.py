@@ -0,0 +1,163 @@
+"""
+测试共用的夹具：同步Redis替身和内存SQLite数据库
+"""
+
+import time
+
+import pytest
+import redis
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+
+def _encode(value):
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode()
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        def command(*args, **kwargs):
+            self.calls.append((getattr(self.client, name), args, kwargs))
+            return self
+        return command
+
+    def execute(self):
+        return [method(*args, **kwargs) for method, args, kwargs in self.calls]
+
+
+class FakeRedis:
+    """实现测试用到的redis-py命令子集，返回值与redis-py一样是bytes"""
+
+    def __init__(self):
+        self.available = True
+        self.hashes = {}
+        self.strings = {}
+        self.streams = {}
+        self.sequence = 0
+
+    def _check(self):
+        if not self.available:
+            raise redis.ConnectionError("Redis不可用")
+
+    def pipeline(self, transaction=True):
+        self._check()
+        return FakePipeline(self)
+
+    def set(self, key, value, nx=False, ex=None):
+        self._check()
+        if nx and key in self.strings:
+            return None
+        self.strings[key] = _encode(value)
+        return True
+
+    def get(self, key):
+        self._check()
+        return self.strings.get(key)
+
+    def mget(self, keys):
+        self._check()
+        return [self.strings.get(key) for key in keys]
+
+    def incr(self, key):
+        self._check()
+        self.strings[key] = _encode(int(self.strings.get(key, 0)) + 1)
+        return int(self.strings[key])
+
+    def hincrby(self, key, field, amount):
+        self._check()
+        values = self.hashes.setdefault(key, {})
+        values[_encode(field)] = _encode(int(values.get(_encode(field), 0)) + amount)
+        return int(values[_encode(field)])
+
+    def hset(self, key, mapping):
+        self._check()
+        self.hashes.setdefault(key, {}).update({_encode(name): _encode(value) for name, value in mapping.items()})
+        return len(mapping)
+
+    def hget(self, key, field):
+        self._check()
+        return self.hashes.get(key, {}).get(_encode(field))
+
+    def hmget(self, key, fields):
+        return [self.hget(key, field) for field in fields]
+
+    def hgetall(self, key):
+        self._check()
+        return dict(self.hashes.get(key, {}))
+
+    def hdel(self, key, *fields):
+        self._check()
+        values = self.hashes.get(key, {})
+        removed = sum(values.pop(_encode(field), None) is not None for field in fields)
+        if key in self.hashes and not values:
+            del self.hashes[key]
+        return removed
+
+    def hlen(self, key):
+        self._check()
+        return len(self.hashes.get(key, {}))
+
+    def exists(self, key):
+        self._check()
+        return int(key in self.hashes or key in self.strings)
+
+    def rename(self, src, dst):
+        self._check()
+        if src not in self.hashes:
+            raise redis.ResponseError("no such key")
+        self.hashes[dst] = self.hashes.pop(src)
+
+    def delete(self, key):
+        self._check()
+        found = self.hashes.pop(key, None) is not None
+        found = self.strings.pop(key, None) is not None or found
+        return int(found)
+
+    def expire(self, key, ttl):
+        self._check()
+        return int(key in self.hashes or key in self.strings)
+
+    def xadd(self, key, fields, maxlen=None, approximate=True):
+        self._check()
+        self.sequence += 1
+        entry_id = f"{int(time.time() * 1000)}-{self.sequence}".encode()
+        self.streams.setdefault(key, []).append(
+            (entry_id, {_encode(k): _encode(v) for k, v in fields.items()})
+        )
+        return entry_id
+
+    def xrange(self, key, count=None):
+        self._check()
+        return list(self.streams.get(key, []))[:count]
+
+    def xdel(self, key, *entry_ids):
+        self._check()
+        entries = self.streams.get(key, [])
+        self.streams[key] = [entry for entry in entries if entry[0] not in entry_ids]
+        return len(entries) - len(self.streams[key])
+
+    def xlen(self, key):
+        self._check()
+        return len(self.streams.get(key, []))
+
+
+@pytest.fixture
+def fake_redis():
+    """内存中的同步Redis替身，把available设为False可模拟Redis不可用"""
+    return FakeRedis()
+
+
+@pytest.fixture
+def sqlite_engine():
+    """内存SQLite数据库，连接在线程之间共享，测试结束后释放"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    try:
+        yield engine
+    finally:
+        engine.dispose()
@@ -0,0 +1,131 @@
+"""
+适配器延迟加载测试
+"""
+
+import os
+import sys
+import subprocess
+
+import pytest
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from worker.sources.adapter_registry import AdapterRegistry, adapter_registry
+from worker.sources.factory import NewsSourceFactory
+from worker.sources.provider import DefaultNewsSourceProvider
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+class DummySource:
+    def __init__(self, source_id="dummy", category="test", **kwargs):
+        self.source_id = source_id
+        self.name = source_id
+        self.category = category
+        self.kwargs = kwargs
+
+
+# 导入工厂不会导入任何站点模块和selenium
+def test_factory_import_is_lazy():
+    code = (
+        "import sys\n"
+        "import worker.sources.factory\n"
+        "import worker.sources.sites\n"
+        "loaded = [m for m in sys.modules if m.startswith('worker.sources.sites.') or m == 'selenium']\n"
+        "print(','.join(loaded))\n"
+    )
+    env = dict(os.environ, DATABASE_URL="sqlite://", SECRET_KEY="x")
+    result = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
+
+
+# 首次创建时导入模块并记录耗时，默认参数可被覆盖
+def test_registry_imports_on_first_use(tmp_path, monkeypatch):
+    (tmp_path / "lazy_adapter_module.py").write_text(
+        "class LazySource:\n"
+        "    def __init__(self, **kwargs):\n"
+        "        self.kwargs = kwargs\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "lazy_adapter_module", raising=False)
+
+    registry = AdapterRegistry()
+    registry.register("lazy", "lazy_adapter_module", "LazySource", country="CN", name="默认")
+    assert "lazy_adapter_module" not in sys.modules
+
+    source = registry.create("lazy", name="覆盖")
+    assert source.kwargs == {"country": "CN", "name": "覆盖"}
+    assert [entry["module"] for entry in registry.get_import_report()] == ["lazy_adapter_module"]
+
+    assert registry.create("missing") is None
+    assert registry.warm_up(["lazy", "missing"]) == ["lazy"]
+
+
+# 工厂通过注册表创建内置的数据源
+def test_factory_creates_registered_sources():
+    source = NewsSourceFactory.create_source("techcrunch")
+    assert source.source_id == "techcrunch"
+    assert NewsSourceFactory.create_source("no-such-source") is None
+    assert set(NewsSourceFactory.get_available_sources()) <= set(adapter_registry.source_types())
+
+
+@pytest.fixture
+def fake_factory(monkeypatch):
+    created = []
+
+    def create_source(source_type, **kwargs):
+        if source_type == "broken":
+            raise RuntimeError("boom")
+        created.append(source_type)
+        return DummySource(source_id=source_type, **kwargs)
+
+    monkeypatch.setattr(NewsSourceFactory, "create_source", staticmethod(create_source))
+    monkeypatch.setattr(NewsSourceFactory, "get_available_sources", staticmethod(lambda: ["a", "b", "broken"]))
+    monkeypatch.setattr(DefaultNewsSourceProvider, "_load_sources_from_db", lambda self: [{"source_id": "b", "url": "u"}])
+    return created
+
+
+# 提供者只在首次获取时创建数据源
+def test_provider_creates_sources_on_demand(fake_factory):
+    provider = DefaultNewsSourceProvider(warm_up=[])
+    assert fake_factory == []
+
+    assert provider.get_source("a").source_id == "a"
+    assert fake_factory == ["a"]
+    assert provider.get_source("a") is provider.get_source("a")
+
+    assert provider.get_source("b").kwargs == {"config": {"source_id": "b", "url": "u"}}
+    assert provider.get_source("broken") is None
+
+    assert sorted(source.source_id for source in provider.get_all_sources()) == ["a", "b"]
+    assert fake_factory == ["a", "b"]
+
+
+# 预加载列表中的数据源在初始化时创建，注销的数据源不会被重新创建
+def test_provider_warm_up_and_unregister(fake_factory):
+    provider = DefaultNewsSourceProvider(warm_up=["b"])
+    assert fake_factory == ["b"]
+
+    provider.unregister_source("b")
+    assert provider.get_source("b") is None
+    assert [source.source_id for source in provider.get_all_sources()] == ["a"]
+
+
+# 源管理器通过提供者按需创建源，ensure_sources只在首次调用时创建全部源
+def test_manager_resolves_sources_through_provider(fake_factory):
+    from worker.sources.manager import NewsSourceManager
+
+    provider = DefaultNewsSourceProvider(warm_up=["a"])
+    manager = NewsSourceManager()
+    manager.attach_provider(provider)
+    assert [source.source_id for source in manager.get_all_sources()] == ["a"]
+    assert fake_factory == ["a"]
+
+    assert manager.get_or_create_source("b") is provider.get_source("b")
+    assert manager.get_or_create_source("b").kwargs == {"config": {"source_id": "b", "url": "u"}}
+    assert fake_factory == ["a", "b"]
+
+    assert sorted(source.source_id for source in manager.ensure_sources()) == ["a", "b"]
+    manager.ensure_sources()
+    assert fake_factory == ["a", "b"]
@@ -0,0 +1,145 @@
+"""
+自适应调度器并发调度测试
+"""
+
+import os
+import sys
+import asyncio
+
+import pytest
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from worker.scheduler import AdaptiveScheduler
+
+
+class Tracker:
+    """记录同时进行的抓取数量"""
+
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+
+
+class FakeSource:
+    def __init__(self, source_id, delay=0.0, update_interval=0.05, url=None, fail=False, tracker=None):
+        self.source_id = source_id
+        self.name = source_id
+        self.category = "test"
+        self.update_interval = update_interval
+        self.url = url
+        self.delay = delay
+        self.fail = fail
+        self.tracker = tracker or Tracker()
+        self.fetch_count = 0
+
+    async def get_news(self, force_update=False):
+        self.tracker.active += 1
+        self.tracker.max_active = max(self.tracker.max_active, self.tracker.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail:
+                raise RuntimeError("fetch failed")
+            self.fetch_count += 1
+            return []
+        finally:
+            self.tracker.active -= 1
+
+    def update_metrics(self, news_count, success=True, error=None):
+        pass
+
+
+class FakeProvider:
+    def __init__(self, sources):
+        self.sources = {source.source_id: source for source in sources}
+
+    def get_all_sources(self):
+        return list(self.sources.values())
+
+    def get_source(self, source_id):
+        return self.sources.get(source_id)
+
+
+def _make_scheduler(sources, **kwargs):
+    return AdaptiveScheduler(FakeProvider(sources), cache_manager=None, enable_adaptive=False, **kwargs)
+
+
+# 强制运行时所有数据源并发抓取
+@pytest.mark.asyncio
+async def test_run_once_fetches_concurrently():
+    sources = [FakeSource(f"s{i}", delay=0.2) for i in range(4)]
+    scheduler = _make_scheduler(sources)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    results = await scheduler.run_once(force=True)
+
+    assert loop.time() - start < 0.6
+    assert results == {f"s{i}": True for i in range(4)}
+
+
+# 只抓取到期的数据源，失败的数据源记为False
+@pytest.mark.asyncio
+async def test_run_once_only_fetches_due_sources():
+    ok = FakeSource("ok", update_interval=3600)
+    bad = FakeSource("bad", update_interval=3600, fail=True)
+    scheduler = _make_scheduler([ok, bad])
+
+    assert await scheduler.run_once() == {"ok": True, "bad": False}
+    assert await scheduler.run_once() == {}
+    assert ok.fetch_count == 1
+
+
+# 同一主机的并发数受限，不同主机不受影响
+@pytest.mark.asyncio
+async def test_per_host_limit():
+    tracker = Tracker()
+    same_host = [FakeSource(f"a{i}", delay=0.05, url=f"https://a.example.com/{i}", tracker=tracker) for i in range(3)]
+    other = FakeSource("b", delay=0.05, url="https://b.example.com/")
+    scheduler = _make_scheduler(same_host + [other], max_per_host=1)
+
+    results = await scheduler.run_once(force=True)
+    assert all(results.values())
+    assert tracker.max_active == 1
+
+
+# 全局并发数受限
+@pytest.mark.asyncio
+async def test_global_limit():
+    tracker = Tracker()
+    sources = [FakeSource(f"s{i}", delay=0.05, tracker=tracker) for i in range(5)]
+    scheduler = _make_scheduler(sources, max_concurrency=2)
+
+    results = await scheduler.run_once(force=True)
+    assert all(results.values())
+    assert tracker.max_active == 2
+
+
+# 慢数据源不阻塞快数据源的周期刷新
+@pytest.mark.asyncio
+async def test_slow_source_does_not_block_fast_source():
+    slow = FakeSource("slow", delay=1.0, update_interval=3600)
+    fast = FakeSource("fast", update_interval=0.05)
+    scheduler = _make_scheduler([slow, fast])
+
+    task = asyncio.create_task(scheduler.run_forever(check_interval=1))
+    await asyncio.sleep(0.5)
+    task.cancel()
+    await task
+
+    assert fast.fetch_count >= 4
+    assert slow.fetch_count == 0
+    assert not scheduler.running_tasks
+
+
+# 状态中包含所有数据源的下次抓取时间
+@pytest.mark.asyncio
+async def test_get_status_lists_sources():
+    scheduler = _make_scheduler([FakeSource("x", update_interval=60)])
+    await scheduler.run_once()
+
+    status = scheduler.get_status()
+    assert status["sources_count"] == 1
+    assert status["sources"][0]["next_fetch_time"] is not None
+    assert status["sources"][0]["is_running"] is False
@@ -0,0 +1,64 @@
+"""
+NewsAggregator 增量聚类测试
+"""
+
+import os
+import sys
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from worker.sources.aggregator import NewsAggregator
+from worker.sources.base import NewsItemModel
+
+
+def _make_news(index: int, title: str) -> NewsItemModel:
+    source_id = f"source_{index % 3}"
+    return NewsItemModel(id=str(index), title=title, source_id=source_id, extra={"source_id": source_id})
+
+
+TITLES = [
+    "苹果公司发布新款iPhone手机",
+    "美联储宣布加息25个基点",
+    "北京发布暴雨红色预警",
+]
+
+
+# 相同话题的新闻被分到同一个聚类
+def test_similar_news_grouped_into_clusters():
+    aggregator = NewsAggregator()
+    news_items = [_make_news(i, TITLES[i % 3]) for i in range(30)]
+
+    aggregator.add_news_batch(news_items)
+
+    assert len(aggregator.clusters) == 3
+    assert sorted(len(cluster.related_news) + 1 for cluster in aggregator.clusters) == [10, 10, 10]
+
+
+# 跨批次时新新闻与已有聚类的质心比较，词表持续累积
+def test_later_batches_join_existing_clusters():
+    aggregator = NewsAggregator()
+    aggregator.batch_size = 4
+    aggregator.add_news_batch([_make_news(i, TITLES[i % 3]) for i in range(6)])
+    vocabulary_size = len(aggregator.vectorizer.vocabulary)
+
+    aggregator.add_news_batch([_make_news(i, TITLES[i % 3]) for i in range(6, 12)])
+    aggregator.add_news(_make_news(12, "周末体育赛事前瞻"))
+
+    assert len(aggregator.clusters) == 4
+    assert len(aggregator.vectorizer.vocabulary) > vocabulary_size
+    assert aggregator.vectorizer.n_docs == 13
+
+
+# 相似度计算不改变词表和文档频率
+def test_calculate_similarity_does_not_fit():
+    aggregator = NewsAggregator()
+    aggregator.add_news_batch([_make_news(i, TITLES[i % 3]) for i in range(3)])
+    n_docs = aggregator.vectorizer.n_docs
+
+    same = aggregator._calculate_similarity(_make_news(0, TITLES[0]), _make_news(1, TITLES[0]))
+    different = aggregator._calculate_similarity(_make_news(0, TITLES[0]), _make_news(1, TITLES[1]))
+
+    assert same > 0.99
+    assert different < 0.1
+    assert aggregator.vectorizer.n_docs == n_docs
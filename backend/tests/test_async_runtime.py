@@ -0,0 +1,113 @@
+"""
+Celery工作进程常驻事件循环测试
+"""
+
+import os
+import sys
+import asyncio
+import concurrent.futures
+
+import pytest
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from worker.utils.async_runtime import AsyncRuntime
+from worker.utils.http_transport import http_transport
+
+
+@pytest.fixture
+def runtime():
+    runtime = AsyncRuntime(name="test-runtime")
+    runtime.start()
+    try:
+        yield runtime
+    finally:
+        runtime.stop()
+
+
+async def _current_loop():
+    return asyncio.get_running_loop()
+
+
+async def _shared_session():
+    return http_transport.get_session()
+
+
+# 多次提交的协程运行在同一个事件循环上，共享HTTP会话跨任务复用
+def test_tasks_share_loop_and_http_session(runtime):
+    first_loop = runtime.run(_current_loop())
+    assert runtime.run(_current_loop()) is first_loop is runtime.loop
+
+    session = runtime.run(_shared_session())
+    assert runtime.run(_shared_session()) is session
+    assert runtime.get_stats()["submitted"] == 4
+
+
+# 协程中的异常原样抛给调用方
+def test_exceptions_propagate(runtime):
+    async def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        runtime.run(fail())
+    assert runtime.stats["failed"] == 1
+    assert runtime.run(_current_loop()) is runtime.loop
+
+
+# 等待超时时取消协程
+def test_timeout_cancels_coroutine(runtime):
+    state = {"cancelled": False}
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            state["cancelled"] = True
+            raise
+
+    with pytest.raises(concurrent.futures.TimeoutError):
+        runtime.run(slow(), timeout=0.1)
+
+    runtime.run(asyncio.sleep(0.05))
+    assert state["cancelled"]
+    assert runtime.stats["cancelled"] == 1
+
+
+# 停止时关闭共享HTTP会话和事件循环
+def test_stop_closes_loop_and_session():
+    runtime = AsyncRuntime(name="test-runtime")
+    loop = runtime.start()
+    session = runtime.run(_shared_session())
+
+    runtime.stop()
+    assert session.closed
+    assert loop.is_closed()
+    assert not runtime.is_running
+
+
+# run_async在常驻事件循环运行时把协程提交给它
+def test_run_async_uses_runtime(runtime, monkeypatch):
+    import worker.asyncio_fix.auto_fix as auto_fix
+    monkeypatch.setattr(auto_fix, "async_runtime", runtime)
+
+    assert auto_fix.run_async(_current_loop()) is runtime.loop
+
+
+# 新闻任务的协程提交到常驻事件循环，不再为每个任务创建新循环
+def test_news_tasks_run_on_runtime(runtime, monkeypatch):
+    import worker.tasks.news as news_tasks
+
+    loops = []
+
+    async def fake_schedule():
+        loops.append(asyncio.get_running_loop())
+        return {"status": "success"}
+
+    monkeypatch.setattr(news_tasks, "async_runtime", runtime)
+    monkeypatch.setattr(news_tasks, "_async_schedule_source_updates", fake_schedule)
+    monkeypatch.setattr(news_tasks, "cleanup_chrome_processes", lambda: 0)
+
+    assert news_tasks.schedule_source_updates.run() == {"status": "success"}
+    assert news_tasks.schedule_source_updates.run() == {"status": "success"}
+    assert loops == [runtime.loop, runtime.loop]
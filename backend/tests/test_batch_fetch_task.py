@@ -0,0 +1,167 @@
+"""
+批量抓取任务测试
+"""
+
+import os
+import sys
+import asyncio
+
+import pytest
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import worker.tasks.news as news_tasks
+
+
+class FakeSource:
+    def __init__(self, source_id, items=1, delay=0.0, fail=False, due=True):
+        self.source_id = source_id
+        self.items = items
+        self.delay = delay
+        self.fail = fail
+        self.due = due
+
+    def should_update(self):
+        return self.due
+
+
+class FakeProvider:
+    def __init__(self, sources):
+        self.sources = {source.source_id: source for source in sources}
+
+    def get_source(self, source_id):
+        return self.sources.get(source_id)
+
+    def get_all_sources(self):
+        return list(self.sources.values())
+
+
+@pytest.fixture
+def batch_env(monkeypatch):
+    state = {"active": 0, "max_active": 0, "saves": [], "marked": []}
+
+    async def fake_fetch(source):
+        state["active"] += 1
+        state["max_active"] = max(state["max_active"], state["active"])
+        try:
+            await asyncio.sleep(source.delay)
+            if source.fail:
+                raise RuntimeError(f"Source {source.source_id} failed")
+            return [f"{source.source_id}-{i}" for i in range(source.items)]
+        finally:
+            state["active"] -= 1
+
+    def fake_save(items, db=None):
+        if any(item in state["bad_items"] for item in items):
+            raise RuntimeError("数据库写入失败")
+        state["saves"].append(list(items))
+        return {"inserted": len(items), "updated": 0, "unchanged": 0}
+
+    async def fake_run_db(func, *args, **kwargs):
+        return func(None, *args, **kwargs)
+
+    state["bad_items"] = set()
+    monkeypatch.setattr(news_tasks, "_fetch_source_news", fake_fetch)
+    monkeypatch.setattr(news_tasks, "_bulk_save_news", fake_save)
+    monkeypatch.setattr(news_tasks, "_mark_sources_updated", lambda ids, db=None: state["marked"].append(list(ids)))
+    monkeypatch.setattr(news_tasks, "run_db", fake_run_db)
+
+    def use_sources(*sources):
+        monkeypatch.setattr(news_tasks, "source_provider", FakeProvider(sources))
+
+    state["use_sources"] = use_sources
+    return state
+
+
+# 每个源的结果汇总在一个返回值中，每个源的新闻分别写入
+@pytest.mark.asyncio
+async def test_batch_reports_outcomes_and_saves_per_source(batch_env):
+    batch_env["use_sources"](FakeSource("a", items=2), FakeSource("b", fail=True), FakeSource("c", items=3))
+
+    result = await news_tasks._async_fetch_sources_batch(["a", "b", "c", "missing", "a"], max_concurrency=4)
+
+    assert result["status"] == "partial_success"
+    assert result["total_news"] == 5
+    assert {k: v["status"] for k, v in result["sources"].items()} == {
+        "a": "success", "b": "error", "c": "success", "missing": "not_found"
+    }
+    assert result["sources"]["c"]["count"] == 3
+    assert sorted(len(items) for items in batch_env["saves"]) == [2, 3]
+    assert result["saved"]["inserted"] == 5
+    assert sorted(batch_env["marked"][0]) == ["a", "c"]
+
+
+# 一个源保存失败只影响该源，全部保存失败时报告error
+@pytest.mark.asyncio
+async def test_batch_save_failure_is_per_source(batch_env):
+    batch_env["use_sources"](FakeSource("a", items=2), FakeSource("b", items=1))
+    batch_env["bad_items"].add("b-0")
+
+    result = await news_tasks._async_fetch_sources_batch(["a", "b"], max_concurrency=2)
+
+    assert result["status"] == "partial_success"
+    assert result["sources"]["a"]["status"] == "success"
+    assert result["sources"]["b"]["status"] == "error"
+    assert batch_env["saves"] == [["a-0", "a-1"]]
+    assert batch_env["marked"] == [["a"]]
+
+    batch_env["bad_items"].add("a-0")
+    result = await news_tasks._async_fetch_sources_batch(["a", "b"], max_concurrency=2)
+
+    assert result["status"] == "error"
+
+
+# 同时抓取的源数量不超过并发预算
+@pytest.mark.asyncio
+async def test_batch_respects_concurrency_budget(batch_env):
+    batch_env["use_sources"](*[FakeSource(f"s{i}", delay=0.05) for i in range(6)])
+
+    result = await news_tasks._async_fetch_sources_batch([f"s{i}" for i in range(6)], max_concurrency=2)
+
+    assert result["status"] == "success"
+    assert batch_env["max_active"] == 2
+
+
+# 单个源超时不影响其他源
+@pytest.mark.asyncio
+async def test_batch_source_timeout(batch_env, monkeypatch):
+    monkeypatch.setattr(news_tasks, "FETCH_SOURCE_TIMEOUT", 0.05)
+    batch_env["use_sources"](FakeSource("slow", delay=1), FakeSource("fast"))
+
+    result = await news_tasks._async_fetch_sources_batch(["slow", "fast"], max_concurrency=2)
+
+    assert result["sources"]["slow"]["status"] == "error"
+    assert result["sources"]["fast"]["status"] == "success"
+
+
+# 调度任务按批次发送，而不是每个源一个任务
+@pytest.mark.asyncio
+async def test_schedule_sends_batches(batch_env, monkeypatch):
+    batch_env["use_sources"](*[FakeSource(f"s{i}", due=i != 0) for i in range(6)])
+    monkeypatch.setattr(news_tasks, "FETCH_BATCH_SIZE", 2)
+    sent = []
+    monkeypatch.setattr(news_tasks.celery_app, "send_task", lambda name, args: sent.append((name, args)))
+
+    result = await news_tasks._async_schedule_source_updates()
+
+    assert result["batches"] == 3
+    assert sent == [
+        ("news.fetch_sources_batch", [["s1", "s2"]]),
+        ("news.fetch_sources_batch", [["s3", "s4"]]),
+        ("news.fetch_sources_batch", [["s5"]]),
+    ]
+
+
+# 浏览器池启用时任务结束后不按进程名清理Chrome，以免杀掉池中保持预热的浏览器
+def test_chrome_cleanup_skipped_when_pool_enabled(monkeypatch):
+    import psutil
+    from worker.utils import browser_pool as browser_pool_module
+
+    def fail_process_iter(*args, **kwargs):
+        raise AssertionError("不应扫描Chrome进程")
+
+    monkeypatch.setattr(browser_pool_module, "browser_pool_enabled", lambda: True)
+    monkeypatch.setattr(psutil, "process_iter", fail_process_iter)
+
+    assert news_tasks.cleanup_chrome_processes() == 0
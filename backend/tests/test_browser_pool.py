@@ -0,0 +1,149 @@
+"""
+共享浏览器池测试
+"""
+
+import os
+import sys
+import asyncio
+import itertools
+
+import pytest
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from worker.utils import browser_pool as browser_pool_module
+from worker.utils.browser_pool import BrowserPool, BrowserPoolMixin, BrowserPoolTimeout
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        if self.driver.crashed or handle not in self.driver.window_handles:
+            raise RuntimeError("no such window")
+        self.driver.current_window_handle = handle
+
+    def new_window(self, kind):
+        handle = f"tab-{next(self.driver.counter)}"
+        self.driver.window_handles.append(handle)
+        self.driver.current_window_handle = handle
+
+
+class FakeDriver:
+    def __init__(self):
+        self.counter = itertools.count()
+        self.window_handles = ["base"]
+        self.current_window_handle = "base"
+        self.switch_to = FakeSwitchTo(self)
+        self.crashed = False
+        self.quit_called = False
+        self.cdp_commands = []
+
+    def close(self):
+        self.window_handles.remove(self.current_window_handle)
+
+    def quit(self):
+        self.quit_called = True
+
+    def set_page_load_timeout(self, timeout):
+        pass
+
+    def set_script_timeout(self, timeout):
+        pass
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp_commands.append(cmd)
+
+
+def _make_pool(**kwargs):
+    drivers = []
+
+    def factory(user_data_dir):
+        driver = FakeDriver()
+        drivers.append(driver)
+        return driver
+
+    return BrowserPool(driver_factory=factory, **kwargs), drivers
+
+
+# 连续租用复用同一个浏览器，归还时关闭标签页并清除Cookie
+@pytest.mark.asyncio
+async def test_browser_is_reused_with_fresh_tab():
+    pool, drivers = _make_pool(max_size=2)
+    async with pool.lease(user_agent="UA") as driver:
+        assert driver.current_window_handle != "base"
+    async with pool.lease() as driver:
+        pass
+
+    assert len(drivers) == 1
+    assert drivers[0].window_handles == ["base"]
+    assert "Network.clearBrowserCookies" in drivers[0].cdp_commands
+    assert pool.get_stats()["leases"] == 2
+
+
+# 达到最大使用次数后浏览器退役重建
+@pytest.mark.asyncio
+async def test_browser_recycled_after_max_uses():
+    pool, drivers = _make_pool(max_size=1, max_uses=2)
+    for _ in range(3):
+        async with pool.lease():
+            pass
+
+    assert len(drivers) == 2
+    assert drivers[0].quit_called
+    assert pool.get_stats()["size"] == 1
+
+
+# 池满时排队等待，超时抛出BrowserPoolTimeout，归还后等待者获得浏览器
+@pytest.mark.asyncio
+async def test_acquire_waits_and_times_out():
+    pool, drivers = _make_pool(max_size=1)
+    first = await pool.acquire()
+
+    with pytest.raises(BrowserPoolTimeout):
+        await pool.acquire(timeout=0.2)
+
+    waiter = asyncio.ensure_future(pool.acquire(timeout=5))
+    await asyncio.sleep(0.15)
+    assert not waiter.done()
+    await pool.release(first)
+    second = await waiter
+
+    assert second is first
+    assert len(drivers) == 1
+    await pool.release(second)
+    assert pool.get_stats()["waiting"] == 0
+
+
+# 健康检查失败的浏览器被替换
+@pytest.mark.asyncio
+async def test_unhealthy_browser_replaced():
+    pool, drivers = _make_pool(max_size=1)
+    async with pool.lease():
+        pass
+    drivers[0].crashed = True
+
+    async with pool.lease() as driver:
+        assert driver is drivers[1]
+
+    assert drivers[0].quit_called
+    assert pool.get_stats()["size"] == 1
+
+
+# BROWSER_POOL_SIZE为0时数据源不使用浏览器池，自行创建WebDriver
+def test_mixin_skips_disabled_pool(monkeypatch):
+    class Source(BrowserPoolMixin):
+        config = {}
+
+    monkeypatch.setattr(browser_pool_module, "HAVE_SELENIUM", True)
+    monkeypatch.setattr(browser_pool_module.settings, "browser_pool_size", 0)
+    assert not browser_pool_module.browser_pool_enabled()
+    assert not Source().use_browser_pool
+
+    monkeypatch.setattr(browser_pool_module.settings, "browser_pool_size", 2)
+    assert Source().use_browser_pool
+
+    Source.config = {"use_browser_pool": False}
+    assert not Source().use_browser_pool
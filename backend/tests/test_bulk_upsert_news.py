@@ -0,0 +1,124 @@
+"""
+新闻批量写入测试
+"""
+
+import os
+import sys
+import datetime
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models import News
+from app.crud.news import bulk_upsert_news
+
+
+@pytest.fixture
+def db(sqlite_engine):
+    News.__table__.create(sqlite_engine)
+    session = sessionmaker(bind=sqlite_engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def _make_row(original_id: str, title: str):
+    return {
+        "source_id": "test",
+        "original_id": original_id,
+        "title": title,
+        "url": f"https://example.com/{original_id}",
+        "content": None,
+        "summary": f"{title} 摘要",
+        "image_url": None,
+        "published_at": datetime.datetime(2024, 1, 1, 8, 0),
+        "category_id": None,
+    }
+
+
+# 首次写入全部为新增
+def test_insert_new_rows(db):
+    result = bulk_upsert_news(db, [_make_row(str(i), f"新闻 {i}") for i in range(5)])
+
+    assert result == {"inserted": 5, "updated": 0, "unchanged": 0, "failed": []}
+    assert db.query(News).count() == 5
+
+
+# 内容未变化的新闻被跳过，变化的新闻被更新
+def test_skip_unchanged_and_update_changed(db):
+    bulk_upsert_news(db, [_make_row("1", "旧标题"), _make_row("2", "不变")])
+    before = db.query(News).filter(News.original_id == "2").one().updated_at
+
+    result = bulk_upsert_news(db, [_make_row("1", "新标题"), _make_row("2", "不变"), _make_row("3", "新增")])
+
+    assert result == {"inserted": 1, "updated": 1, "unchanged": 1, "failed": []}
+    db.expire_all()
+    assert db.query(News).filter(News.original_id == "1").one().title == "新标题"
+    assert db.query(News).filter(News.original_id == "2").one().updated_at == before
+    assert db.query(News).count() == 3
+
+
+# 同一批次内重复的新闻只写入最后一条，分块写入结果一致
+def test_duplicates_and_chunking(db):
+    rows = [_make_row(str(i), f"新闻 {i}") for i in range(7)] + [_make_row("0", "重复")]
+
+    result = bulk_upsert_news(db, rows, chunk_size=3)
+
+    assert result["inserted"] == 7
+    assert db.query(News).filter(News.original_id == "0").one().title == "重复"
+
+
+# 不支持 ON CONFLICT 的数据库退回逐行插入和更新
+def test_fallback_without_on_conflict(db, monkeypatch):
+    import app.crud.news as news_crud
+    monkeypatch.setattr(news_crud, "dialect_insert", lambda session: None)
+
+    bulk_upsert_news(db, [_make_row("1", "旧标题"), _make_row("2", "不变")])
+    result = bulk_upsert_news(db, [_make_row("1", "新标题"), _make_row("2", "不变"), _make_row("3", "新增")])
+
+    assert result == {"inserted": 1, "updated": 1, "unchanged": 1, "failed": []}
+    db.expire_all()
+    assert db.query(News).filter(News.original_id == "1").one().title == "新标题"
+    assert db.query(News).count() == 3
+
+
+# 分块写入失败时逐行重试，只丢弃数据库拒绝的行
+def test_bad_row_only_drops_itself(db):
+    bad = _make_row("2", "坏数据")
+    bad["title"] = None
+    rows = [_make_row("1", "新闻 1"), bad, _make_row("3", "新闻 3")]
+
+    result = bulk_upsert_news(db, rows)
+
+    assert result["inserted"] == 2
+    assert result["failed"] == [("test", "2")]
+    assert sorted(n.original_id for n in db.query(News)) == ["1", "3"]
+
+
+# 并发写入已保存相同内容时，ON CONFLICT 的条件跳过更新，不计为更新
+@pytest.mark.parametrize("on_conflict", [True, False])
+def test_concurrently_stored_row_counts_as_unchanged(db, monkeypatch, on_conflict):
+    import app.crud.news as news_crud
+    if not on_conflict:
+        monkeypatch.setattr(news_crud, "dialect_insert", lambda session: None)
+
+    bulk_upsert_news(db, [_make_row("1", "旧标题")])
+
+    write_news_rows = news_crud._write_news_rows
+
+    def concurrent_write(session, insert, rows, existing, now):
+        # 模拟另一个写入方在读取现有哈希之后抢先写入了同样的内容
+        for row in rows:
+            session.query(News).filter(News.original_id == row["original_id"]).update(
+                {"title": row["title"], "content_hash": row["content_hash"]}, synchronize_session=False
+            )
+        return write_news_rows(session, insert, rows, existing, now)
+
+    monkeypatch.setattr(news_crud, "_write_news_rows", concurrent_write)
+    result = bulk_upsert_news(db, [_make_row("1", "新标题")])
+
+    assert result == {"inserted": 0, "updated": 0, "unchanged": 1, "failed": []}
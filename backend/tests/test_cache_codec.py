@@ -0,0 +1,96 @@
+"""
+缓存序列化模块测试
+"""
+
+import os
+import sys
+import pickle
+import datetime
+
+import pytest
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from worker.sources.base import NewsItemModel
+from worker.utils.cache_codec import (
+    CacheSerializer, MsgpackSerializer, CODEC_VERSION, COMPRESSION_NONE, HAVE_MSGPACK
+)
+
+pytestmark = pytest.mark.skipif(not HAVE_MSGPACK, reason="msgpack未安装")
+
+
+def _make_news(count: int):
+    published = datetime.datetime(2024, 1, 1, 8, 30)
+    return [
+        NewsItemModel(
+            id=str(i),
+            title=f"新闻 {i}",
+            url=f"https://example.com/{i}",
+            source_id="test",
+            published_at=published,
+            tags=["财经", "科技"],
+            extra={"rank": i, "is_top": i == 0}
+        )
+        for i in range(count)
+    ]
+
+
+# NewsItemModel列表往返后字段保持一致
+def test_news_items_round_trip():
+    serializer = MsgpackSerializer()
+    news = _make_news(3)
+
+    result = serializer.loads(serializer.dumps(news))
+
+    assert [item.to_dict() for item in result] == [item.to_dict() for item in news]
+    assert isinstance(result[0].published_at, datetime.datetime)
+
+
+# 小负载不压缩，大负载超过阈值后压缩
+def test_large_payload_is_compressed():
+    serializer = MsgpackSerializer(compress_threshold=1024)
+
+    small = serializer.dumps(_make_news(1))
+    large = serializer.dumps(_make_news(200))
+
+    assert small[0] == CODEC_VERSION
+    assert small[1] == COMPRESSION_NONE
+    assert large[1] != COMPRESSION_NONE
+    assert len(serializer.loads(large)) == 200
+
+
+# 旧的pickle缓存数据仍然可以读取
+def test_reads_legacy_pickle_payload():
+    serializer = MsgpackSerializer()
+    legacy = pickle.dumps({"sources": ["a", "b"]})
+
+    assert serializer.loads(legacy) == {"sources": ["a", "b"]}
+
+
+# 无法用msgpack编码的对象回退到pickle
+def test_unsupported_type_falls_back_to_pickle():
+    serializer = MsgpackSerializer()
+    payload = serializer.dumps(datetime.date(2024, 1, 1))
+
+    assert serializer.loads(payload) == datetime.date(2024, 1, 1)
+
+
+# 未知版本的数据直接报错，由调用方当作缓存未命中处理
+def test_unknown_version_raises():
+    serializer = MsgpackSerializer()
+
+    with pytest.raises(ValueError):
+        serializer.loads(bytes((99, COMPRESSION_NONE)) + b"\x90")
+
+
+# 序列化器接口不能直接实例化，子类必须实现dumps和loads
+def test_serializer_interface_is_abstract():
+    class DumpsOnly(CacheSerializer):
+        def dumps(self, data):
+            return b""
+
+    with pytest.raises(TypeError):
+        CacheSerializer()
+    with pytest.raises(TypeError):
+        DumpsOnly()
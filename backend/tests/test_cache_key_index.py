@@ -0,0 +1,243 @@
+"""
+缓存键索引、SCAN遍历和缓存元数据测试
+"""
+
+import os
+import sys
+import time
+import asyncio
+import fnmatch
+from types import SimpleNamespace
+
+import pytest
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from worker.cache import CacheManager
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def command(*args, **kwargs):
+            future = asyncio.get_running_loop().create_future()
+            self.calls.append((getattr(self.redis, name), args, kwargs, future))
+            return future
+        return command
+
+    async def execute(self):
+        self.redis.pipelines += 1
+        results = []
+        for method, args, kwargs, future in self.calls:
+            result = await method(*args, **kwargs)
+            future.set_result(result)
+            results.append(result)
+        return results
+
+
+class FakeRedis:
+    """实现测试用到的aioredis命令子集，没有KEYS命令"""
+
+    def __init__(self):
+        self.data = {}
+        self.expires = {}
+        self.zsets = {}
+        self.scan_calls = 0
+        self.pipelines = 0
+        self.get_calls = 0
+        self.mget_calls = 0
+
+    def _alive(self, key):
+        expire = self.expires.get(key)
+        if expire is not None and expire <= time.time():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return key in self.data
+
+    async def get(self, key):
+        self.get_calls += 1
+        return self.data.get(key) if self._alive(key) else None
+
+    async def mget(self, *keys):
+        self.mget_calls += 1
+        return [self.data.get(key) if self._alive(key) else None for key in keys]
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+        self.expires[key] = time.time() + ttl
+        return True
+
+    async def ttl(self, key):
+        if not self._alive(key):
+            return -2
+        return int(self.expires[key] - time.time())
+
+    async def delete(self, *keys):
+        return sum(1 for key in keys if self.data.pop(key, None) is not None)
+
+    async def unlink(self, *keys):
+        return await self.delete(*keys)
+
+    async def zadd(self, key, score, member):
+        self.zsets.setdefault(key, {})[member] = score
+        return 1
+
+    async def zrem(self, key, *members):
+        zset = self.zsets.get(key, {})
+        return sum(1 for member in members if zset.pop(member, None) is not None)
+
+    async def zremrangebyscore(self, key, min=float("-inf"), max=float("inf")):
+        zset = self.zsets.get(key, {})
+        expired = [member for member, score in zset.items() if min <= score <= max]
+        for member in expired:
+            del zset[member]
+        return len(expired)
+
+    async def zrange(self, key, start=0, stop=-1, encoding=None):
+        members = sorted(self.zsets.get(key, {}), key=lambda m: self.zsets[key][m])
+        return members[start:None if stop == -1 else stop + 1]
+
+    async def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+
+    async def dbsize(self):
+        return len([key for key in list(self.data) if self._alive(key)]) + len(self.zsets)
+
+    async def info(self, section=None):
+        return {"used_memory_human": "1M"}
+
+    async def iscan(self, match="*", count=None):
+        # 模拟SCAN分批返回
+        self.scan_calls += 1
+        for key in sorted(self.data):
+            if self._alive(key) and fnmatch.fnmatchcase(key, match):
+                await asyncio.sleep(0)
+                yield key.encode()
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+async def _make_manager(**kwargs):
+    manager = CacheManager(enable_memory_cache=False, **kwargs)
+    manager.redis = FakeRedis()
+    manager.initialized = True
+    return manager
+
+
+# 写入和删除时维护缓存键索引
+@pytest.mark.asyncio
+async def test_set_and_delete_maintain_index():
+    manager = await _make_manager()
+    await manager.set("source:a", [1], 60)
+    await manager.set("source:b", [2], 60)
+    await manager.set("other:c", [3], 60)
+
+    assert await manager.indexed_keys("source:") == ["source:a", "source:b"]
+
+    await manager.delete("source:a")
+    assert await manager.indexed_keys("source:") == ["source:b"]
+    assert "source:a" not in manager.redis.data
+
+
+# 过期的键会从索引中移除
+@pytest.mark.asyncio
+async def test_expired_keys_leave_index():
+    manager = await _make_manager()
+    await manager.set("source:a", [1], 60)
+    await manager.set("source:b", [2], 60)
+    manager.redis.zsets[manager.key_index]["source:a"] = time.time() - 1
+
+    assert await manager.indexed_keys() == ["source:b"]
+    stats = await manager.get_stats()
+    assert stats["redis_count"] == 1
+    assert manager.redis.scan_calls == 0
+
+
+# 清除使用SCAN分批删除，同时清理索引
+@pytest.mark.asyncio
+async def test_clear_scans_in_batches():
+    manager = await _make_manager(scan_count=2)
+    for i in range(5):
+        await manager.set(f"source:{i}", [i], 60)
+    await manager.set("celery", "queue", 60)
+
+    assert await manager.scan_keys("source:*") == [f"source:{i}" for i in range(5)]
+
+    pipelines_before = manager.redis.pipelines
+    assert await manager.clear("source:*") == 5
+    assert manager.redis.pipelines - pipelines_before == 3
+    assert sorted(manager.redis.data) == ["cache:meta:celery", "celery"]
+    assert await manager.indexed_keys("source:") == []
+
+
+# 没有Redis连接时返回空结果
+@pytest.mark.asyncio
+async def test_without_redis():
+    manager = CacheManager(enable_memory_cache=True)
+    manager.initialized = True
+    assert await manager.scan_keys() == []
+    assert await manager.indexed_keys() == []
+    assert await manager.clear("source:*") == 0
+
+
+# 写入时记录条目数和字节数元数据，删除时一并移除
+@pytest.mark.asyncio
+async def test_metadata_follows_entry():
+    manager = await _make_manager()
+    await manager.set("source:a", [{"title": "x"}, {"title": "y"}], 60)
+    await manager.set("source:b", "plain", 30)
+
+    metadata = await manager.get_metadata(["source:a", "source:b", "source:missing"])
+    assert manager.redis.mget_calls == 1
+    assert metadata["source:a"]["count"] == 2
+    assert metadata["source:a"]["size"] == len(manager.redis.data["source:a"])
+    assert 58 <= metadata["source:a"]["ttl"] <= 60
+    assert metadata["source:b"]["count"] is None
+    assert metadata["source:missing"] is None
+
+    await manager.delete("source:a")
+    assert manager.meta_key("source:a") not in manager.redis.data
+    await manager.clear("source:*")
+    assert manager.meta_key("source:b") not in manager.redis.data
+
+
+# 统计接口只用一次MGET获取所有源的元数据，不读取缓存数据
+@pytest.mark.asyncio
+async def test_stats_endpoint_reads_metadata(monkeypatch):
+    from app.api.endpoints import cache as cache_endpoint
+    from worker.sources import provider as provider_module
+
+    manager = await _make_manager()
+    await manager.set("source:a", [1, 2, 3], 60)
+    await manager.set("source:b", [1], 60)
+    # 升级前写入的缓存只有数据和索引，没有元数据
+    await manager.redis.setex("source:legacy", 60, b"x")
+    await manager.redis.zadd(manager.key_index, time.time() + 60, "source:legacy")
+
+    sources = [SimpleNamespace(source_id=source_id, name=source_id.upper())
+               for source_id in ("a", "b", "legacy", "empty")]
+
+    class StubProvider:
+        def get_all_sources(self):
+            return sources
+
+    monkeypatch.setattr(cache_endpoint, "cache_manager", manager)
+    monkeypatch.setattr(provider_module, "DefaultNewsSourceProvider", StubProvider)
+
+    result = await cache_endpoint.get_cache_stats(pattern="source:*")
+    stats = {entry["id"]: entry for entry in result["sources"]}
+
+    assert manager.redis.get_calls == 0
+    assert manager.redis.mget_calls == 1
+    assert result["total_keys"] == 3
+    assert result["total_items"] == 4
+    assert result["no_cache_sources"] == ["empty"]
+    assert stats["a"]["items_count"] == 3 and stats["a"]["name"] == "A"
+    assert stats["a"]["memory"].endswith("B") and stats["a"]["ttl"] > 0
+    assert stats["legacy"]["has_cache"] and stats["legacy"]["memory"] == "未知"
+    assert not stats["empty"]["has_cache"]
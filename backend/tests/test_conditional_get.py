@@ -0,0 +1,110 @@
+"""
+条件请求（ETag/Last-Modified）测试
+"""
+
+import os
+import sys
+from typing import List
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from worker.sources.base import NewsItemModel
+from worker.sources.web import WebNewsSource
+from worker.utils.conditional_get import ValidatorStore, validator_store
+from worker.utils.http_transport import http_transport
+
+
+class CountingSource(WebNewsSource):
+    def __init__(self, url: str):
+        super().__init__(source_id="conditional_test", name="Conditional Test", url=url,
+                         config={"max_retries": 0})
+        self.parse_count = 0
+
+    async def parse_response(self, response: str) -> List[NewsItemModel]:
+        self.parse_count += 1
+        return [NewsItemModel(id=line, title=line, url=f"https://example.com/{line}", source_id=self.source_id)
+                for line in response.split()]
+
+
+async def _start_server(state):
+    async def handler(request):
+        state["requests"].append(dict(request.headers))
+        if request.headers.get("If-None-Match") == state["etag"]:
+            return web.Response(status=304)
+        return web.Response(text=state["body"], headers={"ETag": state["etag"]})
+
+    app = web.Application()
+    app.router.add_get("/feed", handler)
+    server = TestServer(app)
+    await server.start_server()
+    return server
+
+
+# 内容未变化时收到304，沿用缓存且不重新解析
+@pytest.mark.asyncio
+async def test_not_modified_reuses_cache_without_parsing():
+    state = {"etag": '"v1"', "body": "a b c", "requests": []}
+    server = await _start_server(state)
+    source = CountingSource(str(server.make_url("/feed")))
+    try:
+        first = await source.get_news(force_update=True)
+        refreshed_at = source._last_cache_update
+        second = await source.get_news(force_update=True)
+
+        assert [item.id for item in second] == [item.id for item in first] == ["a", "b", "c"]
+        assert source.parse_count == 1
+        assert state["requests"][1]["If-None-Match"] == '"v1"'
+        assert source._last_cache_update >= refreshed_at
+        assert source.cache_status()["metrics"]["not_modified_count"] == 1
+
+        # 内容变化后返回完整响应并重新解析
+        state.update(etag='"v2"', body="d e f")
+        third = await source.get_news(force_update=True)
+        assert [item.id for item in third] == ["d", "e", "f"]
+        assert source.parse_count == 2
+    finally:
+        await source.clear_cache()
+        await http_transport.close()
+        await server.close()
+
+
+# 清空缓存后不再发送条件请求头
+@pytest.mark.asyncio
+async def test_cleared_cache_sends_unconditional_request():
+    state = {"etag": '"v1"', "body": "a b c", "requests": []}
+    server = await _start_server(state)
+    source = CountingSource(str(server.make_url("/feed")))
+    try:
+        await source.get_news(force_update=True)
+        await source.clear_cache()
+        items = await source.get_news(force_update=True)
+
+        assert len(items) == 3
+        assert "If-None-Match" not in state["requests"][1]
+        assert source.parse_count == 2
+    finally:
+        await source.clear_cache()
+        await http_transport.close()
+        await server.close()
+
+
+# 校验值按作用域隔离，超出容量时淘汰最久未使用的记录
+def test_validator_store_scopes_and_eviction():
+    store = ValidatorStore(max_entries=2)
+    key_a = store.make_key("a", "https://example.com/feed", {"page": 1})
+    key_b = store.make_key("b", "https://example.com/feed", {"page": 1})
+    store.update(key_a, {"ETag": '"1"', "Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"})
+
+    assert store.apply(key_a) == {"If-None-Match": '"1"', "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT"}
+    assert store.apply(key_b) == {}
+
+    store.update(key_b, {"ETag": '"2"'})
+    store.update(store.make_key("c", "https://example.com/other"), {"ETag": '"3"'})
+    assert store.get(key_a) == {}
+    assert store.invalidate_scope("b") == 1
+    assert validator_store is not store
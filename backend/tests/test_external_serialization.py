@@ -0,0 +1,215 @@
+"""
+对外接口快速序列化测试
+"""
+
+import os
+import sys
+import json
+import pickle
+import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.api.endpoints import external as external_endpoint
+from worker.sources.base import NewsItemModel, EXTERNAL_FIELDS
+from worker.utils import fast_json
+
+
+class StubSource:
+    def __init__(self, source_id, name, items, category="tech"):
+        self.source_id = source_id
+        self.name = name
+        self.category = category
+        self.country = "CN"
+        self.language = "zh-CN"
+        self.items = items
+
+    def is_cache_valid(self):
+        return True
+
+    async def get_news(self, force_update=False):
+        return self.items
+
+
+def make_client(monkeypatch, sources):
+    monkeypatch.setattr(external_endpoint.source_manager, "ensure_sources", lambda: sources)
+    app = FastAPI()
+    app.include_router(external_endpoint.router, prefix="/external")
+    return TestClient(app)
+
+
+# 发布时间在赋值时规范化为无时区的UTC时间，原始值保持不变
+def test_published_at_normalized_once():
+    item = NewsItemModel(id="1", title="a", published_at="2024-05-01T08:00:00+08:00")
+
+    assert item.published_at == "2024-05-01T08:00:00+08:00"
+    assert item.published_at_utc == datetime.datetime(2024, 5, 1, 0, 0)
+    assert item.published_at_iso == "2024-05-01T00:00:00"
+
+    item.published_at = "不是日期"
+    assert item.published_at_iso is None
+    assert item.sort_key == datetime.datetime.min
+
+
+# 序列化结果缓存在条目上，属性重新赋值后失效
+def test_to_json_cached_until_attribute_changes():
+    item = NewsItemModel(id="1", title="标题", published_at=datetime.datetime(2024, 5, 1, 12))
+
+    first = item.to_json(source_name="源", category="tech")
+    assert item.to_json(source_name="源", category="tech") is first
+    assert json.loads(first)["published_at"] == "2024-05-01T12:00:00"
+    assert json.loads(first)["source_name"] == "源"
+
+    item.title = "新标题"
+    assert json.loads(item.to_json(source_name="源", category="tech"))["title"] == "新标题"
+
+    full = json.loads(item.to_json(EXTERNAL_FIELDS))
+    assert list(full) == list(EXTERNAL_FIELDS)
+
+
+# pickle往返不保存序列化缓存，并保留规范化后的发布时间
+def test_pickle_round_trip():
+    item = NewsItemModel(id="1", title="a", published_at="2024-05-01T08:00:00+08:00")
+    item.to_json()
+
+    restored = pickle.loads(pickle.dumps(item))
+
+    assert restored._json_cache is None
+    assert restored.published_at_iso == "2024-05-01T00:00:00"
+
+
+# 预先序列化的数组元素原样拼接进外层对象
+def test_dumps_with_array():
+    body = fast_json.dumps_with_array({"total": 2}, "news", [b'{"id":"1"}', b'{"id":"2"}'])
+    assert json.loads(body) == {"total": 2, "news": [{"id": "1"}, {"id": "2"}]}
+
+    assert json.loads(fast_json.dumps_with_array({}, "news", [])) == {"news": []}
+
+
+# /unified按规范化后的发布时间排序，只序列化当前页，输出格式与原先的响应模型一致
+def test_unified_sorts_and_paginates(monkeypatch):
+    items_a = [
+        NewsItemModel(id="a1", title="A1", url="u", source_id="a", published_at="2024-05-01T10:00:00+08:00"),
+        NewsItemModel(id="a2", title="A2", url="u", source_id="a", published_at=datetime.datetime(2024, 5, 1, 3)),
+    ]
+    items_b = [
+        NewsItemModel(id="b1", title="B1", url="u", source_id="b", published_at=datetime.datetime(2024, 5, 1, 1)),
+    ]
+    client = make_client(monkeypatch, [StubSource("a", "源A", items_a), StubSource("b", "源B", items_b, category="")])
+
+    response = client.get("/external/unified", params={"page_size": 2})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    data = response.json()
+    assert data["total"] == 3
+    assert data["total_pages"] == 2
+    assert [news["id"] for news in data["news"]] == ["a2", "a1"]
+    assert data["news"][0]["source_name"] == "源A"
+    assert data["news"][1]["published_at"] == "2024-05-01T02:00:00"
+    assert set(data["news"][0]) == set(external_endpoint.UnifiedNewsItem.model_fields)
+    # 不在当前页的条目不会被序列化
+    assert items_b[0]._json_cache is None
+
+    second = client.get("/external/unified", params={"page": 2, "page_size": 2}).json()
+    assert [news["id"] for news in second["news"]] == ["b1"]
+    assert second["news"][0]["category"] == "unknown"
+
+
+# 没有符合条件的源时返回空列表
+def test_unified_without_sources(monkeypatch):
+    client = make_client(monkeypatch, [])
+
+    data = client.get("/external/unified", params={"category": "sports"}).json()
+
+    assert data["total"] == 0
+    assert data["news"] == []
+    assert data["filters"]["category"] == "sports"
+
+
+# 常驻源刷新时通过参数传入统计包装，源实例上的fetch不会被替换
+@pytest.mark.asyncio
+async def test_pooled_refresh_does_not_patch_fetch(monkeypatch):
+    from worker.sources.base import NewsSource
+
+    class CountingSource(NewsSource):
+        async def fetch(self):
+            return [NewsItemModel(id="1", title="标题", source_id=self.source_id)]
+
+    calls = []
+
+    async def fake_wrap_fetch(source_id, fetch_func, api_type="internal", *args, **kwargs):
+        calls.append((source_id, api_type, source.fetch == fetch_func))
+        return await fetch_func(*args, **kwargs)
+
+    source = CountingSource("pooled", "常驻源")
+    original_fetch = source.fetch
+    monkeypatch.setattr(external_endpoint.stats_updater, "wrap_fetch", fake_wrap_fetch)
+
+    news = await external_endpoint.get_pooled_source_news(source, force_update=True)
+
+    assert [item.id for item in news] == ["1"]
+    assert calls == [("pooled", "external", True)]
+    assert "fetch" not in vars(source)
+    assert source.fetch == original_fetch
+
+
+# 单个源接口默认读取常驻源的缓存，refresh=true时才抓取上游
+def test_source_endpoint_is_cache_first(monkeypatch):
+    from worker.sources.base import NewsSource
+
+    fetches = []
+
+    class PooledSource(NewsSource):
+        async def fetch(self):
+            fetches.append(self.source_id)
+            return [NewsItemModel(id=str(len(fetches)), title="标题", url="u", source_id=self.source_id)]
+
+    async def fake_wrap_fetch(source_id, fetch_func, api_type="internal", *args, **kwargs):
+        return await fetch_func(*args, **kwargs)
+
+    source = PooledSource("pooled", "常驻源")
+    monkeypatch.setattr(external_endpoint.source_manager, "sources", {"pooled": source})
+    monkeypatch.setattr(external_endpoint.stats_updater, "wrap_fetch", fake_wrap_fetch)
+    client = make_client(monkeypatch, [source])
+
+    first = client.get("/external/source/pooled").json()
+    second = client.get("/external/source/pooled").json()
+    assert fetches == ["pooled"]
+    assert first["news"] == second["news"]
+
+    refreshed = client.get("/external/source/pooled", params={"refresh": "true"}).json()
+    assert fetches == ["pooled", "pooled"]
+    assert refreshed["news"][0]["id"] == "2"
+
+
+# 源列表和统计接口读取常驻源池，不再为每个请求创建并关闭源实例
+def test_sources_and_stats_use_source_pool(monkeypatch):
+    from worker.sources.base import NewsSource
+
+    async def no_custom_sources(func):
+        return {}
+
+    def fail_create(*args, **kwargs):
+        raise AssertionError("不应创建新的源实例")
+
+    class PooledSource(NewsSource):
+        async def fetch(self):
+            return []
+
+    sources = [PooledSource("a", "源A", category="tech"), PooledSource("b", "源B", category="news")]
+    monkeypatch.setattr(external_endpoint, "run_db", no_custom_sources)
+    monkeypatch.setattr(external_endpoint.NewsSourceFactory, "create_source", staticmethod(fail_create))
+    client = make_client(monkeypatch, sources)
+
+    listed = client.get("/external/sources").json()
+    assert [source["source_id"] for source in listed["sources"]] == ["a", "b"]
+
+    stats = client.get("/external/stats").json()
+    assert stats["total_sources"] == 2
+    assert stats["categories"] == {"tech": 1, "news": 1}
@@ -0,0 +1,123 @@
+"""
+共享HTTP传输层测试
+"""
+
+import os
+import sys
+import asyncio
+
+import pytest
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from worker.utils.http_transport import SharedHTTPTransport
+
+
+# 同一事件循环内的所有视图复用同一个会话
+@pytest.mark.asyncio
+async def test_views_share_session_within_loop():
+    transport = SharedHTTPTransport()
+    async with transport.session() as first:
+        pass
+    second = transport.session(headers={"Referer": "https://example.com"})
+
+    assert first.closed
+    assert not transport.get_session().closed
+    assert transport.get_stats()["sessions"] == 1
+    assert transport.get_stats()["created_count"] == 1
+    assert not second.closed
+    await transport.close()
+
+
+# 不同事件循环使用各自的会话
+def test_new_loop_gets_new_session():
+    transport = SharedHTTPTransport()
+
+    async def get():
+        return transport.get_session()
+
+    loop_a = asyncio.new_event_loop()
+    loop_b = asyncio.new_event_loop()
+    try:
+        session_a = loop_a.run_until_complete(get())
+        session_b = loop_b.run_until_complete(get())
+        assert session_a is not session_b
+        assert transport.get_stats()["created_count"] == 2
+        transport.close_all()
+        assert session_a.closed and session_b.closed
+    finally:
+        loop_a.close()
+        loop_b.close()
+
+
+# 视图的默认请求头与调用方请求头合并，数值超时转换为ClientTimeout
+@pytest.mark.asyncio
+async def test_view_merges_headers_and_timeout(monkeypatch):
+    transport = SharedHTTPTransport()
+    captured = {}
+
+    def fake_request(method, url, **kwargs):
+        captured.update(kwargs, method=method, url=url)
+
+    monkeypatch.setattr(transport.get_session(), "request", fake_request)
+    view = transport.session(headers={"Referer": "a", "X-Test": "1"}, timeout=5)
+    view.get("https://example.com", headers={"Referer": "b"})
+
+    assert captured["method"] == "GET"
+    assert captured["headers"] == {"Referer": "b", "X-Test": "1"}
+    assert captured["timeout"].total == 5
+    await transport.close()
+
+
+# 每个视图分别保存响应设置的Cookie，不同视图之间互不可见
+@pytest.mark.asyncio
+async def test_views_keep_separate_cookies():
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+
+    async def login(request):
+        response = web.Response(text="ok")
+        response.set_cookie("token", request.query["name"])
+        return response
+
+    async def whoami(request):
+        return web.Response(text=request.cookies.get("token", ""))
+
+    app = web.Application()
+    app.router.add_get("/login", login)
+    app.router.add_get("/whoami", whoami)
+    transport = SharedHTTPTransport()
+    async with TestServer(app, host="localhost") as server:
+        first = transport.session()
+        second = transport.session()
+        async with first.get(server.make_url("/login?name=a")):
+            pass
+        response = await second.get(server.make_url("/login?name=b"))
+        response.release()
+
+        async with first.get(server.make_url("/whoami")) as response:
+            assert await response.text() == "a"
+        async with second.get(server.make_url("/whoami")) as response:
+            assert await response.text() == "b"
+        async with transport.session().get(server.make_url("/whoami")) as response:
+            assert await response.text() == ""
+    await transport.close()
+
+
+# 只有显式要求时才读取环境变量中的代理配置，两种会话共用同一个连接器
+@pytest.mark.asyncio
+async def test_trust_env_session_shares_connector():
+    transport = SharedHTTPTransport()
+
+    plain = transport.get_session()
+    with_env = transport.get_session(trust_env=True)
+
+    assert not plain.trust_env
+    assert with_env.trust_env
+    assert plain.connector is with_env.connector
+    assert transport.session(trust_env=True).trust_env
+    connector = plain.connector
+    await transport.close()
+    assert plain.closed and with_env.closed
+    assert connector.closed
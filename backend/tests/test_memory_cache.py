@@ -0,0 +1,95 @@
+"""
+CacheManager 有界内存缓存测试
+"""
+
+import os
+import sys
+import asyncio
+
+import pytest
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from worker.cache import MemoryCache, CacheManager
+
+
+def test_lru_eviction_by_entry_count():
+    cache = MemoryCache(max_entries=3)
+    for i in range(3):
+        cache.set(f"k{i}", i, ttl=60)
+
+    # 访问k0使其成为最近使用，k1成为最久未使用
+    assert cache.get("k0") == 0
+    cache.set("k3", 3, ttl=60)
+
+    assert "k1" not in cache
+    assert cache.keys() == ["k2", "k0", "k3"]
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_eviction_by_byte_budget():
+    cache = MemoryCache(max_entries=100, max_bytes=1000)
+    cache.set("a", "x", ttl=60, size=400)
+    cache.set("b", "y", ttl=60, size=400)
+    cache.set("c", "z", ttl=60, size=400)
+
+    assert "a" not in cache
+    assert cache.get_stats()["bytes"] == 800
+
+
+def test_oversized_entry_is_not_cached():
+    cache = MemoryCache(max_bytes=100)
+    assert cache.set("big", "x" * 1000, ttl=60) is False
+    assert "big" not in cache
+
+
+def test_expired_entries_count_as_miss():
+    cache = MemoryCache()
+    cache.set("k", "v", ttl=0)
+
+    assert cache.get("k") is None
+    stats = cache.get_stats()
+    assert stats["misses"] == 1
+    assert stats["expirations"] == 1
+    assert stats["entries"] == 0
+
+
+def test_purge_expired_and_prefix_clear():
+    cache = MemoryCache()
+    cache.set("news:a", 1, ttl=0)
+    cache.set("news:b", 2, ttl=60)
+    cache.set("sources:all", 3, ttl=60)
+
+    assert cache.purge_expired() == 1
+    assert cache.clear(prefix="news:") == 1
+    assert cache.keys() == ["sources:all"]
+
+
+@pytest.mark.asyncio
+async def test_background_sweeper_removes_expired_entries():
+    cache = MemoryCache(sweep_interval=0.01)
+    cache.set("k", "v", ttl=0)
+    cache.start_sweeper()
+    try:
+        await asyncio.sleep(0.05)
+        assert len(cache) == 0
+    finally:
+        await cache.stop_sweeper()
+
+
+@pytest.mark.asyncio
+async def test_cache_manager_reports_memory_stats():
+    manager = CacheManager(memory_max_entries=2)
+    await manager.set("a", [1], ttl=60)
+    await manager.set("b", [2], ttl=60)
+    await manager.set("c", [3], ttl=60)
+
+    assert await manager.get("a") is None
+    assert await manager.get("c") == [3]
+
+    stats = await manager.get_stats()
+    assert stats["memory_cache_count"] == 2
+    assert stats["memory_cache"]["evictions"] == 1
+    assert stats["memory_cache"]["hits"] == 1
+    await manager.close()
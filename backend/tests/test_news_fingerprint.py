@@ -0,0 +1,155 @@
+"""
+增量入库指纹测试
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from worker.utils.news_fingerprint import FingerprintStore
+
+
+def _store(client):
+    store = FingerprintStore()
+    store._client = client
+    return store
+
+
+def _row(original_id, title, source_id="hot"):
+    return {"source_id": source_id, "original_id": original_id, "title": title, "url": f"https://example.com/{original_id}"}
+
+
+# 首次比较时全部为新增，提交指纹后只返回新增和变化的新闻
+def test_diff_against_committed_fingerprints(fake_redis):
+    store = _store(fake_redis)
+    first = store.diff("hot", [_row("1", "a"), _row("2", "b"), _row("3", "c")])
+    assert first.counts() == {"added": 3, "changed": 0, "removed": 0, "unchanged": 0}
+    store.commit(first)
+
+    second = store.diff("hot", [_row("1", "a"), _row("2", "b2"), _row("4", "d")])
+    assert second.counts() == {"added": 1, "changed": 1, "removed": 1, "unchanged": 1}
+    assert [row["original_id"] for row in second.rows] == ["2", "4"]
+
+
+# 未提交的差异不会改变指纹，写入失败后下一轮会重新写入
+def test_uncommitted_diff_is_repeated(fake_redis):
+    store = _store(fake_redis)
+    store.diff("hot", [_row("1", "a")])
+    assert store.diff("hot", [_row("1", "a")]).added == 1
+
+
+# 指纹在进程之间共享，一个进程写入的新版本对其他进程可见
+def test_fingerprints_shared_between_processes(fake_redis):
+    first, second = _store(fake_redis), _store(fake_redis)
+
+    first.commit(first.diff("hot", [_row("1", "A")]))
+    second.commit(second.diff("hot", [_row("1", "B")]))
+
+    again = first.diff("hot", [_row("1", "A")])
+    assert again.counts() == {"added": 0, "changed": 1, "removed": 0, "unchanged": 0}
+    assert first.invalidate("hot")
+    assert not second.invalidate("hot")
+
+
+# Redis不可用时全部新闻按新增处理
+def test_redis_unavailable_writes_everything(fake_redis):
+    store = _store(fake_redis)
+    store.commit(store.diff("hot", [_row("1", "a")]))
+
+    fake_redis.available = False
+    delta = store.diff("hot", [_row("1", "a")])
+    assert delta.added == 1
+    store.commit(delta)
+    assert store.get_stats()["errors"] == 2
+
+
+# 批量保存只把新增和变化的新闻交给数据库写入
+def test_bulk_save_writes_only_delta(fake_redis, monkeypatch):
+    import worker.tasks.news as news_tasks
+
+    store = _store(fake_redis)
+    written = []
+
+    def fake_upsert(db, rows, chunk_size=500):
+        written.append([row["original_id"] for row in rows])
+        return {"inserted": len(rows), "updated": 0, "unchanged": 0}
+
+    class FakeSession:
+        def rollback(self):
+            pass
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(news_tasks, "fingerprint_store", store)
+    monkeypatch.setattr(news_tasks, "bulk_upsert_news", fake_upsert)
+    monkeypatch.setattr(news_tasks, "SessionLocal", FakeSession)
+    bumped = []
+    monkeypatch.setattr(news_tasks.response_cache, "bump", lambda **scopes: bumped.append(scopes))
+
+    def item(original_id, title):
+        return SimpleNamespace(
+            id=original_id, original_id=original_id, source_id="hot", title=title,
+            url=f"https://example.com/{original_id}", content=None, summary=None,
+            image_url=None, published_at=None
+        )
+
+    news_tasks._bulk_save_news([item(str(i), "t") for i in range(10)])
+    result = news_tasks._bulk_save_news([item(str(i), "t") for i in range(9)] + [item("9", "new"), item("10", "t")])
+
+    assert written == [[str(i) for i in range(10)], ["9", "10"]]
+    assert result["sources"]["hot"] == {"added": 1, "changed": 1, "removed": 0, "unchanged": 9}
+    assert result["skipped"] == 9
+    assert bumped[-1] == {"source_ids": {"hot"}, "category_ids": {None}}
+
+    # 没有变化时不访问数据库
+    news_tasks._bulk_save_news([item(str(i), "t") for i in range(9)] + [item("9", "new"), item("10", "t")])
+    assert len(written) == 2
+    assert len(bumped) == 2
+
+    # 消失的新闻只计数，不写入数据库
+    result = news_tasks._bulk_save_news([item(str(i), "t") for i in range(8)])
+    assert result["sources"]["hot"] == {"added": 0, "changed": 0, "removed": 3, "unchanged": 8}
+    assert result["removed"] == 3
+    assert len(written) == 2
+
+
+# 被数据库拒绝的新闻不记录指纹，下一轮只重试这些新闻
+def test_failed_rows_retried_next_cycle(fake_redis, monkeypatch):
+    import worker.tasks.news as news_tasks
+
+    store = _store(fake_redis)
+    written = []
+
+    def fake_upsert(db, rows, chunk_size=500):
+        written.append([row["original_id"] for row in rows])
+        failed = [("hot", "3")] if len(written) == 1 else []
+        return {"inserted": len(rows) - len(failed), "updated": 0, "unchanged": 0, "failed": failed}
+
+    class FakeSession:
+        def rollback(self):
+            pass
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(news_tasks, "fingerprint_store", store)
+    monkeypatch.setattr(news_tasks, "bulk_upsert_news", fake_upsert)
+    monkeypatch.setattr(news_tasks, "SessionLocal", FakeSession)
+    monkeypatch.setattr(news_tasks.response_cache, "bump", lambda **scopes: None)
+
+    def item(original_id):
+        return SimpleNamespace(
+            id=original_id, original_id=original_id, source_id="hot", title="t",
+            url=f"https://example.com/{original_id}", content=None, summary=None,
+            image_url=None, published_at=None
+        )
+
+    result = news_tasks._bulk_save_news([item(str(i)) for i in range(5)])
+    assert result["failed"] == 1
+
+    news_tasks._bulk_save_news([item(str(i)) for i in range(5)])
+    assert written == [[str(i) for i in range(5)], ["3"]]
@@ -0,0 +1,102 @@
+"""
+NewsItemModel 紧凑存储和字典视图测试
+"""
+
+import os
+import sys
+import pickle
+import datetime
+
+import pytest
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from worker.sources.base import NewsSource, NewsItemModel
+
+
+class DummySource(NewsSource):
+    async def fetch(self):
+        return []
+
+
+# 条目使用__slots__，不能再添加任意属性
+def test_item_is_slotted():
+    item = NewsItemModel(id="1", title="标题")
+
+    assert not hasattr(item, "__dict__")
+    with pytest.raises(AttributeError):
+        item.score = 1
+
+
+# create_news_item在创建时替换无法编码为UTF-8的字符，包括extra中的字符串
+def test_create_news_item_sanitizes_once():
+    source = DummySource("dummy", "测试源")
+
+    item = source.create_news_item(
+        id="1", title="标题", url="https://example.com/a",
+        summary="摘要\ud800", extra={"note": "备注\udfff", "rank": 1}
+    )
+
+    assert item.summary == "摘要?"
+    assert item.extra == {"note": "备注?", "rank": 1}
+    assert item.source_name == "测试源"
+
+
+# 直接构造和from_dict创建的条目同样经过清洗，可以正常序列化
+def test_direct_construction_sanitizes():
+    item = NewsItemModel(id="1", title="bad \ud83d x", extra={"note": "\udfff"})
+    restored = NewsItemModel.from_dict({"id": "2", "title": "坏\ud800", "published_at": "2024-05-01T00:00:00"})
+
+    assert item.title == "bad ? x"
+    assert item.extra["note"] == "?"
+    assert restored.title == "坏?"
+    assert item.to_json()
+    assert restored.to_json()
+
+
+# to_dict返回可以修改的副本，字典视图只在首次访问时生成
+def test_to_dict_uses_cached_view():
+    item = NewsItemModel(id="1", title="标题", published_at=datetime.datetime(2024, 5, 1, 12), tags=["a"])
+
+    view = item.as_dict
+    assert item.as_dict is view
+    with pytest.raises(TypeError):
+        view["title"] = "x"
+
+    data = item.to_dict()
+    data["title"] = "修改"
+    assert item.title == "标题"
+    assert data["published_at"] == "2024-05-01T12:00:00"
+    assert data["tags"] is item.tags
+
+
+# 属性重新赋值后字典视图和序列化缓存都会失效
+def test_attribute_assignment_invalidates_caches():
+    item = NewsItemModel(id="1", title="标题")
+    item.as_dict
+    item.to_json()
+
+    item.title = "新标题"
+
+    assert item._dict_cache is None
+    assert item._json_cache is None
+    assert item.to_dict()["title"] == "新标题"
+
+
+# 旧版本pickle保存的__dict__状态仍可恢复
+def test_restore_legacy_pickle_state():
+    item = NewsItemModel.__new__(NewsItemModel)
+    item.__setstate__({
+        "id": "1",
+        "title": "旧条目",
+        "published_at": datetime.datetime(2023, 1, 1, 8),
+        "extra": {"rank": 1},
+    })
+
+    assert item.title == "旧条目"
+    assert item.published_at_iso == "2023-01-01T08:00:00"
+    assert item.tags == []
+
+    restored = pickle.loads(pickle.dumps(item))
+    assert restored.to_dict() == item.to_dict()
@@ -0,0 +1,78 @@
+"""
+新闻列表游标分页测试
+"""
+
+import os
+import sys
+import datetime
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models import News
+from app.crud.news import get_news, encode_news_cursor, decode_news_cursor
+
+
+@pytest.fixture
+def db(sqlite_engine):
+    News.__table__.create(sqlite_engine)
+    session = sessionmaker(bind=sqlite_engine)()
+    base = datetime.datetime(2024, 1, 1, 8, 0)
+    for i in range(10):
+        # 包含发布时间为空和发布时间相同的记录
+        published_at = None if i % 4 == 0 else base + datetime.timedelta(hours=i // 3)
+        session.add(News(
+            title=f"新闻 {i}", url=f"https://example.com/{i}", original_id=str(i),
+            source_id="test" if i % 2 else "other", published_at=published_at
+        ))
+    session.commit()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def _collect_pages(db, limit, **filters):
+    pages = []
+    cursor = ""
+    while True:
+        page = get_news(db, limit=limit, cursor=cursor, **filters)
+        pages.append(page)
+        if len(page) < limit:
+            return pages
+        cursor = encode_news_cursor(page[-1].published_at, page[-1].id)
+
+
+def _expected_order(rows):
+    # 发布时间为空的排在最前，其余按发布时间倒序，相同时按ID倒序
+    return sorted(rows, key=lambda n: (n.published_at is None, n.published_at or datetime.datetime.min, n.id), reverse=True)
+
+
+# 逐页遍历结果与整体排序一致，不重复不遗漏
+def test_keyset_pages_cover_all_rows_in_order(db):
+    pages = _collect_pages(db, limit=3)
+    ids = [news.id for page in pages for news in page]
+
+    assert ids == [news.id for news in _expected_order(db.query(News).all())]
+    assert len(pages) == 4
+
+
+# 游标分页与过滤条件组合使用
+def test_keyset_with_source_filter(db):
+    pages = _collect_pages(db, limit=2, source_id="test")
+    ids = [news.id for page in pages for news in page]
+
+    assert ids == [news.id for news in _expected_order(db.query(News).filter(News.source_id == "test").all())]
+
+
+# 游标编码往返，非法游标抛出ValueError
+def test_cursor_round_trip_and_invalid_cursor():
+    published_at = datetime.datetime(2024, 1, 1, 8, 30)
+    assert decode_news_cursor(encode_news_cursor(published_at, 42)) == (published_at, 42)
+    assert decode_news_cursor(encode_news_cursor(None, 7)) == (None, 7)
+
+    with pytest.raises(ValueError):
+        decode_news_cursor("not-a-cursor")
@@ -0,0 +1,109 @@
+"""
+新闻全文搜索测试
+"""
+
+import os
+import sys
+import datetime
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models import News, Source, Category
+from app.models.source import SourceType
+from app.core.search import build_search_tokens, query_terms, highlight
+from app.crud.news import search_news, bulk_upsert_news, backfill_search_tokens
+
+
+@pytest.fixture
+def db(sqlite_engine):
+    for model in (Category, Source, News):
+        model.__table__.create(sqlite_engine)
+    session = sessionmaker(bind=sqlite_engine)()
+    session.add(Source(id="test", name="测试源", type=SourceType.API))
+    session.commit()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def _add(db, title, summary=None, hours=0):
+    news = News(
+        title=title, summary=summary, url=f"https://example.com/{title}", original_id=title,
+        source_id="test", published_at=datetime.datetime(2024, 1, 1) + datetime.timedelta(hours=hours)
+    )
+    db.add(news)
+    db.commit()
+    return news
+
+
+# 标题和摘要分两行保存，搜索模式分词包含长词中的短词
+def test_build_search_tokens_splits_title_and_summary():
+    tokens = build_search_tokens("中国商业银行发布年报", "净利润增长")
+    title_line, summary_line = tokens.split("\n")
+    assert "银行" in title_line.split()
+    assert "净利润" in summary_line.split() or "利润" in summary_line.split()
+
+
+# 查询词中的tsquery特殊字符被去掉
+def test_query_terms_strip_operators():
+    assert query_terms("银行 & (年报) | !") == ["银行", "年报"]
+
+
+# 高亮先转义HTML，只保留高亮标记
+def test_highlight_escapes_html():
+    assert highlight("<b>银行</b>", ["银行"]) == "&lt;b&gt;<mark>银行</mark>&lt;/b&gt;"
+
+
+# 插入和修改标题时自动生成分词
+def test_orm_listener_maintains_tokens(db):
+    news = _add(db, "央行宣布降准")
+    assert "降准" in news.search_tokens
+
+    news.title = "股市大涨"
+    db.commit()
+    assert "股市" in news.search_tokens
+    assert "降准" not in news.search_tokens
+
+
+# 非PostgreSQL数据库回退到分词子串匹配，所有查询词都要命中
+def test_search_fallback_matches_all_terms(db):
+    _add(db, "央行宣布降准", "释放长期资金", hours=1)
+    _add(db, "央行例行发布会", hours=2)
+    _add(db, "股市大涨", "银行股领涨", hours=3)
+
+    results = search_news(db, "央行")
+    assert [r["title"] for r in results] == ["央行例行发布会", "央行宣布降准"]
+    assert results[0]["source_name"] == "测试源"
+    assert results[0]["title_highlight"] == "<mark>央行</mark>例行发布会"
+
+    results = search_news(db, "央行 降准")
+    assert [r["title"] for r in results] == ["央行宣布降准"]
+
+    assert search_news(db, "银行")[0]["summary_highlight"] == "<mark>银行</mark>股领涨"
+    assert search_news(db, "  ") == []
+
+
+# 批量写入同样生成分词
+def test_bulk_upsert_sets_tokens(db):
+    bulk_upsert_news(db, [{
+        "source_id": "test", "original_id": "1", "title": "新能源汽车销量创新高",
+        "url": "https://example.com/1", "summary": None,
+    }])
+    assert [r["title"] for r in search_news(db, "汽车销量")] == ["新能源汽车销量创新高"]
+
+
+# 回填缺失的分词
+def test_backfill_search_tokens(db):
+    _add(db, "央行宣布降准")
+    _add(db, "股市大涨")
+    db.query(News).update({News.search_tokens: None})
+    db.commit()
+
+    assert backfill_search_tokens(db, batch_size=1) == 2
+    assert backfill_search_tokens(db) == 0
+    assert len(search_news(db, "股市")) == 1
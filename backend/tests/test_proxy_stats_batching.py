@@ -0,0 +1,128 @@
+"""
+代理使用统计批量写入测试
+"""
+
+import os
+import sys
+import asyncio
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app.db.session as db_session
+from app.models.proxy import ProxyConfig, ProxyStatus
+from worker.utils.proxy_manager import ProxyManager
+
+
+@pytest.fixture
+def session_factory(sqlite_engine, monkeypatch):
+    # 内存数据库在数据库线程池和测试线程之间共享同一个连接
+    ProxyConfig.__table__.create(sqlite_engine)
+    factory = sessionmaker(bind=sqlite_engine)
+    monkeypatch.setattr(db_session, "SessionLocal", factory)
+
+    db = factory()
+    db.add_all([
+        ProxyConfig(id=1, name="p1", host="127.0.0.1", port=1080, status=ProxyStatus.ACTIVE),
+        ProxyConfig(id=2, name="p2", host="127.0.0.1", port=1081, status=ProxyStatus.ACTIVE),
+    ])
+    db.commit()
+    db.close()
+
+    yield factory
+
+
+async def _make_manager() -> ProxyManager:
+    # ProxyManager是单例，测试中绕过单例创建独立实例
+    instance = object.__new__(ProxyManager)
+    instance._initialized = False
+    ProxyManager.__init__(instance, refresh_interval=0, stats_flush_interval=3600, stats_flush_threshold=1000)
+    await instance.refresh_proxies()
+    return instance
+
+
+def _load(factory, proxy_id):
+    db = factory()
+    try:
+        return db.query(ProxyConfig).filter(ProxyConfig.id == proxy_id).one()
+    finally:
+        db.close()
+
+
+# 报告只在内存中累积，写入时一次性更新
+@pytest.mark.asyncio
+async def test_reports_are_aggregated_until_flush(session_factory):
+    manager = await _make_manager()
+    for _ in range(8):
+        await manager.report_proxy_status(1, True, 1.0)
+    await manager.report_proxy_status(1, False)
+
+    assert _load(session_factory, 1).total_requests == 0
+
+    assert await manager.flush_proxy_stats() == 1
+    proxy = _load(session_factory, 1)
+    assert proxy.total_requests == 9
+    assert proxy.successful_requests == 8
+    assert proxy.failed_requests == 1
+    assert proxy.avg_response_time == pytest.approx(1.0)
+    assert manager._proxies[1].total_requests == 9
+
+
+# 按累积后的成功率把代理标记为错误并移出活跃列表
+@pytest.mark.asyncio
+async def test_low_success_rate_demotes_proxy(session_factory):
+    manager = await _make_manager()
+    for _ in range(12):
+        await manager.report_proxy_status(2, False)
+    await manager.flush_proxy_stats()
+
+    assert _load(session_factory, 2).status == ProxyStatus.ERROR
+    assert all(p.id != 2 for proxies in manager._active_proxies.values() for p in proxies)
+
+
+# 达到数量阈值后在后台写入
+@pytest.mark.asyncio
+async def test_threshold_triggers_background_flush(session_factory):
+    manager = await _make_manager()
+    manager.stats_flush_threshold = 3
+    for _ in range(3):
+        await manager.report_proxy_status(1, True, 0.5)
+
+    await manager._flush_task
+    assert _load(session_factory, 1).total_requests == 3
+    assert not manager._pending_stats
+
+
+# 没有新的报告时定时任务按间隔写入统计
+@pytest.mark.asyncio
+async def test_periodic_flusher_writes_without_new_reports(session_factory):
+    manager = await _make_manager()
+    manager.stats_flush_interval = 0.05
+    await manager.report_proxy_status(1, True, 0.5)
+
+    for _ in range(100):
+        if not manager._pending_stats and _load(session_factory, 1).total_requests:
+            break
+        await asyncio.sleep(0.02)
+    assert _load(session_factory, 1).total_requests == 1
+    manager._flusher_task.cancel()
+
+
+# 事件循环关闭取消定时任务时先写入剩余的统计
+@pytest.mark.asyncio
+async def test_flusher_writes_pending_stats_when_cancelled(session_factory):
+    manager = await _make_manager()
+    await manager.report_proxy_status(2, True, 0.5)
+    await manager.report_proxy_status(2, False)
+    await asyncio.sleep(0)
+
+    manager._flusher_task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await manager._flusher_task
+
+    proxy = _load(session_factory, 2)
+    assert proxy.total_requests == 2
+    assert proxy.failed_requests == 1
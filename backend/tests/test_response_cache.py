@@ -0,0 +1,147 @@
+"""
+新闻列表接口响应缓存测试
+"""
+
+import os
+import sys
+import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.api.deps import get_db
+from app.api.endpoints import news as news_endpoint
+from app.core.response_cache import ResponseCache
+from app.models import News, Source, Category
+from app.models.source import SourceType
+
+
+@pytest.fixture
+def env(sqlite_engine, fake_redis, monkeypatch):
+    for model in (Category, Source, News):
+        model.__table__.create(sqlite_engine)
+    Session = sessionmaker(bind=sqlite_engine)
+    db = Session()
+    db.add(Source(id="a", name="源A", type=SourceType.API))
+    db.add(Source(id="b", name="源B", type=SourceType.API))
+    now = datetime.datetime.utcnow()
+    for i, source_id in enumerate(["a", "a", "b"], start=1):
+        db.add(News(
+            id=i, title=f"新闻{i}", url=f"https://example.com/{i}", original_id=str(i),
+            source_id=source_id, published_at=now - datetime.timedelta(minutes=i), view_count=i
+        ))
+    db.commit()
+    db.close()
+
+    cache = ResponseCache()
+    cache._client = fake_redis
+    monkeypatch.setattr(news_endpoint, "response_cache", cache)
+    monkeypatch.setattr(news_endpoint.view_buffer, "pending_counts", lambda: {})
+
+    statements = []
+    event.listen(sqlite_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    def override_db():
+        session = Session()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app = FastAPI()
+    app.include_router(news_endpoint.router, prefix="/news")
+    app.dependency_overrides[get_db] = override_db
+    yield TestClient(app), cache, statements
+
+
+# 相同查询第二次直接从缓存返回，不访问数据库
+def test_repeated_query_is_served_from_cache(env):
+    client, cache, statements = env
+
+    first = client.get("/news/", params={"source_id": "a", "limit": 10})
+    assert first.status_code == 200
+    assert first.headers["X-Cache"] == "MISS"
+    assert [item["id"] for item in first.json()] == [1, 2]
+
+    executed = len(statements)
+    second = client.get("/news/", params={"limit": 10, "source_id": "a"})
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.content == first.content
+    assert len(statements) == executed
+
+
+# 客户端携带相同的ETag时返回304
+def test_etag_revalidation(env):
+    client, cache, statements = env
+
+    first = client.get("/news/trending")
+    etag = first.headers["ETag"]
+    executed = len(statements)
+
+    revalidated = client.get("/news/trending", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert len(statements) == executed
+
+
+# 只有写入相关源时缓存才失效
+def test_bump_invalidates_only_dependent_scopes(env):
+    client, cache, statements = env
+
+    client.get("/news/", params={"source_id": "a"})
+    client.get("/news/", params={"source_id": "b"})
+    client.get("/news/")
+
+    cache.bump(source_ids=["b"])
+
+    assert client.get("/news/", params={"source_id": "a"}).headers["X-Cache"] == "HIT"
+    assert client.get("/news/", params={"source_id": "b"}).headers["X-Cache"] == "MISS"
+    assert client.get("/news/").headers["X-Cache"] == "MISS"
+
+
+# 缓存条目过期后，旧ETag只在内容未变时才返回304
+def test_etag_expires_with_cached_body(env):
+    client, cache, statements = env
+
+    etag = client.get("/news/trending").headers["ETag"]
+    cache._client.hashes.clear()
+
+    unchanged = client.get("/news/trending", headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304
+
+    cache._client.hashes.clear()
+    session = next(client.app.dependency_overrides[get_db]())
+    session.query(News).filter(News.id == 1).update({News.view_count: 100})
+    session.commit()
+    session.close()
+
+    changed = client.get("/news/trending", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+# 游标分页的下一页游标随缓存一起保存
+def test_cursor_header_is_cached(env):
+    client, cache, statements = env
+
+    first = client.get("/news/", params={"cursor": "", "limit": 2})
+    second = client.get("/news/", params={"cursor": "", "limit": 2})
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.headers["X-Next-Cursor"] == first.headers["X-Next-Cursor"]
+
+
+# Redis不可用时直接查询数据库
+def test_bypass_without_redis(env):
+    client, cache, statements = env
+    cache._client.available = False
+
+    response = client.get("/news/")
+    assert response.status_code == 200
+    assert response.headers["X-Cache"] == "BYPASS"
+    assert len(response.json()) == 3
@@ -0,0 +1,92 @@
+"""
+数据库线程池执行测试
+"""
+
+import os
+import sys
+import time
+import asyncio
+import threading
+
+import pytest
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app.db.session as db_session
+from worker.stats_wrapper import StatsUpdater
+
+
+class FakeSession:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_sessions(monkeypatch):
+    sessions = []
+
+    def factory():
+        session = FakeSession()
+        sessions.append(session)
+        return session
+
+    monkeypatch.setattr(db_session, "SessionLocal", factory)
+    return sessions
+
+
+# 慢查询在线程池中执行，事件循环上的其他任务不受影响
+@pytest.mark.asyncio
+async def test_slow_query_does_not_block_event_loop(fake_sessions):
+    ticks = []
+
+    def slow_query(db, value):
+        time.sleep(0.2)
+        return threading.current_thread().name, value
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    (thread_name, value), _ = await asyncio.gather(db_session.run_db(slow_query, 42), ticker())
+
+    assert value == 42
+    assert thread_name.startswith("db")
+    assert len(ticks) == 5 and ticks[-1] - ticks[0] < 0.15
+    assert all(session.closed for session in fake_sessions)
+
+
+# 异常会传递给调用方，会话仍然会被关闭
+@pytest.mark.asyncio
+async def test_exception_propagates_and_session_closed(fake_sessions):
+    def failing_query(db):
+        raise RuntimeError("db error")
+
+    with pytest.raises(RuntimeError):
+        await db_session.run_db(failing_query)
+
+    assert fake_sessions[0].closed
+
+
+# 写入数据库期间新增的内存统计不会被清零
+@pytest.mark.asyncio
+async def test_stats_recorded_during_db_write_are_kept(monkeypatch):
+    updater = StatsUpdater()
+    await updater._update_memory_stats("test", True, 100, news_count=5)
+
+    async def fake_run_db(func, source_id, api_type, stats, error_sources):
+        await updater._update_memory_stats("test", True, 50, news_count=3)
+        return source_id
+
+    monkeypatch.setattr("worker.stats_wrapper.run_db", fake_run_db)
+    await updater._update_db_stats("test", "internal")
+
+    stats = updater.stats_cache["test:internal"]
+    assert stats["total_requests"] == 1
+    assert stats["news_count"] == 3
+    assert stats["total_response_time"] == 50
+    assert "test" in updater.last_update
@@ -11,6 +11,8 @@ import asyncio
 import logging
 import datetime
 import time
+import tempfile
+from pathlib import Path
 from typing import List, Dict, Any, Optional
 
 # 添加项目根目录到Python路径
@@ -226,9 +228,9 @@ def test_api_schemas():
     except Exception as e:
         logger.error(f"检查响应模型时出错: {str(e)}")
 
-def test_alternative_response():
+def test_alternative_response(tmp_path: Path):
     """
-    测试创建和序列化简单的自定义响应
+    测试创建和序列化简单的自定义响应，结果写入临时目录
     """
     logger.info("=== 测试简单替代响应 ===")
     
@@ -265,9 +267,10 @@ def test_alternative_response():
             logger.info(f"测试项序列化成功，长度: {len(test_json)}")
             
             # 保存到文件
-            with open("test_response.json", "w", encoding="utf-8") as f:
+            response_file = tmp_path / "test_response.json"
+            with open(response_file, "w", encoding="utf-8") as f:
                 f.write(test_json)
-            logger.info("已将测试响应保存到 test_response.json")
+            logger.info(f"已将测试响应保存到 {response_file}")
             
             # 尝试提供解决方案 - 创建一个简单的API端点示例
             example_code = """
@@ -388,7 +391,7 @@ async def main():
     test_api_schemas()
     
     # 测试替代响应
-    test_alternative_response()
+    test_alternative_response(Path(tempfile.mkdtemp()))
     
     logger.info("\n" + "="*30 + " 测试完成 " + "="*30)
 
@@ -0,0 +1,75 @@
+"""
+NewsSource.get_news 单飞（请求合并）测试
+"""
+
+import os
+import sys
+import asyncio
+
+import pytest
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from worker.sources.base import NewsSource, NewsItemModel
+
+
+# 模拟的慢速新闻源，记录fetch被调用的次数
+class SlowNewsSource(NewsSource):
+    def __init__(self, *args, delay: float = 0.1, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.delay = delay
+        self.fetch_count = 0
+
+    async def fetch(self):
+        self.fetch_count += 1
+        await asyncio.sleep(self.delay)
+        return [NewsItemModel(id=str(i), title=f"新闻 {i}", source_id=self.source_id) for i in range(10)]
+
+
+@pytest.fixture
+def slow_source():
+    return SlowNewsSource("slow_test", "慢速测试源")
+
+
+# 冷缓存下的并发请求只触发一次上游请求
+@pytest.mark.asyncio
+async def test_concurrent_get_news_coalesced(slow_source):
+    results = await asyncio.gather(*[slow_source.get_news() for _ in range(20)])
+
+    assert slow_source.fetch_count == 1
+    assert all(len(news) == 10 for news in results)
+    assert slow_source._cache_metrics["coalesced_count"] == 19
+    assert not slow_source._inflight_refreshes
+
+
+# 每个调用者拿到的是独立的列表副本
+@pytest.mark.asyncio
+async def test_coalesced_results_are_copies(slow_source):
+    first, second = await asyncio.gather(slow_source.get_news(), slow_source.get_news())
+
+    first.clear()
+    assert len(second) == 10
+
+
+# 某个调用者被取消不影响其他等待者
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_abort_refresh(slow_source):
+    waiter = asyncio.ensure_future(slow_source.get_news())
+    await asyncio.sleep(0)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(slow_source.get_news(), timeout=0.01)
+
+    news = await waiter
+    assert len(news) == 10
+    assert slow_source.fetch_count == 1
+
+
+# 刷新完成后新的请求会重新发起刷新
+@pytest.mark.asyncio
+async def test_sequential_force_update_fetches_again(slow_source):
+    await slow_source.get_news(force_update=True)
+    await slow_source.get_news(force_update=True)
+
+    assert slow_source.fetch_count == 2
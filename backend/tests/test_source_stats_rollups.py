@@ -0,0 +1,127 @@
+"""
+源统计聚合测试
+"""
+
+import os
+import sys
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models import Source, Category, SourceStats, SourceStatsRollup
+from app.models.source import SourceType
+from app.crud import source_stats as stats_crud
+from app.api.endpoints.monitor import get_source_monitor_data
+
+
+@pytest.fixture
+def db(sqlite_engine):
+    for model in (Category, Source, SourceStats, SourceStatsRollup):
+        model.__table__.create(sqlite_engine)
+    session = sessionmaker(bind=sqlite_engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def _add_sources(db, count):
+    for i in range(count):
+        db.add(Source(id=f"s{i}", name=f"源{i}", description="", type=SourceType.API))
+    db.commit()
+
+
+def _record(db, source_id, api_type="internal", requests=10, errors=1, response_time=100.0, success_rate=0.9):
+    return stats_crud.create_source_stats(
+        db, source_id,
+        success_rate=success_rate,
+        avg_response_time=response_time,
+        total_requests=requests,
+        error_count=errors,
+        news_count=5,
+        api_type=api_type
+    )
+
+
+# 写入统计记录时同时累加到小时和天的聚合桶
+def test_create_stats_updates_rollups(db):
+    _add_sources(db, 1)
+    _record(db, "s0", requests=10, response_time=100.0)
+    _record(db, "s0", requests=30, response_time=200.0)
+    _record(db, "s0", api_type="external", requests=4)
+
+    hourly = stats_crud.get_stats_rollups(db, "hour", source_ids=["s0"])
+    internal = next(r for r in hourly if r.api_type == "internal")
+    assert internal.samples == 2
+    assert internal.total_requests == 40
+    assert internal.weighted_response_time_sum == pytest.approx(100.0 * 10 + 200.0 * 30)
+    assert len(stats_crud.get_stats_rollups(db, "day")) == 2
+
+
+# 不支持 ON CONFLICT 的数据库退回到读取后累加
+def test_rollups_without_on_conflict(db, monkeypatch):
+    monkeypatch.setattr(stats_crud, "dialect_insert", lambda session: None)
+    _add_sources(db, 1)
+    _record(db, "s0", requests=10)
+    _record(db, "s0", requests=30)
+
+    hourly = stats_crud.get_stats_rollups(db, "hour", source_ids=["s0"])
+    assert len(hourly) == 1
+    assert hourly[0].samples == 2
+    assert hourly[0].total_requests == 40
+
+
+# 重建的聚合与增量累加的结果一致
+def test_rebuild_matches_incremental(db):
+    _add_sources(db, 2)
+    for i in range(3):
+        _record(db, f"s{i % 2}", requests=i + 1, response_time=50.0 * (i + 1))
+
+    def snapshot():
+        return sorted(
+            (r.source_id, r.api_type, r.granularity, r.bucket, r.samples, r.total_requests, r.weighted_success_sum)
+            for r in db.query(SourceStatsRollup)
+        )
+
+    before = snapshot()
+    assert stats_crud.rebuild_stats_rollups(db, batch_size=2) == len(before)
+    assert snapshot() == before
+
+
+# 最新记录按源和调用类型一次查询获取
+def test_latest_stats_by_source(db):
+    _add_sources(db, 2)
+    _record(db, "s0", requests=1)
+    newest = _record(db, "s0", requests=2)
+    _record(db, "s1", api_type="external", requests=3)
+
+    latest = stats_crud.get_latest_stats_by_source(db, ["s0", "s1"])
+    assert latest[("s0", "internal")].id == newest.id
+    assert set(latest) == {("s0", "internal"), ("s1", "external")}
+
+
+# 监控接口的查询次数与源的数量无关
+@pytest.mark.parametrize("source_count", [2, 20])
+def test_monitor_query_count_is_constant(db, source_count):
+    _add_sources(db, source_count)
+    for i in range(source_count):
+        _record(db, f"s{i}", requests=10, response_time=100.0)
+        _record(db, f"s{i}", requests=30, response_time=200.0)
+        _record(db, f"s{i}", api_type="external", requests=5, response_time=50.0, success_rate=1.0)
+
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    result = get_source_monitor_data(status=None, category=None, search=None, db=db)
+
+    assert len(statements) == 3
+    assert result.total_sources == source_count
+    source = next(info for info in result.sources if info.id == "s0")
+    assert source.metrics.total_requests == 45
+    assert source.api_type_metrics["internal"]["avg_response_time"] == pytest.approx(175.0)
+    assert source.api_type_metrics["external"]["total_requests"] == 5
+    assert result.api_type_metrics.internal_requests == 40 * source_count
+    assert len(result.historical_data) == source_count
@@ -0,0 +1,145 @@
+"""
+浏览量和阅读记录写回缓冲测试
+"""
+
+import os
+import sys
+import datetime
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models import News, Source, Category, User
+from app.models.user import user_read_history
+from app.models.source import SourceType
+from app.core.view_buffer import ViewBuffer
+from app.crud.news import get_trending_news
+
+
+@pytest.fixture
+def db(sqlite_engine):
+    for model in (Category, Source, News, User):
+        model.__table__.create(sqlite_engine)
+    user_read_history.create(sqlite_engine)
+    session = sessionmaker(bind=sqlite_engine)()
+    session.add(Source(id="test", name="测试源", type=SourceType.API))
+    session.add(User(id=1, email="a@example.com", username="a", hashed_password="x"))
+    now = datetime.datetime.utcnow()
+    for i, views in enumerate([10, 5, 0], start=1):
+        session.add(News(
+            id=i, title=f"新闻{i}", url=f"https://example.com/{i}", original_id=str(i),
+            source_id="test", published_at=now - datetime.timedelta(minutes=i), view_count=views
+        ))
+    session.commit()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def buffer(fake_redis):
+    buffer = ViewBuffer()
+    buffer._client = fake_redis
+    return buffer
+
+
+# 浏览量先累加在Redis中，写回时批量加到数据库
+def test_views_are_buffered_and_flushed(db, buffer):
+    for _ in range(3):
+        buffer.record_view(2)
+    assert buffer.record_view(3) == 1
+    assert buffer.pending_counts() == {2: 3, 3: 1}
+    assert db.get(News, 2).view_count == 5
+
+    result = buffer.flush(db, batch_size=1)
+    db.expire_all()
+    assert result["views"] == 2
+    assert db.get(News, 2).view_count == 8
+    assert db.get(News, 3).view_count == 1
+    assert buffer.pending_counts() == {}
+    assert buffer.flush(db) == {"views": 0, "read_history": 0}
+
+
+# 另一次写回持有锁时直接跳过，不会重复累加浏览量
+def test_concurrent_flush_is_skipped(db, buffer):
+    buffer.record_view(1)
+    buffer.client.set(buffer.lock_key, "other", nx=True, ex=60)
+
+    assert buffer.flush(db) == {"views": 0, "read_history": 0}
+    db.expire_all()
+    assert db.get(News, 1).view_count == 10
+    assert buffer.client.get(buffer.lock_key) == b"other"
+
+    buffer.client.delete(buffer.lock_key)
+    assert buffer.flush(db)["views"] == 1
+    db.expire_all()
+    assert db.get(News, 1).view_count == 11
+    assert buffer.client.get(buffer.lock_key) is None
+
+
+# 写回中途失败时，已提交的批次不会在重试时再次累加
+def test_partial_failure_does_not_reapply_committed_batches(db, buffer, monkeypatch):
+    import app.crud.news as crud_news
+
+    buffer.record_view(1)
+    buffer.record_view(2)
+    applied = []
+    original = crud_news.apply_view_counts
+
+    def flaky_apply(session, counts):
+        if applied:
+            raise RuntimeError("数据库断开")
+        original(session, counts)
+        applied.append(counts)
+
+    monkeypatch.setattr(crud_news, "apply_view_counts", flaky_apply)
+    with pytest.raises(RuntimeError):
+        buffer.flush(db, batch_size=1)
+    assert buffer.client.get(buffer.lock_key) is None
+
+    monkeypatch.setattr(crud_news, "apply_view_counts", original)
+    assert buffer.flush(db, batch_size=1)["views"] == 1
+    db.expire_all()
+    assert db.get(News, 1).view_count == 11
+    assert db.get(News, 2).view_count == 6
+    assert buffer.pending_counts() == {}
+
+
+# 阅读记录去重，跳过不存在的新闻，写入后从流中删除
+def test_read_history_is_flushed(db, buffer):
+    buffer.record_view(1, user_id=1)
+    buffer.record_view(1, user_id=1)
+    buffer.record_view(2, user_id=1)
+    buffer.record_view(99, user_id=1)
+
+    assert buffer.flush(db)["read_history"] == 4
+    rows = db.execute(user_read_history.select()).fetchall()
+    assert sorted(row.news_id for row in rows) == [1, 2]
+    assert buffer.get_stats()["pending_read_events"] == 0
+
+    # 已有的阅读记录不会重复写入
+    buffer.record_view(1, user_id=1)
+    buffer.flush(db)
+    assert len(db.execute(user_read_history.select()).fetchall()) == 2
+
+
+# 热门新闻排序合并尚未写回的浏览量
+def test_trending_merges_pending_views(db, buffer):
+    for _ in range(20):
+        buffer.record_view(3)
+
+    trending = get_trending_news(db, limit=2, pending_views=buffer.pending_counts())
+    assert [(row["id"], row["view_count"]) for row in trending] == [(3, 20), (1, 10)]
+    assert [row["id"] for row in get_trending_news(db, limit=2)] == [1, 2]
+
+
+# Redis不可用时由调用方直接写数据库
+def test_unavailable_redis(db, buffer, fake_redis):
+    fake_redis.available = False
+    assert buffer.record_view(1, user_id=1) is None
+    assert buffer.pending_counts() == {}
+    assert buffer.get_stats()["available"] is False
@@ -275,15 +275,12 @@ class RedisCacheMonitor:
         """列出Redis中的缓存键"""
         await self.initialize()
         
-        # 获取Redis客户端
-        redis_client = self.cache_manager.redis
         keys = []
         
-        if redis_client:
+        if self.cache_manager.redis:
             try:
-                # 使用keys命令，确保兼容性
-                raw_keys = await redis_client.keys(pattern)
-                keys = [key.decode('utf-8') if isinstance(key, bytes) else key for key in raw_keys]
+                # 使用SCAN分批遍历，避免KEYS阻塞Redis
+                keys = await self.cache_manager.scan_keys(pattern)
                 logger.info(f"找到 {len(keys)} 个匹配模式 '{pattern}' 的缓存键")
             except Exception as e:
                 logger.error(f"获取缓存键时出错: {str(e)}")
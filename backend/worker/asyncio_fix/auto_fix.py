@@ -14,6 +14,15 @@ from typing import Any, Callable, TypeVar, cast, Optional
 
 logger = logging.getLogger(__name__)
 
+# Celery工作进程的常驻事件循环
+try:
+    from worker.utils.async_runtime import async_runtime
+except ImportError:
+    try:
+        from backend.worker.utils.async_runtime import async_runtime
+    except ImportError:
+        async_runtime = None
+
 # 线程本地存储，用于存储每个线程的事件循环
 _thread_local = threading.local()
 
@@ -67,7 +76,13 @@ def run_async(coro):
     安全地运行异步协程，确保事件循环的正确创建和清理
     
     这是对asyncio.run的包装，添加了额外的错误处理和资源清理
+    
+    工作进程已启动常驻事件循环时，协程提交到常驻循环执行，
+    连接池等资源在任务之间保持可用
     """
+    if async_runtime is not None and async_runtime.is_running and not async_runtime.in_runtime_thread():
+        return async_runtime.run(coro)
+    
     loop = get_or_create_eventloop()
     
     # 存储在线程本地存储中
@@ -24,6 +24,13 @@ except ImportError:
     HAVE_AIOHTTP = False
     logger.warning("未安装aiohttp库，HTTP请求功能将不可用")
 
+# 导入共享HTTP连接池
+if HAVE_AIOHTTP:
+    try:
+        from worker.utils.http_transport import http_transport
+    except ImportError:
+        from backend.worker.utils.http_transport import http_transport
+
 # 导入事件循环修复模块，使用相对导入来避免循环导入
 try:
     # 使用正确的相对导入 - 因为在同一目录
@@ -204,57 +211,30 @@ async def safe_request(
             # 确保事件循环有效
             loop = get_or_create_eventloop()
             
-            # 创建会话并发送请求
-            async with aiohttp.ClientSession(timeout=timeout_obj, trust_env=True) as session:
-                async with session.request(
-                    method=method,
-                    url=url,
-                    headers=headers,
-                    params=params,
-                    data=data,
-                    json=json,
-                    cookies=cookies,
-                    ssl=verify_ssl,
-                    proxy=proxy
-                ) as response:
-                    # 计算请求耗时
-                    elapsed = time.time() - start_time
-                    
-                    # 检查响应状态
-                    if response.status >= 400:
-                        error_text = await response.text()
-                        error_msg = f"HTTP错误 {response.status}: {error_text[:500]}..."
-                        logger.error(error_msg)
-                        last_error = error_msg
-                        
-                        # 如果使用了代理，尝试报告失败状态
-                        if proxy_used:
-                            try:
-                                # 尝试导入代理管理器
-                                proxy_manager = None
-                                try:
-                                    from worker.utils.proxy_manager import proxy_manager
-                                except ImportError:
-                                    try:
-                                        from backend.worker.utils.proxy_manager import proxy_manager
-                                    except ImportError:
-                                        pass
-                                
-                                # 如果成功导入代理管理器，报告代理状态
-                                if proxy_manager:
-                                    proxy_config = await proxy_manager.get_proxy(source_id, proxy_group)
-                                    if proxy_config:
-                                        await proxy_manager.report_proxy_status(proxy_config.get('id'), False)
-                            except Exception as e:
-                                logger.warning(f"报告代理状态时出错: {str(e)}")
-                        
-                        # 检查是否应该重试
-                        if response.status in [429, 500, 502, 503, 504] and retry_count <= max_retries:
-                            continue
-                        else:
-                            return False, None, error_msg
+            # 通过共享连接池发送请求
+            async with http_transport.get_session(trust_env=True).request(
+                method=method,
+                url=url,
+                headers=headers,
+                params=params,
+                data=data,
+                json=json,
+                cookies=cookies,
+                ssl=verify_ssl,
+                proxy=proxy,
+                timeout=timeout_obj
+            ) as response:
+                # 计算请求耗时
+                elapsed = time.time() - start_time
+                
+                # 检查响应状态
+                if response.status >= 400:
+                    error_text = await response.text()
+                    error_msg = f"HTTP错误 {response.status}: {error_text[:500]}..."
+                    logger.error(error_msg)
+                    last_error = error_msg
                     
-                    # 如果使用了代理，尝试报告成功状态
+                    # 如果使用了代理，尝试报告失败状态
                     if proxy_used:
                         try:
                             # 尝试导入代理管理器
@@ -271,27 +251,54 @@ async def safe_request(
                             if proxy_manager:
                                 proxy_config = await proxy_manager.get_proxy(source_id, proxy_group)
                                 if proxy_config:
-                                    await proxy_manager.report_proxy_status(proxy_config.get('id'), True, elapsed)
-                                    logger.info(f"通过代理成功请求 {url}, 状态码: {response.status}, 耗时: {elapsed:.2f}s")
+                                    await proxy_manager.report_proxy_status(proxy_config.get('id'), False)
                         except Exception as e:
                             logger.warning(f"报告代理状态时出错: {str(e)}")
                     
-                    # 获取响应内容
-                    if return_json:
-                        try:
-                            result = await response.json()
-                        except Exception as e:
-                            # JSON解析失败，尝试获取文本
-                            content = await response.text()
-                            error_msg = f"JSON解析错误: {str(e)}, 响应内容: {content[:500]}..."
-                            logger.error(error_msg)
-                            return False, content, error_msg
+                    # 检查是否应该重试
+                    if response.status in [429, 500, 502, 503, 504] and retry_count <= max_retries:
+                        continue
                     else:
-                        result = await response.text()
-                    
-                    # 请求成功
-                    return True, result, None
-                    
+                        return False, None, error_msg
+                
+                # 如果使用了代理，尝试报告成功状态
+                if proxy_used:
+                    try:
+                        # 尝试导入代理管理器
+                        proxy_manager = None
+                        try:
+                            from worker.utils.proxy_manager import proxy_manager
+                        except ImportError:
+                            try:
+                                from backend.worker.utils.proxy_manager import proxy_manager
+                            except ImportError:
+                                pass
+                        
+                        # 如果成功导入代理管理器，报告代理状态
+                        if proxy_manager:
+                            proxy_config = await proxy_manager.get_proxy(source_id, proxy_group)
+                            if proxy_config:
+                                await proxy_manager.report_proxy_status(proxy_config.get('id'), True, elapsed)
+                                logger.info(f"通过代理成功请求 {url}, 状态码: {response.status}, 耗时: {elapsed:.2f}s")
+                    except Exception as e:
+                        logger.warning(f"报告代理状态时出错: {str(e)}")
+                
+                # 获取响应内容
+                if return_json:
+                    try:
+                        result = await response.json()
+                    except Exception as e:
+                        # JSON解析失败，尝试获取文本
+                        content = await response.text()
+                        error_msg = f"JSON解析错误: {str(e)}, 响应内容: {content[:500]}..."
+                        logger.error(error_msg)
+                        return False, content, error_msg
+                else:
+                    result = await response.text()
+                
+                # 请求成功
+                return True, result, None
+                
         except asyncio.TimeoutError:
             last_error = f"请求超时 (>{timeout}秒)"
             if verbose:
@@ -1,11 +1,14 @@
+import sys
 import logging
 import json
-import pickle
 import time
-from typing import Dict, Any, Optional, List, Union
+import asyncio
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Union, AsyncIterator
 
 import aioredis
 from app.core.logging_config import get_cache_logger
+from worker.utils.cache_codec import CacheSerializer, get_default_serializer
 
 # 保留主日志记录器用于关键错误信息
 logger = logging.getLogger(__name__)
@@ -13,10 +16,220 @@ logger = logging.getLogger(__name__)
 cache_logger = get_cache_logger()
 
 
+def estimate_size(obj: Any, _depth: int = 0) -> int:
+    """
+    粗略估算对象占用的内存字节数
+
+    只递归容器和普通对象的__dict__/__slots__，用于内存缓存的字节预算，不追求精确
+    """
+    if _depth > 4:
+        return sys.getsizeof(obj)
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool)) or obj is None:
+        return size
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            size += estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1)
+        return size
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += estimate_size(item, _depth + 1)
+        return size
+    if hasattr(obj, "__dict__"):
+        size += estimate_size(vars(obj), _depth + 1)
+    for slot in getattr(type(obj), "__slots__", ()):
+        if hasattr(obj, slot):
+            size += estimate_size(getattr(obj, slot), _depth + 1)
+    return size
+
+
+class MemoryCache:
+    """
+    有界的进程内缓存
+    按条目数和字节预算限制容量，超出时按LRU淘汰，过期条目由后台任务定期清理
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        max_bytes: int = 64 * 1024 * 1024,  # 默认64MB
+        sweep_interval: int = 60  # 过期清理间隔，单位秒
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+
+        # key -> (data, expire_time, size)，按访问顺序排列，最近访问的在末尾
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._total_bytes = 0
+        self._sweep_task: Optional[asyncio.Task] = None
+
+        # 统计计数
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def keys(self) -> List[str]:
+        return list(self._entries.keys())
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        获取未过期的缓存数据，命中时将其移到LRU末尾
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        data, expire_time, _ = entry
+        if expire_time <= time.time():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return data
+
+    def set(self, key: str, data: Any, ttl: int, size: Optional[int] = None) -> bool:
+        """
+        写入缓存数据
+
+        Returns:
+            是否写入成功，单个条目超过字节预算时不缓存
+        """
+        if size is None:
+            size = estimate_size(data)
+        if size > self.max_bytes:
+            cache_logger.debug(f"[CACHE] 条目过大，跳过内存缓存: {key}, 大小={size}字节")
+            self.delete(key)
+            return False
+
+        self._remove(key)
+        self._entries[key] = (data, time.time() + ttl, size)
+        self._total_bytes += size
+        self._evict()
+        return True
+
+    def delete(self, key: str) -> bool:
+        return self._remove(key)
+
+    def clear(self, prefix: Optional[str] = None) -> int:
+        """
+        清空缓存，指定prefix时只删除匹配前缀的键
+
+        Returns:
+            删除的条目数
+        """
+        if prefix is None:
+            count = len(self._entries)
+            self._entries.clear()
+            self._total_bytes = 0
+            return count
+
+        keys_to_delete = [k for k in self._entries if k.startswith(prefix)]
+        for key in keys_to_delete:
+            self._remove(key)
+        return len(keys_to_delete)
+
+    def purge_expired(self) -> int:
+        """
+        删除所有过期条目
+
+        Returns:
+            删除的条目数
+        """
+        now = time.time()
+        expired = [k for k, (_, expire_time, _) in self._entries.items() if expire_time <= now]
+        for key in expired:
+            self._remove(key)
+        self.expirations += len(expired)
+        return len(expired)
+
+    def start_sweeper(self):
+        """
+        在当前事件循环中启动过期清理任务
+        """
+        if self._sweep_task is not None and not self._sweep_task.done():
+            return
+        try:
+            self._sweep_task = asyncio.get_running_loop().create_task(self._sweep_loop())
+        except RuntimeError:
+            # 没有运行中的事件循环，只依赖读取时的惰性清理
+            self._sweep_task = None
+
+    async def stop_sweeper(self):
+        """
+        停止过期清理任务
+        """
+        if self._sweep_task is not None and not self._sweep_task.done():
+            self._sweep_task.cancel()
+            try:
+                await self._sweep_task
+            except asyncio.CancelledError:
+                pass
+        self._sweep_task = None
+
+    async def _sweep_loop(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                removed = self.purge_expired()
+                if removed:
+                    cache_logger.debug(f"[CACHE] 内存缓存清理了 {removed} 个过期条目")
+            except Exception as e:
+                logger.error(f"内存缓存过期清理失败: {str(e)}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
+
+    def _remove(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._total_bytes -= entry[2]
+        return True
+
+    def _evict(self):
+        # 优先淘汰过期条目，再按LRU顺序淘汰
+        if len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+            self.purge_expired()
+        while self._entries and (len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes):
+            key, (_, _, size) = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+
+
 class CacheManager:
     """
     缓存管理器
     支持内存缓存和Redis缓存
+
+    写入Redis的键同时记录在一个有序集合索引中（分数为过期时间），统计信息直接读取索引，
+    清除和列出键使用SCAN分批遍历，不使用会阻塞Redis的KEYS命令
+
+    每个Redis缓存条目另有一个同TTL的元数据键，记录条目数、序列化后的字节数和过期时间，
+    统计页面用一次MGET读取全部元数据，不需要读取和反序列化缓存数据
     """
     
     def __init__(
@@ -24,7 +237,14 @@ class CacheManager:
         redis_url: Optional[str] = None,
         enable_memory_cache: bool = True,
         default_ttl: int = 900,  # 默认缓存时间，单位秒，默认15分钟
-        verbose_logging: bool = False  # 是否启用详细日志记录
+        verbose_logging: bool = False,  # 是否启用详细日志记录
+        memory_max_entries: int = 1000,  # 内存缓存最大条目数
+        memory_max_bytes: int = 64 * 1024 * 1024,  # 内存缓存字节预算，默认64MB
+        memory_sweep_interval: int = 60,  # 内存缓存过期清理间隔，单位秒
+        serializer: Optional[CacheSerializer] = None,  # Redis数据的序列化器，默认使用msgpack
+        key_index: str = "cache:key_index",  # 记录缓存键的有序集合
+        meta_prefix: str = "cache:meta:",  # 缓存元数据键的前缀
+        scan_count: int = 500  # SCAN每批返回的键数量提示
     ):
         self.redis_url = redis_url
         self.enable_memory_cache = enable_memory_cache
@@ -32,7 +252,19 @@ class CacheManager:
         self.verbose_logging = verbose_logging
         
         # 内存缓存
-        self.memory_cache: Dict[str, Dict[str, Any]] = {}
+        self.memory_cache = MemoryCache(
+            max_entries=memory_max_entries,
+            max_bytes=memory_max_bytes,
+            sweep_interval=memory_sweep_interval
+        )
+        
+        # Redis数据的序列化器
+        self.serializer = serializer or get_default_serializer()
+        
+        # 缓存键索引
+        self.key_index = key_index
+        self.meta_prefix = meta_prefix
+        self.scan_count = scan_count
         
         # Redis连接
         self.redis = None
@@ -40,6 +272,10 @@ class CacheManager:
         # 初始化标志
         self.initialized = False
     
+    def meta_key(self, key: str) -> str:
+        """缓存键对应的元数据键"""
+        return f"{self.meta_prefix}{key}"
+    
     def _debug_log(self, message: str):
         """仅在启用详细日志的情况下记录DEBUG日志"""
         if self.verbose_logging:
@@ -67,6 +303,10 @@ class CacheManager:
                 cache_logger.error(f"[BASE-CACHE-INIT] {error_msg}")
                 self.redis = None
         
+        # 启动内存缓存的过期清理任务
+        if self.enable_memory_cache:
+            self.memory_cache.start_sweeper()
+        
         # 初始化完成
         self.initialized = True
         # 简化主日志中的信息
@@ -88,7 +328,8 @@ class CacheManager:
             # 详细信息记录到缓存专用日志
             cache_logger.info("[BASE-CACHE-INIT] Redis连接已关闭")
         
-        # 清空内存缓存
+        # 停止过期清理并清空内存缓存
+        await self.memory_cache.stop_sweeper()
         self.memory_cache.clear()
         
         # 重置初始化标志
@@ -109,15 +350,10 @@ class CacheManager:
         
         # 尝试从内存缓存获取
         if self.enable_memory_cache:
-            cache_item = self.memory_cache.get(key)
-            if cache_item:
-                # 检查是否过期
-                if cache_item.get("expire_time", 0) > time.time():
-                    self._debug_log(f"内存缓存命中: {key}")
-                    return cache_item.get("data")
-                else:
-                    # 过期，删除缓存
-                    del self.memory_cache[key]
+            data = self.memory_cache.get(key)
+            if data is not None:
+                self._debug_log(f"内存缓存命中: {key}")
+                return data
         
         # 如果有Redis连接，则尝试从Redis获取
         if self.redis:
@@ -127,18 +363,14 @@ class CacheManager:
                 if data:
                     # 反序列化
                     try:
-                        result = pickle.loads(data)
+                        result = self.serializer.loads(data)
                         
                         # 如果启用内存缓存，则存入内存缓存
                         if self.enable_memory_cache:
                             # 获取TTL
                             ttl = await self.redis.ttl(key)
                             if ttl > 0:
-                                expire_time = time.time() + ttl
-                                self.memory_cache[key] = {
-                                    "data": result,
-                                    "expire_time": expire_time
-                                }
+                                self.memory_cache.set(key, result, ttl)
                         
                         self._debug_log(f"Redis缓存命中: {key}")
                         return result
@@ -171,20 +403,27 @@ class CacheManager:
         
         # 如果启用内存缓存，则存入内存缓存
         if self.enable_memory_cache:
-            expire_time = time.time() + ttl
-            self.memory_cache[key] = {
-                "data": data,
-                "expire_time": expire_time
-            }
+            self.memory_cache.set(key, data, ttl)
         
         # 如果有Redis连接，则存入Redis
         if self.redis:
             try:
                 # 序列化
-                serialized_data = pickle.dumps(data)
+                serialized_data = self.serializer.dumps(data)
+                
+                expires_at = time.time() + ttl
+                metadata = {
+                    "count": len(data) if isinstance(data, (list, tuple, dict)) else None,
+                    "size": len(serialized_data),
+                    "expires_at": expires_at,
+                }
                 
-                # 存入Redis
-                await self.redis.setex(key, ttl, serialized_data)
+                # 存入Redis，同时写入元数据并在索引中记录过期时间
+                pipe = self.redis.pipeline()
+                pipe.setex(key, ttl, serialized_data)
+                pipe.setex(self.meta_key(key), ttl, json.dumps(metadata))
+                pipe.zadd(self.key_index, expires_at, key)
+                await pipe.execute()
                 
                 # 只记录操作成功的简要日志，如果是缓存批量操作，避免过多日志
                 if self.verbose_logging:
@@ -207,13 +446,16 @@ class CacheManager:
             await self.initialize()
         
         # 如果启用内存缓存，则删除内存缓存
-        if self.enable_memory_cache and key in self.memory_cache:
-            del self.memory_cache[key]
+        if self.enable_memory_cache:
+            self.memory_cache.delete(key)
         
         # 如果有Redis连接，则删除Redis缓存
         if self.redis:
             try:
-                await self.redis.delete(key)
+                pipe = self.redis.pipeline()
+                pipe.delete(key, self.meta_key(key))
+                pipe.zrem(self.key_index, key)
+                await pipe.execute()
                 self._debug_log(f"Redis缓存已删除: {key}")
             except Exception as e:
                 # 错误信息保留在主日志中
@@ -221,9 +463,55 @@ class CacheManager:
                 logger.error(error_msg)
                 cache_logger.error(f"[CACHE-ERROR] {error_msg}")
     
-    async def clear(self, pattern: str = "*"):
+    async def iter_keys(self, pattern: str = "*") -> AsyncIterator[str]:
+        """
+        使用SCAN逐批遍历匹配的Redis键，不会长时间阻塞Redis
+        
+        同一个键在遍历期间可能被返回多次，调用方需要自行去重
+        """
+        if not self.initialized:
+            await self.initialize()
+        if not self.redis:
+            return
+        
+        async for key in self.redis.iscan(match=pattern, count=self.scan_count):
+            yield key.decode() if isinstance(key, bytes) else key
+    
+    async def scan_keys(self, pattern: str = "*") -> List[str]:
+        """
+        获取所有匹配的Redis键（去重后按字典序排列）
+        """
+        keys = set()
+        async for key in self.iter_keys(pattern):
+            keys.add(key)
+        return sorted(keys)
+    
+    async def indexed_keys(self, prefix: str = "") -> List[str]:
+        """
+        从索引中获取未过期的缓存键，不遍历Redis键空间
+        
+        Args:
+            prefix: 只返回以该前缀开头的键
+        """
+        if not self.initialized:
+            await self.initialize()
+        if not self.redis:
+            return []
+        
+        # 先移除已过期的索引记录
+        pipe = self.redis.pipeline()
+        pipe.zremrangebyscore(self.key_index, max=time.time())
+        members = pipe.zrange(self.key_index, 0, -1, encoding="utf-8")
+        await pipe.execute()
+        members = await members
+        return [key for key in members if key.startswith(prefix)]
+    
+    async def clear(self, pattern: str = "*") -> int:
         """
         清空缓存
+        
+        Returns:
+            删除的Redis键数量
         """
         # 确保初始化完成
         if not self.initialized:
@@ -235,27 +523,78 @@ class CacheManager:
                 self.memory_cache.clear()
             else:
                 # 删除匹配的键
-                keys_to_delete = [k for k in self.memory_cache.keys() if k.startswith(pattern.replace("*", ""))]
-                for key in keys_to_delete:
-                    del self.memory_cache[key]
+                self.memory_cache.clear(prefix=pattern.replace("*", ""))
+        
+        deleted = 0
         
         # 如果有Redis连接，则清空Redis缓存
         if self.redis:
             try:
-                # 获取匹配的键
-                keys = await self.redis.keys(pattern)
-                if keys:
-                    # 删除键
-                    await self.redis.delete(*keys)
+                # 按SCAN的批次删除匹配的键，同时从索引中移除
+                batch = []
+                async for key in self.iter_keys(pattern):
+                    batch.append(key)
+                    if len(batch) >= self.scan_count:
+                        deleted += await self._delete_batch(batch)
+                        batch = []
+                if batch:
+                    deleted += await self._delete_batch(batch)
+                
+                if deleted:
                     # 保留简要信息到主日志
-                    logger.info(f"已清空Redis缓存, 模式: {pattern}, 数量: {len(keys)}")
+                    logger.info(f"已清空Redis缓存, 模式: {pattern}, 数量: {deleted}")
                     # 详细信息记录到缓存专用日志
-                    cache_logger.info(f"[CACHE-CLEAR] 已清空Redis缓存, 模式: {pattern}, 数量: {len(keys)}")
+                    cache_logger.info(f"[CACHE-CLEAR] 已清空Redis缓存, 模式: {pattern}, 数量: {deleted}")
             except Exception as e:
                 # 错误信息保留在主日志中
                 error_msg = f"清空Redis缓存失败: {str(e)}"
                 logger.error(error_msg)
                 cache_logger.error(f"[CACHE-ERROR] {error_msg}")
+        
+        return deleted
+    
+    async def _delete_batch(self, keys: List[str]) -> int:
+        pipe = self.redis.pipeline()
+        deleted = pipe.unlink(*keys)
+        pipe.unlink(*[self.meta_key(key) for key in keys])
+        pipe.zrem(self.key_index, *keys)
+        await pipe.execute()
+        return await deleted
+    
+    async def get_metadata(self, keys: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        用一次MGET批量获取缓存条目的元数据
+        
+        Returns:
+            缓存键到元数据的映射，元数据包含count（条目数，非集合类型为None）、
+            size（序列化后的字节数）、expires_at和ttl（剩余秒数）；
+            键不存在或没有元数据（如升级前写入的条目）时为None
+        """
+        if not self.initialized:
+            await self.initialize()
+        result: Dict[str, Optional[Dict[str, Any]]] = {key: None for key in keys}
+        if not self.redis or not keys:
+            return result
+        
+        try:
+            values = await self.redis.mget(*[self.meta_key(key) for key in keys])
+        except Exception as e:
+            error_msg = f"批量获取缓存元数据失败: {str(e)}"
+            logger.error(error_msg)
+            cache_logger.error(f"[CACHE-ERROR] {error_msg}")
+            return result
+        
+        now = time.time()
+        for key, value in zip(keys, values):
+            if not value:
+                continue
+            try:
+                metadata = json.loads(value)
+            except ValueError:
+                continue
+            metadata["ttl"] = max(int(metadata.get("expires_at", now) - now), 0)
+            result[key] = metadata
+        return result
     
     async def get_stats(self) -> Dict[str, Any]:
         """
@@ -269,15 +608,17 @@ class CacheManager:
             "memory_cache_enabled": self.enable_memory_cache,
             "redis_enabled": self.redis is not None,
             "memory_cache_count": len(self.memory_cache) if self.enable_memory_cache else 0,
+            "memory_cache": self.memory_cache.get_stats() if self.enable_memory_cache else {},
             "redis_count": 0
         }
         
         # 如果有Redis连接，则获取Redis统计信息
         if self.redis:
             try:
-                # 获取所有键
-                keys = await self.redis.keys("*")
-                stats["redis_count"] = len(keys)
+                # 缓存键数量来自索引，数据库键总数来自DBSIZE，都不需要遍历键空间
+                await self.redis.zremrangebyscore(self.key_index, max=time.time())
+                stats["redis_count"] = await self.redis.zcard(self.key_index)
+                stats["redis_db_keys"] = await self.redis.dbsize()
                 
                 # 获取Redis信息
                 info = await self.redis.info()
@@ -288,7 +629,7 @@ class CacheManager:
                 }
                 
                 # 记录到缓存专用日志
-                cache_logger.info(f"[CACHE-STATS] Redis统计信息: 键数量={len(keys)}, 内存使用={info.get('used_memory_human', '')}")
+                cache_logger.info(f"[CACHE-STATS] Redis统计信息: 缓存键数量={stats['redis_count']}, 内存使用={info.get('used_memory_human', '')}")
             except Exception as e:
                 # 错误信息保留在主日志中
                 error_msg = f"获取Redis统计信息失败: {str(e)}"
@@ -298,4 +639,4 @@ class CacheManager:
         return stats 
 
 # 创建一个全局的缓存管理器实例供其他模块导入使用
-cache_manager = CacheManager() 
\ No newline at end of file
+cache_manager = CacheManager()
@@ -1,7 +1,9 @@
 import os
 import sys
+import asyncio
 import logging
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
 
 from app.core.config import settings
 
@@ -135,6 +137,38 @@ celery_app.conf.update(
 # 注册任务模块
 celery_app.autodiscover_tasks(["worker.tasks"])
 
+
+# 每个工作进程启动一个常驻事件循环，任务中的协程通过async_runtime.run提交到该循环，
+# 连接池和数据源实例在任务之间复用
+@worker_process_init.connect
+def start_async_runtime(**kwargs):
+    try:
+        from worker.utils.async_runtime import async_runtime
+    except ImportError:
+        from backend.worker.utils.async_runtime import async_runtime
+    async_runtime.start()
+
+
+@worker_process_shutdown.connect
+def stop_async_runtime(**kwargs):
+    try:
+        from worker.utils.async_runtime import async_runtime
+        from worker.utils.proxy_manager import proxy_manager
+    except ImportError:
+        from backend.worker.utils.async_runtime import async_runtime
+        from backend.worker.utils.proxy_manager import proxy_manager
+
+    # 子进程退出前写入内存中尚未落库的代理使用统计
+    try:
+        if async_runtime.is_running:
+            async_runtime.run(proxy_manager.flush_proxy_stats(), timeout=10)
+        else:
+            asyncio.run(proxy_manager.flush_proxy_stats())
+    except Exception as e:
+        logger.warning(f"写入代理使用统计时出错: {str(e)}")
+    async_runtime.stop()
+
+
 # 应用事件循环修复日志
 if fixes_applied and VERBOSE_LOGGING:
     logger.info(f"应用的事件循环修复: {fixes_applied}")
@@ -10,6 +10,7 @@ import aiohttp_cors
 
 from worker.cache import CacheManager
 from worker.scheduler import AdaptiveScheduler
+from worker.sources.adapter_registry import adapter_registry
 from worker.sources.factory import NewsSourceFactory
 from worker.sources.provider import DefaultNewsSourceProvider, NewsSourceProvider
 
@@ -42,7 +43,9 @@ class NewsWorker:
         api_port: int = 8000,
         enable_cors: bool = True,
         use_api_for_data: bool = False,  # 是否使用API获取数据
-        api_base_url: str = "http://localhost:8000"  # API基础URL
+        api_base_url: str = "http://localhost:8000",  # API基础URL
+        max_concurrency: int = 8,  # 同时抓取的数据源数量上限
+        max_per_host: int = 2  # 同一主机同时抓取的数据源数量上限
     ):
         self.redis_url = redis_url
         self.enable_memory_cache = enable_memory_cache
@@ -71,7 +74,9 @@ class NewsWorker:
             min_interval=min_interval,
             max_interval=max_interval,
             enable_adaptive=enable_adaptive,
-            api_base_url=self.api_base_url if self.use_api_for_data else None
+            api_base_url=self.api_base_url if self.use_api_for_data else None,
+            max_concurrency=max_concurrency,
+            max_per_host=max_per_host
         )
         
         # 创建API服务
@@ -118,6 +123,9 @@ class NewsWorker:
         # 初始化调度器
         await self.scheduler.initialize()
         
+        # 输出适配器模块的导入耗时
+        adapter_registry.log_import_report()
+        
         # 启动调度器任务
         self.scheduler_task = asyncio.create_task(self.scheduler.run_forever())
         
@@ -378,6 +386,8 @@ async def main():
     parser.add_argument("--no-cors", help="Disable CORS", action="store_true")
     parser.add_argument("--use-api", help="Use API to fetch data instead of direct fetch", action="store_true")
     parser.add_argument("--api-base-url", help="API base URL", default="http://localhost:8000")
+    parser.add_argument("--max-concurrency", help="Maximum number of sources fetched concurrently", type=int, default=8)
+    parser.add_argument("--max-per-host", help="Maximum number of concurrent fetches per host", type=int, default=2)
     
     args = parser.parse_args()
     
@@ -392,7 +402,9 @@ async def main():
         api_port=args.port,
         enable_cors=not args.no_cors,
         use_api_for_data=args.use_api,
-        api_base_url=args.api_base_url
+        api_base_url=args.api_base_url,
+        max_concurrency=args.max_concurrency,
+        max_per_host=args.max_per_host
     )
     
     # 启动工作器
@@ -1,8 +1,11 @@
 import logging
 import asyncio
+import heapq
 import time
 import datetime
-from typing import Dict, List, Any, Optional, Set
+from contextlib import asynccontextmanager
+from typing import Dict, List, Any, Optional, Set, Tuple
+from urllib.parse import urlparse
 
 # 引入接口而不是具体实现
 from worker.sources.interface import NewsSourceInterface  
@@ -16,6 +19,10 @@ class AdaptiveScheduler:
     """
     自适应调度器
     根据数据源的更新频率和重要性动态调整抓取任务的执行频率
+
+    数据源按下次抓取时间放入最小堆，调度循环睡眠到最早的到期时间，
+    到期的数据源并发抓取，并受全局和单主机并发数限制，
+    慢数据源不会阻塞其他数据源的刷新
     """
     
     def __init__(
@@ -27,6 +34,8 @@ class AdaptiveScheduler:
         enable_adaptive: bool = True,  # 是否启用自适应调度
         enable_cache: bool = True,  # 是否启用缓存
         api_base_url: str = None,  # API基础URL，如果设置，将通过API获取数据
+        max_concurrency: int = 8,  # 同时抓取的数据源数量上限
+        max_per_host: int = 2,  # 同一主机同时抓取的数据源数量上限
     ):
         self.source_provider = source_provider  # 保存提供者引用
         self.cache_manager = cache_manager
@@ -35,6 +44,8 @@ class AdaptiveScheduler:
         self.enable_adaptive = enable_adaptive
         self.enable_cache = enable_cache
         self.api_base_url = api_base_url  # 保存API基础URL
+        self.max_concurrency = max_concurrency
+        self.max_per_host = max_per_host
         
         # 存储数据源的最后抓取时间
         self.last_fetch_time: Dict[str, float] = {}
@@ -51,6 +62,23 @@ class AdaptiveScheduler:
         # 存储正在执行的任务
         self.running_tasks: Set[str] = set()
         
+        # 存储数据源的下次抓取时间
+        self.next_fetch_time: Dict[str, float] = {}
+        
+        # 按下次抓取时间排序的最小堆，元素为(到期时间, 数据源ID)
+        # 重新计划时不删除旧元素，出堆时与next_fetch_time不一致的元素直接丢弃
+        self._due_heap: List[Tuple[float, str]] = []
+        
+        # 并发限制
+        self._global_semaphore = asyncio.Semaphore(max_concurrency)
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        
+        # 调度循环派发的抓取任务
+        self._inflight: Set[asyncio.Task] = set()
+        
+        # 抓取计划变化时唤醒调度循环
+        self._wakeup = asyncio.Event()
+        
         # 初始化标志
         self.initialized = False
     
@@ -89,6 +117,72 @@ class AdaptiveScheduler:
         
         # 初始化更新频率评分
         self.update_frequency_scores[source_id] = 0.5  # 初始评分为中等
+        
+        # 新数据源立即到期
+        self._schedule(source_id, 0)
+    
+    def _schedule(self, source_id: str, due: float):
+        """
+        设置数据源的下次抓取时间
+        """
+        self.next_fetch_time[source_id] = due
+        heapq.heappush(self._due_heap, (due, source_id))
+        
+        # 过期元素过多时重建堆
+        if len(self._due_heap) > 2 * len(self.next_fetch_time) + 16:
+            self._due_heap = [(when, sid) for sid, when in self.next_fetch_time.items()]
+            heapq.heapify(self._due_heap)
+        
+        self._wakeup.set()
+    
+    def _pop_due(self, now: float) -> List[str]:
+        """
+        取出所有已到期的数据源
+        """
+        due = []
+        while self._due_heap and self._due_heap[0][0] <= now:
+            when, source_id = heapq.heappop(self._due_heap)
+            # 已被重新计划的过期元素
+            if self.next_fetch_time.get(source_id) != when:
+                continue
+            # 正在抓取的数据源在完成后会重新计划
+            if source_id in self.running_tasks:
+                continue
+            due.append(source_id)
+        return due
+    
+    def _sync_sources(self):
+        """
+        为新注册的数据源建立抓取计划
+        """
+        for source in self.source_provider.get_all_sources():
+            source_id = source.source_id
+            if source_id in self.next_fetch_time or source_id in self.running_tasks:
+                continue
+            if source_id not in self.dynamic_intervals:
+                self._initialize_source_state(source)
+            else:
+                self._schedule(source_id, self.last_fetch_time.get(source_id, 0) + self.dynamic_intervals[source_id])
+    
+    def _host_key(self, source: NewsSourceInterface) -> str:
+        """
+        获取单主机并发限制使用的主机名，没有URL的数据源各自独立
+        """
+        url = getattr(source, "url", None) or ""
+        return urlparse(url).hostname or source.source_id
+    
+    @asynccontextmanager
+    async def _fetch_slot(self, source: NewsSourceInterface):
+        """
+        占用一个抓取名额，先取主机名额再取全局名额，等待主机名额时不占用全局名额
+        """
+        host = self._host_key(source)
+        host_semaphore = self._host_semaphores.get(host)
+        if host_semaphore is None:
+            host_semaphore = self._host_semaphores[host] = asyncio.Semaphore(self.max_per_host)
+        async with host_semaphore:
+            async with self._global_semaphore:
+                yield
 
     def should_fetch(self, source_id: str) -> bool:
         """
@@ -132,6 +226,7 @@ class AdaptiveScheduler:
         source = self.source_provider.get_source(source_id)
         if not source:
             logger.warning(f"Source {source_id} not found")
+            self.next_fetch_time.pop(source_id, None)
             return False
         
         # 如果数据源正在抓取，则不重复抓取
@@ -143,64 +238,96 @@ class AdaptiveScheduler:
         if not force and not self.should_fetch(source_id):
             return False
         
-        # 标记为正在抓取
+        return await self._fetch(source, force)
+    
+    async def _fetch_due(self, source_id: str) -> bool:
+        """
+        抓取调度循环取出的到期数据源，到期判断已由最小堆完成
+        """
+        source = self.source_provider.get_source(source_id)
+        if not source:
+            self.next_fetch_time.pop(source_id, None)
+            return False
+        if source_id in self.running_tasks:
+            return False
+        return await self._fetch(source, force=False)
+    
+    async def _fetch(self, source: NewsSourceInterface, force: bool) -> bool:
+        """
+        在并发限制内抓取数据源，完成后重新计划下次抓取
+        """
+        source_id = source.source_id
+        
+        # 标记为正在抓取，等待名额期间也不会重复派发
         self.running_tasks.add(source_id)
         
         try:
-            # 记录开始时间
-            start_time = time.time()
-            
-            # 通过API抓取数据或直接从源抓取
-            try:
-                # 尝试通过API获取数据
-                if hasattr(self, 'api_base_url') and self.api_base_url:
-                    news_items = await self._fetch_source_via_api(source_id, force)
-                    logger.info(f"Fetched source {source_id} via API")
-                else:
-                    # 如果没有设置API基础URL，则直接从源获取
-                    news_items = await source.get_news(force_update=force)
-                    logger.info(f"Fetched source {source_id} directly from source")
-                success = True
-                error = None
-            except Exception as e:
-                logger.exception(f"Error fetching source {source_id}: {str(e)}")
-                news_items = []
-                success = False
-                error = e
-            
-            # 记录结束时间
-            end_time = time.time()
-            
-            # 更新最后抓取时间
-            self.last_fetch_time[source_id] = end_time
-            
-            # 更新源的指标
-            source.update_metrics(len(news_items), success, error)
-            
-            # 调整抓取间隔
-            if self.enable_adaptive:
-                self._adjust_interval(source_id, news_items, end_time - start_time)
-            
-            if success:
-                logger.info(f"Successfully fetched {len(news_items)} items from {source_id} in {end_time - start_time:.2f}s")
-                
-                # 将新闻条目保存到Redis缓存
-                if self.cache_manager and news_items:
-                    try:
-                        cache_key = f"source:{source_id}"
-                        # 使用源的cache_ttl作为Redis缓存的过期时间
-                        ttl = getattr(source, 'cache_ttl', 900)  # 默认15分钟
-                        await self.cache_manager.set(cache_key, news_items, ttl)
-                        logger.info(f"Saved {len(news_items)} news items to Redis cache with key: {cache_key}, TTL: {ttl}s")
-                    except Exception as cache_error:
-                        logger.error(f"Failed to save news items to Redis cache: {str(cache_error)}")
-            else:
-                logger.error(f"Failed to fetch from {source_id} after {end_time - start_time:.2f}s")
-                
-            return success
+            async with self._fetch_slot(source):
+                return await self._fetch_and_store(source, force)
         finally:
             # 移除正在抓取标记
-            self.running_tasks.remove(source_id)
+            self.running_tasks.discard(source_id)
+            # 按最后抓取时间和调整后的间隔重新计划
+            interval = self.dynamic_intervals.get(source_id, source.update_interval)
+            self._schedule(source_id, self.last_fetch_time.get(source_id, 0) + interval)
+    
+    async def _fetch_and_store(self, source: NewsSourceInterface, force: bool) -> bool:
+        """
+        抓取数据源并更新指标和缓存
+        """
+        source_id = source.source_id
+        
+        # 记录开始时间
+        start_time = time.time()
+        
+        # 通过API抓取数据或直接从源抓取
+        try:
+            # 尝试通过API获取数据
+            if hasattr(self, 'api_base_url') and self.api_base_url:
+                news_items = await self._fetch_source_via_api(source_id, force)
+                logger.info(f"Fetched source {source_id} via API")
+            else:
+                # 如果没有设置API基础URL，则直接从源获取
+                news_items = await source.get_news(force_update=force)
+                logger.info(f"Fetched source {source_id} directly from source")
+            success = True
+            error = None
+        except Exception as e:
+            logger.exception(f"Error fetching source {source_id}: {str(e)}")
+            news_items = []
+            success = False
+            error = e
+        
+        # 记录结束时间
+        end_time = time.time()
+        
+        # 更新最后抓取时间
+        self.last_fetch_time[source_id] = end_time
+        
+        # 更新源的指标
+        source.update_metrics(len(news_items), success, error)
+        
+        # 调整抓取间隔
+        if self.enable_adaptive:
+            self._adjust_interval(source_id, news_items, end_time - start_time)
+        
+        if success:
+            logger.info(f"Successfully fetched {len(news_items)} items from {source_id} in {end_time - start_time:.2f}s")
+            
+            # 将新闻条目保存到Redis缓存
+            if self.cache_manager and news_items:
+                try:
+                    cache_key = f"source:{source_id}"
+                    # 使用源的cache_ttl作为Redis缓存的过期时间
+                    ttl = getattr(source, 'cache_ttl', 900)  # 默认15分钟
+                    await self.cache_manager.set(cache_key, news_items, ttl)
+                    logger.info(f"Saved {len(news_items)} news items to Redis cache with key: {cache_key}, TTL: {ttl}s")
+                except Exception as cache_error:
+                    logger.error(f"Failed to save news items to Redis cache: {str(cache_error)}")
+        else:
+            logger.error(f"Failed to fetch from {source_id} after {end_time - start_time:.2f}s")
+            
+        return success
     
     async def _fetch_source_via_api(self, source_id: str, force: bool = False) -> List[Any]:
         """
@@ -345,27 +472,53 @@ class AdaptiveScheduler:
             self.dynamic_intervals[source_id] = new_interval
             logger.info(f"Increased interval for source: {source_id}, from {current_interval}s to {new_interval}s")
     
-    async def run_once(self, force: bool = False):
+    async def run_once(self, force: bool = False) -> Dict[str, bool]:
         """
-        运行一次调度
+        运行一次调度，并发抓取所有到期的数据源
+        
+        Args:
+            force: 是否强制抓取所有数据源
+            
+        Returns:
+            各数据源是否抓取成功
         """
         # 确保初始化完成
         if not self.initialized:
             await self.initialize()
         
-        # 获取所有数据源ID
-        source_ids = list(self.sources.keys())
+        self._sync_sources()
+        
+        if force:
+            source_ids = [source.source_id for source in self.source_provider.get_all_sources()]
+            coros = [self.fetch_source(source_id, force=True) for source_id in source_ids]
+        else:
+            source_ids = self._pop_due(time.time())
+            coros = [self._fetch_due(source_id) for source_id in source_ids]
+        
+        results = await asyncio.gather(*coros, return_exceptions=True)
         
-        # 遍历所有数据源
-        for source_id in source_ids:
-            # 判断是否应该抓取
-            if force or self.should_fetch(source_id):
-                # 抓取数据源
-                await self.fetch_source(source_id, force)
+        outcome = {}
+        for source_id, result in zip(source_ids, results):
+            if isinstance(result, Exception):
+                logger.error(f"Unexpected error fetching source {source_id}: {str(result)}")
+            outcome[source_id] = result is True
+        return outcome
+    
+    def _dispatch_due(self):
+        """
+        为所有到期的数据源创建后台抓取任务
+        """
+        for source_id in self._pop_due(time.time()):
+            task = asyncio.create_task(self._fetch_due(source_id))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
     
     async def run_forever(self, check_interval: int = 10):
         """
         持续运行调度
+        
+        Args:
+            check_interval: 最长睡眠时间，单位秒，用于发现新注册的数据源
         """
         # 确保初始化完成
         if not self.initialized:
@@ -375,12 +528,22 @@ class AdaptiveScheduler:
         
         try:
             while True:
-                # 运行一次调度
-                await self.run_once()
+                self._sync_sources()
+                self._dispatch_due()
                 
-                # 等待一段时间
-                await asyncio.sleep(check_interval)
+                # 睡到最早的到期时间，抓取完成重新计划时提前唤醒
+                self._wakeup.clear()
+                delay = check_interval
+                if self._due_heap:
+                    delay = min(delay, max(0, self._due_heap[0][0] - time.time()))
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
         except asyncio.CancelledError:
+            for task in list(self._inflight):
+                task.cancel()
+            await asyncio.gather(*self._inflight, return_exceptions=True)
             logger.info("Scheduler stopped")
         except Exception as e:
             logger.error(f"Scheduler error: {str(e)}")
@@ -390,18 +553,22 @@ class AdaptiveScheduler:
         """
         获取调度器状态
         """
+        sources = self.source_provider.get_all_sources()
         status = {
-            "sources_count": len(self.sources),
+            "sources_count": len(sources),
             "running_tasks": len(self.running_tasks),
+            "max_concurrency": self.max_concurrency,
+            "max_per_host": self.max_per_host,
             "sources": []
         }
         
         # 获取所有数据源状态
-        for source_id, source in self.sources.items():
+        for source in sources:
+            source_id = source.source_id
             last_fetch = self.last_fetch_time.get(source_id, 0)
             last_fetch_time = datetime.datetime.fromtimestamp(last_fetch).isoformat() if last_fetch > 0 else None
             
-            next_fetch = last_fetch + self.dynamic_intervals.get(source_id, source.update_interval)
+            next_fetch = self.next_fetch_time.get(source_id, last_fetch + self.dynamic_intervals.get(source_id, source.update_interval))
             next_fetch_time = datetime.datetime.fromtimestamp(next_fetch).isoformat() if next_fetch > 0 else None
             
             source_status = {
@@ -0,0 +1,240 @@
+"""
+新闻源适配器注册表
+
+按数据源类型记录适配器所在的模块和类名，首次创建该类型的数据源时才导入模块，
+API进程和Celery子进程启动时不再导入全部站点模块以及selenium、jieba等重量级依赖。
+
+每个模块首次导入的耗时会被记录下来，get_import_report()返回按耗时排序的报告。
+耗时是增量的：多个模块共享的依赖计入最先导入它的模块。
+
+直接运行本模块会导入全部适配器并输出导入耗时报告:
+    python -m worker.sources.adapter_registry
+"""
+
+import importlib
+import logging
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+SITES_PACKAGE = "worker.sources.sites"
+
+
+class AdapterSpec(NamedTuple):
+    """
+    适配器定义
+    """
+    module: str  # 适配器所在模块
+    class_name: str  # 适配器类名
+    defaults: Optional[Dict[str, Any]] = None  # 创建时的默认参数，调用方传入的参数优先
+
+
+def _site(module: str, class_name: str, **defaults) -> AdapterSpec:
+    return AdapterSpec(f"{SITES_PACKAGE}.{module}", class_name, defaults or None)
+
+
+def _rss(**defaults) -> AdapterSpec:
+    return AdapterSpec("worker.sources.rss", "RSSNewsSource", defaults)
+
+
+# 数据源类型到适配器的映射
+ADAPTERS: Dict[str, AdapterSpec] = {
+    "zhihu": _site("zhihu", "ZhihuHotNewsSource"),
+    "weibo": _site("weibo", "WeiboHotNewsSource"),
+    "baidu": _site("baidu", "BaiduHotNewsSource"),
+    "hackernews": _site("hackernews", "HackerNewsSource"),
+    "bilibili": _site("bilibili", "BilibiliHotNewsSource"),
+    "douyin": _site("douyin", "DouyinHotNewsSource"),
+    "toutiao": _site("toutiao", "ToutiaoHotNewsSource"),
+    "thepaper": _site("thepaper_selenium", "ThePaperSeleniumSource"),
+    "ithome": _site("ithome", "ITHomeNewsSource"),
+    "github": _site("github", "GitHubTrendingSource"),
+    "v2ex": _site("v2ex", "V2EXSeleniumSource"),
+    "xueqiu": _site("xueqiu", "XueqiuHotStockSource"),
+    "tieba": _site("tieba", "TiebaHotTopicSource"),
+    "kuaishou": _site("kuaishou", "KuaishouHotSearchSource"),
+    "jin10": _site("jin10", "Jin10NewsSource"),
+    "cankaoxiaoxi": _site("cankaoxiaoxi", "CanKaoXiaoXiNewsSource"),
+    "solidot": _site("solidot", "SolidotNewsSource"),
+    "zaobao": _site("zaobao", "ZaoBaoNewsSource"),
+    "sputniknewscn": _site("sputniknewscn", "SputnikNewsCNSource"),
+    "producthunt": _site("producthunt", "ProductHuntNewsSource"),
+    "linuxdo": _site("linuxdo", "LinuxDoNewsSource"),
+    "linuxdo-latest": _site("linuxdo", "LinuxDoLatestNewsSource"),
+    "linuxdo-hot": _site("linuxdo", "LinuxDoHotNewsSource"),
+    "kaopu": _site("kaopu", "KaoPuNewsSource"),
+    "gelonghui": _site("gelonghui", "GeLongHuiNewsSource"),
+    "fastbull": _site("fastbull", "FastBullExpressNewsSource"),
+    "fastbull-express": _site("fastbull", "FastBullExpressNewsSource"),
+    "fastbull-news": _site("fastbull", "FastBullGeneralNewsSource"),
+    "wallstreetcn": _site("wallstreetcn", "WallStreetCNLiveNewsSource"),
+    "wallstreetcn-news": _site("wallstreetcn", "WallStreetCNNewsSource"),
+    "wallstreetcn-hot": _site("wallstreetcn", "WallStreetCNHotNewsSource"),
+    "36kr": _site("kr36", "Kr36NewsSource"),
+    "coolapk": _site("coolapk", "CoolApkNewsSource"),
+    "coolapk-feed": _site("coolapk", "CoolApkFeedNewsSource"),
+    "coolapk-app": _site("coolapk", "CoolApkAppNewsSource"),
+    "cls": _site("cls", "CLSNewsSource"),
+    "bbc_world": _site("bbc", "BBCWorldNewsSource"),
+    "bloomberg": _site("bloomberg", "BloombergNewsSource"),
+    "bloomberg-markets": _site("bloomberg", "BloombergMarketsNewsSource"),
+    "bloomberg-tech": _site("bloomberg", "BloombergTechnologyNewsSource"),
+    # bloomberg-china已被合并到bloomberg中，保留以兼容旧配置
+    "bloomberg-china": _site("bloomberg", "BloombergNewsSource", source_id="bloomberg", country="CN"),
+    "yicai-brief": _site("yicai", "YiCaiBriefSource"),
+    "yicai-news": _site("yicai", "YiCaiNewsSource"),
+    "ifeng-studio": _site("ifeng", "IfengStudioSource"),
+    "ifeng-tech": _site("ifeng", "IfengTechSource"),
+    "zhihu_daily": _site("zhihu_daily", "ZhihuDailyNewsSource"),
+    "ifanr": _rss(
+        source_id="ifanr",
+        name="爱范儿",
+        feed_url="https://www.ifanr.com/feed",
+        category="technology",
+        country="CN",
+        language="zh-CN",
+        update_interval=1800,  # 30分钟更新一次
+        config={
+            "fetch_content": True,
+            "content_selector": ".article-content"
+        }
+    ),
+    "techcrunch": _rss(
+        source_id="techcrunch",
+        name="TechCrunch",
+        feed_url="https://techcrunch.com/feed/",
+        category="technology",
+        country="US",
+        language="en",
+        update_interval=1800,  # 30分钟更新一次
+        config={
+            "fetch_content": True,
+            "content_selector": ".article-content"
+        }
+    ),
+    "the_verge": _rss(
+        source_id="the_verge",
+        name="The Verge",
+        feed_url="https://www.theverge.com/rss/index.xml",
+        category="technology",
+        country="US",
+        language="en",
+        update_interval=1800,  # 30分钟更新一次
+        config={
+            "fetch_content": True,
+            "content_selector": ".c-entry-content"
+        }
+    ),
+}
+
+
+class AdapterRegistry:
+    """
+    延迟加载的适配器注册表
+    """
+
+    def __init__(self, adapters: Optional[Dict[str, AdapterSpec]] = None):
+        self._adapters: Dict[str, AdapterSpec] = dict(adapters or {})
+        self._import_costs: Dict[str, float] = {}
+        self._lock = threading.RLock()
+
+    def register(self, source_type: str, module: str, class_name: str, **defaults) -> None:
+        """
+        注册或覆盖一个适配器
+        """
+        self._adapters[source_type] = AdapterSpec(module, class_name, defaults or None)
+
+    def is_registered(self, source_type: str) -> bool:
+        return source_type in self._adapters
+
+    def source_types(self) -> List[str]:
+        return list(self._adapters)
+
+    def _import(self, module_name: str):
+        """
+        导入模块并记录首次导入的耗时
+        """
+        with self._lock:
+            if module_name in sys.modules:
+                return importlib.import_module(module_name)
+
+            start_time = time.perf_counter()
+            module = importlib.import_module(module_name)
+            cost = time.perf_counter() - start_time
+            self._import_costs[module_name] = cost
+            logger.debug(f"导入适配器模块 {module_name} 耗时 {cost * 1000:.1f}ms")
+            return module
+
+    def load_class(self, source_type: str) -> Optional[type]:
+        """
+        导入并返回数据源类型对应的适配器类，未注册时返回None
+        """
+        spec = self._adapters.get(source_type)
+        if spec is None:
+            return None
+        return getattr(self._import(spec.module), spec.class_name)
+
+    def create(self, source_type: str, **kwargs):
+        """
+        创建数据源实例，未注册时返回None
+        """
+        spec = self._adapters.get(source_type)
+        if spec is None:
+            return None
+        source_class = self.load_class(source_type)
+        params = dict(spec.defaults or {})
+        params.update(kwargs)
+        return source_class(**params)
+
+    def warm_up(self, source_types: Iterable[str]) -> List[str]:
+        """
+        预先导入指定数据源类型的适配器模块
+
+        Returns:
+            成功导入的数据源类型
+        """
+        loaded = []
+        for source_type in source_types:
+            try:
+                if self.load_class(source_type) is not None:
+                    loaded.append(source_type)
+                else:
+                    logger.warning(f"预加载的数据源类型未注册: {source_type}")
+            except Exception as e:
+                logger.error(f"预加载适配器 {source_type} 失败: {str(e)}")
+        return loaded
+
+    def get_import_report(self) -> List[Dict[str, Any]]:
+        """
+        获取适配器模块的导入耗时报告，按耗时倒序
+        """
+        return [
+            {"module": module, "seconds": round(cost, 4)}
+            for module, cost in sorted(self._import_costs.items(), key=lambda item: item[1], reverse=True)
+        ]
+
+    def log_import_report(self, top: int = 10) -> None:
+        """
+        在日志中输出导入耗时最多的模块
+        """
+        report = self.get_import_report()
+        if not report:
+            logger.info("尚未导入任何适配器模块")
+            return
+        total = sum(entry["seconds"] for entry in report)
+        logger.info(f"已导入 {len(report)} 个适配器模块，共耗时 {total:.2f}s，耗时最多的模块:")
+        for entry in report[:top]:
+            logger.info(f"  {entry['module']}: {entry['seconds'] * 1000:.1f}ms")
+
+
+# 全局单例
+adapter_registry = AdapterRegistry(ADAPTERS)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    adapter_registry.warm_up(adapter_registry.source_types())
+    adapter_registry.log_import_report(top=len(ADAPTERS))
@@ -1,11 +1,11 @@
 import logging
 import datetime
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional
 from collections import defaultdict
 import jieba
 import jieba.analyse
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from scipy.sparse import csr_matrix, vstack
+from sklearn.preprocessing import normalize
 import numpy as np
 
 from worker.sources.base import NewsItemModel
@@ -28,6 +28,19 @@ class NewsCluster:
         self.created_at = datetime.datetime.now()  # 创建时间
         self.updated_at = self.created_at  # 更新时间
         self.score = 0  # 热度分数
+        self.term_counts: Optional[csr_matrix] = None  # 聚类内所有新闻的词频之和，用于计算质心
+    
+    def add_term_counts(self, counts: csr_matrix) -> None:
+        """
+        累加新闻的词频向量到聚类质心
+        """
+        if self.term_counts is None:
+            self.term_counts = counts
+            return
+        
+        # 词表增长后旧向量的列数较少，需要先补齐
+        width = max(self.term_counts.shape[1], counts.shape[1])
+        self.term_counts = _pad_columns(self.term_counts, width) + _pad_columns(counts, width)
     
     def add_news(self, news: NewsItemModel) -> None:
         """
@@ -107,6 +120,93 @@ class NewsCluster:
         }
 
 
+def _pad_columns(matrix: csr_matrix, width: int) -> csr_matrix:
+    """
+    将稀疏矩阵的列数补齐到指定宽度
+    """
+    if matrix.shape[1] >= width:
+        return matrix
+    padded = matrix.copy()
+    padded.resize((matrix.shape[0], width))
+    return padded
+
+
+class IncrementalTfidfVectorizer:
+    """
+    增量TF-IDF向量化器
+    词表和文档频率在多个批次之间持续累积，新批次无需重新拟合
+    """
+    
+    def __init__(self, stop_words: List[str], max_features: int = 50000):
+        self.stop_words = set(stop_words)
+        self.max_features = max_features  # 词表上限，超过后新词被忽略
+        self.vocabulary: Dict[str, int] = {}
+        self.doc_freq = np.zeros(0, dtype=np.float64)
+        self.n_docs = 0
+    
+    def tokenize(self, text: str) -> List[str]:
+        """
+        分词，去除停用词和纯标点
+        """
+        tokens = []
+        for token in jieba.lcut(text):
+            token = token.strip().lower()
+            if token and token not in self.stop_words and any(ch.isalnum() for ch in token):
+                tokens.append(token)
+        return tokens
+    
+    def partial_fit_transform(self, token_lists: List[List[str]]) -> csr_matrix:
+        """
+        更新词表和文档频率，返回这批文本的词频矩阵
+        """
+        counts = self._count(token_lists, grow=True)
+        
+        if len(self.vocabulary) > len(self.doc_freq):
+            self.doc_freq = np.concatenate([
+                self.doc_freq, np.zeros(len(self.vocabulary) - len(self.doc_freq))
+            ])
+        
+        # 每条文本中出现的词各计一次文档频率
+        self.doc_freq += np.bincount(counts.indices, minlength=len(self.doc_freq))
+        self.n_docs += len(token_lists)
+        return counts
+    
+    def transform(self, token_lists: List[List[str]]) -> csr_matrix:
+        """
+        按当前词表计算词频矩阵，不更新统计
+        """
+        return self._count(token_lists, grow=False)
+    
+    def weight(self, counts: csr_matrix) -> csr_matrix:
+        """
+        将词频矩阵转换为L2归一化的TF-IDF矩阵
+        """
+        counts = _pad_columns(counts, len(self.doc_freq))
+        idf = np.log((1 + self.n_docs) / (1 + self.doc_freq)) + 1
+        return normalize(csr_matrix(counts.multiply(idf)))
+    
+    def _count(self, token_lists: List[List[str]], grow: bool) -> csr_matrix:
+        rows, cols, data = [], [], []
+        for row, tokens in enumerate(token_lists):
+            term_counts: Dict[int, int] = defaultdict(int)
+            for token in tokens:
+                index = self.vocabulary.get(token)
+                if index is None:
+                    if not grow or len(self.vocabulary) >= self.max_features:
+                        continue
+                    index = len(self.vocabulary)
+                    self.vocabulary[token] = index
+                term_counts[index] += 1
+            rows.extend([row] * len(term_counts))
+            cols.extend(term_counts.keys())
+            data.extend(term_counts.values())
+        
+        return csr_matrix(
+            (np.asarray(data, dtype=np.float64), (rows, cols)),
+            shape=(len(token_lists), len(self.vocabulary))
+        )
+
+
 class NewsAggregator:
     """
     新闻聚合器
@@ -115,22 +215,12 @@ class NewsAggregator:
     
     def __init__(self):
         self.clusters: List[NewsCluster] = []
-        self.vectorizer = TfidfVectorizer(
-            analyzer='word',
-            tokenizer=self._tokenize,
-            stop_words=self._get_stop_words(),
-            max_features=5000
-        )
+        self.vectorizer = IncrementalTfidfVectorizer(stop_words=self._get_stop_words())
         self.similarity_threshold = 0.6  # 相似度阈值
         self.max_clusters = 100  # 最大聚类数量
+        self.batch_size = 256  # 每次矩阵运算处理的新闻数量
         self.last_update_time = 0  # 上次更新时间
     
-    def _tokenize(self, text: str) -> List[str]:
-        """
-        分词
-        """
-        return jieba.lcut(text)
-    
     def _get_stop_words(self) -> List[str]:
         """
         获取停用词
@@ -138,76 +228,99 @@ class NewsAggregator:
         # 简单的停用词列表，实际应用中可以加载更完整的停用词表
         return ['的', '了', '和', '是', '在', '有', '为', '与', '等', '这', '那', '也', '中', '上', '下']
     
-    def _calculate_similarity(self, news1: NewsItemModel, news2: NewsItemModel) -> float:
+    def _get_news_text(self, news: NewsItemModel) -> str:
         """
-        计算两条新闻的相似度
+        合并标题和摘要作为聚类文本
         """
-        # 合并标题和摘要
-        text1 = news1.title
-        if news1.summary:
-            text1 += " " + news1.summary
-        
-        text2 = news2.title
-        if news2.summary:
-            text2 += " " + news2.summary
-        
-        # 转换为TF-IDF向量
-        try:
-            tfidf_matrix = self.vectorizer.fit_transform([text1, text2])
-            # 计算余弦相似度
-            similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-            return similarity
-        except Exception as e:
-            logger.error(f"Error calculating similarity: {str(e)}")
-            # 如果计算失败，使用简单的标题比较
-            from difflib import SequenceMatcher
-            return SequenceMatcher(None, news1.title, news2.title).ratio()
+        if news.summary:
+            return news.title + " " + news.summary
+        return news.title
     
-    def _find_best_cluster(self, news: NewsItemModel) -> Tuple[Optional[NewsCluster], float]:
+    def _calculate_similarity(self, news1: NewsItemModel, news2: NewsItemModel) -> float:
         """
-        为新闻找到最佳聚类
-        返回最佳聚类和相似度
+        计算两条新闻的相似度
         """
-        best_cluster = None
-        best_similarity = 0
-        
-        for cluster in self.clusters:
-            similarity = self._calculate_similarity(news, cluster.main_news)
-            if similarity > best_similarity:
-                best_similarity = similarity
-                best_cluster = cluster
-        
-        return best_cluster, best_similarity
+        token_lists = [self.vectorizer.tokenize(self._get_news_text(news)) for news in (news1, news2)]
+        vectors = self.vectorizer.weight(self.vectorizer.transform(token_lists))
+        return float(vectors[0].multiply(vectors[1]).sum())
     
     def add_news(self, news: NewsItemModel) -> None:
         """
         添加新闻到聚合器
         """
-        # 查找最佳聚类
-        best_cluster, similarity = self._find_best_cluster(news)
+        self.add_news_batch([news])
+    
+    def add_news_batch(self, news_items: List[NewsItemModel]) -> None:
+        """
+        批量添加新闻
+        每个分块只做一次分词和一次与聚类质心的矩阵乘法
+        """
+        for start in range(0, len(news_items), self.batch_size):
+            self._assign_chunk(news_items[start:start + self.batch_size])
+    
+    def _assign_chunk(self, news_items: List[NewsItemModel]) -> None:
+        """
+        将一批新闻分配到最相似的聚类
+        
+        已有聚类按质心比较，同一批次中新建的聚类按其首条新闻比较，
+        质心在批次结束后才反映本批次新增的新闻
+        """
+        if not news_items:
+            return
         
-        # 如果相似度超过阈值，添加到现有聚类
-        if best_cluster and similarity >= self.similarity_threshold:
-            best_cluster.add_news(news)
-            logger.debug(f"Added news to existing cluster: {news.title[:30]}... (similarity: {similarity:.2f})")
+        token_lists = [self.vectorizer.tokenize(self._get_news_text(news)) for news in news_items]
+        counts = self.vectorizer.partial_fit_transform(token_lists)
+        vectors = self.vectorizer.weight(counts)
+        
+        existing_clusters = [cluster for cluster in self.clusters if cluster.term_counts is not None]
+        if existing_clusters:
+            centroids = self.vectorizer.weight(vstack([
+                _pad_columns(cluster.term_counts, counts.shape[1]) for cluster in existing_clusters
+            ]))
+            cluster_similarity = (vectors @ centroids.T).toarray()
         else:
-            # 否则创建新聚类
-            new_cluster = NewsCluster(news)
-            self.clusters.append(new_cluster)
-            logger.debug(f"Created new cluster for news: {news.title[:30]}...")
+            cluster_similarity = np.zeros((len(news_items), 0))
+        batch_similarity = (vectors @ vectors.T).toarray()
+        
+        # 本批次新建的聚类及其首条新闻在批次中的位置
+        new_clusters: List[NewsCluster] = []
+        new_positions: List[int] = []
+        
+        for i, news in enumerate(news_items):
+            best_cluster = None
+            best_similarity = 0.0
+            
+            if existing_clusters:
+                index = int(cluster_similarity[i].argmax())
+                best_cluster = existing_clusters[index]
+                best_similarity = cluster_similarity[i, index]
+            
+            if new_positions:
+                similarities = batch_similarity[i, new_positions]
+                index = int(similarities.argmax())
+                if similarities[index] > best_similarity:
+                    best_cluster = new_clusters[index]
+                    best_similarity = similarities[index]
+            
+            # 如果相似度超过阈值，添加到现有聚类
+            if best_cluster and best_similarity >= self.similarity_threshold:
+                best_cluster.add_news(news)
+                best_cluster.add_term_counts(counts[i])
+                logger.debug(f"Added news to existing cluster: {news.title[:30]}... (similarity: {best_similarity:.2f})")
+            else:
+                # 否则创建新聚类
+                new_cluster = NewsCluster(news)
+                new_cluster.add_term_counts(counts[i])
+                self.clusters.append(new_cluster)
+                new_clusters.append(new_cluster)
+                new_positions.append(i)
+                logger.debug(f"Created new cluster for news: {news.title[:30]}...")
         
         # 如果聚类数量超过最大值，删除得分最低的聚类
         if len(self.clusters) > self.max_clusters:
             self.clusters.sort(key=lambda x: x.score, reverse=True)
             self.clusters = self.clusters[:self.max_clusters]
     
-    def add_news_batch(self, news_items: List[NewsItemModel]) -> None:
-        """
-        批量添加新闻
-        """
-        for news in news_items:
-            self.add_news(news)
-    
     def get_hot_topics(self, limit: int = 20) -> List[Dict[str, Any]]:
         """
         获取热门话题
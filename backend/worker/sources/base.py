@@ -9,7 +9,8 @@ import re
 import urllib.parse
 import random
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, Union, Tuple, Set
+from types import MappingProxyType
+from typing import List, Dict, Any, Optional, Union, Tuple, Set, Callable, Awaitable, Mapping
 
 import aiohttp
 from bs4 import BeautifulSoup
@@ -17,6 +18,9 @@ from bs4 import BeautifulSoup
 from worker.sources.config import settings
 from worker.sources.interface import NewsSourceInterface
 from worker.utils.proxy_manager import proxy_manager
+from worker.utils.http_transport import http_transport, TransportSession
+from worker.utils.conditional_get import NotModified, validator_store
+from worker.utils import fast_json
 from app.core.logging_config import get_cache_logger
 
 # 设置日志
@@ -25,10 +29,87 @@ logger = logging.getLogger(__name__)
 cache_logger = get_cache_logger()
 
 
+def normalize_published_at(value: Any) -> Optional[datetime.datetime]:
+    """
+    把发布时间统一为无时区的UTC时间，字符串按ISO格式解析，无法解析时返回None
+    """
+    if not value:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if not isinstance(value, datetime.datetime):
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return value
+
+
+# 对外接口/external/unified等使用的统一格式字段
+UNIFIED_FIELDS = (
+    "id", "title", "url", "source_id", "source_name", "category", "published_at",
+    "summary", "content", "image_url", "country", "language", "extra"
+)
+
+# 对外接口/external/source/{id}使用的完整字段
+EXTERNAL_FIELDS = (
+    "id", "title", "url", "source_id", "source_name", "published_at", "updated_at",
+    "summary", "content", "author", "category", "tags", "image_url", "language", "country", "extra"
+)
+
+# pickle保存的字段，published_at单独保存原始值
+NEWS_ITEM_STATE_FIELDS = (
+    "id", "title", "url", "source_id", "source_name", "updated_at", "summary", "content",
+    "author", "category", "tags", "image_url", "language", "country", "extra"
+)
+
+# 每个条目最多缓存的序列化结果数，同一条目通常只会以一两种字段组合输出
+_JSON_CACHE_SIZE = 4
+
+
+def sanitize_text(value: Any) -> Any:
+    """
+    替换字符串中无法编码为UTF-8的字符（如孤立的代理项），合法字符串和非字符串值原样返回
+    """
+    if not isinstance(value, str):
+        return value
+    try:
+        value.encode("utf-8")
+        return value
+    except UnicodeEncodeError:
+        return value.encode("utf-8", errors="replace").decode("utf-8")
+
+
+def sanitize_extra(extra: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    清洗extra中的字符串值，原地修改并返回
+    """
+    for key, value in extra.items():
+        if isinstance(value, str):
+            extra[key] = sanitize_text(value)
+    return extra
+
+
 class NewsItemModel:
     """
     新闻条目模型
+
+    使用__slots__，不为每个实例分配__dict__，源缓存和聚合器中常驻的大量条目占用更少的内存。
+    字符串的UTF-8清洗在构造时完成一次（包括直接构造、from_dict和create_news_item），
+    to_dict()和to_json()不再逐个检查。
+
+    published_at在赋值时即规范化为无时区的UTC时间并缓存ISO字符串，排序和输出时不再重复解析。
+    as_dict和to_json()的结果缓存在条目上，任何属性重新赋值都会清空缓存；原地修改extra等
+    可变字段后需要调用invalidate_json()。
     """
+    __slots__ = (
+        "id", "title", "url", "source_id", "source_name", "_published_at", "updated_at",
+        "summary", "content", "author", "category", "tags", "image_url", "language", "country", "extra",
+        "_published_at_utc", "_published_at_iso", "_dict_cache", "_json_cache"
+    )
+
     def __init__(
         self,
         id: str = "",
@@ -48,66 +129,153 @@ class NewsItemModel:
         country: str = "",
         extra: Dict[str, Any] = None
     ):
-        self.id = id
-        self.title = title
-        self.url = url
-        self.source_id = source_id
-        self.source_name = source_name
+        object.__setattr__(self, "_dict_cache", None)
+        object.__setattr__(self, "_json_cache", None)
+        self.id = sanitize_text(id)
+        self.title = sanitize_text(title)
+        self.url = sanitize_text(url)
+        self.source_id = sanitize_text(source_id)
+        self.source_name = sanitize_text(source_name)
         self.published_at = published_at or datetime.datetime.now()
         self.updated_at = updated_at or datetime.datetime.now()
-        self.summary = summary
-        self.content = content
-        self.author = author
-        self.category = category
+        self.summary = sanitize_text(summary)
+        self.content = sanitize_text(content)
+        self.author = sanitize_text(author)
+        self.category = sanitize_text(category)
         self.tags = tags or []
-        self.image_url = image_url
-        self.language = language
-        self.country = country
-        self.extra = extra or {}
-    
-    def to_dict(self) -> Dict[str, Any]:
+        self.image_url = sanitize_text(image_url)
+        self.language = sanitize_text(language)
+        self.country = sanitize_text(country)
+        self.extra = sanitize_extra(extra) if extra else {}
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if self._dict_cache is not None or self._json_cache is not None:
+            self.invalidate_json()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = {field: getattr(self, field) for field in NEWS_ITEM_STATE_FIELDS}
+        state["published_at"] = self._published_at
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # 兼容旧版本pickle的数据（普通对象的__dict__），其中published_at是普通属性
+        self.__init__(
+            published_at=state.get("published_at", state.get("_published_at")),
+            **{field: state[field] for field in NEWS_ITEM_STATE_FIELDS if field in state}
+        )
+
+    @property
+    def published_at(self) -> Any:
+        return self._published_at
+
+    @published_at.setter
+    def published_at(self, value: Any) -> None:
+        # 保留原始值，其他代码读取published_at的行为不变
+        self._published_at = value
+        self._published_at_utc = normalize_published_at(value)
+        self._published_at_iso = self._published_at_utc.isoformat() if self._published_at_utc else None
+
+    @property
+    def published_at_utc(self) -> Optional[datetime.datetime]:
         """
-        转换为字典
+        规范化后的发布时间（无时区的UTC时间），无法解析时为None
         """
+        return self._published_at_utc
+
+    @property
+    def published_at_iso(self) -> Optional[str]:
+        """
+        规范化后的发布时间的ISO字符串
+        """
+        return self._published_at_iso
+
+    @property
+    def sort_key(self) -> datetime.datetime:
+        """
+        按发布时间排序使用的键，没有发布时间的条目排在最早
+        """
+        return self._published_at_utc or datetime.datetime.min
+
+    def invalidate_json(self) -> None:
+        """
+        清空as_dict和to_json()的缓存
+        """
+        object.__setattr__(self, "_dict_cache", None)
+        object.__setattr__(self, "_json_cache", None)
+
+    def _json_value(self, field: str) -> Any:
+        if field == "published_at":
+            return self._published_at_iso
+        if field == "updated_at":
+            updated_at = self.updated_at
+            return updated_at.isoformat() if isinstance(updated_at, datetime.datetime) else updated_at
+        return getattr(self, field)
+
+    def to_json(self, fields: Tuple[str, ...] = UNIFIED_FIELDS, **overrides: Any) -> bytes:
+        """
+        直接序列化为JSON字节，用于对外接口的快速输出
+
+        Args:
+            fields: 输出的字段及顺序
+            overrides: 覆盖条目自身值的字段，例如按数据源设置的source_name、category
+        """
+        key = (fields, tuple(sorted(overrides.items())))
+        cache = self._json_cache
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+        else:
+            cache = {}
+
         data = {
-            "id": self.id,
-            "title": self.title,
-            "url": self.url,
-            "source_id": self.source_id,
-            "source_name": self.source_name,
-            "published_at": self.published_at.isoformat() if self.published_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-            "summary": self.summary,
-            "content": self.content,
-            "author": self.author,
-            "category": self.category,
-            "tags": self.tags,
-            "image_url": self.image_url,
-            "language": self.language,
-            "country": self.country,
-            "extra": self.extra
+            field: overrides[field] if field in overrides else self._json_value(field)
+            for field in fields
         }
-        
-        # 确保所有字符串值都是有效的UTF-8
-        for key, value in data.items():
-            if isinstance(value, str):
-                # 确保字符串是有效的UTF-8
-                try:
-                    # 尝试编码再解码，检测是否有非法字符
-                    value.encode('utf-8').decode('utf-8')
-                except UnicodeError:
-                    # 如果有编码问题，使用替换策略
-                    data[key] = value.encode('utf-8', errors='replace').decode('utf-8')
-            elif isinstance(value, dict):
-                # 处理嵌套字典(如extra)中的字符串值
-                for k, v in value.items():
-                    if isinstance(v, str):
-                        try:
-                            v.encode('utf-8').decode('utf-8')
-                        except UnicodeError:
-                            value[k] = v.encode('utf-8', errors='replace').decode('utf-8')
-        
-        return data
+        payload = fast_json.dumps(data)
+
+        if len(cache) >= _JSON_CACHE_SIZE:
+            cache.clear()
+        cache[key] = payload
+        object.__setattr__(self, "_json_cache", cache)
+        return payload
+
+    @property
+    def as_dict(self) -> Mapping[str, Any]:
+        """
+        条目的只读字典视图，首次访问时生成并缓存，格式与to_dict()相同
+        """
+        view = self._dict_cache
+        if view is None:
+            published_at = self._published_at
+            updated_at = self.updated_at
+            view = MappingProxyType({
+                "id": self.id,
+                "title": self.title,
+                "url": self.url,
+                "source_id": self.source_id,
+                "source_name": self.source_name,
+                "published_at": published_at.isoformat() if isinstance(published_at, datetime.datetime) else published_at or None,
+                "updated_at": updated_at.isoformat() if isinstance(updated_at, datetime.datetime) else updated_at or None,
+                "summary": self.summary,
+                "content": self.content,
+                "author": self.author,
+                "category": self.category,
+                "tags": self.tags,
+                "image_url": self.image_url,
+                "language": self.language,
+                "country": self.country,
+                "extra": self.extra
+            })
+            object.__setattr__(self, "_dict_cache", view)
+        return view
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        转换为字典，返回as_dict的浅拷贝，调用方可以自由修改
+        """
+        return dict(self.as_dict)
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'NewsItemModel':
@@ -225,7 +393,11 @@ class NewsSource(ABC):
             "fetch_error_count": 0,       # 获取错误次数
             "last_cache_size": 0,         # 最后一次缓存大小
             "max_cache_size": 0,          # 历史最大缓存大小
+            "coalesced_count": 0,         # 合并到进行中刷新的请求次数
+            "not_modified_count": 0,      # 上游返回304、直接复用缓存的次数
         }
+        # 进行中的刷新任务，按缓存键索引，用于合并并发刷新
+        self._inflight_refreshes: Dict[str, asyncio.Task] = {}
         self._cache_protection_stats = {
             "empty_protection_count": 0,   # 空结果保护次数
             "error_protection_count": 0,   # 错误保护次数
@@ -283,6 +455,8 @@ class NewsSource(ABC):
         # 添加缓存配置
         self.use_memory_cache = self.config.get("use_memory_cache", True)
         self.use_persistent_cache = self.config.get("use_persistent_cache", False)
+        # 是否发送条件请求(ETag/Last-Modified)，上游返回304时复用缓存
+        self.conditional_get = self.config.get("conditional_get", True)
         
         # 添加日志配置
         self.log_requests = self.config.get("log_requests", False)
@@ -302,9 +476,11 @@ class NewsSource(ABC):
             self.need_proxy = True
     
     @property
-    async def http_client(self) -> aiohttp.ClientSession:
+    async def http_client(self) -> TransportSession:
         """
         获取HTTP客户端
+        
+        返回共享连接池的会话视图，附带该源的请求头和超时，关闭视图不会关闭连接池
         """
         if self._http_client is None or self._http_client.closed:
             headers = {
@@ -315,14 +491,13 @@ class NewsSource(ABC):
             if "headers" in self.config:
                 headers.update(self.config["headers"])
             
-            self._http_client = aiohttp.ClientSession(
+            self._http_client = http_transport.session(
                 headers=headers,
                 timeout=aiohttp.ClientTimeout(
                     connect=self.connect_timeout,
                     sock_read=self.read_timeout,
                     total=self.total_timeout
                 )
-                # 注意：aiohttp.ClientSession不接受proxy参数
                 # 代理应该在请求时通过proxy参数传递
             )
         return self._http_client
@@ -533,33 +708,32 @@ class NewsSource(ABC):
                         try:
                             logger.info(f"使用代理 {proxy} 请求 {url}")
                             # 执行请求（使用代理）
-                            async with aiohttp.ClientSession(timeout=timeout_obj) as session:
-                                async with session.request(
-                                    method, url, headers=headers, data=data, params=params, 
-                                    proxy=proxy, ssl=kwargs.get('verify_ssl', True)
-                                ) as response:
-                                    # 检查响应状态
-                                    if response.status >= 400:
-                                        error_text = await response.text()
-                                        logger.warning(f"通过代理请求响应状态码: {response.status}")
-                                        # 如果不允许回退到直连，则抛出异常
-                                        if not self.proxy_fallback:
-                                            raise Exception(f"HTTP error {response.status}: {error_text[:500]}")
-                                    else:
-                                        # 报告代理成功
-                                        elapsed = time.time() - start_time
-                                        if hasattr(proxy_manager, 'report_proxy_status') and proxy_used:
-                                            await proxy_manager.report_proxy_status(proxy_config.get('id'), True, elapsed)
+                            async with http_transport.get_session().request(
+                                method, url, headers=headers, data=data, params=params, 
+                                proxy=proxy, ssl=kwargs.get('verify_ssl', True), timeout=timeout_obj
+                            ) as response:
+                                # 检查响应状态
+                                if response.status >= 400:
+                                    error_text = await response.text()
+                                    logger.warning(f"通过代理请求响应状态码: {response.status}")
+                                    # 如果不允许回退到直连，则抛出异常
+                                    if not self.proxy_fallback:
+                                        raise Exception(f"HTTP error {response.status}: {error_text[:500]}")
+                                else:
+                                    # 报告代理成功
+                                    elapsed = time.time() - start_time
+                                    if hasattr(proxy_manager, 'report_proxy_status') and proxy_used:
+                                        await proxy_manager.report_proxy_status(proxy_config.get('id'), True, elapsed)
                                         
-                                        logger.info(f"通过代理成功请求 {url}，状态码: {response.status}")
+                                    logger.info(f"通过代理成功请求 {url}，状态码: {response.status}")
                                         
-                                        # 根据response_type返回不同类型的响应
-                                        if response_type.lower() == 'json':
-                                            return await response.json()
-                                        elif response_type.lower() == 'bytes':
-                                            return await response.read()
-                                        else:
-                                            return await response.text()
+                                    # 根据response_type返回不同类型的响应
+                                    if response_type.lower() == 'json':
+                                        return await response.json()
+                                    elif response_type.lower() == 'bytes':
+                                        return await response.read()
+                                    else:
+                                        return await response.text()
                         except Exception as e:
                             # 报告代理失败
                             if hasattr(proxy_manager, 'report_proxy_status') and proxy_used and proxy_config:
@@ -574,23 +748,22 @@ class NewsSource(ABC):
                     if not proxy_used or (proxy_used and self.proxy_fallback):
                         logger.info(f"直连请求 {url}")
                         # 执行请求（直连）
-                        async with aiohttp.ClientSession(timeout=timeout_obj) as session:
-                            async with session.request(
-                                method, url, headers=headers, data=data, params=params, 
-                                ssl=kwargs.get('verify_ssl', True)
-                            ) as response:
-                                # 检查响应状态
-                                if response.status >= 400:
-                                    error_text = await response.text()
-                                    raise Exception(f"HTTP error {response.status}: {error_text[:500]}")
+                        async with http_transport.get_session().request(
+                            method, url, headers=headers, data=data, params=params, 
+                            ssl=kwargs.get('verify_ssl', True), timeout=timeout_obj
+                        ) as response:
+                            # 检查响应状态
+                            if response.status >= 400:
+                                error_text = await response.text()
+                                raise Exception(f"HTTP error {response.status}: {error_text[:500]}")
                                 
-                                # 根据response_type返回不同类型的响应
-                                if response_type.lower() == 'json':
-                                    return await response.json()
-                                elif response_type.lower() == 'bytes':
-                                    return await response.read()
-                                else:
-                                    return await response.text()
+                            # 根据response_type返回不同类型的响应
+                            if response_type.lower() == 'json':
+                                return await response.json()
+                            elif response_type.lower() == 'bytes':
+                                return await response.read()
+                            else:
+                                return await response.text()
                 
                 except (aiohttp.ClientError, asyncio.TimeoutError, Exception) as e:
                     last_exception = e
@@ -659,7 +832,7 @@ class NewsSource(ABC):
         
         if 'url' in kwargs:
             kwargs['url'] = self.clean_url(kwargs['url'])
-        
+
         # 创建NewsItemModel实例
         return NewsItemModel(**kwargs)
     
@@ -915,12 +1088,17 @@ class NewsSource(ABC):
         self.last_update_time = current_time
         self.last_update_count = news_count
     
-    async def get_news(self, force_update: bool = False) -> List[NewsItemModel]:
+    async def get_news(
+        self,
+        force_update: bool = False,
+        fetch: Optional[Callable[[], Awaitable[List[NewsItemModel]]]] = None
+    ) -> List[NewsItemModel]:
         """
         获取新闻，包含缓存逻辑
         
         Args:
             force_update: 是否强制更新
+            fetch: 刷新时代替self.fetch调用的函数，例如带调用统计的包装，不修改源实例
             
         Returns:
             新闻项列表
@@ -967,82 +1145,12 @@ class NewsSource(ABC):
                 
                 cache_logger.info(f"[CACHE-DEBUG] {self.source_id}: 需要更新数据 ({cache_decision})")
                 
-                try:
-                    news_items = await self.fetch()
-                    
-                    # 保存当前缓存大小以用于后续保护决策
-                    current_items_count = current_cache_size
-                    new_items_count = len(news_items) if news_items else 0
-                    
-                    # 增强的缓存保护: 如果fetch返回空列表但缓存中有数据，保留现有缓存
-                    if not news_items and hasattr(self, '_cached_news_items') and self._cached_news_items:
-                        logger.debug(f"缓存保护触发: {self.source_id} - 使用现有缓存替代空结果")
-                        cache_logger.warning(f"[CACHE-PROTECTION] {self.source_id}: fetch()返回空列表，但缓存中有 {len(self._cached_news_items)} 条数据，将使用缓存")
-                        news_items = self._cached_news_items.copy()
-                        
-                        # 记录此类保护操作
-                        self._cache_protection_count += 1
-                        self._cache_metrics["empty_result_count"] += 1
-                        self._cache_protection_stats["empty_protection_count"] += 1
-                        self._cache_protection_stats["last_protection_time"] = time.time()
-                        self._cache_protection_stats["protection_history"].append({
-                            "time": time.time(),
-                            "type": "empty_protection",
-                            "cache_size": len(self._cached_news_items)
-                        })
-                        
-                        # 如果频繁发生保护操作，记录警告
-                        if self._cache_protection_count > 3:
-                            logger.warning(f"缓存保护频繁触发: {self.source_id} - 已触发 {self._cache_protection_count} 次")
-                            cache_logger.warning(f"[CACHE-ALERT] {self.source_id}: 已触发缓存保护 {self._cache_protection_count} 次，可能需要检查数据源")
-                    
-                    # 增强的缓存保护：如果新闻条目数量相比缓存大幅减少（超过70%），使用缓存
-                    elif (current_items_count > 5 and new_items_count > 0 and 
-                          new_items_count < current_items_count * 0.3):
-                        logger.debug(f"缓存保护触发: {self.source_id} - 新数据数量大幅减少")
-                        cache_logger.warning(f"[CACHE-PROTECTION] {self.source_id}: fetch()返回 {new_items_count} 条数据，比缓存中的 {current_items_count} 条减少了 {(current_items_count - new_items_count) / current_items_count:.1%}，将使用缓存")
-                        news_items = self._cached_news_items.copy()
-                        
-                        # 记录此类保护操作
-                        self._cache_protection_stats["shrink_protection_count"] += 1
-                        self._cache_protection_stats["last_protection_time"] = time.time()
-                        self._cache_protection_stats["protection_history"].append({
-                            "time": time.time(),
-                            "type": "shrink_protection",
-                            "old_size": current_items_count,
-                            "new_size": new_items_count
-                        })
-                    else:
-                        # 更新缓存
-                        await self.update_cache(news_items)
-                        
-                        # 更新缓存指标
-                        self._cache_metrics["last_cache_size"] = len(news_items) if news_items else 0
-                        if self._cache_metrics["last_cache_size"] > self._cache_metrics["max_cache_size"]:
-                            self._cache_metrics["max_cache_size"] = self._cache_metrics["last_cache_size"]
-                
-                except Exception as e:
-                    logger.error(f"获取 {self.source_id} 的新闻时出错: {str(e)}", exc_info=True)
-                    self._cache_metrics["fetch_error_count"] += 1
-                    
-                    # 增强的错误处理: 在出错情况下，如果有缓存数据，则使用缓存
-                    if hasattr(self, '_cached_news_items') and self._cached_news_items:
-                        logger.info(f"使用缓存作为错误恢复: {self.source_id}")
-                        cache_logger.warning(f"[CACHE-PROTECTION] {self.source_id}: fetch()出错，使用缓存的 {len(self._cached_news_items)} 条数据")
-                        news_items = self._cached_news_items.copy()
-                        cache_decision = "出错后使用缓存"
-                        
-                        # 记录错误保护操作
-                        self._cache_protection_stats["error_protection_count"] += 1
-                        self._cache_protection_stats["last_protection_time"] = time.time()
-                        self._cache_protection_stats["protection_history"].append({
-                            "time": time.time(),
-                            "type": "error_protection",
-                            "error": str(e),
-                            "cache_size": len(self._cached_news_items)
-                        })
-                    else:
-                        news_items = []
+                # 并发的刷新请求合并为一次上游请求，共享同一个结果
+                news_items, cache_decision = await self._single_flight(
+                    self.get_cache_key(),
+                    lambda: self._refresh_news(cache_decision, fetch)
+                )
+                news_items = list(news_items)
             else:
                 # 使用缓存数据
                 cache_decision = "使用缓存"
@@ -1064,6 +1172,156 @@ class NewsSource(ABC):
             self.update_metrics(0, success=False, error=e)
             return []
     
+    async def _refresh_news(
+        self,
+        cache_decision: str,
+        fetch: Optional[Callable[[], Awaitable[List[NewsItemModel]]]] = None
+    ) -> Tuple[List[NewsItemModel], str]:
+        """
+        调用fetch刷新缓存，包含空结果、数量锐减和出错时的缓存保护
+
+        Args:
+            cache_decision: 触发刷新的原因
+            fetch: 代替self.fetch调用的函数
+
+        Returns:
+            (新闻项列表, 缓存决策)
+        """
+        has_cache = hasattr(self, '_cached_news_items') and isinstance(self._cached_news_items, list)
+        current_cache_size = len(self._cached_news_items) if has_cache else 0
+        news_items = []
+        
+        # 没有缓存可复用时不能接受304，丢弃旧的校验值以获取完整内容
+        if not current_cache_size:
+            validator_store.invalidate_scope(self.source_id)
+        
+        try:
+            news_items = await (fetch or self.fetch)()
+            
+            # 保存当前缓存大小以用于后续保护决策
+            current_items_count = current_cache_size
+            new_items_count = len(news_items) if news_items else 0
+            
+            # 增强的缓存保护: 如果fetch返回空列表但缓存中有数据，保留现有缓存
+            if not news_items and hasattr(self, '_cached_news_items') and self._cached_news_items:
+                logger.debug(f"缓存保护触发: {self.source_id} - 使用现有缓存替代空结果")
+                cache_logger.warning(f"[CACHE-PROTECTION] {self.source_id}: fetch()返回空列表，但缓存中有 {len(self._cached_news_items)} 条数据，将使用缓存")
+                news_items = self._cached_news_items.copy()
+                # 缓存未采用本次内容，下次需要完整获取
+                validator_store.invalidate_scope(self.source_id)
+                
+                # 记录此类保护操作
+                self._cache_protection_count += 1
+                self._cache_metrics["empty_result_count"] += 1
+                self._cache_protection_stats["empty_protection_count"] += 1
+                self._cache_protection_stats["last_protection_time"] = time.time()
+                self._cache_protection_stats["protection_history"].append({
+                    "time": time.time(),
+                    "type": "empty_protection",
+                    "cache_size": len(self._cached_news_items)
+                })
+                
+                # 如果频繁发生保护操作，记录警告
+                if self._cache_protection_count > 3:
+                    logger.warning(f"缓存保护频繁触发: {self.source_id} - 已触发 {self._cache_protection_count} 次")
+                    cache_logger.warning(f"[CACHE-ALERT] {self.source_id}: 已触发缓存保护 {self._cache_protection_count} 次，可能需要检查数据源")
+            
+            # 增强的缓存保护：如果新闻条目数量相比缓存大幅减少（超过70%），使用缓存
+            elif (current_items_count > 5 and new_items_count > 0 and 
+                  new_items_count < current_items_count * 0.3):
+                logger.debug(f"缓存保护触发: {self.source_id} - 新数据数量大幅减少")
+                cache_logger.warning(f"[CACHE-PROTECTION] {self.source_id}: fetch()返回 {new_items_count} 条数据，比缓存中的 {current_items_count} 条减少了 {(current_items_count - new_items_count) / current_items_count:.1%}，将使用缓存")
+                news_items = self._cached_news_items.copy()
+                validator_store.invalidate_scope(self.source_id)
+                
+                # 记录此类保护操作
+                self._cache_protection_stats["shrink_protection_count"] += 1
+                self._cache_protection_stats["last_protection_time"] = time.time()
+                self._cache_protection_stats["protection_history"].append({
+                    "time": time.time(),
+                    "type": "shrink_protection",
+                    "old_size": current_items_count,
+                    "new_size": new_items_count
+                })
+            else:
+                # 更新缓存
+                await self.update_cache(news_items)
+                
+                # 更新缓存指标
+                self._cache_metrics["last_cache_size"] = len(news_items) if news_items else 0
+                if self._cache_metrics["last_cache_size"] > self._cache_metrics["max_cache_size"]:
+                    self._cache_metrics["max_cache_size"] = self._cache_metrics["last_cache_size"]
+        
+        except NotModified:
+            # 上游内容未变化：缓存视为已刷新，跳过解析
+            self._cache_metrics["not_modified_count"] += 1
+            if self._cached_news_items:
+                self._last_cache_update = time.time()
+                news_items = self._cached_news_items.copy()
+                cache_decision = "内容未修改"
+                cache_logger.info(f"[CACHE-DEBUG] {self.source_id}: 上游返回304，沿用缓存的 {len(news_items)} 条数据")
+            else:
+                validator_store.invalidate_scope(self.source_id)
+                news_items = []
+        
+        except Exception as e:
+            logger.error(f"获取 {self.source_id} 的新闻时出错: {str(e)}", exc_info=True)
+            self._cache_metrics["fetch_error_count"] += 1
+            validator_store.invalidate_scope(self.source_id)
+            
+            # 增强的错误处理: 在出错情况下，如果有缓存数据，则使用缓存
+            if hasattr(self, '_cached_news_items') and self._cached_news_items:
+                logger.info(f"使用缓存作为错误恢复: {self.source_id}")
+                cache_logger.warning(f"[CACHE-PROTECTION] {self.source_id}: fetch()出错，使用缓存的 {len(self._cached_news_items)} 条数据")
+                news_items = self._cached_news_items.copy()
+                cache_decision = "出错后使用缓存"
+                
+                # 记录错误保护操作
+                self._cache_protection_stats["error_protection_count"] += 1
+                self._cache_protection_stats["last_protection_time"] = time.time()
+                self._cache_protection_stats["protection_history"].append({
+                    "time": time.time(),
+                    "type": "error_protection",
+                    "error": str(e),
+                    "cache_size": len(self._cached_news_items)
+                })
+            else:
+                news_items = []
+
+        return news_items, cache_decision
+
+    async def _single_flight(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        单飞执行：同一个键同时只有一个协程真正执行factory，
+        并发调用者等待同一个future并共享其结果
+
+        刷新在独立任务中执行，某个调用者被取消（如超时）不会中断其他等待者
+
+        Args:
+            key: 单飞键，通常为缓存键
+            factory: 返回协程的可调用对象
+
+        Returns:
+            factory协程的结果
+        """
+        loop = asyncio.get_running_loop()
+        task = self._inflight_refreshes.get(key)
+        # 其他事件循环中遗留的任务无法在当前循环中等待，忽略它
+        if task is not None and not task.done() and task.get_loop() is loop:
+            self._cache_metrics["coalesced_count"] += 1
+            cache_logger.info(f"[CACHE-DEBUG] {self.source_id}: 已有进行中的刷新 ({key})，等待其结果")
+            return await asyncio.shield(task)
+
+        task = loop.create_task(factory())
+        self._inflight_refreshes[key] = task
+
+        def _release(done_task: asyncio.Task) -> None:
+            if self._inflight_refreshes.get(key) is done_task:
+                del self._inflight_refreshes[key]
+
+        task.add_done_callback(_release)
+        return await asyncio.shield(task)
+
     def is_cache_valid(self) -> bool:
         """
         检查缓存是否有效，默认实现
@@ -1142,6 +1400,9 @@ class NewsSource(ABC):
         
         if hasattr(self, '_last_cache_update'):
             self._last_cache_update = 0
+        
+        # 缓存已清空，旧的校验值不再有效
+        validator_store.invalidate_scope(self.source_id)
             
         # 记录清除操作
         cache_logger.info(f"[CACHE-DEBUG] {self.source_id}: 缓存已清除，之前有 {old_count} 条数据")
@@ -1246,6 +1507,8 @@ class NewsSource(ABC):
                 "hit_ratio": self._cache_metrics["cache_hit_count"] / max(1, self._cache_metrics["cache_hit_count"] + self._cache_metrics["cache_miss_count"]),
                 "empty_result_count": self._cache_metrics["empty_result_count"],
                 "fetch_error_count": self._cache_metrics["fetch_error_count"],
+                "coalesced_count": self._cache_metrics["coalesced_count"],
+                "not_modified_count": self._cache_metrics["not_modified_count"],
                 "current_cache_size": self._cache_metrics["last_cache_size"],
                 "max_cache_size": self._cache_metrics["max_cache_size"]
             }
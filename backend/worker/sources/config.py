@@ -41,6 +41,14 @@ class Settings:
         self.cache_ttl = int(os.getenv("CACHE_TTL", "3600"))  # 缓存过期时间（秒）
         self.use_redis_cache = os.getenv("USE_REDIS_CACHE", "False").lower() in ("true", "1", "t")
         
+        # 启动时预先创建的数据源，逗号分隔，其余数据源在首次使用时创建
+        self.source_warm_up = [s.strip() for s in os.getenv("SOURCE_WARM_UP", "").split(",") if s.strip()]
+        
+        # 浏览器池设置
+        self.browser_pool_size = int(os.getenv("BROWSER_POOL_SIZE", "2"))  # 同时运行的浏览器数量上限
+        self.browser_max_uses = int(os.getenv("BROWSER_MAX_USES", "50"))  # 每个浏览器重建前的最大租用次数
+        self.browser_acquire_timeout = float(os.getenv("BROWSER_ACQUIRE_TIMEOUT", "60"))  # 等待可用浏览器的超时（秒）
+        
         # API设置
         self.api_host = os.getenv("API_HOST", "0.0.0.0")
         self.api_port = int(os.getenv("API_PORT", "8000"))
@@ -90,6 +98,9 @@ class Settings:
             "max_fetch_interval": self.max_fetch_interval,
             "cache_ttl": self.cache_ttl,
             "use_redis_cache": self.use_redis_cache,
+            "browser_pool_size": self.browser_pool_size,
+            "browser_max_uses": self.browser_max_uses,
+            "browser_acquire_timeout": self.browser_acquire_timeout,
             "api_host": self.api_host,
             "api_port": self.api_port
         }
@@ -24,13 +24,14 @@ from webdriver_manager.chrome import ChromeDriverManager
 
 from worker.sources.web import WebNewsSource
 from worker.sources.base import NewsItemModel
+from worker.utils.browser_pool import BrowserPoolMixin
 from worker.utils.http_client import http_client
 
 logger = logging.getLogger(__name__)
 DEBUG_MODE = os.environ.get("DEBUG", "0") == "1"
 
 
-class CustomWebSource(WebNewsSource):
+class CustomWebSource(BrowserPoolMixin, WebNewsSource):
     """
     自定义网页新闻源适配器
     用于处理用户创建的自定义源
@@ -376,6 +377,10 @@ class CustomWebSource(WebNewsSource):
         """
         获取WebDriver实例，如果不存在则创建
         """
+        # 优先从共享浏览器池租用已启动的浏览器
+        if self.use_browser_pool:
+            return await self._lease_pooled_driver()
+        
         if self._driver is None:
             logger.debug("创建新的WebDriver实例")
             # 在事件循环中运行阻塞的WebDriver创建
@@ -390,6 +395,10 @@ class CustomWebSource(WebNewsSource):
         """
         关闭WebDriver及其相关进程
         """
+        # 租用的浏览器归还给浏览器池，不关闭
+        if await self._release_pooled_driver():
+            return
+        
         if self._driver is not None:
             try:
                 logger.debug("正在关闭WebDriver")
@@ -643,7 +652,9 @@ class CustomWebSource(WebNewsSource):
         
         try:
             # 清理可能存在的旧进程，避免"user data directory is already in use"错误
-            await self.clean_chrome_processes()
+            # 使用浏览器池时不清理，否则会终止池中的浏览器
+            if not self.use_browser_pool:
+                await self.clean_chrome_processes()
             
             logger.info(f"开始获取 {self.name} 数据")
             
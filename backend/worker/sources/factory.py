@@ -2,53 +2,7 @@ import logging
 from typing import Dict, Any, Optional, List, Type
 
 from worker.sources.base import NewsSource
-from worker.sources.rss import RSSNewsSource, RSSSourceFactory
-from worker.sources.sites import (
-    ZhihuHotNewsSource,
-    WeiboHotNewsSource,
-    BaiduHotNewsSource,
-    HackerNewsSource,
-    BilibiliHotNewsSource,
-    DouyinHotNewsSource,
-    ToutiaoHotNewsSource,
-    ITHomeNewsSource,
-    GitHubTrendingSource,
-    V2EXSeleniumSource,
-    XueqiuHotStockSource,
-    TiebaHotTopicSource,
-    KuaishouHotSearchSource,
-    Jin10NewsSource,
-    CanKaoXiaoXiNewsSource,
-    SolidotNewsSource,
-    ZaoBaoNewsSource,
-    SputnikNewsCNSource,
-    ProductHuntNewsSource,
-    LinuxDoNewsSource,
-    LinuxDoLatestNewsSource,
-    LinuxDoHotNewsSource,
-    KaoPuNewsSource,
-    GeLongHuiNewsSource,
-    FastBullExpressNewsSource,
-    FastBullGeneralNewsSource,
-    WallStreetCNLiveNewsSource,
-    WallStreetCNNewsSource,
-    WallStreetCNHotNewsSource,
-    Kr36NewsSource,
-    CoolApkNewsSource,
-    CoolApkFeedNewsSource,
-    CoolApkAppNewsSource,
-    CLSNewsSource,
-    BBCWorldNewsSource,
-    ThePaperSeleniumSource,
-    ZhihuDailyNewsSource,
-    BloombergNewsSource,
-    BloombergMarketsNewsSource,
-    BloombergTechnologyNewsSource,
-    YiCaiBriefSource,
-    YiCaiNewsSource,
-    IfengStudioSource,
-    IfengTechSource
-)
+from worker.sources.adapter_registry import adapter_registry
 
 logger = logging.getLogger(__name__)
 
@@ -159,147 +113,14 @@ class NewsSourceFactory:
                 logger.error(traceback.format_exc())
                 return None
                 
-        if source_type == "zhihu":
-            return ZhihuHotNewsSource(**kwargs)
-        elif source_type == "weibo":
-            return WeiboHotNewsSource(**kwargs)
-        elif source_type == "baidu":
-            return BaiduHotNewsSource(**kwargs)
-        elif source_type == "hackernews":
-            return HackerNewsSource(**kwargs)
-        elif source_type == "bilibili":
-            return BilibiliHotNewsSource(**kwargs)
-        elif source_type == "douyin":
-            return DouyinHotNewsSource(**kwargs)
-        elif source_type == "toutiao":
-            return ToutiaoHotNewsSource(**kwargs)
-        elif source_type == "thepaper":
-            return ThePaperSeleniumSource(**kwargs)
-        elif source_type == "ithome":
-            return ITHomeNewsSource(**kwargs)
-        elif source_type == "github":
-            return GitHubTrendingSource(**kwargs)
-        elif source_type == "v2ex":
-            return V2EXSeleniumSource(**kwargs)
-        elif source_type == "xueqiu":
-            return XueqiuHotStockSource(**kwargs)
-        elif source_type == "tieba":
-            return TiebaHotTopicSource(**kwargs)
-        elif source_type == "kuaishou":
-            return KuaishouHotSearchSource(**kwargs)
-        elif source_type == "jin10":
-            return Jin10NewsSource(**kwargs)
-        elif source_type == "cankaoxiaoxi":
-            return CanKaoXiaoXiNewsSource(**kwargs)
-        elif source_type == "solidot":
-            return SolidotNewsSource(**kwargs)
-        elif source_type == "zaobao":
-            return ZaoBaoNewsSource(**kwargs)
-        elif source_type == "sputniknewscn":
-            return SputnikNewsCNSource(**kwargs)
-        elif source_type == "producthunt":
-            return ProductHuntNewsSource(**kwargs)
-        elif source_type == "linuxdo":
-            return LinuxDoNewsSource(**kwargs)
-        elif source_type == "linuxdo-latest":
-            return LinuxDoLatestNewsSource(**kwargs)
-        elif source_type == "linuxdo-hot":
-            return LinuxDoHotNewsSource(**kwargs)
-        elif source_type == "kaopu":
-            return KaoPuNewsSource(**kwargs)
-        elif source_type == "gelonghui":
-            return GeLongHuiNewsSource(**kwargs)
-        elif source_type == "fastbull":
-            return FastBullExpressNewsSource(**kwargs)
-        elif source_type == "fastbull-express":
-            return FastBullExpressNewsSource(**kwargs)
-        elif source_type == "fastbull-news":
-            return FastBullGeneralNewsSource(**kwargs)
-        elif source_type == "wallstreetcn":
-            return WallStreetCNLiveNewsSource(**kwargs)
-        elif source_type == "wallstreetcn-news":
-            return WallStreetCNNewsSource(**kwargs)
-        elif source_type == "wallstreetcn-hot":
-            return WallStreetCNHotNewsSource(**kwargs)
-        elif source_type == "36kr":
-            return Kr36NewsSource(**kwargs)
-        elif source_type == "coolapk":
-            return CoolApkNewsSource(**kwargs)
-        elif source_type == "coolapk-feed":
-            return CoolApkFeedNewsSource(**kwargs)
-        elif source_type == "coolapk-app":
-            return CoolApkAppNewsSource(**kwargs)
-        elif source_type == "cls":
-            return CLSNewsSource(**kwargs)
-        elif source_type == "bbc_world":
-            return BBCWorldNewsSource(**kwargs)
-        elif source_type == "bloomberg":
-            return BloombergNewsSource(**kwargs)
-        elif source_type == "bloomberg-markets":
-            return BloombergMarketsNewsSource(**kwargs)
-        elif source_type == "bloomberg-tech":
-            return BloombergTechnologyNewsSource(**kwargs)
-        elif source_type == "bloomberg-china":  # 处理被合并的源的兼容性
+        if source_type == "bloomberg-china":  # 处理被合并的源的兼容性
             logger.info("bloomberg-china已被合并到bloomberg中，使用bloomberg源替代")
-            return BloombergNewsSource(source_id="bloomberg", country="CN", **kwargs)
-        elif source_type == "yicai-brief":
-            return YiCaiBriefSource(**kwargs)
-        elif source_type == "yicai-news":
-            return YiCaiNewsSource(**kwargs)
-        elif source_type == "ifeng-studio":
-            return IfengStudioSource(**kwargs)
-        elif source_type == "ifeng-tech":
-            return IfengTechSource(**kwargs)
-        elif source_type == "ifanr":
-            return RSSNewsSource(
-                source_id="ifanr",
-                name="爱范儿",
-                feed_url="https://www.ifanr.com/feed",
-                category="technology",
-                country="CN",
-                language="zh-CN",
-                update_interval=1800,  # 30分钟更新一次
-                config={
-                    "fetch_content": True,
-                    "content_selector": ".article-content"
-                },
-                **kwargs
-            )
-        elif source_type == "techcrunch":
-            return RSSNewsSource(
-                source_id="techcrunch",
-                name="TechCrunch",
-                feed_url="https://techcrunch.com/feed/",
-                category="technology",
-                country="US",
-                language="en",
-                update_interval=1800,  # 30分钟更新一次
-                config={
-                    "fetch_content": True,
-                    "content_selector": ".article-content"
-                },
-                **kwargs
-            )
-        elif source_type == "the_verge":
-            return RSSNewsSource(
-                source_id="the_verge",
-                name="The Verge",
-                feed_url="https://www.theverge.com/rss/index.xml",
-                category="technology",
-                country="US",
-                language="en",
-                update_interval=1800,  # 30分钟更新一次
-                config={
-                    "fetch_content": True,
-                    "content_selector": ".c-entry-content"
-                },
-                **kwargs
-            )
-        elif source_type == "zhihu_daily":
-            return ZhihuDailyNewsSource(**kwargs)
-        else:
+        
+        # 适配器模块在首次创建时才导入
+        if not adapter_registry.is_registered(source_type):
             logger.error(f"Unknown source type: {source_type}")
             return None
+        return adapter_registry.create(source_type, **kwargs)
     
     @staticmethod
     def create_default_sources() -> List[NewsSource]:
@@ -24,6 +24,8 @@ class NewsSourceManager:
         self.last_fetch_time: Dict[str, float] = {}
         self.duplicate_cache: Set[str] = set()  # 用于存储已处理的新闻标题指纹
         self.similarity_threshold = 0.85  # 相似度阈值，超过此值认为是重复新闻
+        self.provider = None  # 设置后通过源提供者按需创建源，使用数据库中的源配置
+        self._all_loaded = False
     
     def register_source(self, source: NewsSource) -> None:
         """
@@ -39,9 +41,22 @@ class NewsSourceManager:
         for source in sources:
             self.register_source(source)
     
+    def attach_provider(self, provider: Any) -> None:
+        """
+        使用源提供者按需创建源，并注册提供者中已创建的源（如预加载的源）
+
+        Args:
+            provider: NewsSourceProvider实例
+        """
+        self.provider = provider
+        self.register_sources([
+            source for source_id, source in list(provider.sources.items())
+            if source_id not in self.sources
+        ])
+    
     def register_default_sources(self) -> None:
         """
-        注册默认新闻源
+        注册默认新闻源，已注册的源保持不变
         """
         # 获取所有可用的源类型
         source_types = NewsSourceFactory.get_available_sources()
@@ -49,6 +64,8 @@ class NewsSourceManager:
         # 创建并注册源实例
         sources = []
         for source_type in source_types:
+            if source_type in self.sources:
+                continue
             try:
                 source = NewsSourceFactory.create_source(source_type)
                 if source:
@@ -57,6 +74,7 @@ class NewsSourceManager:
                 logger.error(f"创建源 {source_type} 时出错: {str(e)}")
         
         self.register_sources(sources)
+        self._all_loaded = True
         
         # 只记录源总数，而不是每个源的详细信息
         logger.info(f"注册了 {len(self.sources)} 个新闻源")
@@ -66,7 +84,50 @@ class NewsSourceManager:
         获取新闻源
         """
         return self.sources.get(source_id)
-    
+
+    def get_or_create_source(self, source_id: str, **kwargs) -> Optional[NewsSource]:
+        """
+        获取常驻的新闻源实例，不存在时通过工厂创建并注册
+
+        注册后的实例在进程内长期存活，其内存缓存可被后续请求复用。
+        设置了源提供者且没有额外参数时由提供者创建，以使用数据库中的源配置
+
+        Args:
+            source_id: 源ID
+            **kwargs: 创建源时传递给工厂的参数
+
+        Returns:
+            新闻源实例，创建失败时返回None
+        """
+        source = self.sources.get(source_id)
+        if source is not None:
+            return source
+
+        if self.provider is not None and not kwargs:
+            source = self.provider.get_source(source_id)
+        else:
+            source = NewsSourceFactory.create_source(source_id, **kwargs)
+        if source is not None:
+            self.register_source(source)
+        return source
+
+    def ensure_sources(self) -> List[NewsSource]:
+        """
+        确保所有源都已创建，返回所有常驻新闻源
+
+        首次调用时创建尚未创建的源：设置了源提供者时从提供者获取，否则注册默认源
+        """
+        if not self._all_loaded:
+            if self.provider is not None:
+                self.register_sources([
+                    source for source in self.provider.get_all_sources()
+                    if source.source_id not in self.sources
+                ])
+                self._all_loaded = True
+            else:
+                self.register_default_sources()
+        return self.get_all_sources()
+
     def get_all_sources(self) -> List[NewsSource]:
         """
         获取所有新闻源
@@ -135,7 +196,7 @@ class NewsSourceManager:
         支持强制更新和缓存
         """
         settings.log_info(f">>> NewsSourceManager.fetch_news called for {source_id}")
-        source = self.get_source(source_id)
+        source = self.get_or_create_source(source_id)
         if not source:
             logger.error(f"News source not found: {source_id}")
             return []
@@ -1,10 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Set
+import threading
 import traceback
 import logging
 
 from worker.sources.interface import NewsSourceInterface
 from worker.sources.factory import NewsSourceFactory
+from worker.sources.config import settings
 
 # 创建日志器
 logger = logging.getLogger(__name__)
@@ -57,72 +59,98 @@ class DefaultNewsSourceProvider(NewsSourceProvider):
     """
     默认新闻源提供者实现
     使用工厂方法创建新闻源
+    
+    新闻源在首次获取时才创建，适配器模块也随之按需导入；
+    warm_up中的新闻源在初始化时预先创建
     """
     
-    def __init__(self):
+    def __init__(self, warm_up: Optional[Iterable[str]] = None):
         self.sources: Dict[str, NewsSourceInterface] = {}
-        self._initialize_sources()
+        
+        # 数据库配置和可用源类型在首次需要时加载
+        self._db_configs: Optional[Dict[str, Dict[str, Any]]] = None
+        self._source_types: Optional[List[str]] = None
+        
+        # 创建失败或已注销的源类型，不再自动创建
+        self._skipped_types: Set[str] = set()
+        self._all_loaded = False
+        self._lock = threading.RLock()
+        
+        for source_type in (settings.source_warm_up if warm_up is None else warm_up):
+            self.get_source(source_type)
     
-    def _initialize_sources(self):
-        """
-        初始化新闻源
-        """
-        try:
-            # 首先尝试从数据库加载源配置
-            all_configs = self._load_sources_from_db()
-            
+    def _get_source_types(self) -> List[str]:
+        if self._source_types is None:
+            self._source_types = NewsSourceFactory.get_available_sources()
+        return self._source_types
+    
+    def _get_db_configs(self) -> Dict[str, Dict[str, Any]]:
+        if self._db_configs is None:
             # 将配置按source_id索引
             db_configs = {}
-            for config in all_configs:
+            for config in self._load_sources_from_db():
                 source_id = config.get("source_id")
                 if source_id:
                     db_configs[source_id] = config
             
             if db_configs:
                 logger.info(f"从数据库加载了 {len(db_configs)} 个源的配置信息")
+            self._db_configs = db_configs
+        return self._db_configs
+    
+    def _find_config(self, source_type: str) -> Optional[Dict[str, Any]]:
+        """
+        查找源类型对应的数据库配置，兼容-和_的写法
+        """
+        db_configs = self._get_db_configs()
+        for key in (source_type, source_type.replace('-', '_'), source_type.replace('_', '-')):
+            if key in db_configs:
+                return db_configs[key]
+        return None
+    
+    def _create_source(self, source_type: str) -> Optional[NewsSourceInterface]:
+        """
+        创建并注册一个源，优先使用数据库配置
+        """
+        if source_type in self._skipped_types:
+            return None
+        
+        try:
+            found_config = self._find_config(source_type)
             
-            # 获取所有可用的源类型
-            source_types = NewsSourceFactory.get_available_sources()
-            
-            # 创建所有源的实例，优先使用数据库配置
-            for source_type in source_types:
-                try:
-                    # 尝试查找匹配的配置
-                    found_config = None
-                    config_key = None
-                    
-                    # 首先尝试精确匹配
-                    if source_type in db_configs:
-                        found_config = db_configs[source_type]
-                        config_key = source_type
-                    else:
-                        # 尝试替换-和_
-                        alt_source_type = source_type.replace('-', '_')
-                        if alt_source_type in db_configs:
-                            found_config = db_configs[alt_source_type]
-                            config_key = alt_source_type
-                        else:
-                            alt_source_type = source_type.replace('_', '-')
-                            if alt_source_type in db_configs:
-                                found_config = db_configs[alt_source_type]
-                                config_key = alt_source_type
-                                
-                    # 如果找到配置，使用配置创建源
-                    if found_config:
-                        source = NewsSourceFactory.create_source(source_type, config=found_config)
-                        logger.debug(f"使用数据库配置创建源 {source_type}: {found_config}")
-                    else:
-                        source = NewsSourceFactory.create_source(source_type)
-                        logger.debug(f"使用默认配置创建源 {source_type}")
-                    
-                    if source:
-                        self.sources[source.source_id] = source
-                except Exception as e:
-                    logger.error(f"创建源 {source_type} 时出错: {str(e)}")
-                     
+            # 如果找到配置，使用配置创建源
+            if found_config:
+                source = NewsSourceFactory.create_source(source_type, config=found_config)
+                logger.debug(f"使用数据库配置创建源 {source_type}: {found_config}")
+            else:
+                source = NewsSourceFactory.create_source(source_type)
+                logger.debug(f"使用默认配置创建源 {source_type}")
         except Exception as e:
-            logger.error(f"初始化新闻源出错: {str(e)}")
-            logger.error(traceback.format_exc())
+            logger.error(f"创建源 {source_type} 时出错: {str(e)}")
+            source = None
+        
+        if source is None:
+            self._skipped_types.add(source_type)
+            return None
+        
+        self.sources[source.source_id] = source
+        return source
+    
+    def _load_all_sources(self):
+        """
+        创建所有尚未创建的源
+        """
+        with self._lock:
+            if self._all_loaded:
+                return
+            try:
+                for source_type in self._get_source_types():
+                    if source_type not in self.sources:
+                        self._create_source(source_type)
+                self._all_loaded = True
+            except Exception as e:
+                logger.error(f"初始化新闻源出错: {str(e)}")
+                logger.error(traceback.format_exc())
     
     def get_source(self, source_id: str) -> Optional[NewsSourceInterface]:
         """
@@ -134,6 +162,28 @@ class DefaultNewsSourceProvider(NewsSourceProvider):
         Returns:
             新闻源
         """
+        source = self.sources.get(source_id)
+        if source is not None or source_id in self._skipped_types:
+            return source
+        
+        with self._lock:
+            source = self.sources.get(source_id)
+            if source is not None:
+                return source
+            
+            try:
+                source_types = self._get_source_types()
+            except Exception as e:
+                logger.error(f"获取可用源类型出错: {str(e)}")
+                return None
+            
+            if source_id in source_types:
+                source = self._create_source(source_id)
+                if source is not None and source.source_id == source_id:
+                    return source
+        
+        # 源ID与源类型不一致时（如被合并的源），创建全部源后再查找
+        self._load_all_sources()
         return self.sources.get(source_id)
     
     def get_all_sources(self) -> List[NewsSourceInterface]:
@@ -143,6 +193,7 @@ class DefaultNewsSourceProvider(NewsSourceProvider):
         Returns:
             所有新闻源
         """
+        self._load_all_sources()
         return list(self.sources.values())
     
     def get_sources_by_category(self, category: str) -> List[NewsSourceInterface]:
@@ -155,7 +206,7 @@ class DefaultNewsSourceProvider(NewsSourceProvider):
         Returns:
             指定分类的新闻源列表
         """
-        return [source for source in self.sources.values() if source.category == category]
+        return [source for source in self.get_all_sources() if source.category == category]
     
     def register_source(self, source: NewsSourceInterface):
         """
@@ -165,6 +216,7 @@ class DefaultNewsSourceProvider(NewsSourceProvider):
             source: 新闻源
         """
         self.sources[source.source_id] = source
+        self._skipped_types.discard(source.source_id)
     
     def unregister_source(self, source_id: str):
         """
@@ -175,6 +227,7 @@ class DefaultNewsSourceProvider(NewsSourceProvider):
         """
         if source_id in self.sources:
             del self.sources[source_id]
+        self._skipped_types.add(source_id)
     
     def _load_sources_from_db(self) -> List[Dict[str, Any]]:
         """
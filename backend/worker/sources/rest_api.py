@@ -97,7 +97,9 @@ class RESTNewsSource(NewsSource):
             method="GET",
             params=self.params,
             headers=self.headers,
-            response_type="json"
+            response_type="json",
+            source_id=self.source_id,
+            conditional=self.conditional_get
         )
         
         # Use custom parser if provided
@@ -12,6 +12,7 @@ from bs4 import BeautifulSoup
 
 from worker.sources.base import NewsSource, NewsItemModel
 from worker.utils.http_client import http_client
+from worker.utils.conditional_get import NotModified
 
 logger = logging.getLogger(__name__)
 
@@ -63,7 +64,9 @@ class RSSNewsSource(NewsSource):
                 url=self.feed_url,
                 method="GET",
                 headers={"User-Agent": self.user_agent},
-                response_type="text"
+                response_type="text",
+                source_id=self.source_id,
+                conditional=self.conditional_get
             )
             
             # 解析RSS
@@ -182,6 +185,9 @@ class RSSNewsSource(NewsSource):
             logger.info(f"Fetched {len(news_items)} news items from RSS feed: {self.feed_url}")
             return news_items
         
+        except NotModified:
+            logger.info(f"RSS feed not modified: {self.feed_url}")
+            raise
         except Exception as e:
             logger.error(f"Error fetching RSS feed {self.feed_url}: {str(e)}")
             raise
@@ -1,52 +1,73 @@
-# 导入所有新闻源适配器
-from worker.sources.sites.zhihu import ZhihuHotNewsSource
-from worker.sources.sites.weibo import WeiboHotNewsSource
-from worker.sources.sites.baidu import BaiduHotNewsSource
-from worker.sources.sites.hackernews import HackerNewsSource
-from worker.sources.sites.bilibili import BilibiliHotNewsSource
-from worker.sources.sites.douyin import DouyinHotNewsSource
-from worker.sources.sites.toutiao import ToutiaoHotNewsSource
-from worker.sources.sites.ithome import ITHomeNewsSource
-from worker.sources.sites.github import GitHubTrendingSource
-from worker.sources.sites.v2ex import V2EXSeleniumSource
-from worker.sources.sites.xueqiu import XueqiuHotStockSource
-from worker.sources.sites.tieba import TiebaHotTopicSource
-from worker.sources.sites.kuaishou import KuaishouHotSearchSource
-from worker.sources.sites.jin10 import Jin10NewsSource
-from worker.sources.sites.cankaoxiaoxi import CanKaoXiaoXiNewsSource
-from worker.sources.sites.solidot import SolidotNewsSource
-from worker.sources.sites.zaobao import ZaoBaoNewsSource
-from worker.sources.sites.sputniknewscn import SputnikNewsCNSource
-from worker.sources.sites.producthunt import ProductHuntNewsSource
-from worker.sources.sites.linuxdo import LinuxDoNewsSource, LinuxDoLatestNewsSource, LinuxDoHotNewsSource
-from worker.sources.sites.kaopu import KaoPuNewsSource
-from worker.sources.sites.gelonghui import GeLongHuiNewsSource
-from worker.sources.sites.fastbull import FastBullExpressNewsSource, FastBullGeneralNewsSource
-from worker.sources.sites.wallstreetcn import (
-    WallStreetCNLiveNewsSource,
-    WallStreetCNNewsSource,
-    WallStreetCNHotNewsSource
-)
-# 36kr模块名称需要使用引号，因为Python不允许模块名以数字开头
-from worker.sources.sites.kr36 import Kr36NewsSource
-# 新增适配器
-from worker.sources.sites.coolapk import CoolApkNewsSource, CoolApkFeedNewsSource, CoolApkAppNewsSource
-from worker.sources.sites.cls import CLSNewsSource
-# 添加BBC世界新闻适配器
-from worker.sources.sites.bbc import BBCWorldNewsSource
-# 添加新创建的澎湃新闻Selenium适配器
-from worker.sources.sites.thepaper_selenium import ThePaperSeleniumSource
-# 添加知乎日报适配器
-from worker.sources.sites.zhihu_daily import ZhihuDailyNewsSource
-# 添加彭博社新闻适配器
-from worker.sources.sites.bloomberg import (
-    BloombergNewsSource,
-    BloombergMarketsNewsSource,
-    BloombergTechnologyNewsSource
-)
-# 添加第一财经新闻适配器
-from worker.sources.sites.yicai import YiCaiBriefSource, YiCaiNewsSource
-from worker.sources.sites.ifeng import IfengStudioSource, IfengTechSource
+"""
+新闻源适配器
+
+适配器类在首次访问时才导入所在模块，导入本包不会加载任何站点模块
+"""
+
+import importlib
+
+# 适配器类名到所在模块的映射
+_ADAPTER_MODULES = {
+    "ZhihuHotNewsSource": "zhihu",
+    "WeiboHotNewsSource": "weibo",
+    "BaiduHotNewsSource": "baidu",
+    "HackerNewsSource": "hackernews",
+    "BilibiliHotNewsSource": "bilibili",
+    "DouyinHotNewsSource": "douyin",
+    "ToutiaoHotNewsSource": "toutiao",
+    "ITHomeNewsSource": "ithome",
+    "GitHubTrendingSource": "github",
+    "V2EXSeleniumSource": "v2ex",
+    "XueqiuHotStockSource": "xueqiu",
+    "TiebaHotTopicSource": "tieba",
+    "KuaishouHotSearchSource": "kuaishou",
+    "Jin10NewsSource": "jin10",
+    "CanKaoXiaoXiNewsSource": "cankaoxiaoxi",
+    "SolidotNewsSource": "solidot",
+    "ZaoBaoNewsSource": "zaobao",
+    "SputnikNewsCNSource": "sputniknewscn",
+    "ProductHuntNewsSource": "producthunt",
+    "LinuxDoNewsSource": "linuxdo",
+    "LinuxDoLatestNewsSource": "linuxdo",
+    "LinuxDoHotNewsSource": "linuxdo",
+    "KaoPuNewsSource": "kaopu",
+    "GeLongHuiNewsSource": "gelonghui",
+    "FastBullExpressNewsSource": "fastbull",
+    "FastBullGeneralNewsSource": "fastbull",
+    "WallStreetCNLiveNewsSource": "wallstreetcn",
+    "WallStreetCNNewsSource": "wallstreetcn",
+    "WallStreetCNHotNewsSource": "wallstreetcn",
+    # 36kr模块名称不能以数字开头，模块名为kr36
+    "Kr36NewsSource": "kr36",
+    "CoolApkNewsSource": "coolapk",
+    "CoolApkFeedNewsSource": "coolapk",
+    "CoolApkAppNewsSource": "coolapk",
+    "CLSNewsSource": "cls",
+    "BBCWorldNewsSource": "bbc",
+    "ThePaperSeleniumSource": "thepaper_selenium",
+    "ZhihuDailyNewsSource": "zhihu_daily",
+    "BloombergNewsSource": "bloomberg",
+    "BloombergMarketsNewsSource": "bloomberg",
+    "BloombergTechnologyNewsSource": "bloomberg",
+    "YiCaiBriefSource": "yicai",
+    "YiCaiNewsSource": "yicai",
+    "IfengStudioSource": "ifeng",
+    "IfengTechSource": "ifeng",
+}
+
+
+def __getattr__(name):
+    module_name = _ADAPTER_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
 
 # 导出所有新闻源适配器
 __all__ = [
@@ -94,4 +115,4 @@ __all__ = [
     "YiCaiNewsSource",
     "IfengStudioSource",
     "IfengTechSource"
-] 
\ No newline at end of file
+]
@@ -2,7 +2,6 @@ import logging
 import datetime
 import os
 from typing import List, Dict, Any, Optional, Union
-import aiohttp
 import json
 import asyncio
 import re
@@ -25,12 +24,14 @@ from selenium.common.exceptions import TimeoutException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
 
 from worker.sources.base import NewsItemModel
+from worker.utils.browser_pool import BrowserPoolMixin
 from worker.sources.rest_api import RESTNewsSource
+from worker.utils.http_transport import http_transport
 
 logger = logging.getLogger(__name__)
 
 
-class CLSNewsSource(RESTNewsSource):
+class CLSNewsSource(BrowserPoolMixin, RESTNewsSource):
     """
     财联社新闻源适配器
     使用多种方式获取财联社内容:
@@ -250,7 +251,7 @@ class CLSNewsSource(RESTNewsSource):
             # 随机延迟，模拟人类行为
             await asyncio.sleep(0.5 + random.random())
             
-            async with aiohttp.ClientSession() as session:
+            async with http_transport.session() as session:
                 async with session.get(url, params=params, headers=api_headers, timeout=10) as response:
                     if response.status != 200:
                         logger.warning(f"获取财联社电报失败，状态码: {response.status}")
@@ -350,7 +351,7 @@ class CLSNewsSource(RESTNewsSource):
             # 随机延迟，模拟人类行为
             await asyncio.sleep(0.5 + random.random())
             
-            async with aiohttp.ClientSession() as session:
+            async with http_transport.session() as session:
                 async with session.get(url, params=params, headers=api_headers, timeout=10) as response:
                     if response.status != 200:
                         logger.warning(f"获取财联社热门文章失败，状态码: {response.status}")
@@ -444,7 +445,7 @@ class CLSNewsSource(RESTNewsSource):
             # 随机延迟，模拟人类行为
             await asyncio.sleep(0.5 + random.random())
             
-            async with aiohttp.ClientSession() as session:
+            async with http_transport.session() as session:
                 async with session.get(url, params=params, headers=api_headers, timeout=10) as response:
                     if response.status != 200:
                         logger.warning(f"获取环球市场情报失败，状态码: {response.status}")
@@ -871,8 +872,8 @@ class CLSNewsSource(RESTNewsSource):
             # 不在这里关闭driver，让外部调用者处理异常并关闭
             raise
         finally:
-            # 不要在这里关闭WebDriver，因为同一实例可能会被复用
-            pass
+            # 租用的浏览器在抓取结束后归还给浏览器池；自建的WebDriver保留复用
+            await self._release_pooled_driver()
     
     async def _scrape_telegraph_page(self):
         """Scrape CLS telegraph page using HTTP"""
@@ -1370,6 +1371,10 @@ class CLSNewsSource(RESTNewsSource):
         Returns:
             WebDriver: Chrome WebDriver实例，失败返回None
         """
+        # 优先从共享浏览器池租用已启动的浏览器
+        if self.use_browser_pool:
+            return await self._lease_pooled_driver()
+        
         if self._driver is None:
             logger.info("WebDriver不存在，开始创建新的WebDriver实例")
             
@@ -1428,6 +1433,10 @@ class CLSNewsSource(RESTNewsSource):
         关闭WebDriver实例并清理资源
         包含失败后的后备清理措施
         """
+        # 租用的浏览器归还给浏览器池，不关闭
+        if await self._release_pooled_driver():
+            return
+        
         if self._driver:
             logger.info("关闭WebDriver实例")
             try:
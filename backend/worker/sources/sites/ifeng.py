@@ -12,7 +12,6 @@ from typing import List, Dict, Any, Optional, Tuple
 from urllib.parse import urljoin
 from pathlib import Path
 
-import aiohttp
 from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -25,13 +24,15 @@ from webdriver_manager.chrome import ChromeDriverManager
 
 from worker.sources.web import WebNewsSource
 from worker.sources.base import NewsItemModel
+from worker.utils.browser_pool import BrowserPoolMixin
 from worker.utils.http_client import http_client
+from worker.utils.http_transport import http_transport
 
 logger = logging.getLogger(__name__)
 DEBUG_MODE = os.environ.get("DEBUG", "0") == "1"
 
 
-class IfengBaseSource(WebNewsSource):
+class IfengBaseSource(BrowserPoolMixin, WebNewsSource):
     """
     凤凰网新闻适配器基类
     可以获取凤凰网站的新闻内容
@@ -260,6 +261,10 @@ class IfengBaseSource(WebNewsSource):
         """
         获取WebDriver实例，如果不存在则创建
         """
+        # 优先从共享浏览器池租用已启动的浏览器
+        if self.use_browser_pool:
+            return await self._lease_pooled_driver()
+        
         if self._driver is None:
             logger.debug("创建新的WebDriver实例")
             # 在事件循环中运行阻塞的WebDriver创建
@@ -274,6 +279,10 @@ class IfengBaseSource(WebNewsSource):
         """
         关闭WebDriver及其相关进程
         """
+        # 租用的浏览器归还给浏览器池，不关闭
+        if await self._release_pooled_driver():
+            return
+        
         if self._driver is not None:
             try:
                 logger.debug("正在关闭WebDriver")
@@ -479,7 +488,7 @@ class IfengBaseSource(WebNewsSource):
             logger.info(f"HTTP备用请求: GET {self.url}, UA: {headers['User-Agent'][:20]}...")
             
             # 使用aiohttp进行异步请求
-            async with aiohttp.ClientSession(headers=headers) as session:
+            async with http_transport.session(headers=headers) as session:
                 try:
                     # 增加超时设置
                     async with session.get(self.url, timeout=30) as response:
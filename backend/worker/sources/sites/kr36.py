@@ -6,6 +6,7 @@ from bs4 import BeautifulSoup
 
 from worker.sources.base import NewsItemModel
 from worker.sources.web import WebNewsSource
+from worker.utils.conditional_get import NotModified
 
 logger = logging.getLogger(__name__)
 
@@ -203,6 +204,8 @@ class Kr36NewsSource(WebNewsSource):
             logger.info(f"[36KR-DEBUG] 成功获取 {len(news_items)} 条36氪快讯")
             return news_items
         
+        except NotModified:
+            raise
         except Exception as e:
             logger.error(f"[36KR-DEBUG] 获取36氪快讯出错: {str(e)}")
             return []
@@ -24,6 +24,7 @@ from webdriver_manager.chrome import ChromeDriverManager
 
 from worker.sources.web import WebNewsSource
 from worker.sources.base import NewsItemModel
+from worker.utils.browser_pool import BrowserPoolMixin
 from worker.utils.http_client import http_client
 try:
     # Import the custom logging configuration module
@@ -45,7 +46,7 @@ DEBUG_MODE = False
 _initialized_instances = {}
 _initialized_source_ids = set()
 
-class ThePaperSeleniumSource(WebNewsSource):
+class ThePaperSeleniumSource(BrowserPoolMixin, WebNewsSource):
     """
     澎湃新闻热榜适配器 - Selenium版本
     专门使用Selenium从澎湃新闻网站获取热榜数据
@@ -432,6 +433,10 @@ class ThePaperSeleniumSource(WebNewsSource):
         """
         获取WebDriver实例，如果不存在则创建
         """
+        # 优先从共享浏览器池租用已启动的浏览器
+        if self.use_browser_pool:
+            return await self._lease_pooled_driver()
+        
         if self._driver is None:
             if DEBUG_MODE:
                 logger.debug("创建新的WebDriver实例")
@@ -447,6 +452,10 @@ class ThePaperSeleniumSource(WebNewsSource):
         """
         关闭WebDriver及其相关进程
         """
+        # 租用的浏览器归还给浏览器池，不关闭
+        if await self._release_pooled_driver():
+            return
+        
         if self._driver is not None:
             try:
                 if DEBUG_MODE:
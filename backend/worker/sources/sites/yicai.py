@@ -11,7 +11,6 @@ import asyncio
 import platform
 from typing import List, Dict, Any, Optional
 from bs4 import BeautifulSoup
-import aiohttp
 
 # Selenium相关导入
 from selenium import webdriver
@@ -25,7 +24,9 @@ from webdriver_manager.chrome import ChromeDriverManager
 
 from worker.sources.web import WebNewsSource
 from worker.sources.base import NewsItemModel
+from worker.utils.browser_pool import BrowserPoolMixin
 from worker.utils.http_client import http_client
+from worker.utils.http_transport import http_transport
 
 # 创建日志记录器
 logger = logging.getLogger(__name__)
@@ -35,7 +36,7 @@ logger.setLevel(logging.INFO)
 # 全局调试模式标志
 DEBUG_MODE = False
 
-class YiCaiBaseSource(WebNewsSource):
+class YiCaiBaseSource(BrowserPoolMixin, WebNewsSource):
     """
     第一财经新闻适配器基类 - Selenium版本
     可以获取第一财经网站的快讯和新闻内容
@@ -263,6 +264,10 @@ class YiCaiBaseSource(WebNewsSource):
         """
         获取WebDriver实例，如果不存在则创建
         """
+        # 优先从共享浏览器池租用已启动的浏览器
+        if self.use_browser_pool:
+            return await self._lease_pooled_driver()
+        
         if self._driver is None:
             if DEBUG_MODE:
                 logger.debug("创建新的WebDriver实例")
@@ -278,6 +283,10 @@ class YiCaiBaseSource(WebNewsSource):
         """
         关闭WebDriver及其相关进程
         """
+        # 租用的浏览器归还给浏览器池，不关闭
+        if await self._release_pooled_driver():
+            return
+        
         if self._driver is not None:
             try:
                 if DEBUG_MODE:
@@ -426,7 +435,7 @@ class YiCaiBaseSource(WebNewsSource):
         # 1. 获取快讯数据
         logger.info(f"获取快讯数据，URL: {self.BRIEF_URL}")
         try:
-            async with aiohttp.ClientSession() as session:
+            async with http_transport.session() as session:
                 async with session.get(self.BRIEF_URL, headers=headers, timeout=30) as response:
                     logger.info(f"快讯页面状态码: {response.status}")
                     
@@ -611,7 +620,7 @@ class YiCaiBaseSource(WebNewsSource):
         # 2. 获取新闻数据
         logger.info(f"获取新闻数据，URL: {self.NEWS_URL}")
         try:
-            async with aiohttp.ClientSession() as session:
+            async with http_transport.session() as session:
                 async with session.get(self.NEWS_URL, headers=headers, timeout=30) as response:
                     logger.info(f"新闻页面状态码: {response.status}")
                     
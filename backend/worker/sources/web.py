@@ -7,11 +7,12 @@ import re
 from abc import abstractmethod
 from typing import List, Dict, Any, Optional, Tuple, Union
 
-import aiohttp
 from bs4 import BeautifulSoup
 
 from worker.sources.base import NewsSource, NewsItemModel
 from worker.utils.http_client import http_client
+from worker.utils.http_transport import http_transport, TransportSession
+from worker.utils.conditional_get import NotModified, validator_store
 
 logger = logging.getLogger(__name__)
 
@@ -59,12 +60,13 @@ class WebNewsSource(NewsSource):
             self.headers["User-Agent"] = self.config.get("user_agent", "HeatLink News Aggregator")
     
     @property
-    async def http_client(self) -> aiohttp.ClientSession:
+    async def http_client(self) -> TransportSession:
         """
         获取HTTP客户端
         """
         if self._http_client is None or self._http_client.closed:
-            self._http_client = aiohttp.ClientSession()
+            # 使用共享连接池的会话视图，关闭时不会关闭连接池
+            self._http_client = http_transport.session()
         return self._http_client
     
     async def close(self):
@@ -92,9 +94,18 @@ class WebNewsSource(NewsSource):
     async def fetch_content(self) -> str:
         """
         获取网页内容
+        
+        启用条件请求时上游返回304会抛出NotModified
         """
         client = await self.http_client
         
+        # 条件请求头
+        headers = self.headers
+        validator_key = None
+        if self.conditional_get:
+            validator_key = validator_store.make_key(self.source_id, self.url)
+            headers = validator_store.apply(validator_key, self.headers)
+        
         # 实现智能重试
         retry_count = 0
         current_delay = self.retry_delay
@@ -117,9 +128,14 @@ class WebNewsSource(NewsSource):
         while retry_count <= self.max_retries:
             try:
                 # 使用代理发起请求
-                async with client.get(self.url, headers=self.headers, timeout=30, proxy=proxy_url) as response:
+                async with client.get(self.url, headers=headers, timeout=30, proxy=proxy_url) as response:
                     if response.status == 200:
+                        if validator_key:
+                            validator_store.update(validator_key, response.headers)
                         return await response.text()
+                    elif response.status == 304 and validator_key:
+                        validator_store.record_not_modified(validator_key)
+                        raise NotModified(self.url)
                     elif response.status in self.retry_status_codes and retry_count < self.max_retries:
                         # 需要重试的状态码
                         retry_count += 1
@@ -129,6 +145,8 @@ class WebNewsSource(NewsSource):
                     else:
                         logger.error(f"Failed to fetch content from {self.url}, status: {response.status}")
                         return ""
+            except NotModified:
+                raise
             except asyncio.TimeoutError:
                 if retry_count < self.max_retries:
                     retry_count += 1
@@ -176,6 +194,8 @@ class WebNewsSource(NewsSource):
             logger.info(f"Fetched {len(news_items)} news items from web: {self.url}")
             return news_items
         
+        except NotModified:
+            raise
         except Exception as e:
             logger.error(f"Error fetching web news from {self.url}: {str(e)}")
             raise
@@ -296,7 +316,9 @@ class APINewsSource(WebNewsSource):
                 headers=self.headers,
                 params=self.params,
                 json_data=self.json_data,
-                response_type=self.response_type
+                response_type=self.response_type,
+                source_id=self.source_id,
+                conditional=self.conditional_get
             )
             
             # 解析响应
@@ -305,6 +327,8 @@ class APINewsSource(WebNewsSource):
             logger.info(f"Fetched {len(news_items)} news items from API: {self.api_url}")
             return news_items
         
+        except NotModified:
+            raise
         except Exception as e:
             logger.error(f"Error fetching API news from {self.api_url}: {str(e)}")
             raise 
\ No newline at end of file
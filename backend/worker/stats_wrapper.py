@@ -10,7 +10,7 @@ import logging
 from typing import List, Dict, Any, Optional
 import datetime
 
-from app.db.session import SessionLocal
+from app.db.session import run_db
 from app.crud.source_stats import update_source_status, get_latest_stats, create_source_stats
 from app.crud.source import get_source, update_source, get_source_by_alias
 from worker.sources.base import NewsItemModel
@@ -118,136 +118,141 @@ class StatsUpdater:
             logger.error(f"StatsUpdater: 所有重试都失败，最后错误: {str(last_error)}")
     
     async def _update_db_stats(self, source_id: str, api_type: str = "internal") -> None:
-        """更新数据库统计，使用独立的事务和简化的错误处理"""
+        """更新数据库统计，数据库操作在专用线程池中执行，不阻塞事件循环"""
         cache_key = f"{source_id}:{api_type}"
         stats = self.stats_cache.get(cache_key, {})
         if not stats:
             return
-            
-        # 使用一个新的会话和事务
-        db = None
+        
+        # 复制一份快照，线程池中执行期间新的请求仍可继续累加内存统计
+        snapshot = dict(stats)
+        error_sources = dict(self._error_sources)
+        
         try:
-            # 创建单独的数据库会话
-            db = SessionLocal()
-            
-            # 尝试获取源
-            db_source = None
-            source_id_found = None
-            
-            # 尝试所有可能的ID格式
-            possible_ids = [source_id]
-            
-            # 添加连字符/下划线转换的变体
-            if "_" in source_id:
-                possible_ids.append(source_id.replace("_", "-"))
-            elif "-" in source_id:
-                possible_ids.append(source_id.replace("-", "_"))
-            
-            # 尝试每个可能的ID
-            for try_id in possible_ids:
-                try:
-                    # 直接尝试ID
-                    db_source = get_source(db, try_id)
-                    if db_source:
-                        source_id_found = try_id
-                        break
-                except Exception:
-                    continue
-                    
-                try:
-                    # 尝试作为别名查找
-                    db_source = get_source_by_alias(db, try_id)
-                    if db_source:
-                        source_id_found = db_source.id
-                        break
-                except Exception:
-                    continue
-            
-            # 如果找不到源，记录为无效并返回
-            if not db_source:
-                logger.warning(f"StatsUpdater: 源 {source_id} 不存在于数据库中，标记为无效")
-                self._invalid_source_ids.add(source_id)
-                return
-                
-            # 使用找到的ID
-            source_id = source_id_found or source_id
+            resolved_id = await run_db(self._write_db_stats, source_id, api_type, snapshot, error_sources)
+        except Exception as e:
+            logger.error(f"StatsUpdater: 更新数据库统计时出错: {str(e)}")
+            raise  # 重新抛出异常以触发重试
+        
+        # 如果找不到源，记录为无效并返回
+        if resolved_id is None:
+            logger.warning(f"StatsUpdater: 源 {source_id} 不存在于数据库中，标记为无效")
+            self._invalid_source_ids.add(source_id)
+            return
+        
+        # 清除错误源记录
+        if resolved_id in self._error_sources:
+            del self._error_sources[resolved_id]
+        
+        # 更新最后更新时间
+        self.last_update[resolved_id] = time.time()
+        
+        # 扣除已写入数据库的统计量，保留写入期间新增的部分
+        current = self.stats_cache.get(cache_key, {})
+        for field in ("success_count", "error_count", "total_requests", "total_response_time", "news_count"):
+            current[field] = current.get(field, 0) - snapshot.get(field, 0)
+        if current.get("total_requests", 0) <= 0:
+            current["last_error"] = None
+            current["last_response_time"] = 0
+        current["api_type"] = api_type
+        self.stats_cache[cache_key] = current
+        
+        logger.info(f"StatsUpdater: 成功更新数据库中 {resolved_id} 的统计信息")
+    
+    @staticmethod
+    def _write_db_stats(db, source_id: str, api_type: str, stats: Dict[str, Any],
+                        error_sources: Dict[str, Any]) -> Optional[str]:
+        """
+        写入源状态和统计记录，在数据库线程池中执行
+        
+        Returns:
+            数据库中实际的源ID，找不到源时返回None
+        """
+        # 尝试获取源
+        db_source = None
+        source_id_found = None
+        
+        # 尝试所有可能的ID格式
+        possible_ids = [source_id]
+        
+        # 添加连字符/下划线转换的变体
+        if "_" in source_id:
+            possible_ids.append(source_id.replace("_", "-"))
+        elif "-" in source_id:
+            possible_ids.append(source_id.replace("-", "_"))
+        
+        # 尝试每个可能的ID
+        for try_id in possible_ids:
+            try:
+                # 直接尝试ID
+                db_source = get_source(db, try_id)
+                if db_source:
+                    source_id_found = try_id
+                    break
+            except Exception:
+                continue
                 
-            # 计算统计数据
-            success_rate = stats["success_count"] / stats["total_requests"] if stats["total_requests"] > 0 else 0
-            avg_response_time = stats["total_response_time"] / stats["total_requests"] if stats["total_requests"] > 0 else 0
+            try:
+                # 尝试作为别名查找
+                db_source = get_source_by_alias(db, try_id)
+                if db_source:
+                    source_id_found = db_source.id
+                    break
+            except Exception:
+                continue
+        
+        if not db_source:
+            return None
             
-            # 更新源状态（简化版本）
-            if source_id in self._error_sources:
-                db_source.status = "error"
-                db_source.last_error = self._error_sources[source_id]["error"]
-                db_source.error_count = db_source.error_count + stats["error_count"] if db_source.error_count else stats["error_count"]
-            else:
-                db_source.status = "active"
-                
-            db_source.last_updated = datetime.datetime.now()
-            # 更新源的news_count字段，但不累加，直接使用最新值
-            db_source.news_count = stats["news_count"]
+        # 使用找到的ID
+        source_id = source_id_found or source_id
             
-            # 提交源状态更新
-            db.commit()
+        # 计算统计数据
+        success_rate = stats["success_count"] / stats["total_requests"] if stats["total_requests"] > 0 else 0
+        avg_response_time = stats["total_response_time"] / stats["total_requests"] if stats["total_requests"] > 0 else 0
+        
+        # 更新源状态（简化版本）
+        if source_id in error_sources:
+            db_source.status = "error"
+            db_source.last_error = error_sources[source_id]["error"]
+            db_source.error_count = db_source.error_count + stats["error_count"] if db_source.error_count else stats["error_count"]
+        else:
+            db_source.status = "active"
             
-            # 创建统计记录（简单版本）
-            try:
-                # 增加累积的统计量，从最新的历史记录中获取
-                # 先尝试获取最近的统计记录，以累加total_requests
-                latest_stats = get_latest_stats(db, source_id, api_type)
-                total_requests = stats["total_requests"]
-                if latest_stats:
-                    # 把当前请求数加到上一次的总请求数上，实现累加效果
-                    total_requests = latest_stats.total_requests + stats["total_requests"]
-                
-                create_source_stats(
-                    db, source_id,
-                    success_rate=success_rate,
-                    avg_response_time=avg_response_time,
-                    last_response_time=stats["last_response_time"],
-                    total_requests=total_requests,  # 使用累加后的请求总数
-                    error_count=stats["error_count"],
-                    news_count=stats["news_count"],
-                    api_type=api_type
-                )
-                db.commit()
-                
-                # 清除错误源记录
-                if source_id in self._error_sources:
-                    del self._error_sources[source_id]
-                
-                # 更新最后更新时间
-                self.last_update[source_id] = time.time()
-                
-                # 重置统计缓存
-                self.stats_cache[cache_key] = {
-                    "success_count": 0,
-                    "error_count": 0,
-                    "total_requests": 0,
-                    "total_response_time": 0,
-                    "news_count": 0,
-                    "last_error": None,
-                    "last_response_time": 0,
-                    "api_type": api_type
-                }
-                
-                logger.info(f"StatsUpdater: 成功更新数据库中 {source_id} 的统计信息")
-            except Exception as stats_err:
-                logger.warning(f"StatsUpdater: 创建统计记录失败: {str(stats_err)}")
-                db.rollback()
-                raise  # 重新抛出异常以触发重试
+        db_source.last_updated = datetime.datetime.now()
+        # 更新源的news_count字段，但不累加，直接使用最新值
+        db_source.news_count = stats["news_count"]
+        
+        # 提交源状态更新
+        db.commit()
+        
+        # 创建统计记录（简单版本）
+        try:
+            # 增加累积的统计量，从最新的历史记录中获取
+            # 先尝试获取最近的统计记录，以累加total_requests
+            latest_stats = get_latest_stats(db, source_id, api_type)
+            total_requests = stats["total_requests"]
+            if latest_stats:
+                # 把当前请求数加到上一次的总请求数上，实现累加效果
+                total_requests = latest_stats.total_requests + stats["total_requests"]
             
-        except Exception as e:
-            logger.error(f"StatsUpdater: 更新数据库统计时出错: {str(e)}")
+            create_source_stats(
+                db, source_id,
+                success_rate=success_rate,
+                avg_response_time=avg_response_time,
+                last_response_time=stats["last_response_time"],
+                total_requests=total_requests,  # 使用累加后的请求总数
+                error_count=stats["error_count"],
+                news_count=stats["news_count"],
+                api_type=api_type
+            )
+            db.commit()
+        except Exception as stats_err:
+            logger.warning(f"StatsUpdater: 创建统计记录失败: {str(stats_err)}")
+            db.rollback()
             raise  # 重新抛出异常以触发重试
-        finally:
-            # 确保关闭会话
-            if db:
-                try:
-                    db.close()
-                except Exception:
-                    pass
+        
+        return source_id
     
     async def _update_memory_stats(self, source_id: str, success: bool, response_time: float, 
                            news_count: int = 0, error_message: Optional[str] = None,
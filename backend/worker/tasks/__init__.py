@@ -103,6 +103,15 @@ celery_app.conf.beat_schedule = {
         }
     },
     
+    # 浏览量和阅读记录写回任务（每分钟），只在这里注册，避免两次写回同时运行
+    'flush-view-buffer': {
+        'task': 'news.flush_view_buffer',
+        'schedule': 60.0,  # 1分钟
+        'options': {
+            'queue': 'news-queue',
+        }
+    },
+    
     # 清理旧新闻任务（每天凌晨3点）
     'cleanup-old-news': {
         'task': 'news.cleanup_old_news',
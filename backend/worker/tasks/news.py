@@ -4,17 +4,15 @@ import sys
 import os
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
-import functools
 import inspect
 
 from sqlalchemy.orm import Session
 from celery import Task
 
-from app.crud.news import get_news_by_original_id, create_news, update_news
+from app.crud.news import bulk_upsert_news
 from app.crud.source import get_source, update_source
-from app.db.session import SessionLocal
+from app.db.session import SessionLocal, run_db
 from app.models.news import News
-from app.schemas.news import NewsCreate, NewsUpdate
 from worker.celery_app import celery_app
 from worker.sources.registry import source_registry
 from worker.sources.base import NewsItemModel
@@ -23,6 +21,8 @@ from app.core.config import settings
 from worker.sources.manager import source_manager
 from worker.sources.interface import NewsSourceInterface
 from worker.sources.provider import NewsSourceProvider, DefaultNewsSourceProvider
+from worker.utils.news_fingerprint import fingerprint_store
+from app.core.response_cache import response_cache
 import random
 import time
 import traceback
@@ -31,54 +31,11 @@ import uuid
 # 创建日志器
 logger = logging.getLogger(__name__)
 
-# 创建一个简单的ensure_event_loop装饰器，防止导入失败
-def get_or_create_eventloop():
-    """获取当前事件循环或创建新的事件循环"""
-    try:
-        return asyncio.get_event_loop()
-    except RuntimeError as ex:
-        if "There is no current event loop in thread" in str(ex):
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            return loop
-        raise
-
-def run_async(coro):
-    """安全地运行异步协程"""
-    loop = get_or_create_eventloop()
-    return loop.run_until_complete(coro)
-
-def ensure_event_loop(func):
-    """确保异步函数在有效的事件循环中执行"""
-    @functools.wraps(func)
-    async def wrapper(*args, **kwargs):
-        # 确保事件循环有效
-        get_or_create_eventloop()
-        try:
-            return await func(*args, **kwargs)
-        except RuntimeError as e:
-            if "Event loop is closed" in str(e):
-                logger.warning(f"检测到事件循环已关闭，为函数 {func.__name__} 创建新循环")
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                return await func(*args, **kwargs)
-            raise
-    return wrapper
-
-# 尝试导入事件循环修复模块
+# 任务中的协程都提交到工作进程的常驻事件循环，连接池和数据源实例在任务之间复用
 try:
-    from backend.worker.asyncio_fix import ensure_event_loop, run_async, get_or_create_eventloop
-    have_asyncio_fix = True
-    logger.info("成功从 backend.worker.asyncio_fix 导入事件循环修复")
+    from worker.utils.async_runtime import async_runtime
 except ImportError:
-    try:
-        from worker.asyncio_fix import ensure_event_loop, run_async, get_or_create_eventloop
-        have_asyncio_fix = True
-        logger.info("成功从 worker.asyncio_fix 导入事件循环修复")
-    except ImportError:
-        # 我们已经在上面定义了本地版本，所以继续使用它们
-        have_asyncio_fix = True
-        logger.warning("使用内置的事件循环修复函数")
+    from backend.worker.utils.async_runtime import async_runtime
 
 # 尝试导入任务日志助手
 try:
@@ -93,7 +50,12 @@ except ImportError:
 
 # 定义清理Chrome进程的函数
 def cleanup_chrome_processes():
-    """任务执行后清理Chrome进程"""
+    """任务执行后清理Chrome进程，浏览器池启用时跳过"""
+    from worker.utils.browser_pool import browser_pool_enabled
+    if browser_pool_enabled():
+        # 浏览器由池管理，按进程名清理会杀掉其他任务正在租用的浏览器
+        return 0
+    
     try:
         # 导入清理函数
         try:
@@ -146,6 +108,11 @@ source_provider = DefaultNewsSourceProvider()
 USE_API_FOR_DATA = os.environ.get("USE_API_FOR_DATA") == "1"
 API_BASE_URL = os.environ.get("API_BASE_URL", "http://localhost:8000")
 
+# 批量抓取配置
+FETCH_BATCH_SIZE = int(os.environ.get("FETCH_BATCH_SIZE", "20"))  # 每个批量任务包含的源数量上限
+FETCH_BATCH_CONCURRENCY = int(os.environ.get("FETCH_BATCH_CONCURRENCY", "8"))  # 批量任务内同时抓取的源数量
+FETCH_SOURCE_TIMEOUT = float(os.environ.get("FETCH_SOURCE_TIMEOUT", "180"))  # 单个源的抓取超时（秒）
+
 @celery_app.task(bind=True, name="news.schedule_source_updates")
 def schedule_source_updates(self: Task) -> Dict[str, Any]:
     """
@@ -157,17 +124,7 @@ def schedule_source_updates(self: Task) -> Dict[str, Any]:
         
         # 使用异步函数来处理这个任务
         try:
-            if have_asyncio_fix:
-                # 使用安全的事件循环运行
-                coroutine = _async_schedule_source_updates()
-                results = run_async(coroutine)
-            else:
-                # 使用标准方法
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                coroutine = _async_schedule_source_updates()
-                results = loop.run_until_complete(coroutine)
-                loop.close()
+            results = async_runtime.run(_async_schedule_source_updates())
                 
             return results
         except Exception as e:
@@ -182,7 +139,6 @@ def schedule_source_updates(self: Task) -> Dict[str, Any]:
         cleanup_chrome_processes()
 
 # 异步版本的调度任务
-@ensure_event_loop
 async def _async_schedule_source_updates() -> Dict[str, Any]:
     """
     异步版本的源更新调度器
@@ -190,22 +146,162 @@ async def _async_schedule_source_updates() -> Dict[str, Any]:
     # 获取所有源
     sources = source_provider.get_all_sources()
     
-    scheduled_sources = []
-    for source in sources:
-        # 检查是否应该更新
-        if source.should_update():
-            # 创建异步任务，使用send_task而不是delay
-            celery_app.send_task("news.fetch_source_news", args=[source.source_id])
-            scheduled_sources.append(source.source_id)
+    # 检查哪些源需要更新
+    scheduled_sources = [source.source_id for source in sources if source.should_update()]
+    
+    # 到期的源分批放入批量抓取任务，每次调度只发送少量任务
+    batches = 0
+    for start in range(0, len(scheduled_sources), FETCH_BATCH_SIZE):
+        batch = scheduled_sources[start:start + FETCH_BATCH_SIZE]
+        celery_app.send_task("news.fetch_sources_batch", args=[batch])
+        batches += 1
     
-    logger.info(f"Scheduled updates for {len(scheduled_sources)} sources")
+    logger.info(f"Scheduled updates for {len(scheduled_sources)} sources in {batches} batch tasks")
     
     return {
         "status": "success",
-        "message": f"Scheduled updates for {len(scheduled_sources)} sources",
-        "sources": scheduled_sources
+        "message": f"Scheduled updates for {len(scheduled_sources)} sources in {batches} batch tasks",
+        "sources": scheduled_sources,
+        "batches": batches
+    }
+
+
+@celery_app.task(bind=True, name="news.fetch_sources_batch")
+def fetch_sources_batch(self: Task, source_ids: List[str], max_concurrency: Optional[int] = None) -> Dict[str, Any]:
+    """
+    在一个任务中并发抓取多个新闻源，并一次性批量写入数据库
+    
+    Args:
+        source_ids: 新闻源ID列表
+        max_concurrency: 同时抓取的源数量，默认为FETCH_BATCH_CONCURRENCY
+        
+    Returns:
+        包含每个源抓取结果的汇总
+    """
+    logger.info(f"Starting batch fetch for {len(source_ids)} sources")
+    
+    try:
+        return async_runtime.run(_async_fetch_sources_batch(source_ids, max_concurrency or FETCH_BATCH_CONCURRENCY))
+    except Exception as e:
+        logger.error(f"Error in batch fetch task: {str(e)}")
+        logger.error(traceback.format_exc())
+        return {"status": "error", "message": str(e), "sources": {}}
+
+
+async def _async_fetch_sources_batch(source_ids: List[str], max_concurrency: int) -> Dict[str, Any]:
+    """
+    并发抓取多个新闻源，汇总后批量保存
+    """
+    outcomes: Dict[str, Dict[str, Any]] = {}
+    sources = []
+    for source_id in dict.fromkeys(source_ids):
+        source = source_provider.get_source(source_id)
+        if source is None:
+            outcomes[source_id] = {"status": "not_found", "count": 0}
+        else:
+            sources.append(source)
+    
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    
+    async def fetch_one(source) -> List[Any]:
+        async with semaphore:
+            start_time = time.time()
+            try:
+                news_items = await asyncio.wait_for(_fetch_source_news(source), timeout=FETCH_SOURCE_TIMEOUT)
+                outcomes[source.source_id] = {
+                    "status": "success",
+                    "count": len(news_items),
+                    "elapsed": round(time.time() - start_time, 2)
+                }
+                return news_items
+            except Exception as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    error = f"抓取超时（{FETCH_SOURCE_TIMEOUT}秒）"
+                else:
+                    error = str(e)
+                logger.error(f"Error fetching news from {source.source_id}: {error}")
+                outcomes[source.source_id] = {
+                    "status": "error",
+                    "count": 0,
+                    "error": error,
+                    "elapsed": round(time.time() - start_time, 2)
+                }
+                return []
+    
+    fetched = await asyncio.gather(*(fetch_one(source) for source in sources))
+    items_by_source = {source.source_id: news_items for source, news_items in zip(sources, fetched)}
+    fetched_ids = [source_id for source_id, outcome in outcomes.items() if outcome["status"] == "success"]
+    total_news = sum(len(news_items) for news_items in fetched)
+    
+    # 每个源的新闻单独写入，一个源保存失败不影响其他源；只写入与上一轮相比新增和变化的新闻
+    saved: Dict[str, Any] = {"inserted": 0, "updated": 0, "unchanged": 0, "failed": 0}
+    saved_ids = []
+    for source_id in fetched_ids:
+        news_items = items_by_source.get(source_id)
+        if news_items:
+            try:
+                result = await run_db(lambda db, items=news_items: _bulk_save_news(items, db=db))
+            except Exception as e:
+                logger.error(f"保存新闻源 {source_id} 的新闻时出错: {str(e)}")
+                logger.error(traceback.format_exc())
+                outcomes[source_id]["status"] = "error"
+                outcomes[source_id]["error"] = f"保存到数据库时出错: {str(e)}"
+                continue
+            for key in saved:
+                saved[key] += result.get(key, 0)
+            delta = result.get("sources", {}).get(source_id)
+            if delta:
+                outcomes[source_id]["delta"] = delta
+        saved_ids.append(source_id)
+    
+    try:
+        await run_db(lambda db: _mark_sources_updated(saved_ids, db=db))
+    except Exception as e:
+        logger.error(f"更新新闻源的最后更新时间时出错: {str(e)}")
+    
+    status = "success" if len(saved_ids) == len(outcomes) else ("partial_success" if saved_ids else "error")
+    message = (
+        f"成功抓取 {len(fetched_ids)}/{len(outcomes)} 个新闻源，共 {total_news} 条新闻，"
+        f"{len(saved_ids)} 个新闻源保存成功"
+    )
+    
+    logger.info(f"Batch fetch finished: {message}")
+    
+    return {
+        "status": status,
+        "message": message,
+        "sources": outcomes,
+        "total_news": total_news,
+        "saved": saved
     }
 
+
+def _mark_sources_updated(source_ids: List[str], db: Optional[Session] = None) -> None:
+    """
+    在一个事务中更新多个源的最后更新时间
+
+    Args:
+        source_ids: 新闻源ID列表
+        db: 使用的会话，默认新建一个会话并在结束后关闭
+    """
+    if not source_ids:
+        return
+    
+    from app.models.source import Source as SourceModel
+    
+    session = db or SessionLocal()
+    try:
+        session.query(SourceModel).filter(SourceModel.id.in_(source_ids)).update(
+            {SourceModel.last_updated: datetime.now()}, synchronize_session=False
+        )
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        if db is None:
+            session.close()
+
 @celery_app.task(bind=True, name="news.fetch_high_frequency_sources")
 def fetch_high_frequency_sources(self: Task) -> Dict[str, Any]:
     """
@@ -227,17 +323,7 @@ def fetch_high_frequency_sources(self: Task) -> Dict[str, Any]:
         
         # 获取所有高频源的新闻
         try:
-            if have_asyncio_fix:
-                # 使用安全的事件循环运行
-                coroutine = _fetch_sources_news(sources)
-                results = run_async(coroutine)
-            else:
-                # 使用标准方法
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                coroutine = _fetch_sources_news(sources)
-                results = loop.run_until_complete(coroutine)
-                loop.close()
+            results = async_runtime.run(_fetch_sources_news(sources))
             
             # 确保结果可用并适合计算
             total_news = 0
@@ -286,17 +372,7 @@ def fetch_medium_frequency_sources(self: Task) -> Dict[str, Any]:
         
         # 获取所有中频源的新闻
         try:
-            if have_asyncio_fix:
-                # 使用安全的事件循环运行
-                coroutine = _fetch_sources_news(sources)
-                results = run_async(coroutine)
-            else:
-                # 使用标准方法
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                coroutine = _fetch_sources_news(sources)
-                results = loop.run_until_complete(coroutine)
-                loop.close()
+            results = async_runtime.run(_fetch_sources_news(sources))
             
             # 确保结果可用并适合计算
             total_news = 0
@@ -345,17 +421,7 @@ def fetch_low_frequency_sources(self: Task) -> Dict[str, Any]:
         
         # 获取所有低频源的新闻
         try:
-            if have_asyncio_fix:
-                # 使用安全的事件循环运行
-                coroutine = _fetch_sources_news(sources)
-                results = run_async(coroutine)
-            else:
-                # 使用标准方法
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                coroutine = _fetch_sources_news(sources)
-                results = loop.run_until_complete(coroutine)
-                loop.close()
+            results = async_runtime.run(_fetch_sources_news(sources))
             
             # 确保结果可用并适合计算
             total_news = 0
@@ -400,17 +466,7 @@ def fetch_all_news(self: Task) -> Dict[str, Any]:
         
         # 获取所有源的新闻
         try:
-            if have_asyncio_fix:
-                # 使用安全的事件循环运行
-                coroutine = _fetch_sources_news(sources)
-                results = run_async(coroutine)
-            else:
-                # 使用标准方法
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                coroutine = _fetch_sources_news(sources)
-                results = loop.run_until_complete(coroutine)
-                loop.close()
+            results = async_runtime.run(_fetch_sources_news(sources))
             
             # 确保结果可用并适合计算
             total_news = 0
@@ -483,33 +539,11 @@ def fetch_source_news(self: Task, source_id: str) -> Dict[str, Any]:
             complete_task_step("get_source_from_provider")
             add_task_step("fetch_news")
         
-        # 获取新闻 - 使用带装饰器的版本
+        # 获取新闻
         coroutine = _fetch_source_news(source)
         
         try:
-            if have_asyncio_fix:
-                # 使用安全的事件循环运行
-                try:
-                    news_items = run_async(coroutine)
-                except RuntimeError as e:
-                    # 特别处理事件循环已关闭错误
-                    if "Event loop is closed" in str(e):
-                        logger.warning(f"[{task_uuid}] 检测到事件循环已关闭，正在尝试重新创建...")
-                        # 强制创建新的事件循环
-                        loop = asyncio.new_event_loop()
-                        asyncio.set_event_loop(loop)
-                        news_items = loop.run_until_complete(coroutine)
-                        loop.close()
-                    else:
-                        raise
-            else:
-                # 使用标准方法
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    news_items = loop.run_until_complete(coroutine)
-                finally:
-                    loop.close()
+            news_items = async_runtime.run(coroutine)
         except Exception as e:
             error_msg = f"获取新闻源 {source_id} 时出错: {str(e)}"
             logger.error(f"[{task_uuid}] {error_msg}")
@@ -607,243 +641,244 @@ def fetch_source_news(self: Task, source_id: str) -> Dict[str, Any]:
             "task_id": task_uuid
         }
 
-# 根据是否有asyncio修复模块，使用不同的实现
-if have_asyncio_fix:
-    # 事件循环修复版本
-    @ensure_event_loop
-    async def _fetch_sources_news(sources: List[Any]) -> Dict[str, List[Any]]:
-        """
-        获取多个源的新闻
-        
-        Args:
-            sources: 源列表
-            
-        Returns:
-            以源ID为键，新闻列表为值的字典
-        """
-        logger.info(f"Fetching news from {len(sources)} sources")
-        
-        results = {}
-        tasks = []
+async def _fetch_sources_news(sources: List[Any]) -> Dict[str, List[Any]]:
+    """
+    获取多个源的新闻
+    
+    Args:
+        sources: 源列表
         
-        # 创建任务
-        for source in sources:
-            tasks.append(_fetch_source_news(source))
+    Returns:
+        以源ID为键，新闻列表为值的字典
+    """
+    logger.info(f"Fetching news from {len(sources)} sources")
+    
+    results = {}
+    tasks = []
+    
+    # 创建任务
+    for source in sources:
+        tasks.append(_fetch_source_news(source))
+    
+    # 并发执行任务
+    try:
+        source_news_list = await asyncio.gather(*tasks, return_exceptions=True)
         
-        # 并发执行任务
-        try:
-            source_news_list = await asyncio.gather(*tasks, return_exceptions=True)
+        # 处理结果
+        for i, news_items in enumerate(source_news_list):
+            source = sources[i]
+            if isinstance(news_items, Exception):
+                logger.error(f"Error fetching news from {source.source_id}: {str(news_items)}")
+                continue
             
-            # 处理结果
-            for i, news_items in enumerate(source_news_list):
-                source = sources[i]
-                if isinstance(news_items, Exception):
-                    logger.error(f"Error fetching news from {source.source_id}: {str(news_items)}")
-                    continue
-                
-                # 保存到数据库
+            # 保存到数据库，一个源保存失败不影响其他源
+            try:
                 saved_count = _save_news_to_db(news_items)
-                
-                # 更新源的最后更新时间
-                db = SessionLocal()
-                try:
-                    # 获取源对象
-                    db_source = get_source(db, source.source_id)
-                    if db_source:
-                        update_source(db, db_source, {"last_updated": datetime.now()})
-                finally:
-                    db.close()
-                
+            except Exception as e:
+                logger.error(f"Error saving news from {source.source_id}: {str(e)}")
                 results[source.source_id] = news_items
-                logger.info(f"Fetched {len(news_items)} news from {source.source_id}, saved {saved_count}")
-        except Exception as e:
-            logger.error(f"Error in async gather: {str(e)}")
-        
-        return results
+                continue
+            
+            # 更新源的最后更新时间
+            db = SessionLocal()
+            try:
+                # 获取源对象
+                db_source = get_source(db, source.source_id)
+                if db_source:
+                    update_source(db, db_source, {"last_updated": datetime.now()})
+            finally:
+                db.close()
+            
+            results[source.source_id] = news_items
+            logger.info(f"Fetched {len(news_items)} news from {source.source_id}, saved {saved_count}")
+    except Exception as e:
+        logger.error(f"Error in async gather: {str(e)}")
     
-    @ensure_event_loop
-    async def _fetch_source_news(source: Any) -> List[Any]:
-        """
-        获取单个源的新闻
+    return results
+
+async def _fetch_source_news(source: Any) -> List[Any]:
+    """
+    获取单个源的新闻
+    
+    Args:
+        source: 新闻源
         
-        Args:
-            source: 新闻源
+    Returns:
+        新闻列表
+    """
+    logger.info(f"Fetching news for {source.source_id}")
+    
+    try:
+        # 判断是否通过API获取数据
+        if USE_API_FOR_DATA:
+            # 通过API获取数据
+            import aiohttp
+            from worker.sources.base import NewsItemModel
             
-        Returns:
-            新闻列表
-        """
-        logger.info(f"Fetching news for {source.source_id}")
-        
-        try:
-            # 判断是否通过API获取数据
-            if USE_API_FOR_DATA:
-                # 通过API获取数据
-                import aiohttp
-                from worker.sources.base import NewsItemModel
-                
-                # 构建API URL
-                url = f"{API_BASE_URL}/api/sources/external/{source.source_id}/news"
-                
-                logger.info(f"Fetching from API: {url}")
-                
-                # 发送请求
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url) as response:
-                        if response.status != 200:
-                            error_text = await response.text()
-                            logger.error(f"API error: {response.status} - {error_text}")
-                            raise Exception(f"API error: {response.status} - {error_text}")
-                        
-                        # 解析响应
-                        data = await response.json()
-                        
-                        # 将JSON数据转换为NewsItemModel对象
-                        news_items = []
-                        for item_data in data:
-                            news_item = NewsItemModel.from_dict(item_data)
-                            news_items.append(news_item)
-                
-                logger.info(f"API fetch completed for {source.source_id}, received {len(news_items)} items")
-                return news_items
-            else:
-                # 直接从源获取数据，使用stats_updater.wrap_fetch包装获取internal API调用统计
-                from worker.stats_wrapper import stats_updater
-                original_fetch = source.fetch
-                source.fetch = lambda *args, **kwargs: stats_updater.wrap_fetch(source.source_id, original_fetch, api_type="internal", *args, **kwargs)
-                
-                try:
-                    # 获取新闻
-                    news_items = await source.get_news()
-                    logger.info(f"source.get_news completed for {source.source_id}, received {len(news_items)} items")
-                    return news_items
-                finally:
-                    # 恢复原始fetch方法
-                    source.fetch = original_fetch
-        except Exception as e:
-            logger.error(f"Error fetching news from {source.source_id}: {str(e)}")
+            # 构建API URL
+            url = f"{API_BASE_URL}/api/sources/external/{source.source_id}/news"
             
-            # 不再返回空列表，而是重新抛出异常
-            # 这样调用者可以正确处理错误，同时允许stats_updater正确记录失败
-            logger.warning(f"Source {source.source_id} failed to provide data: {str(e)}")
-            # 为了保持向后兼容性，将异常包装成RuntimeError
-            raise RuntimeError(f"Source {source.source_id} failed: {str(e)}")
-else:
-    # 标准版本，不使用事件循环装饰器
-    async def _fetch_sources_news(sources: List[Any]) -> Dict[str, List[Any]]:
-        """
-        获取多个源的新闻
-        
-        Args:
-            sources: 源列表
+            logger.info(f"Fetching from API: {url}")
             
-        Returns:
-            以源ID为键，新闻列表为值的字典
-        """
-        logger.info(f"Fetching news from {len(sources)} sources")
-        
-        results = {}
-        tasks = []
+            # 发送请求
+            async with aiohttp.ClientSession() as session:
+                async with session.get(url) as response:
+                    if response.status != 200:
+                        error_text = await response.text()
+                        logger.error(f"API error: {response.status} - {error_text}")
+                        raise Exception(f"API error: {response.status} - {error_text}")
+                    
+                    # 解析响应
+                    data = await response.json()
+                    
+                    # 将JSON数据转换为NewsItemModel对象
+                    news_items = []
+                    for item_data in data:
+                        news_item = NewsItemModel.from_dict(item_data)
+                        news_items.append(news_item)
+            
+            logger.info(f"API fetch completed for {source.source_id}, received {len(news_items)} items")
+            return news_items
+        else:
+            # 直接从源获取数据，使用stats_updater.wrap_fetch包装获取internal API调用统计
+            from worker.stats_wrapper import stats_updater
+            original_fetch = source.fetch
+            source.fetch = lambda *args, **kwargs: stats_updater.wrap_fetch(source.source_id, original_fetch, api_type="internal", *args, **kwargs)
+            
+            try:
+                # 获取新闻
+                news_items = await source.get_news()
+                logger.info(f"source.get_news completed for {source.source_id}, received {len(news_items)} items")
+                return news_items
+            finally:
+                # 恢复原始fetch方法
+                source.fetch = original_fetch
+    except Exception as e:
+        logger.error(f"Error fetching news from {source.source_id}: {str(e)}")
         
-        # 创建任务
-        for source in sources:
-            tasks.append(_fetch_source_news(source))
+        # 不再返回空列表，而是重新抛出异常
+        # 这样调用者可以正确处理错误，同时允许stats_updater正确记录失败
+        logger.warning(f"Source {source.source_id} failed to provide data: {str(e)}")
+        # 为了保持向后兼容性，将异常包装成RuntimeError
+        raise RuntimeError(f"Source {source.source_id} failed: {str(e)}")
+
+def _build_news_rows(news_items: List[Any]) -> List[Dict[str, Any]]:
+    """
+    将新闻条目转换为批量写入的行数据，跳过source_id为空的新闻
+    """
+    rows = []
+    for item in news_items:
+        # 检查source_id是否为空，如果为空则跳过该条新闻
+        if not item.source_id:
+            logger.warning(f"跳过保存新闻: {item.title} - source_id为空")
+            continue
         
-        # 并发执行任务
-        try:
-            source_news_list = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # 处理结果
-            for i, news_items in enumerate(source_news_list):
-                source = sources[i]
-                if isinstance(news_items, Exception):
-                    logger.error(f"Error fetching news from {source.source_id}: {str(news_items)}")
-                    continue
-                
-                # 保存到数据库
-                saved_count = _save_news_to_db(news_items)
-                
-                # 更新源的最后更新时间
-                db = SessionLocal()
-                try:
-                    # 获取源对象
-                    db_source = get_source(db, source.source_id)
-                    if db_source:
-                        update_source(db, db_source, {"last_updated": datetime.now()})
-                finally:
-                    db.close()
-                
-                results[source.source_id] = news_items
-                logger.info(f"Fetched {len(news_items)} news from {source.source_id}, saved {saved_count}")
-        except Exception as e:
-            logger.error(f"Error in async gather: {str(e)}")
+        # 获取original_id，如果item有original_id属性则使用，否则使用id
+        original_id = getattr(item, 'original_id', None) or item.id
         
-        return results
+        rows.append({
+            "source_id": item.source_id,
+            "original_id": _fit_column("original_id", str(original_id)),
+            "title": _fit_column("title", item.title),
+            "url": _fit_column("url", item.url),
+            "content": item.content,
+            "summary": item.summary,
+            "image_url": _fit_column("image_url", item.image_url),
+            "published_at": item.published_at,
+            "category_id": getattr(item, 'category_id', None),
+        })
+    return rows
+
+
+def _fit_column(column: str, value: Any) -> Any:
+    """
+    截断超过列长度的字符串，避免单条过长的新闻导致整批写入失败
+    """
+    length = getattr(News.__table__.c[column].type, "length", None)
+    if isinstance(value, str) and length and len(value) > length:
+        logger.warning(f"新闻字段 {column} 超过 {length} 个字符，已截断: {value[:50]}...")
+        return value[:length]
+    return value
+
+
+def _bulk_save_news(news_items: List[Any], chunk_size: int = 500, db: Optional[Session] = None) -> Dict[str, Any]:
+    """
+    批量保存新闻到数据库
     
-    async def _fetch_source_news(source: Any) -> List[Any]:
-        """
-        获取单个源的新闻
-        
-        Args:
-            source: 新闻源
-            
-        Returns:
-            新闻列表
-        """
-        logger.info(f"Fetching news for {source.source_id}")
+    每个源的新闻先与该源上一次成功入库的指纹比较，只有新增和内容变化的新闻进入批量写入；
+    每个分块使用一条 INSERT ... ON CONFLICT DO UPDATE 语句，内容哈希未变化的新闻不会被重写
+    
+    Args:
+        news_items: 新闻列表
+        chunk_size: 每条语句写入的最大行数
+        db: 使用的会话，默认新建一个会话并在结束后关闭
         
+    Returns:
+        包含inserted、updated、unchanged、failed（被数据库拒绝的行）数量的字典，以及本轮的差异统计：
+        added、changed、removed、skipped（未变化而跳过写入的数量）和按源划分的sources
+    """
+    result: Dict[str, Any] = {
+        "inserted": 0, "updated": 0, "unchanged": 0, "failed": 0,
+        "added": 0, "changed": 0, "removed": 0, "skipped": 0,
+        "sources": {}
+    }
+    
+    rows_by_source: Dict[str, List[Dict[str, Any]]] = {}
+    for row in _build_news_rows(news_items):
+        rows_by_source.setdefault(row["source_id"], []).append(row)
+    if not rows_by_source:
+        return result
+    
+    deltas = [fingerprint_store.diff(source_id, rows) for source_id, rows in rows_by_source.items()]
+    pending = [row for delta in deltas for row in delta.rows]
+    
+    failed_ids: Dict[str, set] = {}
+    if pending:
+        session = db or SessionLocal()
         try:
-            # 判断是否通过API获取数据
-            if USE_API_FOR_DATA:
-                # 通过API获取数据
-                import aiohttp
-                from worker.sources.base import NewsItemModel
-                
-                # 构建API URL
-                url = f"{API_BASE_URL}/api/sources/external/{source.source_id}/news"
-                
-                logger.info(f"Fetching from API: {url}")
-                
-                # 发送请求
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url) as response:
-                        if response.status != 200:
-                            error_text = await response.text()
-                            logger.error(f"API error: {response.status} - {error_text}")
-                            raise Exception(f"API error: {response.status} - {error_text}")
-                        
-                        # 解析响应
-                        data = await response.json()
-                        
-                        # 将JSON数据转换为NewsItemModel对象
-                        news_items = []
-                        for item_data in data:
-                            news_item = NewsItemModel.from_dict(item_data)
-                            news_items.append(news_item)
-                
-                logger.info(f"API fetch completed for {source.source_id}, received {len(news_items)} items")
-                return news_items
-            else:
-                # 直接从源获取数据，使用stats_updater.wrap_fetch包装获取internal API调用统计
-                from worker.stats_wrapper import stats_updater
-                original_fetch = source.fetch
-                source.fetch = lambda *args, **kwargs: stats_updater.wrap_fetch(source.source_id, original_fetch, api_type="internal", *args, **kwargs)
-                
-                try:
-                    # 获取新闻
-                    news_items = await source.get_news()
-                    logger.info(f"source.get_news completed for {source.source_id}, received {len(news_items)} items")
-                    return news_items
-                finally:
-                    # 恢复原始fetch方法
-                    source.fetch = original_fetch
-        except Exception as e:
-            logger.error(f"Error fetching news from {source.source_id}: {str(e)}")
-            
-            # 不再返回空列表，而是重新抛出异常
-            # 这样调用者可以正确处理错误，同时允许stats_updater正确记录失败
-            logger.warning(f"Source {source.source_id} failed to provide data: {str(e)}")
-            # 为了保持向后兼容性，将异常包装成RuntimeError
-            raise RuntimeError(f"Source {source.source_id} failed: {str(e)}")
+            written = bulk_upsert_news(session, pending, chunk_size=chunk_size)
+            for source_id, original_id in written.pop("failed", []):
+                failed_ids.setdefault(source_id, set()).add(original_id)
+            result.update(written)
+            result["failed"] = sum(len(ids) for ids in failed_ids.values())
+        except Exception:
+            # 出现异常时回滚，避免事务被挂起；指纹不更新，下一轮重新比较
+            session.rollback()
+            raise
+        finally:
+            if db is None:
+                session.close()
+        
+        # 数据库有变化时使相关源和分类的接口响应缓存失效
+        if result["inserted"] or result["updated"]:
+            response_cache.bump(
+                source_ids={row["source_id"] for row in pending},
+                category_ids={row["category_id"] for row in pending}
+            )
+    
+    for delta in deltas:
+        # 写入失败的新闻不记录指纹，下一轮重新尝试
+        failed = failed_ids.get(delta.source_id)
+        if failed:
+            delta = delta._replace(fingerprints={
+                original_id: fingerprint for original_id, fingerprint in delta.fingerprints.items()
+                if original_id not in failed
+            })
+        fingerprint_store.commit(delta)
+        result["sources"][delta.source_id] = delta.counts()
+        result["added"] += delta.added
+        result["changed"] += delta.changed
+        result["removed"] += delta.removed
+        result["skipped"] += delta.unchanged
+    
+    logger.info(
+        f"批量保存新闻完成: 新增 {result['added']} 条, 变化 {result['changed']} 条, "
+        f"消失 {result['removed']} 条, 跳过未变化 {result['skipped']} 条; "
+        f"数据库新增 {result['inserted']} 条, 更新 {result['updated']} 条, 未变化 {result['unchanged']} 条, "
+        f"写入失败 {result['failed']} 条"
+    )
+    return result
+
 
 def _save_news_to_db(news_items: List[Any]) -> int:
     """
@@ -853,66 +888,15 @@ def _save_news_to_db(news_items: List[Any]) -> int:
         news_items: 新闻列表
         
     Returns:
-        保存的新闻数量
+        新增的新闻数量
+        
+    Raises:
+        写入数据库失败时抛出异常，由调用方决定如何报告
     """
     if not news_items:
         return 0
     
-    db = SessionLocal()
-    try:
-        saved_count = 0
-        for item in news_items:
-            try:
-                # 获取original_id，如果item有original_id属性则使用，否则使用id
-                original_id = item.id
-                if hasattr(item, 'original_id'):
-                    original_id = item.original_id
-                
-                # 检查source_id是否为空，如果为空则跳过该条新闻
-                if not item.source_id:
-                    logger.warning(f"跳过保存新闻: {item.title} - source_id为空")
-                    continue
-                
-                # 检查是否已存在 - 正确传递source_id和original_id两个参数
-                existing_news = get_news_by_original_id(db, item.source_id, original_id)
-                
-                if existing_news:
-                    # 更新现有新闻
-                    update_data = NewsUpdate(
-                        title=item.title,
-                        content=item.content,
-                        summary=item.summary,
-                        url=item.url,
-                        image_url=item.image_url,
-                        published_at=item.published_at,
-                        source_id=item.source_id,
-                        category_id=item.category_id if hasattr(item, 'category_id') else None,
-                    )
-                    update_news(db, existing_news.id, update_data)
-                else:
-                    # 创建新新闻
-                    news_data = NewsCreate(
-                        title=item.title,
-                        content=item.content,
-                        summary=item.summary,
-                        url=item.url,
-                        image_url=item.image_url,
-                        published_at=item.published_at,
-                        source_id=item.source_id,
-                        original_id=original_id,
-                        category_id=item.category_id if hasattr(item, 'category_id') else None,
-                    )
-                    create_news(db, news_data)
-                    saved_count += 1
-            except Exception as e:
-                logger.error(f"Error saving news item: {str(e)}")
-                # 如果出现异常，进行回滚以避免事务被挂起
-                db.rollback()
-                continue
-        
-        return saved_count
-    finally:
-        db.close()
+    return _bulk_save_news(news_items)["inserted"]
 
 
 def init_sources():
@@ -953,6 +937,7 @@ def cleanup_old_news(self: Task, days: int = 30) -> Dict[str, Any]:
             # 执行删除操作
             query.delete()
             db.commit()
+            response_cache.bump()
             
             logger.info(f"Successfully deleted {count} news items older than {days} days")
             
@@ -967,6 +952,29 @@ def cleanup_old_news(self: Task, days: int = 30) -> Dict[str, Any]:
         logger.error(f"Error cleaning up old news: {str(e)}")
         return {"status": "error", "message": str(e)}
 
+@celery_app.task(bind=True, name="news.flush_view_buffer")
+def flush_view_buffer(self: Task, batch_size: int = 1000) -> Dict[str, Any]:
+    """
+    将Redis中缓冲的浏览量和阅读记录批量写入数据库
+    """
+    from app.core.view_buffer import view_buffer
+    
+    db = SessionLocal()
+    try:
+        flushed = view_buffer.flush(db, batch_size=batch_size)
+        if flushed["views"] or flushed["read_history"]:
+            logger.info(
+                f"Flushed view counts of {flushed['views']} news items "
+                f"and {flushed['read_history']} read history events"
+            )
+        return {"status": "success", **flushed}
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error flushing view buffer: {str(e)}")
+        return {"status": "error", "message": str(e)}
+    finally:
+        db.close()
+
 @celery_app.task(bind=True, name="news.analyze_news_trends")
 def analyze_news_trends(self: Task, days: int = 7) -> Dict[str, Any]:
     """
@@ -0,0 +1,146 @@
+"""
+Celery工作进程的常驻事件循环
+
+每个工作进程在worker_process_init时启动一个后台线程运行事件循环，任务通过run()
+把协程提交到这个循环执行。事件循环在任务之间持续运行，共享HTTP连接池、Redis连接池
+以及已创建的数据源实例都可以跨任务复用，keep-alive连接不会在每个任务结束后被丢弃。
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from typing import Any, Coroutine, Dict, Optional
+
+try:
+    from worker.utils.http_transport import http_transport
+except ImportError:
+    from backend.worker.utils.http_transport import http_transport
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRuntime:
+    """
+    在后台线程中运行的常驻事件循环
+    """
+
+    def __init__(self, name: str = "async-runtime"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self.stats = {
+            "submitted": 0,  # 提交的协程数
+            "failed": 0,  # 抛出异常的协程数
+            "cancelled": 0,  # 因超时或任务被中断而取消的协程数
+        }
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        return self._loop if self.is_running else None
+
+    @property
+    def is_running(self) -> bool:
+        # fork出的子进程会继承父进程的状态，但不会继承运行循环的线程
+        return (
+            self._loop is not None
+            and self._thread is not None
+            and self._thread.is_alive()
+            and self._pid == os.getpid()
+        )
+
+    def in_runtime_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """
+        启动事件循环线程，已在运行时直接返回
+        """
+        with self._lock:
+            if self.is_running:
+                return self._loop
+
+            loop = asyncio.new_event_loop()
+            started = threading.Event()
+
+            def _run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(started.set)
+                loop.run_forever()
+
+            thread = threading.Thread(target=_run, name=self.name, daemon=True)
+            thread.start()
+            started.wait()
+
+            self._loop = loop
+            self._thread = thread
+            self._pid = os.getpid()
+            logger.info(f"进程 {self._pid} 已启动常驻事件循环")
+            return loop
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        在常驻事件循环中运行协程并等待结果
+
+        等待被中断（超时、Celery软时间限制等）时会取消协程，避免它在后台继续运行；
+        超时时抛出concurrent.futures.TimeoutError（Python 3.11之前不是内置的TimeoutError）
+        """
+        if not self.is_running:
+            self.start()
+        if self.in_runtime_thread():
+            coro.close()
+            raise RuntimeError("不能在常驻事件循环的线程中同步等待协程")
+
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        self.stats["submitted"] += 1
+        try:
+            return future.result(timeout)
+        except BaseException:
+            if future.cancel():
+                self.stats["cancelled"] += 1
+            else:
+                self.stats["failed"] += 1
+            raise
+
+    async def _shutdown(self) -> None:
+        current = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await http_transport.close()
+        await asyncio.get_running_loop().shutdown_asyncgens()
+
+    def stop(self, timeout: float = 10) -> None:
+        """
+        取消未完成的协程，关闭共享HTTP会话并停止事件循环
+        """
+        with self._lock:
+            if not self.is_running:
+                self._loop = None
+                self._thread = None
+                return
+
+            loop, thread = self._loop, self._thread
+            try:
+                asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(timeout)
+            except Exception as e:
+                logger.warning(f"关闭常驻事件循环时出错: {str(e)}")
+
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            if not thread.is_alive():
+                loop.close()
+
+            self._loop = None
+            self._thread = None
+            logger.info(f"进程 {os.getpid()} 已停止常驻事件循环")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"running": self.is_running, **self.stats}
+
+
+# 全局单例
+async_runtime = AsyncRuntime()
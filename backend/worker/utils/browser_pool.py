@@ -0,0 +1,413 @@
+"""
+共享无头浏览器池
+
+Selenium数据源不再各自启动Chrome，而是从浏览器池租用已经启动的浏览器:
+    - 池内浏览器数量有上限，空闲浏览器保持运行，避免每次抓取冷启动Chrome
+    - 每次租用在新标签页中进行，归还时关闭标签页并清除Cookie
+    - 租用前做健康检查，失效的浏览器被替换
+    - 浏览器使用达到max_uses次后退役重建，避免长期运行的内存膨胀
+    - 池满时按先来后到排队等待，超过acquire_timeout抛出BrowserPoolTimeout
+"""
+
+import os
+import time
+import atexit
+import random
+import shutil
+import asyncio
+import logging
+import platform
+import itertools
+import threading
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, Optional
+
+try:
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+    HAVE_SELENIUM = True
+except ImportError:
+    HAVE_SELENIUM = False
+
+from worker.sources.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserPoolTimeout(Exception):
+    """
+    等待可用浏览器超时
+    """
+    pass
+
+
+class PooledBrowser:
+    """
+    池中的一个浏览器实例
+    """
+
+    def __init__(self, driver: Any, user_data_dir: Optional[str] = None):
+        self.driver = driver
+        self.user_data_dir = user_data_dir
+        self.uses = 0
+        self.created_at = time.time()
+        # 浏览器启动时的初始标签页，租用时在它之外打开新标签页
+        self.base_handle: Optional[str] = None
+        try:
+            self.pid = driver.service.process.pid
+        except Exception:
+            self.pid = None
+
+
+def create_chrome_driver(headless: bool = True, user_data_dir: Optional[str] = None) -> Any:
+    """
+    启动一个Chrome WebDriver，优先使用系统安装的ChromeDriver，失败时使用webdriver_manager
+    """
+    if not HAVE_SELENIUM:
+        raise RuntimeError("未安装selenium，无法创建浏览器")
+
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--enable-javascript")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option("useAutomationExtension", False)
+    if user_data_dir:
+        chrome_options.add_argument(f"--user-data-dir={user_data_dir}")
+
+    if platform.system() == "Windows":
+        chromedriver_paths = ["./chromedriver.exe"]
+    else:
+        chromedriver_paths = ["/usr/local/bin/chromedriver", "/usr/bin/chromedriver", "/snap/bin/chromedriver", "./chromedriver"]
+    chromedriver_path = next((path for path in chromedriver_paths if os.path.exists(path)), None)
+    chromedriver_path = chromedriver_path or shutil.which("chromedriver")
+
+    if chromedriver_path:
+        try:
+            return webdriver.Chrome(service=Service(executable_path=chromedriver_path), options=chrome_options)
+        except Exception as e:
+            logger.warning(f"使用系统ChromeDriver {chromedriver_path} 创建浏览器失败: {str(e)}")
+
+    from webdriver_manager.chrome import ChromeDriverManager
+    return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
+
+
+class BrowserPool:
+    """
+    有上限的浏览器池，可以在不同线程和事件循环之间共享
+    """
+
+    def __init__(
+        self,
+        max_size: int = 2,  # 同时存在的浏览器数量上限
+        max_uses: int = 50,  # 每个浏览器被租用的次数上限，达到后重建
+        acquire_timeout: float = 60,  # 等待可用浏览器的超时时间，单位秒
+        headless: bool = True,
+        driver_factory: Optional[Callable[[Optional[str]], Any]] = None
+    ):
+        self.max_size = max_size
+        self.max_uses = max_uses
+        self.acquire_timeout = acquire_timeout
+        self.headless = headless
+        # 参数为用户数据目录，返回WebDriver
+        self.driver_factory = driver_factory or (lambda user_data_dir: create_chrome_driver(self.headless, user_data_dir))
+
+        self._lock = threading.Lock()
+        self._idle: deque = deque()
+        self._size = 0  # 已创建的浏览器数量，包括空闲和租出的
+        self._waiters: deque = deque()
+        self._tickets = itertools.count()
+        self._closed = False
+        self.stats = {
+            "created": 0,  # 启动的浏览器总数
+            "recycled": 0,  # 因使用次数或健康检查退役的浏览器数
+            "leases": 0,  # 租用次数
+            "timeouts": 0,  # 等待超时次数
+            "wait_time": 0.0,  # 累计排队等待时间
+        }
+
+    def _try_reserve(self, ticket: int) -> Optional[Any]:
+        """
+        排在队首时尝试取得浏览器
+
+        Returns:
+            空闲浏览器；可以新建时返回True；需要继续等待时返回None
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("浏览器池已关闭")
+            if self._waiters[0] != ticket:
+                return None
+            if self._idle:
+                self._waiters.popleft()
+                # 后进先出，优先使用最近用过的浏览器
+                return self._idle.pop()
+            if self._size < self.max_size:
+                self._waiters.popleft()
+                self._size += 1
+                return True
+            return None
+
+    def _create_browser(self) -> PooledBrowser:
+        user_data_dir = f"/tmp/chrome_pool_{os.getpid()}_{time.time()}_{random.randint(1, 10000)}"
+        driver = self.driver_factory(user_data_dir)
+        browser = PooledBrowser(driver, user_data_dir)
+        browser.base_handle = driver.current_window_handle
+        self.stats["created"] += 1
+        logger.info(f"浏览器池启动新浏览器，PID: {browser.pid}")
+        return browser
+
+    def _destroy_browser(self, browser: PooledBrowser) -> None:
+        try:
+            browser.driver.quit()
+        except Exception as e:
+            logger.debug(f"关闭浏览器时出错: {str(e)}")
+        if browser.user_data_dir:
+            shutil.rmtree(browser.user_data_dir, ignore_errors=True)
+
+    def _is_healthy(self, browser: PooledBrowser) -> bool:
+        try:
+            browser.driver.switch_to.window(browser.base_handle)
+            return True
+        except Exception as e:
+            logger.warning(f"浏览器健康检查失败，将重建: {str(e)}")
+            return False
+
+    def _prepare(self, reserved: Any, user_agent: Optional[str], page_load_timeout: Optional[float]) -> PooledBrowser:
+        """
+        在线程池中执行：必要时创建浏览器，做健康检查并打开新标签页
+        """
+        browser = reserved if isinstance(reserved, PooledBrowser) else None
+        try:
+            if browser is not None and not self._is_healthy(browser):
+                self.stats["recycled"] += 1
+                self._destroy_browser(browser)
+                browser = None
+            if browser is None:
+                browser = self._create_browser()
+
+            driver = browser.driver
+            driver.switch_to.new_window("tab")
+            if page_load_timeout:
+                driver.set_page_load_timeout(page_load_timeout)
+                driver.set_script_timeout(page_load_timeout)
+            if user_agent:
+                try:
+                    driver.execute_cdp_cmd("Network.setUserAgentOverride", {"userAgent": user_agent})
+                except Exception as e:
+                    logger.debug(f"设置用户代理失败: {str(e)}")
+        except Exception:
+            if browser is not None:
+                self._destroy_browser(browser)
+            with self._lock:
+                self._size -= 1
+            raise
+
+        browser.uses += 1
+        self.stats["leases"] += 1
+        return browser
+
+    def _reset(self, browser: PooledBrowser) -> None:
+        """
+        关闭租用期间打开的标签页并清除Cookie
+        """
+        driver = browser.driver
+        for handle in driver.window_handles:
+            if handle != browser.base_handle:
+                driver.switch_to.window(handle)
+                driver.close()
+        driver.switch_to.window(browser.base_handle)
+        try:
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        except Exception:
+            driver.delete_all_cookies()
+
+    def _release(self, browser: PooledBrowser, discard: bool) -> None:
+        if not discard:
+            try:
+                self._reset(browser)
+            except Exception as e:
+                logger.warning(f"重置浏览器标签页失败，将重建: {str(e)}")
+                discard = True
+
+        retire = discard or self._closed or browser.uses >= self.max_uses
+        if retire:
+            self.stats["recycled"] += 1
+            self._destroy_browser(browser)
+
+        with self._lock:
+            if retire:
+                self._size -= 1
+            else:
+                self._idle.append(browser)
+
+    async def acquire(
+        self,
+        user_agent: Optional[str] = None,
+        page_load_timeout: Optional[float] = None,
+        timeout: Optional[float] = None
+    ) -> PooledBrowser:
+        """
+        租用一个浏览器，使用完毕后必须调用release归还
+
+        Args:
+            user_agent: 本次租用使用的User-Agent
+            page_load_timeout: 页面加载和脚本执行超时
+            timeout: 排队等待超时，默认acquire_timeout
+
+        Raises:
+            BrowserPoolTimeout: 等待超时
+        """
+        timeout = self.acquire_timeout if timeout is None else timeout
+        start = time.monotonic()
+        ticket = next(self._tickets)
+        with self._lock:
+            self._waiters.append(ticket)
+
+        try:
+            while True:
+                reserved = self._try_reserve(ticket)
+                if reserved is not None:
+                    break
+                if time.monotonic() - start >= timeout:
+                    self.stats["timeouts"] += 1
+                    raise BrowserPoolTimeout(f"等待可用浏览器超时({timeout}秒)")
+                await asyncio.sleep(0.1)
+        except BaseException:
+            with self._lock:
+                if ticket in self._waiters:
+                    self._waiters.remove(ticket)
+            raise
+
+        self.stats["wait_time"] += time.monotonic() - start
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(None, self._prepare, reserved, user_agent, page_load_timeout)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # 调用方被取消时浏览器可能仍在准备，准备完成后直接归还
+            def _return_to_pool(done):
+                if not done.cancelled() and done.exception() is None:
+                    loop.run_in_executor(None, self._release, done.result(), False)
+            future.add_done_callback(_return_to_pool)
+            raise
+
+    async def release(self, browser: PooledBrowser, discard: bool = False) -> None:
+        """
+        归还浏览器
+
+        Args:
+            browser: acquire返回的浏览器
+            discard: 为True时直接关闭该浏览器，而不是放回池中
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._release, browser, discard)
+
+    @asynccontextmanager
+    async def lease(self, user_agent: Optional[str] = None, page_load_timeout: Optional[float] = None):
+        """
+        以上下文管理器方式租用浏览器，返回WebDriver
+        """
+        browser = await self.acquire(user_agent=user_agent, page_load_timeout=page_load_timeout)
+        try:
+            yield browser.driver
+        finally:
+            await self.release(browser)
+
+    def close_all(self) -> None:
+        """
+        关闭所有空闲浏览器，租出的浏览器在归还时关闭
+        """
+        with self._lock:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+        for browser in idle:
+            self._destroy_browser(browser)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "waiting": len(self._waiters),
+                "max_size": self.max_size,
+                **self.stats
+            }
+
+
+def browser_pool_enabled() -> bool:
+    """
+    浏览器池是否启用
+
+    启用时浏览器的生命周期由池管理，不能再按进程名清理整台机器的Chrome进程，
+    否则会杀掉本进程和其他工作进程中正在租用或保持预热的浏览器
+    """
+    return HAVE_SELENIUM and settings.browser_pool_size > 0
+
+
+class BrowserPoolMixin:
+    """
+    Selenium数据源的浏览器池租用方法
+
+    宿主类需要有config、source_id和_driver属性，可选USER_AGENTS列表。
+    浏览器池未启用（BROWSER_POOL_SIZE为0）或config中use_browser_pool为False时，
+    数据源仍自行创建WebDriver
+    """
+
+    _browser_lease: Optional[PooledBrowser] = None
+
+    @property
+    def use_browser_pool(self) -> bool:
+        return browser_pool_enabled() and self.config.get("use_browser_pool", True)
+
+    async def _lease_pooled_driver(self):
+        """
+        租用浏览器并设置为self._driver，失败时返回None
+        """
+        if self._browser_lease is None:
+            user_agents = getattr(self, "USER_AGENTS", None)
+            try:
+                self._browser_lease = await browser_pool.acquire(
+                    user_agent=random.choice(user_agents) if user_agents else None,
+                    page_load_timeout=self.config.get("selenium_timeout", 30)
+                )
+            except Exception as e:
+                logger.error(f"{self.source_id} 从浏览器池租用浏览器失败: {str(e)}")
+                return None
+            self._driver = self._browser_lease.driver
+        return self._driver
+
+    async def _release_pooled_driver(self, discard: bool = False) -> bool:
+        """
+        归还租用的浏览器
+
+        Returns:
+            是否归还了浏览器，没有租用时返回False
+        """
+        lease = self._browser_lease
+        if lease is None:
+            return False
+        self._browser_lease = None
+        self._driver = None
+        await browser_pool.release(lease, discard=discard)
+        return True
+
+
+# 全局单例
+browser_pool = BrowserPool(
+    max_size=settings.browser_pool_size,
+    max_uses=settings.browser_max_uses,
+    acquire_timeout=settings.browser_acquire_timeout
+)
+
+# 进程退出时关闭空闲浏览器
+atexit.register(browser_pool.close_all)
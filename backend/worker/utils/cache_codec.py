@@ -0,0 +1,223 @@
+"""
+缓存序列化模块
+
+为CacheManager提供可插拔的序列化层。默认使用带版本字节的msgpack格式，
+NewsItemModel按固定字段顺序编码为紧凑数组，超过阈值的负载可选压缩。
+读取时兼容旧的pickle数据，便于滚动升级。
+
+负载格式:
+    [版本字节][压缩方式字节][msgpack数据]
+旧数据为pickle格式，首字节固定为0x80，与版本字节不冲突。
+"""
+
+import zlib
+import pickle
+import logging
+import datetime
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+try:
+    import msgpack
+    HAVE_MSGPACK = True
+except ImportError:
+    HAVE_MSGPACK = False
+
+try:
+    import zstandard
+    HAVE_ZSTD = True
+except ImportError:
+    HAVE_ZSTD = False
+
+try:
+    import lz4.frame
+    HAVE_LZ4 = True
+except ImportError:
+    HAVE_LZ4 = False
+
+logger = logging.getLogger(__name__)
+
+# 当前的编码格式版本
+CODEC_VERSION = 1
+
+# pickle协议2及以上的首字节
+PICKLE_PROTOCOL_MARKER = 0x80
+
+# 压缩方式
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_ZSTD = 2
+COMPRESSION_LZ4 = 3
+
+# msgpack扩展类型
+EXT_NEWS_ITEM = 1
+EXT_DATETIME = 2
+
+# NewsItemModel的字段顺序，编码为位置数组，只能在末尾追加字段
+NEWS_ITEM_FIELDS = (
+    "id", "title", "url", "source_id", "source_name",
+    "published_at", "updated_at", "summary", "content", "author",
+    "category", "tags", "image_url", "language", "country", "extra"
+)
+
+_news_item_cls = None
+
+
+def _get_news_item_cls():
+    """延迟导入NewsItemModel，避免缓存模块依赖数据源模块"""
+    global _news_item_cls
+    if _news_item_cls is None:
+        from worker.sources.base import NewsItemModel
+        _news_item_cls = NewsItemModel
+    return _news_item_cls
+
+
+class CacheSerializer(ABC):
+    """
+    缓存序列化器接口
+    """
+    name = "base"
+
+    @abstractmethod
+    def dumps(self, data: Any) -> bytes:
+        """
+        序列化为字节
+        """
+        pass
+
+    @abstractmethod
+    def loads(self, payload: bytes) -> Any:
+        """
+        从字节反序列化
+        """
+        pass
+
+
+class PickleSerializer(CacheSerializer):
+    """
+    pickle序列化器，兼容旧的缓存数据
+    """
+    name = "pickle"
+
+    def dumps(self, data: Any) -> bytes:
+        return pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, payload: bytes) -> Any:
+        return pickle.loads(payload)
+
+
+class MsgpackSerializer(CacheSerializer):
+    """
+    带版本字节的msgpack序列化器
+
+    不支持的类型会整体回退到pickle，读取时按首字节区分格式
+    """
+    name = "msgpack"
+
+    def __init__(
+        self,
+        compress_threshold: int = 4096,  # 超过该字节数才压缩
+        compression: Optional[str] = None,  # zstd、lz4或zlib，默认选择已安装的最优算法
+        compression_level: int = 3
+    ):
+        if not HAVE_MSGPACK:
+            raise RuntimeError("msgpack未安装，无法使用MsgpackSerializer")
+
+        self.compress_threshold = compress_threshold
+        self.compression_level = compression_level
+        self.compression = compression or self._default_compression()
+        self._fallback = PickleSerializer()
+
+        self._zstd_compressor = None
+        self._zstd_decompressor = None
+        if HAVE_ZSTD:
+            self._zstd_compressor = zstandard.ZstdCompressor(level=compression_level)
+            self._zstd_decompressor = zstandard.ZstdDecompressor()
+
+    @staticmethod
+    def _default_compression() -> str:
+        if HAVE_ZSTD:
+            return "zstd"
+        if HAVE_LZ4:
+            return "lz4"
+        return "zlib"
+
+    def dumps(self, data: Any) -> bytes:
+        try:
+            packed = msgpack.packb(data, default=self._default, use_bin_type=True)
+        except (TypeError, ValueError, OverflowError) as e:
+            logger.debug(f"msgpack无法编码该数据，回退到pickle: {str(e)}")
+            return self._fallback.dumps(data)
+
+        compression = COMPRESSION_NONE
+        if len(packed) >= self.compress_threshold:
+            compression, packed = self._compress(packed)
+
+        return bytes((CODEC_VERSION, compression)) + packed
+
+    def loads(self, payload: bytes) -> Any:
+        if not payload:
+            return None
+
+        version = payload[0]
+        if version == PICKLE_PROTOCOL_MARKER:
+            return self._fallback.loads(payload)
+        if version != CODEC_VERSION:
+            raise ValueError(f"不支持的缓存数据版本: {version}")
+
+        body = self._decompress(payload[1], payload[2:])
+        return msgpack.unpackb(body, ext_hook=self._ext_hook, raw=False, strict_map_key=False)
+
+    def _default(self, obj: Any) -> Any:
+        if isinstance(obj, datetime.datetime):
+            return msgpack.ExtType(EXT_DATETIME, obj.isoformat().encode("utf-8"))
+        if isinstance(obj, _get_news_item_cls()):
+            fields = [getattr(obj, field) for field in NEWS_ITEM_FIELDS]
+            return msgpack.ExtType(
+                EXT_NEWS_ITEM,
+                msgpack.packb(fields, default=self._default, use_bin_type=True)
+            )
+        if isinstance(obj, (set, frozenset)):
+            return list(obj)
+        raise TypeError(f"无法编码类型: {type(obj).__name__}")
+
+    def _ext_hook(self, code: int, data: bytes) -> Any:
+        if code == EXT_DATETIME:
+            return datetime.datetime.fromisoformat(data.decode("utf-8"))
+        if code == EXT_NEWS_ITEM:
+            values = msgpack.unpackb(data, ext_hook=self._ext_hook, raw=False, strict_map_key=False)
+            # 新版本追加的字段在旧数据中不存在，使用构造函数默认值
+            return _get_news_item_cls()(**dict(zip(NEWS_ITEM_FIELDS, values)))
+        return msgpack.ExtType(code, data)
+
+    def _compress(self, data: bytes):
+        if self.compression == "zstd" and self._zstd_compressor is not None:
+            return COMPRESSION_ZSTD, self._zstd_compressor.compress(data)
+        if self.compression == "lz4" and HAVE_LZ4:
+            return COMPRESSION_LZ4, lz4.frame.compress(data)
+        return COMPRESSION_ZLIB, zlib.compress(data, self.compression_level)
+
+    def _decompress(self, compression: int, data: bytes) -> bytes:
+        if compression == COMPRESSION_NONE:
+            return data
+        if compression == COMPRESSION_ZLIB:
+            return zlib.decompress(data)
+        if compression == COMPRESSION_ZSTD:
+            if self._zstd_decompressor is None:
+                raise ValueError("缓存数据使用zstd压缩，但zstandard未安装")
+            return self._zstd_decompressor.decompress(data)
+        if compression == COMPRESSION_LZ4:
+            if not HAVE_LZ4:
+                raise ValueError("缓存数据使用lz4压缩，但lz4未安装")
+            return lz4.frame.decompress(data)
+        raise ValueError(f"未知的压缩方式: {compression}")
+
+
+def get_default_serializer() -> CacheSerializer:
+    """
+    获取默认的序列化器，msgpack未安装时使用pickle
+    """
+    if HAVE_MSGPACK:
+        return MsgpackSerializer()
+    logger.warning("msgpack未安装，缓存将使用pickle序列化")
+    return PickleSerializer()
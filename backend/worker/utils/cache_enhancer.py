@@ -200,12 +200,13 @@ class CacheEnhancer:
         source.get_news = self._enhanced_get_news
         source.cache_status = self._cache_status
     
-    async def _enhanced_get_news(self, force_update: bool = False) -> List[NewsItemModel]:
+    async def _enhanced_get_news(self, force_update: bool = False, fetch: Optional[Callable] = None) -> List[NewsItemModel]:
         """
         增强版获取新闻方法，添加缓存保护机制
         
         Args:
             force_update: 是否强制更新
+            fetch: 代替原始fetch调用的函数
             
         Returns:
             新闻项列表
@@ -238,7 +239,7 @@ class CacheEnhancer:
                 
                 try:
                     # 调用原始获取方法
-                    news_items = await self._original_fetch()
+                    news_items = await (fetch or self._original_fetch)()
                     
                     # 增强的缓存保护: 如果fetch返回空列表但缓存中有数据，保留现有缓存
                     if not news_items and hasattr(source, '_cached_news_items') and source._cached_news_items:
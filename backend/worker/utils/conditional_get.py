@@ -0,0 +1,114 @@
+"""
+条件请求（Conditional GET）支持
+
+按URL保存上游返回的ETag/Last-Modified校验值，下次请求时发送
+If-None-Match/If-Modified-Since。上游返回304时抛出NotModified，
+由数据源直接复用已缓存的新闻，不再下载和解析响应体。
+
+校验值按作用域（通常为source_id）隔离：同一个URL被多个数据源抓取时，
+每个数据源只使用与自己缓存内容对应的校验值。
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional, Tuple
+from urllib.parse import urlencode
+
+logger = logging.getLogger(__name__)
+
+
+class NotModified(Exception):
+    """
+    上游返回304，内容自上次请求以来未变化
+    """
+
+    def __init__(self, url: str):
+        super().__init__(f"内容未修改: {url}")
+        self.url = url
+
+
+class ValidatorStore:
+    """
+    进程内的校验值存储，按LRU淘汰
+    """
+
+    def __init__(self, max_entries: int = 5000):
+        self.max_entries = max_entries
+        self._validators: "OrderedDict[Tuple[str, str], Dict[str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {
+            "conditional_requests": 0,  # 携带校验值的请求次数
+            "not_modified": 0,  # 收到304的次数
+        }
+
+    @staticmethod
+    def make_key(scope: Optional[str], url: str, params: Optional[Mapping[str, Any]] = None) -> Tuple[str, str]:
+        """
+        生成存储键，查询参数按名称排序后拼接到URL上
+        """
+        if params:
+            separator = "&" if "?" in url else "?"
+            url = f"{url}{separator}{urlencode(sorted(params.items()), doseq=True)}"
+        return scope or "", url
+
+    def get(self, key: Tuple[str, str]) -> Dict[str, str]:
+        with self._lock:
+            validators = self._validators.get(key)
+            if validators is None:
+                return {}
+            self._validators.move_to_end(key)
+            return dict(validators)
+
+    def apply(self, key: Tuple[str, str], headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """
+        返回附加了条件请求头的新请求头字典
+        """
+        headers = dict(headers or {})
+        validators = self.get(key)
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        if validators:
+            self.stats["conditional_requests"] += 1
+        return headers
+
+    def update(self, key: Tuple[str, str], response_headers: Mapping[str, str]) -> None:
+        """
+        从成功响应的响应头中保存校验值，响应没有校验值时删除旧记录
+        """
+        etag = response_headers.get("ETag") or response_headers.get("etag")
+        last_modified = response_headers.get("Last-Modified") or response_headers.get("last-modified")
+        with self._lock:
+            if not etag and not last_modified:
+                self._validators.pop(key, None)
+                return
+            self._validators[key] = {"etag": etag or "", "last_modified": last_modified or ""}
+            self._validators.move_to_end(key)
+            while len(self._validators) > self.max_entries:
+                self._validators.popitem(last=False)
+
+    def record_not_modified(self, key: Tuple[str, str]) -> None:
+        self.stats["not_modified"] += 1
+        logger.debug(f"条件请求命中304: {key[1]}")
+
+    def invalidate_scope(self, scope: str) -> int:
+        """
+        删除某个作用域下的全部校验值，数据源的缓存被丢弃或未采用新数据时调用
+
+        Returns:
+            删除的记录数
+        """
+        with self._lock:
+            keys = [key for key in self._validators if key[0] == scope]
+            for key in keys:
+                del self._validators[key]
+        return len(keys)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._validators), **self.stats}
+
+
+# 全局单例
+validator_store = ValidatorStore()
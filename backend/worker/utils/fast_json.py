@@ -0,0 +1,46 @@
+"""
+JSON快速序列化
+
+对外接口直接返回序列化好的字节，优先使用orjson，没有安装时退回标准库json，
+两者的输出对客户端等价：datetime输出为ISO格式，非ASCII字符不转义，未知类型转为字符串。
+"""
+
+import json
+import datetime
+from typing import Any, Iterable
+
+try:
+    import orjson
+    HAVE_ORJSON = True
+except ImportError:
+    HAVE_ORJSON = False
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return str(value)
+
+
+def dumps(value: Any) -> bytes:
+    """
+    序列化为UTF-8编码的JSON字节
+    """
+    if HAVE_ORJSON:
+        return orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_with_array(envelope: dict, field: str, items: Iterable[bytes]) -> bytes:
+    """
+    把已经序列化好的数组元素拼接到外层对象的field字段中，元素不会被重新解析或编码
+
+    field总是作为外层对象的最后一个键输出
+    """
+    head = dumps(envelope)
+    separator = b"," if envelope else b""
+    return b"".join((
+        head[:-1], separator, dumps(field), b":[", b",".join(items), b"]}"
+    ))
@@ -6,12 +6,20 @@ import functools
 from typing import Any, Dict, Optional, Union
 
 import aiohttp
-from aiohttp import ClientSession, ClientTimeout
+from aiohttp import ClientTimeout
 from aiocache import cached, Cache
 from aiocache.serializers import JsonSerializer
 
 from app.core.config import settings
 
+# 共享HTTP传输层和条件请求校验值存储
+try:
+    from worker.utils.http_transport import http_transport, TransportSession
+    from worker.utils.conditional_get import NotModified, validator_store
+except ImportError:
+    from backend.worker.utils.http_transport import http_transport, TransportSession
+    from backend.worker.utils.conditional_get import NotModified, validator_store
+
 # 加载缓存修复模块
 try:
     from worker.utils.cache_fix import safe_cache_decorator
@@ -55,8 +63,6 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
-# 线程本地存储，用于存储每个线程的会话和事件循环
-_thread_local = threading.local()
 
 # 保存原始的TCPConnector创建方法
 original_TCPConnector = aiohttp.TCPConnector
@@ -144,155 +150,25 @@ class HTTPClient:
     
     def __init__(self, timeout: int = 30):
         self.timeout = ClientTimeout(total=timeout)
-        self.session = None
-        # 记录该客户端是否启动了关闭处理
-        self._closing = False
-        # 保存当前线程ID
-        self._creator_thread_id = threading.get_ident()
+        self.session: Optional[TransportSession] = None
     
-    async def _get_session(self) -> ClientSession:
+    async def _get_session(self) -> TransportSession:
         """
-        获取或创建一个ClientSession
-        确保每个线程/任务都有自己的会话并且使用正确的事件循环
+        获取会话
+        请求通过当前事件循环的共享连接池发送，事件循环变化时连接池自动切换
         """
-        # 1. 获取当前线程ID和事件循环
-        current_thread_id = threading.get_ident()
-        try:
-            current_loop = asyncio.get_running_loop()
-        except RuntimeError:
-            # 如果没有运行中的事件循环，创建一个新的
-            current_loop = get_or_create_eventloop()
-            asyncio.set_event_loop(current_loop)
-            
-        # 存储当前线程的事件循环以便后续使用
-        if not hasattr(_thread_local, 'event_loops'):
-            _thread_local.event_loops = {}
-        _thread_local.event_loops[current_thread_id] = current_loop
-        
-        # 2. 检查线程本地存储中是否有会话
-        if not hasattr(_thread_local, 'sessions'):
-            _thread_local.sessions = {}
-            
-        # 3. 检查现有会话是否有效并使用正确的事件循环
-        if current_thread_id in _thread_local.sessions:
-            session = _thread_local.sessions[current_thread_id]
-            
-            # 验证会话是否有效
-            if not session.closed:
-                # 检查是否使用同一个事件循环
-                connector = session.connector
-                if connector and getattr(connector, '_loop', None) == current_loop:
-                    # 会话有效且使用正确的事件循环
-                    return session
-                else:
-                    # 会话使用了不同的事件循环，需要关闭并创建新的
-                    logger.debug(f"会话使用了不同的事件循环，创建新会话。线程ID: {current_thread_id}")
-                    try:
-                        # 先关闭现有会话
-                        try:
-                            if not session.closed:
-                                await session.close()
-                        except Exception as e:
-                            logger.warning(f"关闭旧会话时出错: {str(e)}")
-                    finally:
-                        # 无论是否成功关闭，都从存储中移除
-                        _thread_local.sessions.pop(current_thread_id, None)
-        
-        # 4. 如果需要，检查实例级会话
-        if (self.session is not None and 
-            not self.session.closed and 
-            self._creator_thread_id == current_thread_id):
-            
-            connector = self.session.connector
-            if connector and getattr(connector, '_loop', None) == current_loop:
-                # 实例级会话有效且使用正确的事件循环
-                _thread_local.sessions[current_thread_id] = self.session
-                return self.session
-            else:
-                # 实例级会话使用了不同的事件循环，需要关闭
-                try:
-                    if not self.session.closed:
-                        await self.session.close()
-                except Exception as e:
-                    logger.warning(f"关闭实例级会话时出错: {str(e)}")
-                # 不使用实例级会话，继续创建新的
-        
-        # 5. 创建新会话，确保使用当前线程的事件循环
-        try:
-            # 创建新的连接器
-            connector = SafeTCPConnector(
-                ssl=False, 
-                enable_cleanup_closed=True,
-                loop=current_loop,
-                keepalive_timeout=30
-            )
-            
-            # 创建新的会话
+        if self.session is None or self.session.closed:
             headers = {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
             }
-            session = SafeClientSession(
-                connector=connector,
-                timeout=self.timeout,
-                headers=headers,
-                loop=current_loop,
-                trust_env=True
-            )
-            
-            # 存储新会话
-            _thread_local.sessions[current_thread_id] = session
-            
-            # 如果是创建者线程，也更新实例级会话
-            if current_thread_id == self._creator_thread_id:
-                self.session = session
-                
-            logger.debug(f"为线程 {current_thread_id} 创建了新的会话")
-            return session
-            
-        except Exception as e:
-            logger.error(f"创建HTTP会话时出错: {str(e)}")
-            # 尝试退回到简单的会话创建
-            try:
-                import aiohttp
-                session = aiohttp.ClientSession()
-                _thread_local.sessions[current_thread_id] = session
-                return session
-            except Exception as e2:
-                logger.error(f"创建备用HTTP会话时出错: {str(e2)}")
-                raise
+            self.session = http_transport.session(headers=headers, timeout=self.timeout, trust_env=True)
+        return self.session
     
     async def close(self):
-        """安全关闭HTTP会话"""
-        if self._closing:
-            return
-            
-        self._closing = True
-        current_thread_id = threading.get_ident()
-        
-        # 1. 关闭线程本地会话
-        if hasattr(_thread_local, 'sessions'):
-            if current_thread_id in _thread_local.sessions:
-                session = _thread_local.sessions[current_thread_id]
-                if session and not session.closed:
-                    try:
-                        await session.close()
-                        logger.debug(f"已关闭线程 {current_thread_id} 的HTTP会话")
-                    except Exception as e:
-                        if "Event loop is closed" not in str(e):
-                            logger.warning(f"关闭线程会话出错: {str(e)}")
-                _thread_local.sessions.pop(current_thread_id, None)
-        
-        # 2. 如果在创建者线程中，也关闭实例级会话
-        if self._creator_thread_id == current_thread_id and self.session and not self.session.closed:
-            try:
-                await self.session.close()
-                logger.debug("已关闭实例级HTTP会话")
-            except Exception as e:
-                if "Event loop is closed" not in str(e):
-                    logger.warning(f"关闭实例级会话出错: {str(e)}")
+        """关闭会话视图，共享连接池由http_transport统一管理"""
+        if self.session is not None:
+            await self.session.close()
             self.session = None
-            
-        self._closing = False
     
     async def __aenter__(self):
         """异步上下文管理器入口"""
@@ -312,6 +188,9 @@ class HTTPClient:
         发送HTTP请求并返回响应
         自动处理会话管理和失败重试
         支持代理管理器
+        
+        conditional=True时按source_id和URL保存ETag/Last-Modified并发送条件请求头，
+        上游返回304时data为None，不读取响应体
         """
         # 重试机制参数
         max_retries = kwargs.pop('max_retries', 2)
@@ -327,6 +206,10 @@ class HTTPClient:
         need_proxy = kwargs.pop('need_proxy', False)
         proxy_fallback = kwargs.pop('proxy_fallback', True)
         
+        # 条件请求
+        conditional = kwargs.pop('conditional', False)
+        validator_key = validator_store.make_key(source_id, url, kwargs.get('params')) if conditional else None
+        
         # 如果设置了特定代理URL，则使用它，否则使用代理管理器
         proxy_url = kwargs.pop('proxy', None)
         proxy_config = None
@@ -401,6 +284,8 @@ class HTTPClient:
                 
                 # 设置代理参数
                 request_kwargs = dict(kwargs)
+                if conditional:
+                    request_kwargs["headers"] = validator_store.apply(validator_key, request_kwargs.get("headers"))
                 if proxy_url:
                     request_kwargs["proxy"] = proxy_url
                     proxy_used = True
@@ -422,7 +307,7 @@ class HTTPClient:
                         
                         # 向代理管理器报告代理状态
                         if proxy_used and proxy_manager_loaded and proxy_config and proxy_config.get('id'):
-                            success = 200 <= status < 300
+                            success = 200 <= status < 300 or status == 304
                             try:
                                 await proxy_manager.report_proxy_status(proxy_config.get('id'), success, elapsed)
                                 if success:
@@ -432,6 +317,18 @@ class HTTPClient:
                             except Exception as e:
                                 logger.warning(f"报告代理状态时出错: {str(e)}")
                         
+                        # 内容未变化，不读取响应体
+                        if status == 304 and conditional:
+                            validator_store.record_not_modified(validator_key)
+                            return {
+                                'status': status,
+                                'data': None,
+                                'headers': dict(response.headers),
+                                'url': str(response.url)
+                            }
+                        if conditional and 200 <= status < 300:
+                            validator_store.update(validator_key, response.headers)
+                        
                         # 根据响应类型处理
                         if response_type == 'json':
                             try:
@@ -483,15 +380,7 @@ class HTTPClient:
                     "different loop" in error_msg or
                     "Session and connector" in error_msg):
                     logger.warning(f"HTTP请求出现事件循环错误: {error_msg}")
-                    # 删除当前会话，强制在下次请求中创建新会话
                     current_thread_id = threading.get_ident()
-                    if hasattr(_thread_local, 'sessions') and current_thread_id in _thread_local.sessions:
-                        try:
-                            if not _thread_local.sessions[current_thread_id].closed:
-                                await _thread_local.sessions[current_thread_id].close()
-                        except Exception:
-                            pass
-                        _thread_local.sessions.pop(current_thread_id, None)
                     
                     # 需要重新创建事件循环
                     if current_thread_id in _thread_eventloops:
@@ -549,6 +438,8 @@ class HTTPClient:
         统一的数据获取方法，返回处理后的响应内容
         这是APINewsSource等类使用的主要方法
         支持代理管理器配置
+        
+        conditional=True时发送条件请求，上游返回304时抛出NotModified
         """
         max_retries = kwargs.pop('max_retries', 3)
         retry_delay = kwargs.pop('retry_delay', 2)
@@ -598,22 +489,6 @@ class HTTPClient:
                 if retry_count > 0:
                     logger.info(f"第 {retry_count} 次重试获取数据: {url}")
                     
-                    # 强制清理旧会话
-                    if hasattr(_thread_local, 'sessions') and thread_id in _thread_local.sessions:
-                        try:
-                            old_session = _thread_local.sessions[thread_id]
-                            if old_session and not old_session.closed:
-                                try:
-                                    await old_session.close()
-                                except RuntimeError as e:
-                                    if "Event loop is closed" not in str(e):
-                                        logger.warning(f"关闭旧会话出错: {str(e)}")
-                        except Exception as e:
-                            logger.warning(f"访问或关闭旧会话时出错: {str(e)}")
-                        
-                        # 移除旧会话
-                        _thread_local.sessions.pop(thread_id, None)
-                    
                     # 如果有事件循环问题，尝试创建新的事件循环
                     if isinstance(last_error, RuntimeError) and "Event loop is closed" in str(last_error):
                         try:
@@ -679,6 +554,10 @@ class HTTPClient:
                     else:
                         raise
                 
+                # 内容未变化，由调用方复用已有数据
+                if response["status"] == 304 and request_kwargs.get("conditional"):
+                    raise NotModified(url)
+                
                 # 检查状态码
                 if response["status"] < 200 or response["status"] >= 300:
                     logger.warning(f"Fetch请求返回非成功状态码: {response['status']}, URL: {url}")
@@ -712,6 +591,9 @@ class HTTPClient:
                     else:
                         return None
             
+            except NotModified:
+                raise
+            
             except json.JSONDecodeError as e:
                 # JSON解析错误，可能是响应格式错误
                 logger.error(f"JSON解析错误: {url}, 错误: {str(e)}")
@@ -831,18 +713,6 @@ async def fetch(url: str, **kwargs) -> Any:
             if retry_count > 0:
                 logger.debug(f"第 {retry_count} 次重试获取数据: {url}")
                 
-                # 清理旧会话
-                if hasattr(_thread_local, 'sessions') and thread_id in _thread_local.sessions:
-                    try:
-                        old_session = _thread_local.sessions[thread_id]
-                        if old_session and not old_session.closed:
-                            await old_session.close()
-                    except Exception as e:
-                        if "Event loop is closed" not in str(e):
-                            logger.warning(f"关闭旧会话出错: {str(e)}")
-                    # 移除旧会话
-                    _thread_local.sessions.pop(thread_id, None)
-                
                 # 重置事件循环
                 if thread_id in _thread_eventloops:
                     _thread_eventloops.pop(thread_id, None)
@@ -863,6 +733,9 @@ async def fetch(url: str, **kwargs) -> Any:
             result = await default_client.fetch(url, **kwargs)
             return result
             
+        except NotModified:
+            raise
+            
         except Exception as e:
             retry_count += 1
             error_msg = str(e)
@@ -876,16 +749,6 @@ async def fetch(url: str, **kwargs) -> Any:
                     "different loop" in error_msg or 
                     "Session and connector" in error_msg):
                     
-                    # 强制清理会话和事件循环状态
-                    if hasattr(_thread_local, 'sessions'):
-                        for session_id, session in list(_thread_local.sessions.items()):
-                            try:
-                                if session and not session.closed:
-                                    await session.close()
-                            except Exception:
-                                pass
-                        _thread_local.sessions.clear()
-                    
                     # 清理所有事件循环记录
                     _thread_eventloops.clear()
                     
@@ -920,37 +783,8 @@ import asyncio
 def cleanup():
     """在进程退出时清理资源"""
     try:
-        # 从线程映射中获取事件循环
-        for thread_id, loop in _thread_eventloops.items():
-            if loop and not loop.is_closed():
-                # 获取所有线程会话并关闭
-                if hasattr(_thread_local, 'sessions'):
-                    for session_thread_id, session in list(_thread_local.sessions.items()):
-                        if session and not session.closed and session_thread_id == thread_id:
-                            try:
-                                loop.run_until_complete(session.close())
-                                logger.debug(f"已清理线程 {session_thread_id} 的HTTP会话")
-                            except Exception:
-                                pass
-        
-        # 清理默认事件循环
-        try:
-            loop = asyncio.get_event_loop()
-            if not loop.is_closed():
-                # 关闭默认客户端会话
-                if default_client.session and not default_client.session.closed:
-                    try:
-                        loop.run_until_complete(default_client.close())
-                        logger.debug("已清理默认HTTP客户端")
-                    except Exception:
-                        pass
-        except Exception:
-            pass
-                
-        # 清理会话表
-        if hasattr(_thread_local, 'sessions'):
-            _thread_local.sessions.clear()
-            
+        # 关闭共享连接池中的会话
+        http_transport.close_all()
     except Exception as e:
         logger.warning(f"清理HTTP资源时出错: {str(e)}")
 
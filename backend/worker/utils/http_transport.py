@@ -0,0 +1,274 @@
+"""
+共享HTTP传输层
+
+每个事件循环维护一个ClientSession和调优过的TCPConnector，所有数据源适配器
+通过它发起请求，同一上游主机的TLS连接可以在不同数据源和抓取周期之间复用。
+
+连接器配置:
+    - 总连接数和单主机连接数上限
+    - DNS缓存
+    - keep-alive空闲连接保持
+    - 自动协商gzip/deflate压缩（安装brotli后包括br）
+
+数据源不直接持有ClientSession，而是通过session()获取一个视图，视图附带
+默认请求头和超时，close()只关闭视图本身，不会关闭共享的连接池。
+
+共享会话不保存Cookie，每个视图有自己的CookieJar，随请求发送并保存响应设置的
+Cookie，不同数据源之间不会互相带上对方的Cookie。会话默认不读取环境变量中的代理
+配置，需要时用trust_env=True获取单独的会话，两种会话共用同一个连接器。
+"""
+
+import asyncio
+import logging
+import weakref
+from typing import Any, Dict, Optional, Union
+
+import aiohttp
+from yarl import URL
+# worker.utils.http_client会替换aiohttp.ClientSession/TCPConnector，这里直接使用原始类，
+# 避免连接器被替换成未调优的默认连接器
+from aiohttp.client import ClientSession
+from aiohttp.connector import TCPConnector
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+
+class SharedHTTPTransport:
+    """
+    按事件循环共享的HTTP传输层
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,  # 连接池总连接数上限
+        limit_per_host: int = 10,  # 单个主机的连接数上限
+        ttl_dns_cache: int = 300,  # DNS缓存时间，单位秒
+        keepalive_timeout: float = 60,  # 空闲连接保持时间，单位秒
+        timeout: float = 30  # 默认总超时，单位秒
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.ttl_dns_cache = ttl_dns_cache
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+
+        # 事件循环关闭并被回收后，对应的连接器和会话记录自动移除
+        self._connectors: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, TCPConnector]" = weakref.WeakKeyDictionary()
+        self._sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[bool, ClientSession]]" = weakref.WeakKeyDictionary()
+        self._created_count = 0
+
+    def get_session(self, trust_env: bool = False) -> ClientSession:
+        """
+        获取当前事件循环的共享会话，不存在或已关闭时创建
+
+        trust_env为True时返回读取环境变量中代理配置的会话。必须在运行中的事件循环内调用
+        """
+        loop = asyncio.get_running_loop()
+        sessions = self._sessions.setdefault(loop, {})
+        session = sessions.get(trust_env)
+        if session is None or session.closed:
+            session = self._create_session(self._get_connector(loop), trust_env)
+            sessions[trust_env] = session
+        return session
+
+    def _get_connector(self, loop: asyncio.AbstractEventLoop) -> TCPConnector:
+        connector = self._connectors.get(loop)
+        if connector is None or connector.closed:
+            connector = self._create_connector()
+            self._connectors[loop] = connector
+        return connector
+
+    def _create_connector(self) -> TCPConnector:
+        return TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            use_dns_cache=True,
+            ttl_dns_cache=self.ttl_dns_cache,
+            keepalive_timeout=self.keepalive_timeout,
+            enable_cleanup_closed=True,
+            # 与原有会话的默认行为保持一致，需要校验证书的请求单独传ssl参数
+            ssl=False
+        )
+
+    def _create_session(self, connector: TCPConnector, trust_env: bool) -> ClientSession:
+        self._created_count += 1
+        logger.debug(f"为事件循环创建共享HTTP会话，累计创建 {self._created_count} 个")
+        return ClientSession(
+            connector=connector,
+            # 连接器由传输层关闭，两种会话共用
+            connector_owner=False,
+            # Cookie由各个视图分别保存
+            cookie_jar=aiohttp.DummyCookieJar(),
+            timeout=self.timeout,
+            headers={"User-Agent": DEFAULT_USER_AGENT},
+            auto_decompress=True,
+            trust_env=trust_env
+        )
+
+    def session(
+        self,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[Union[aiohttp.ClientTimeout, float]] = None,
+        trust_env: bool = False
+    ) -> "TransportSession":
+        """
+        获取附带默认请求头、超时和独立CookieJar的会话视图
+        """
+        return TransportSession(self, headers=headers, timeout=timeout, trust_env=trust_env)
+
+    async def close(self) -> None:
+        """
+        关闭当前事件循环的共享会话
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        for session in self._sessions.pop(loop, {}).values():
+            if not session.closed:
+                await session.close()
+        connector = self._connectors.pop(loop, None)
+        if connector is not None and not connector.closed:
+            await connector.close()
+
+    def close_all(self) -> None:
+        """
+        关闭所有未运行的事件循环上的会话，用于进程退出时清理
+        """
+        for loop, connector in list(self._connectors.items()):
+            if loop.is_closed() or loop.is_running():
+                continue
+            try:
+                for session in self._sessions.get(loop, {}).values():
+                    if not session.closed:
+                        loop.run_until_complete(session.close())
+                if not connector.closed:
+                    loop.run_until_complete(connector.close())
+            except Exception as e:
+                logger.debug(f"关闭共享HTTP会话时出错: {str(e)}")
+        self._sessions.clear()
+        self._connectors.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取连接池统计信息
+        """
+        return {
+            "sessions": sum(
+                1 for sessions in self._sessions.values() for session in sessions.values() if not session.closed
+            ),
+            "created_count": self._created_count,
+            "limit": self.limit,
+            "limit_per_host": self.limit_per_host
+        }
+
+
+class TransportSession:
+    """
+    共享会话的视图
+
+    提供与ClientSession相同的request/get/post等方法，合并默认请求头、超时和视图
+    保存的Cookie后转发到当前事件循环的共享会话
+    """
+
+    def __init__(
+        self,
+        transport: SharedHTTPTransport,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[Union[aiohttp.ClientTimeout, float]] = None,
+        trust_env: bool = False
+    ):
+        self._transport = transport
+        self.trust_env = trust_env
+        self.cookie_jar = aiohttp.CookieJar()
+        self.headers = dict(headers or {})
+        if timeout is not None and not isinstance(timeout, aiohttp.ClientTimeout):
+            timeout = aiohttp.ClientTimeout(total=timeout)
+        self.timeout = timeout
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def request(self, method: str, url: Any, **kwargs):
+        if self.headers:
+            headers = dict(self.headers)
+            headers.update(kwargs.pop("headers", None) or {})
+            kwargs["headers"] = headers
+        timeout = kwargs.get("timeout", self.timeout)
+        if isinstance(timeout, (int, float)):
+            timeout = aiohttp.ClientTimeout(total=timeout)
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        cookies = self.cookie_jar.filter_cookies(URL(url))
+        if cookies:
+            # 调用方传入的Cookie优先
+            cookies = {name: morsel.value for name, morsel in cookies.items()}
+            cookies.update(kwargs.pop("cookies", None) or {})
+            kwargs["cookies"] = cookies
+        return _CookieRequest(
+            self._transport.get_session(self.trust_env).request(method, url, **kwargs),
+            self.cookie_jar
+        )
+
+    def get(self, url: Any, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: Any, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: Any, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url: Any, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def head(self, url: Any, **kwargs):
+        return self.request("HEAD", url, **kwargs)
+
+    async def close(self) -> None:
+        """只关闭视图，共享连接池继续保留"""
+        self._closed = True
+
+    async def __aenter__(self) -> "TransportSession":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+
+class _CookieRequest:
+    """
+    请求上下文的包装，收到响应后把响应设置的Cookie保存到视图的CookieJar
+
+    与ClientSession.request的返回值一样，既可以await也可以用async with
+    """
+
+    def __init__(self, request: Any, cookie_jar: aiohttp.CookieJar):
+        self._request = request
+        self._cookie_jar = cookie_jar
+
+    def _store_cookies(self, response: aiohttp.ClientResponse) -> aiohttp.ClientResponse:
+        # 重定向过程中的响应也可能设置Cookie
+        for hop in (*response.history, response):
+            self._cookie_jar.update_cookies(hop.cookies, hop.url)
+        return response
+
+    def __await__(self):
+        return self._send().__await__()
+
+    async def _send(self) -> aiohttp.ClientResponse:
+        return self._store_cookies(await self._request)
+
+    async def __aenter__(self) -> aiohttp.ClientResponse:
+        return self._store_cookies(await self._request.__aenter__())
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self._request.__aexit__(exc_type, exc_val, exc_tb)
+
+
+# 全局单例
+http_transport = SharedHTTPTransport()
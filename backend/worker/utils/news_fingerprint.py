@@ -0,0 +1,163 @@
+"""
+新闻增量入库的指纹集合
+
+每个数据源保留上一次成功入库结果的指纹（original_id到内容哈希的映射）。新一轮抓取的结果
+先与指纹比较，分出新增、变化和消失的新闻，只有新增和变化的新闻需要写入数据库。
+热榜类数据源两次抓取之间通常只有少量条目变化，大部分行在这里就被跳过，
+不再需要分词、查询现有哈希和发出UPSERT语句。
+
+指纹按数据源保存在Redis的哈希（news:fingerprint:<source_id>）中，由所有worker进程共享，
+prefork子进程之间不会各自保留一份过期的指纹。指纹只在数据库写入成功后才通过commit()保存，
+写入失败时下一轮会重新比较同样的新闻。Redis不可用或指纹已过期时，全部新闻视为新增，
+由数据库层的内容哈希比较兜底。
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+import redis
+
+from app.core.config import settings
+from app.crud.news import compute_news_hash
+
+logger = logging.getLogger(__name__)
+
+
+class SourceDelta(NamedTuple):
+    """
+    一个数据源本轮抓取结果与上一次结果的差异
+    """
+    source_id: str
+    rows: List[Dict[str, Any]]  # 需要写入的新增和变化的新闻
+    added: int  # 新增的新闻数
+    changed: int  # 内容变化的新闻数
+    removed: int  # 上一次结果中有、本轮消失的新闻数
+    unchanged: int  # 内容未变化、跳过写入的新闻数
+    fingerprints: Dict[str, str]  # 本轮结果的指纹，写入成功后保存
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            "added": self.added,
+            "changed": self.changed,
+            "removed": self.removed,
+            "unchanged": self.unchanged,
+        }
+
+
+class FingerprintStore:
+    """
+    保存在Redis中的数据源指纹存储，按数据源设置过期时间
+    """
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        prefix: str = "news:fingerprint",
+        ttl: int = 86400,
+        socket_timeout: float = 1.0
+    ):
+        self.redis_url = redis_url
+        self.prefix = prefix
+        self.ttl = ttl
+        self.socket_timeout = socket_timeout
+        self._client: Optional[redis.Redis] = None
+        self.stats = {
+            "items_seen": 0,  # 比较过的新闻数
+            "items_skipped": 0,  # 因未变化跳过写入的新闻数
+            "errors": 0,  # Redis访问失败次数
+        }
+
+    @property
+    def client(self) -> redis.Redis:
+        if self._client is None:
+            self._client = redis.Redis.from_url(
+                self.redis_url or settings.REDIS_URL,
+                socket_timeout=self.socket_timeout,
+                socket_connect_timeout=self.socket_timeout
+            )
+        return self._client
+
+    def _key(self, source_id: str) -> str:
+        return f"{self.prefix}:{source_id}"
+
+    def diff(self, source_id: str, rows: Iterable[Dict[str, Any]]) -> SourceDelta:
+        """
+        比较数据源本轮的新闻行与上一次成功入库的指纹
+
+        Args:
+            source_id: 数据源ID
+            rows: 本轮的新闻行，需要包含original_id以及内容哈希用到的字段
+        """
+        # 同一个original_id出现多次时以最后一条为准，与批量写入的行为一致
+        current_rows: Dict[str, Dict[str, Any]] = {}
+        fingerprints: Dict[str, str] = {}
+        for row in rows:
+            original_id = row["original_id"]
+            current_rows[original_id] = row
+            fingerprints[original_id] = compute_news_hash(row)
+
+        previous: Dict[str, str] = {}
+        if current_rows:
+            try:
+                previous = {
+                    original_id.decode(): value.decode()
+                    for original_id, value in self.client.hgetall(self._key(source_id)).items()
+                }
+            except redis.RedisError as e:
+                self.stats["errors"] += 1
+                logger.warning(f"读取数据源 {source_id} 的指纹失败，全部新闻按新增处理: {e}")
+
+        pending = []
+        added = changed = 0
+        for original_id, row in current_rows.items():
+            old_hash = previous.get(original_id)
+            if old_hash is None:
+                added += 1
+            elif old_hash != fingerprints[original_id]:
+                changed += 1
+            else:
+                continue
+            pending.append(row)
+
+        removed = sum(1 for original_id in previous if original_id not in current_rows)
+        unchanged = len(current_rows) - len(pending)
+
+        self.stats["items_seen"] += len(current_rows)
+        self.stats["items_skipped"] += unchanged
+
+        return SourceDelta(source_id, pending, added, changed, removed, unchanged, fingerprints)
+
+    def commit(self, delta: SourceDelta) -> None:
+        """
+        用本轮结果的指纹替换数据源的指纹，数据库写入成功后调用
+        """
+        key = self._key(delta.source_id)
+        try:
+            pipe = self.client.pipeline(transaction=True)
+            pipe.delete(key)
+            if delta.fingerprints:
+                pipe.hset(key, mapping=delta.fingerprints)
+                pipe.expire(key, self.ttl)
+            pipe.execute()
+        except redis.RedisError as e:
+            # 指纹没有保存时下一轮会重新写入，由数据库层的内容哈希比较兜底
+            self.stats["errors"] += 1
+            logger.warning(f"保存数据源 {delta.source_id} 的指纹失败: {e}")
+
+    def invalidate(self, source_id: str) -> bool:
+        """
+        丢弃数据源的指纹，下一轮抓取的新闻全部重新写入
+        """
+        try:
+            return bool(self.client.delete(self._key(source_id)))
+        except redis.RedisError as e:
+            self.stats["errors"] += 1
+            logger.warning(f"删除数据源 {source_id} 的指纹失败: {e}")
+            return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats)
+
+
+# 全局单例
+fingerprint_store = FingerprintStore()
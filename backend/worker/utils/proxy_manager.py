@@ -3,15 +3,16 @@ import random
 import logging
 import asyncio
 import contextlib
+from collections import deque
 from typing import Dict, List, Optional, Any, Tuple, Set
 from datetime import datetime, timedelta
 
 import aiohttp
-from sqlalchemy import func
+from sqlalchemy import func, update
 from sqlalchemy.orm import Session
 
 from app.models.proxy import ProxyConfig, ProxyStatus
-from app.db.session import SessionLocal
+from app.db.session import SessionLocal, run_db
 
 logger = logging.getLogger(__name__)
 
@@ -29,25 +30,34 @@ class ProxyManager:
             cls._instance._initialized = False
         return cls._instance
     
-    def __init__(self, refresh_interval: int = 300):
+    def __init__(self, refresh_interval: int = 300, stats_flush_interval: int = 30,
+                 stats_flush_threshold: int = 200):
         """
         初始化代理管理器
         
         Args:
             refresh_interval: 代理列表刷新间隔(秒)
+            stats_flush_interval: 代理使用统计写入数据库的间隔(秒)
+            stats_flush_threshold: 累积多少次使用报告后立即写入数据库
         """
         if self._initialized:
             return
             
         self.refresh_interval = refresh_interval
+        self.stats_flush_interval = stats_flush_interval
+        self.stats_flush_threshold = stats_flush_threshold
         
         # 代理缓存
         self._proxies = {}  # 所有代理 {id: proxy_config}
         self._active_proxies = {}  # 活跃代理 {group: [proxy_config, ...]}
         self._proxy_status = {}  # 代理状态 {proxy_url: {"success": 0, "failure": 0, "last_used": timestamp}}
         
-        # 锁，用于并发控制
-        self._locks = {}  # {proxy_id: asyncio.Lock()}
+        # 待写入数据库的使用统计 {proxy_id: {"success": 0, "failure": 0, "response_times": deque}}
+        self._pending_stats: Dict[int, Dict[str, Any]] = {}
+        self._pending_reports = 0
+        self._last_stats_flush = time.time()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flusher_task: Optional[asyncio.Task] = None
         
         # 缓存时间戳
         self._last_refresh = 0
@@ -80,39 +90,38 @@ class ProxyManager:
                 return False
             
             logger.info("正在刷新代理列表...")
-            # 使用同步方式查询数据库
-            db = SessionLocal()
-            try:
-                proxies = db.query(ProxyConfig).all()
-                
-                # 重置缓存
-                self._proxies = {}
-                self._active_proxies = {}
-                
-                # 更新缓存
-                for proxy in proxies:
-                    self._proxies[proxy.id] = proxy
-                    
-                    # 只添加活跃的代理
-                    if proxy.status == ProxyStatus.ACTIVE:
-                        group = proxy.group or "default"
-                        if group not in self._active_proxies:
-                            self._active_proxies[group] = []
-                        self._active_proxies[group].append(proxy)
-                
-                # 按优先级排序
-                for group in self._active_proxies:
-                    self._active_proxies[group] = sorted(
-                        self._active_proxies[group], 
-                        key=lambda x: (x.priority, x.success_rate), 
-                        reverse=True
-                    )
+            # 先写入累积的使用统计，避免刷新后的数据落后于内存
+            await self.flush_proxy_stats()
+            
+            # 在数据库线程池中查询，避免阻塞事件循环
+            proxies = await run_db(self._load_proxies)
+            
+            # 重置缓存
+            self._proxies = {}
+            self._active_proxies = {}
+            
+            # 更新缓存
+            for proxy in proxies:
+                self._proxies[proxy.id] = proxy
                 
-                self._last_refresh = now
-                logger.info(f"代理列表刷新完成，共加载 {len(self._proxies)} 个代理，{len(self._active_proxies)} 个代理组")
-                return True
-            finally:
-                db.close()
+                # 只添加活跃的代理
+                if proxy.status == ProxyStatus.ACTIVE:
+                    group = proxy.group or "default"
+                    if group not in self._active_proxies:
+                        self._active_proxies[group] = []
+                    self._active_proxies[group].append(proxy)
+            
+            # 按优先级排序
+            for group in self._active_proxies:
+                self._active_proxies[group] = sorted(
+                    self._active_proxies[group], 
+                    key=lambda x: (x.priority, x.success_rate), 
+                    reverse=True
+                )
+            
+            self._last_refresh = now
+            logger.info(f"代理列表刷新完成，共加载 {len(self._proxies)} 个代理，{len(self._active_proxies)} 个代理组")
+            return True
         except Exception as e:
             logger.error(f"刷新代理列表出错: {e}")
             return False
@@ -175,6 +184,9 @@ class ProxyManager:
         """
         报告代理使用状态
         
+        只在内存中累积，达到数量阈值或时间间隔后批量写入数据库，
+        没有新的报告时由当前事件循环中的定时任务按间隔写入
+        
         Args:
             proxy_id: 代理ID
             success: 是否成功
@@ -183,52 +195,168 @@ class ProxyManager:
         if proxy_id not in self._proxies:
             logger.warning(f"报告状态的代理不存在: {proxy_id}")
             return
+        
+        stats = self._pending_stats.get(proxy_id)
+        if stats is None:
+            stats = {"success": 0, "failure": 0, "response_times": deque(maxlen=64)}
+            self._pending_stats[proxy_id] = stats
+        
+        if success:
+            stats["success"] += 1
+            if response_time is not None:
+                stats["response_times"].append(response_time)
+        else:
+            stats["failure"] += 1
+        self._pending_reports += 1
+        self._ensure_stats_flusher()
+        
+        if (self._pending_reports >= self.stats_flush_threshold
+                or time.time() - self._last_stats_flush >= self.stats_flush_interval):
+            self._schedule_stats_flush()
+    
+    def _schedule_stats_flush(self) -> None:
+        """在后台写入使用统计，同一时间只有一个写入任务"""
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        try:
+            self._flush_task = asyncio.create_task(self.flush_proxy_stats())
+        except RuntimeError as e:
+            logger.error(f"创建代理统计写入任务失败: {e}")
+    
+    def _ensure_stats_flusher(self) -> None:
+        """确保当前事件循环中有定时写入统计的任务"""
+        task = self._flusher_task
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            return
+        self._flusher_task = asyncio.create_task(self._run_stats_flusher())
+    
+    async def _run_stats_flusher(self) -> None:
+        """
+        按stats_flush_interval定时写入统计
+        
+        事件循环关闭时任务被取消，取消前先写入剩余的统计
+        """
+        try:
+            while True:
+                await asyncio.sleep(self.stats_flush_interval)
+                if time.time() - self._last_stats_flush >= self.stats_flush_interval:
+                    await self.flush_proxy_stats()
+        finally:
+            if self._pending_stats:
+                await self.flush_proxy_stats()
+    
+    async def flush_proxy_stats(self) -> int:
+        """
+        将累积的代理使用统计批量写入数据库
+        
+        Returns:
+            int: 更新的代理数量
+        """
+        if not self._pending_stats:
+            self._last_stats_flush = time.time()
+            return 0
+        
+        # 交换缓冲区，写入期间的新报告进入新的缓冲区
+        pending, self._pending_stats = self._pending_stats, {}
+        self._pending_reports = 0
+        self._last_stats_flush = time.time()
+        
+        try:
+            updates = await run_db(self._write_proxy_stats, pending)
+        except Exception as e:
+            logger.error(f"更新代理状态出错: {e}")
+            self._restore_pending_stats(pending)
+            return 0
+        
+        # 更新缓存
+        for values in updates:
+            proxy = self._proxies.get(values["id"])
+            if proxy is None:
+                continue
+            for key, value in values.items():
+                setattr(proxy, key, value)
+            if values["status"] == ProxyStatus.ERROR:
+                for group in self._active_proxies:
+                    self._active_proxies[group] = [p for p in self._active_proxies[group] if p.id != proxy.id]
+        
+        return len(updates)
+    
+    def _restore_pending_stats(self, pending: Dict[int, Dict[str, Any]]) -> None:
+        """写入失败时把统计合并回缓冲区，等待下次写入"""
+        for proxy_id, stats in pending.items():
+            current = self._pending_stats.get(proxy_id)
+            if current is None:
+                self._pending_stats[proxy_id] = stats
+                continue
+            current["success"] += stats["success"]
+            current["failure"] += stats["failure"]
+            # 先发生的响应时间排在前面
+            times = deque(stats["response_times"], maxlen=64)
+            times.extend(current["response_times"])
+            current["response_times"] = times
+        self._pending_reports += sum(s["success"] + s["failure"] for s in pending.values())
+    
+    @staticmethod
+    def _load_proxies(db: Session) -> List[ProxyConfig]:
+        """
+        查询所有代理配置，在数据库线程池中执行
+        """
+        return db.query(ProxyConfig).all()
+    
+    @staticmethod
+    def _write_proxy_stats(db: Session, pending: Dict[int, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        根据累积的统计计算代理的新指标并批量更新，在数据库线程池中执行
+        
+        Returns:
+            List[Dict[str, Any]]: 每个代理更新后的字段
+        """
+        proxies = db.query(ProxyConfig).filter(
+            ProxyConfig.id.in_(list(pending.keys()))
+        ).with_for_update().all()
+        
+        updates = []
+        for proxy in proxies:
+            stats = pending[proxy.id]
+            total_requests = (proxy.total_requests or 0) + stats["success"] + stats["failure"]
+            successful_requests = (proxy.successful_requests or 0) + stats["success"]
+            failed_requests = (proxy.failed_requests or 0) + stats["failure"]
             
-        # 防止并发更新，使用锁
-        if proxy_id not in self._locks:
-            self._locks[proxy_id] = asyncio.Lock()
+            # 按报告顺序折叠指数移动平均
+            avg_response_time = proxy.avg_response_time or 0
+            for response_time in stats["response_times"]:
+                if avg_response_time == 0:
+                    avg_response_time = response_time
+                else:
+                    avg_response_time = 0.7 * avg_response_time + 0.3 * response_time
             
-        async with self._locks[proxy_id]:
-            try:
-                # 使用同步数据库访问
-                db = SessionLocal()
-                try:
-                    proxy = db.query(ProxyConfig).filter(ProxyConfig.id == proxy_id).first()
-                    if not proxy:
-                        logger.warning(f"代理不存在: {proxy_id}")
-                        return
-                    
-                    # 更新统计信息
-                    proxy.total_requests += 1
-                    if success:
-                        proxy.successful_requests += 1
-                        
-                        # 更新平均响应时间
-                        if response_time is not None:
-                            if proxy.avg_response_time == 0:
-                                proxy.avg_response_time = response_time
-                            else:
-                                # 指数移动平均
-                                proxy.avg_response_time = 0.7 * proxy.avg_response_time + 0.3 * response_time
-                    else:
-                        proxy.failed_requests += 1
-                    
-                    # 更新成功率
-                    proxy.success_rate = (proxy.successful_requests / proxy.total_requests) * 100
-                    
-                    # 如果成功率过低，标记为不活跃
-                    if proxy.success_rate < 30 and proxy.total_requests > 10:
-                        proxy.status = ProxyStatus.ERROR
-                        logger.warning(f"代理 {proxy.name} (ID: {proxy.id}) 成功率过低 ({proxy.success_rate:.2f}%)，已标记为不活跃")
-                    
-                    db.commit()
-                    
-                    # 更新缓存
-                    self._proxies[proxy_id] = proxy
-                finally:
-                    db.close()
-            except Exception as e:
-                logger.error(f"更新代理状态出错: {e}")
+            # 更新成功率
+            success_rate = (successful_requests / total_requests) * 100
+            
+            # 如果成功率过低，标记为不活跃
+            status = proxy.status
+            if success_rate < 30 and total_requests > 10 and status != ProxyStatus.ERROR:
+                status = ProxyStatus.ERROR
+                logger.warning(f"代理 {proxy.name} (ID: {proxy.id}) 成功率过低 ({success_rate:.2f}%)，已标记为不活跃")
+            
+            updates.append({
+                "id": proxy.id,
+                "total_requests": total_requests,
+                "successful_requests": successful_requests,
+                "failed_requests": failed_requests,
+                "avg_response_time": avg_response_time,
+                "success_rate": success_rate,
+                "status": status,
+            })
+        
+        missing = set(pending.keys()) - {proxy.id for proxy in proxies}
+        if missing:
+            logger.warning(f"代理不存在: {sorted(missing)}")
+        
+        if updates:
+            db.execute(update(ProxyConfig), updates)
+        db.commit()
+        return updates
     
     async def check_proxy_health(self, proxy_id: int = None):
         """